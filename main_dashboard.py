@@ -23,6 +23,7 @@ sys.path.insert(0, str(project_root))
 from src.web_ui.freqtrade_controller import FreqtradeController
 from src.web_ui.market_data_provider import MarketDataProvider
 from src.web_ui.openbb_provider import EnhancedOpenBBCapabilities
+from src.analysis.screener_pipeline import ScreenerPipeline
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -45,6 +46,42 @@ except ImportError:
     openbb_provider = None
     OPENBB_AVAILABLE = False
 
+# Universe screener - recomputed once per candle close, endpoints read the snapshot
+SCREENER_DEFAULT_PAIRS = [
+    'BTC/USDT', 'ETH/USDT', 'SOL/USDT', 'ADA/USDT', 'DOT/USDT',
+    'LINK/USDT', 'AVAX/USDT', 'UNI/USDT', 'ATOM/USDT'
+]
+_screener_exchange = None
+
+def _fetch_screener_universe():
+    """Fetch OHLCV for the whitelist (or default pairs) from the public exchange API"""
+    global _screener_exchange
+    import ccxt
+    import pandas as pd
+
+    if _screener_exchange is None:
+        _screener_exchange = ccxt.binance({'enableRateLimit': True})
+
+    whitelist = freqtrade.get_whitelist()
+    pairs = whitelist.get('whitelist') if whitelist.get('success') else SCREENER_DEFAULT_PAIRS
+
+    universe = {}
+    for pair in pairs:
+        try:
+            ohlcv = _screener_exchange.fetch_ohlcv(pair, screener.timeframe, limit=400)
+            universe[pair] = pd.DataFrame(
+                ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+            )
+        except Exception as e:
+            logger.warning(f"Screener fetch failed for {pair}: {e}")
+    return universe
+
+screener = ScreenerPipeline(
+    _fetch_screener_universe,
+    timeframe='1h',
+    config={'snapshot_path': 'user_data/screener_snapshot.npz'}
+)
+
 # API Routes
 @app.route('/')
 def dashboard():
@@ -348,6 +385,23 @@ def api_trade_logic(symbol):
 def api_smart_money_screener():
     """Get smart money screening results"""
     try:
+        snapshot = screener.get_snapshot()
+        if len(snapshot):
+            opportunities = [
+                {
+                    "pair": row['pair'],
+                    "signal": row['flow_type'].upper(),
+                    "recommendation": row['recommendation'],
+                    "regime": row['regime'],
+                    "whale_activity": row['flow_strength'],
+                    "confidence": row['regime_confidence'],
+                    "volume_ratio": row['volume_ratio_short'],
+                    "score": (row['volume_score'] or 0.0) / 100
+                }
+                for row in snapshot.top('volume_score', limit=request.args.get('limit', 20, type=int))
+            ]
+            return jsonify(opportunities)
+
         opportunities = [
             {
                 "pair": "BTC/USDT",
@@ -903,6 +957,14 @@ def api_balance():
 def api_market_heatmap():
     """Get market heatmap"""
     try:
+        snapshot = screener.get_snapshot()
+        if len(snapshot):
+            heatmap_data = [
+                {"symbol": row['pair'], "price": row['close'], "change": row['change_pct'], "regime": row['regime']}
+                for row in snapshot.top('change_pct')
+            ]
+            return jsonify({"heatmap": heatmap_data, "updated": snapshot.computed_at.isoformat()})
+
         heatmap_data = [
             {"symbol": "BTC/USDT", "price": 45234.80, "change": 2.35},
             {"symbol": "ETH/USDT", "price": 2456.75, "change": -1.25},
@@ -1287,6 +1349,9 @@ def main():
         print(f"❌ Freqtrade API: {connection_test['message']}")
     
     print()
+    # Only start background work in the serving process (not the reloader parent)
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        screener.start()
     app.run(host='127.0.0.1', port=port, debug=True)
 
 if __name__ == '__main__':
@@ -6,12 +6,34 @@ Combines multiple advanced analysis techniques for high-probability trades
 import logging
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from src.analysis.timeframe_alignment import TimeframeAligner
+    from src.data.history_store import HistoryStore
+    from src.data.resampler import CandleResampler, timeframe_to_ms
+    from src.monitoring.async_logging import HotPathLogger
+    from src.monitoring.metrics import SIGNALS
+except ImportError:  # imported with src/ on the path
+    from analysis.timeframe_alignment import TimeframeAligner
+    from data.history_store import HistoryStore
+    from data.resampler import CandleResampler, timeframe_to_ms
+    from monitoring.async_logging import HotPathLogger
+    from monitoring.metrics import SIGNALS
+
 logger = logging.getLogger(__name__)
+hot_log = HotPathLogger(__name__, interval=60.0)
+
+# Columns of the bounded signal history (one row per emitted signal)
+SIGNAL_HISTORY_FIELDS = [
+    ('signal_type', 'U12'), ('strength', 'i1'), ('confidence', 'f8'),
+    ('entry_price', 'f8'), ('stop_loss', 'f8'), ('take_profit', 'f8'),
+    ('risk_reward_ratio', 'f8'), ('position_size', 'f8'),
+    ('liquidity_score', 'f8'), ('unusual_activity', '?'),
+]
 
 class SignalStrength(Enum):
     WEAK = 1
@@ -51,9 +73,14 @@ class AdvancedSignalEngine:
     Professional-grade signal engine with advanced technical analysis
     """
     
-    def __init__(self):
+    def __init__(self, base_timeframe: str = '1h', signal_history_size: int = 10_000,
+                 history_spill=None):
         self.active_positions = {}
-        self.signal_history = []
+        # One base candle stream per symbol; higher timeframes are resampled locally
+        self.resampler = CandleResampler(base_timeframe)
+        self.aligner = TimeframeAligner(base_timeframe)
+        # Fixed-size ring of emitted signals; evicted rows go to history_spill if set
+        self.signal_history = HistoryStore(SIGNAL_HISTORY_FIELDS, signal_history_size, spill=history_spill)
         self.fibonacci_calculator = FibonacciAnalyzer()
         self.pattern_detector = ChartPatternDetector()
         self.liquidity_analyzer = LiquidityAnalyzer()
@@ -63,7 +90,7 @@ class AdvancedSignalEngine:
     # 1. ADVANCED TECHNICAL ANALYSIS ENGINE
     # =============================================================================
     
-    async def analyze_comprehensive_signals(self, symbol: str, timeframes: List[str] = ['1h', '4h', '1d']) -> List[TradingSignal]:
+    async def analyze_comprehensive_signals(self, symbol: str, timeframes: Sequence[str] = ('1h', '4h', '1d')) -> List[TradingSignal]:
         """
         Generate comprehensive trading signals using advanced multi-timeframe analysis
         """
@@ -71,6 +98,11 @@ class AdvancedSignalEngine:
         
         signals = []
         
+        # Fetch the base stream once, deep enough for the highest timeframe
+        await self._ensure_base_history(
+            symbol, max(self.resampler.base_candles_needed(tf, 500) for tf in timeframes)
+        )
+        
         for timeframe in timeframes:
             try:
                 # Get OHLCV data
@@ -113,10 +145,83 @@ class AdvancedSignalEngine:
                 
         # Rank and filter signals by strength
         ranked_signals = self._rank_and_filter_signals(signals)
+        for signal in ranked_signals:
+            self._record_signal(signal)
         
         logger.info(f"✅ Generated {len(ranked_signals)} high-probability signals for {symbol}")
         return ranked_signals
     
+    def _record_signal(self, signal: TradingSignal):
+        """Append a signal to the bounded history"""
+        SIGNALS.labels('advanced_signal_engine', signal.signal_type.value).inc()
+        self.signal_history.append(
+            signal.symbol,
+            signal.timestamp,
+            signal_type=signal.signal_type.value,
+            strength=signal.strength.value,
+            confidence=signal.confidence,
+            entry_price=signal.entry_price,
+            stop_loss=signal.stop_loss,
+            take_profit=signal.take_profit_levels[0] if signal.take_profit_levels else 0.0,
+            risk_reward_ratio=signal.risk_reward_ratio,
+            position_size=signal.position_size,
+            liquidity_score=signal.liquidity_score,
+            unusual_activity=signal.unusual_activity,
+        )
+    
+    def recent_signals(self, symbol: Optional[str] = None, n: int = 10) -> pd.DataFrame:
+        """Last n recorded signals (for one symbol), oldest first"""
+        return self.signal_history.to_frame(self.signal_history.last(n, symbol))
+    
+    async def get_multi_timeframe_features(
+        self,
+        symbol: str,
+        timeframes: Sequence[str] = ('4h', '1d'),
+        limit: int = 500
+    ) -> pd.DataFrame:
+        """
+        Per-bar feature matrix on the base timeframe with higher-timeframe
+        features aligned to each bar without look-ahead (for bar-by-bar backtests)
+        """
+        await self._ensure_base_history(
+            symbol, max(self.resampler.base_candles_needed(tf, limit) for tf in timeframes)
+        )
+        base = self.resampler.get(symbol, self.resampler.base_timeframe)
+        features = self.aligner.from_base(base, timeframes, self._bar_indicators, key=symbol)
+        return pd.concat([base, features], axis=1).tail(limit).reset_index(drop=True)
+    
+    @staticmethod
+    def _bar_indicators(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Causal per-bar versions of the core technical indicators
+        """
+        close = df['close']
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+        
+        sma_20 = close.rolling(20).mean()
+        std_20 = close.rolling(20).std()
+        ema_12 = close.ewm(span=12).mean()
+        ema_26 = close.ewm(span=26).mean()
+        true_range = np.maximum(
+            df['high'] - df['low'],
+            np.maximum(np.abs(df['high'] - close.shift()), np.abs(df['low'] - close.shift()))
+        )
+        
+        return pd.DataFrame({
+            'sma_20': sma_20,
+            'sma_50': close.rolling(50).mean(),
+            'ema_12': ema_12,
+            'ema_26': ema_26,
+            'macd': ema_12 - ema_26,
+            'rsi': 100 - 100 / (1 + gain / loss),
+            'bb_position': (close - (sma_20 - 2 * std_20)) / (4 * std_20),
+            'volume_ratio': df['volume'] / df['volume'].rolling(20).mean(),
+            'atr': true_range.rolling(14).mean(),
+            'momentum': close / close.shift(9) - 1,
+        }, index=df.index)
+    
     async def _calculate_advanced_indicators(self, df: pd.DataFrame) -> Dict[str, float]:
         """
         Calculate comprehensive technical indicators
@@ -176,7 +281,7 @@ class AdvancedSignalEngine:
             indicators['momentum'] = df['close'].iloc[-1] / df['close'].iloc[-10] - 1
             indicators['rate_of_change'] = (df['close'].iloc[-1] / df['close'].iloc[-12] - 1) * 100
             
-            logger.info(f"📊 Calculated {len(indicators)} technical indicators")
+            hot_log.debug('📊 Calculated %d technical indicators', len(indicators))
             return indicators
             
         except Exception as e:
@@ -438,29 +543,55 @@ class AdvancedSignalEngine:
     
     async def _get_ohlcv_data(self, symbol: str, timeframe: str, limit: int = 500) -> Optional[pd.DataFrame]:
         """
-        Get OHLCV data for analysis
+        Get OHLCV data for analysis, derived from the symbol's base candle stream
+        """
+        try:
+            # Callers top the stream up once per analysis, not per timeframe
+            await self._ensure_base_history(
+                symbol, self.resampler.base_candles_needed(timeframe, limit), top_up=False
+            )
+            return self.resampler.get(symbol, timeframe, limit=limit)
+
+        except Exception as e:
+            logger.error(f"Error getting OHLCV data: {e}")
+            return None
+
+    async def _ensure_base_history(self, symbol: str, needed: int, top_up: bool = True) -> None:
+        """
+        Backfill the base stream when it holds fewer than ``needed`` candles,
+        otherwise fetch the candles after the newest one held
+        """
+        if self.resampler.base_candles(symbol) < needed:
+            base = await self._fetch_base_ohlcv(symbol, needed)
+        elif top_up:
+            # Re-fetches the newest held candle, which may still have been forming
+            base = await self._fetch_base_ohlcv(symbol, needed, since=self.resampler.last_base_timestamp(symbol))
+        else:
+            return
+        if base is not None:
+            self.resampler.ingest(symbol, base)
+
+    async def _fetch_base_ohlcv(self, symbol: str, limit: int, since: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        Fetch base-timeframe OHLCV candles (from open time ``since`` in ms, if given)
         Mock implementation - replace with real data source
         """
         try:
             # Mock data generation for now
             # In production, fetch from Bybit/Binance/etc
-            dates = pd.date_range(start=datetime.now() - timedelta(days=limit), periods=limit, freq='H')
+            interval = pd.Timedelta(milliseconds=timeframe_to_ms(self.resampler.base_timeframe))
+            dates = pd.date_range(end=pd.Timestamp.now().floor(interval), periods=limit, freq=interval)
+            if since is not None:
+                dates = dates[dates >= pd.Timestamp(since, unit='ms')]
+            limit = len(dates)
             
             # Generate realistic OHLCV data with some patterns
             base_price = 50000 if 'BTC' in symbol else 3000 if 'ETH' in symbol else 200
             
-            prices = []
-            volumes = []
-            
-            for i in range(limit):
-                # Add some trending and noise
-                trend = (i - limit/2) * 0.001
-                noise = np.random.normal(0, 0.02)
-                price = base_price * (1 + trend + noise)
-                prices.append(price)
-                
-                volume = np.random.exponential(1000) + 500
-                volumes.append(volume)
+            # Add some trending and noise
+            trend = np.linspace(-0.25, 0.25, limit)
+            prices = base_price * (1 + trend + np.random.normal(0, 0.02, limit))
+            volumes = np.random.exponential(1000, limit) + 500
             
             # Create OHLC from prices
             df = pd.DataFrame({
@@ -477,7 +608,7 @@ class AdvancedSignalEngine:
             return df
             
         except Exception as e:
-            logger.error(f"Error getting OHLCV data: {e}")
+            logger.error(f"Error fetching base OHLCV data: {e}")
             return None
 
 # =============================================================================
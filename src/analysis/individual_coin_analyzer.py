@@ -11,12 +11,32 @@ Key insight: A coin at -90% from ATH might be in accumulation zone
 while BTC is in a bull market - they need different strategies.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, List
 import logging
 from dataclasses import dataclass
 from enum import Enum
 
+from src.analysis.market_panel import MarketPanel, ewm_mean
+
+def _to_scalar(value):
+    """Unwrap NumPy scalars so panel results match the per-frame dicts"""
+    return value.item() if isinstance(value, np.generic) else value
+
+def _last_two_positions(mask: np.ndarray):
+    """Column positions of the last and second-to-last True per row (0 if absent)"""
+    positions = np.where(mask, np.arange(mask.shape[1]), -1)
+    last = positions.max(axis=1)
+    previous = np.where(positions == last[:, None], -1, positions).max(axis=1)
+    return np.maximum(last, 0), np.maximum(previous, 0)
+
+def _mean_of_last_n(values: np.ndarray, mask: np.ndarray, n: int) -> np.ndarray:
+    """Per-row mean of the last n values where mask is True (NaN if none)"""
+    from_end = np.cumsum(mask[:, ::-1], axis=1)[:, ::-1]
+    selected = mask & (from_end <= n)
+    return (values * selected).sum(axis=1) / selected.sum(axis=1)
+
 class CoinRegime(Enum):
     """Individual coin market regimes"""
     BULL_STRONG = "bull_strong"          # Near ATH, strong uptrend
@@ -87,35 +107,41 @@ class IndividualCoinAnalyzer:
             # Volume context
             volume_analysis = self._analyze_volume_context(dataframe)
             
-            # Regime classification
-            regime = self._classify_regime(price_levels, trend_analysis, structure_analysis, volume_analysis)
-            
-            # Trading permissions and position sizing
-            trading_info = self._get_trading_permissions(regime, price_levels, trend_analysis)
-            
-            # Risk and opportunity assessment
-            risk_factors = self._assess_risks(price_levels, trend_analysis, structure_analysis)
-            opportunities = self._identify_opportunities(regime, price_levels, trend_analysis)
-            
-            return CoinAnalysis(
-                pair=pair,
-                regime=regime,
-                trend_strength=trend_analysis['strength'],
-                distance_from_ath=price_levels['distance_from_ath'],
-                distance_from_atl=price_levels['distance_from_atl'], 
-                price_percentile=price_levels['price_percentile'],
-                trade_permission=trading_info['permission'],
-                position_multiplier=trading_info['position_multiplier'],
-                confidence=self._calculate_confidence(price_levels, trend_analysis, structure_analysis),
-                key_levels=price_levels['key_levels'],
-                risk_factors=risk_factors,
-                opportunities=opportunities
-            )
+            return self._build_analysis(pair, price_levels, trend_analysis, structure_analysis, volume_analysis)
             
         except Exception as e:
             self.logger.error(f"Error analyzing {pair}: {e}")
             return self._insufficient_data_analysis(pair)
     
+    def _build_analysis(self, pair: str, price_levels: Dict, trend_analysis: Dict,
+                        structure_analysis: Dict, volume_analysis: Dict) -> CoinAnalysis:
+        """Classify regime and assemble the CoinAnalysis from component analyses"""
+        
+        # Regime classification
+        regime = self._classify_regime(price_levels, trend_analysis, structure_analysis, volume_analysis)
+        
+        # Trading permissions and position sizing
+        trading_info = self._get_trading_permissions(regime, price_levels, trend_analysis)
+        
+        # Risk and opportunity assessment
+        risk_factors = self._assess_risks(price_levels, trend_analysis, structure_analysis)
+        opportunities = self._identify_opportunities(regime, price_levels, trend_analysis)
+        
+        return CoinAnalysis(
+            pair=pair,
+            regime=regime,
+            trend_strength=trend_analysis['strength'],
+            distance_from_ath=price_levels['distance_from_ath'],
+            distance_from_atl=price_levels['distance_from_atl'], 
+            price_percentile=price_levels['price_percentile'],
+            trade_permission=trading_info['permission'],
+            position_multiplier=trading_info['position_multiplier'],
+            confidence=self._calculate_confidence(price_levels, trend_analysis, structure_analysis),
+            key_levels=price_levels['key_levels'],
+            risk_factors=risk_factors,
+            opportunities=opportunities
+        )
+    
     def _analyze_price_levels(self, df: pd.DataFrame) -> Dict:
         """Analyze price positioning relative to historical levels"""
         
@@ -133,7 +159,8 @@ class IndividualCoinAnalyzer:
         distance_from_ath = (current_price - all_time_high) / all_time_high * 100
         distance_from_atl = (current_price - all_time_low) / all_time_low * 100
         
-        # Price percentile (where current price ranks historically)\n        price_percentile = (current_price > price_series).sum() / len(price_series)
+        # Price percentile (where current price ranks historically)
+        price_percentile = (current_price > price_series).sum() / len(price_series)
         
         # Key support/resistance levels
         key_levels = self._identify_key_levels(df, current_price)
@@ -165,25 +192,33 @@ class IndividualCoinAnalyzer:
         ema_50 = df['close'].ewm(span=50).mean()
         ema_100 = df['close'].ewm(span=100).mean()
         
-        current_price = df['close'].iloc[-1]
+        return self._summarize_trend(
+            df['close'].iloc[-1],
+            ema_9.iloc[-1], ema_21.iloc[-1], ema_50.iloc[-1], ema_100.iloc[-1],
+            ema_21.iloc[-20], df['close'].iloc[-20]
+        )
+    
+    def _summarize_trend(self, current_price: float, ema_9: float, ema_21: float, ema_50: float,
+                         ema_100: float, ema_21_back: float, close_back: float) -> Dict:
+        """Trend direction and strength from the latest EMA values"""
         
         # Trend direction
-        short_term_bullish = current_price > ema_9.iloc[-1] > ema_21.iloc[-1]
-        medium_term_bullish = ema_21.iloc[-1] > ema_50.iloc[-1]
-        long_term_bullish = ema_50.iloc[-1] > ema_100.iloc[-1]
+        short_term_bullish = current_price > ema_9 > ema_21
+        medium_term_bullish = ema_21 > ema_50
+        long_term_bullish = ema_50 > ema_100
         
         # Trend strength calculation
         price_above_emas = sum([
-            current_price > ema_9.iloc[-1],
-            current_price > ema_21.iloc[-1],
-            current_price > ema_50.iloc[-1],
-            current_price > ema_100.iloc[-1]
+            current_price > ema_9,
+            current_price > ema_21,
+            current_price > ema_50,
+            current_price > ema_100
         ])
         
         ema_alignment = sum([
-            ema_9.iloc[-1] > ema_21.iloc[-1],
-            ema_21.iloc[-1] > ema_50.iloc[-1],
-            ema_50.iloc[-1] > ema_100.iloc[-1]
+            ema_9 > ema_21,
+            ema_21 > ema_50,
+            ema_50 > ema_100
         ])
         
         # Trend strength classification
@@ -200,8 +235,8 @@ class IndividualCoinAnalyzer:
             strength = TrendStrength.VERY_WEAK
         
         # Trend momentum
-        price_momentum = (current_price - df['close'].iloc[-20]) / df['close'].iloc[-20] * 100
-        ema_momentum = (ema_21.iloc[-1] - ema_21.iloc[-20]) / ema_21.iloc[-20] * 100
+        price_momentum = (current_price - close_back) / close_back * 100
+        ema_momentum = (ema_21 - ema_21_back) / ema_21_back * 100
         
         return {
             'short_term_bullish': short_term_bullish,
@@ -293,23 +328,31 @@ class IndividualCoinAnalyzer:
     def _identify_key_levels(self, df: pd.DataFrame, current_price: float) -> Dict:
         """Identify key support and resistance levels"""
         
+        recent_data = df.tail(100)
+        return self._key_levels_from_arrays(
+            recent_data['low'].to_numpy(dtype=float),
+            recent_data['high'].to_numpy(dtype=float),
+            recent_data['volume'].to_numpy(dtype=float),
+            current_price
+        )
+    
+    def _key_levels_from_arrays(self, low: np.ndarray, high: np.ndarray, volume: np.ndarray,
+                                current_price: float) -> Dict:
+        """Key levels from the most recent 100 bars of low/high/volume arrays"""
+        
         # Volume profile analysis (simplified)
         price_levels = {}
         
-        # Recent significant levels
-        recent_data = df.tail(100)
-        
         # High volume areas
-        volume_threshold = recent_data['volume'].quantile(0.8)
-        high_volume_candles = recent_data[recent_data['volume'] > volume_threshold]
+        high_volume = volume > np.quantile(volume, 0.8)
         
-        if not high_volume_candles.empty:
+        if high_volume.any():
             # Key support (high volume lows)
-            support_candidates = high_volume_candles.nsmallest(3, 'low')['low'].tolist()
+            support_candidates = np.sort(low[high_volume])[:3].tolist()
             price_levels['support'] = [level for level in support_candidates if level < current_price]
             
             # Key resistance (high volume highs)
-            resistance_candidates = high_volume_candles.nlargest(3, 'high')['high'].tolist()
+            resistance_candidates = np.sort(high[high_volume])[::-1][:3].tolist()
             price_levels['resistance'] = [level for level in resistance_candidates if level > current_price]
         else:
             price_levels['support'] = []
@@ -503,6 +546,155 @@ class IndividualCoinAnalyzer:
             
         return results
     
+    def analyze_panel(self, panel: MarketPanel) -> Dict[str, CoinAnalysis]:
+        """
+        Panel fast path for analyze_multiple_coins: price levels, trends, market
+        structure and volume context are computed for every symbol in one
+        vectorized pass. Symbols with gaps or short history fall back to analyze_coin.
+        """
+        n_bars = panel.shape[1]
+        complete = panel.complete_rows() if n_bars >= self.lookback_periods['long'] else np.zeros(len(panel), dtype=bool)
+        fast_symbols = [symbol for symbol, ok in zip(panel.symbols, complete) if ok]
+        
+        results = {}
+        if fast_symbols:
+            block = panel.subset(fast_symbols) if len(fast_symbols) < len(panel) else panel
+            price_levels = self._panel_price_levels(block)
+            emas = self._panel_emas(block)
+            structure = self._panel_market_structure(block)
+            volume = self._panel_volume_context(block)
+            
+            for i, pair in enumerate(fast_symbols):
+                try:
+                    pair_levels = {key: _to_scalar(values[i]) for key, values in price_levels.items()}
+                    pair_levels['key_levels'] = self._key_levels_from_arrays(
+                        block.low[i, -100:], block.high[i, -100:], block.volume[i, -100:],
+                        pair_levels['current_price']
+                    )
+                    trend_analysis = self._summarize_trend(
+                        block.close[i, -1],
+                        emas[9][i, -1], emas[21][i, -1], emas[50][i, -1], emas[100][i, -1],
+                        emas[21][i, -20], block.close[i, -20]
+                    )
+                    results[pair] = self._build_analysis(
+                        pair,
+                        pair_levels,
+                        trend_analysis,
+                        {key: _to_scalar(values[i]) for key, values in structure.items()},
+                        {key: _to_scalar(values[i]) for key, values in volume.items()}
+                    )
+                except Exception as e:
+                    self.logger.error(f"Error analyzing {pair}: {e}")
+                    results[pair] = self._insufficient_data_analysis(pair)
+        
+        for pair in panel.symbols:
+            if pair not in results:
+                results[pair] = self.analyze_coin(pair, panel.frame(pair))
+        
+        return {pair: results[pair] for pair in panel.symbols}
+    
+    def _panel_price_levels(self, panel: MarketPanel) -> Dict[str, np.ndarray]:
+        """Vectorized _analyze_price_levels (without key levels)"""
+        
+        current_price = panel.close[:, -1]
+        analysis_period = min(panel.shape[1], self.lookback_periods['ath_atl'])
+        price_series = panel.close[:, -analysis_period:]
+        
+        all_time_high = price_series.max(axis=1)
+        all_time_low = price_series.min(axis=1)
+        recent_high = panel.high[:, -50:].max(axis=1)
+        recent_low = panel.low[:, -50:].min(axis=1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            range_position = np.where(
+                recent_high != recent_low,
+                (current_price - recent_low) / (recent_high - recent_low),
+                0.5
+            )
+        
+        return {
+            'current_price': current_price,
+            'all_time_high': all_time_high,
+            'all_time_low': all_time_low,
+            'distance_from_ath': (current_price - all_time_high) / all_time_high * 100,
+            'distance_from_atl': (current_price - all_time_low) / all_time_low * 100,
+            'price_percentile': (current_price[:, None] > price_series).sum(axis=1) / analysis_period,
+            'recent_high': recent_high,
+            'recent_low': recent_low,
+            'range_position': range_position
+        }
+    
+    def _panel_emas(self, panel: MarketPanel) -> Dict[int, np.ndarray]:
+        """EMA 9/21/50/100 for every symbol in a single recursive pass"""
+        
+        spans = [9, 21, 50, 100]
+        n_symbols = len(panel)
+        stacked = ewm_mean(np.tile(panel.close, (len(spans), 1)), np.repeat(spans, n_symbols))
+        return {span: stacked[k * n_symbols:(k + 1) * n_symbols] for k, span in enumerate(spans)}
+    
+    def _panel_market_structure(self, panel: MarketPanel) -> Dict[str, np.ndarray]:
+        """Vectorized _analyze_market_structure"""
+        
+        highs = panel.high[:, -50:]
+        lows = panel.low[:, -50:]
+        length = highs.shape[1]
+        
+        # Swing points at positions 2 .. length-3 (same window as the loop version)
+        swing_highs = np.zeros(highs.shape, dtype=bool)
+        swing_lows = np.zeros(lows.shape, dtype=bool)
+        inner = slice(2, length - 2)
+        swing_highs[:, inner] = (highs[:, inner] > highs[:, 1:length - 3]) & (highs[:, inner] > highs[:, 3:length - 1])
+        swing_lows[:, inner] = (lows[:, inner] < lows[:, 1:length - 3]) & (lows[:, inner] < lows[:, 3:length - 1])
+        
+        high_last, high_prev = _last_two_positions(swing_highs)
+        low_last, low_prev = _last_two_positions(swing_lows)
+        rows = np.arange(len(highs))
+        enough_swings = (swing_highs.sum(axis=1) >= 2) & (swing_lows.sum(axis=1) >= 2)
+        
+        higher_high = highs[rows, high_last] > highs[rows, high_prev]
+        higher_low = lows[rows, low_last] > lows[rows, low_prev]
+        lower_high = highs[rows, high_last] < highs[rows, high_prev]
+        lower_low = lows[rows, low_last] < lows[rows, low_prev]
+        bullish_structure = enough_swings & higher_high & higher_low
+        bearish_structure = enough_swings & ~bullish_structure & lower_high & lower_low
+        
+        support_level = lows[:, -20:].min(axis=1)
+        resistance_level = highs[:, -20:].max(axis=1)
+        
+        return {
+            'bullish_structure': bullish_structure,
+            'bearish_structure': bearish_structure,
+            'swing_highs': swing_highs.sum(axis=1),
+            'swing_lows': swing_lows.sum(axis=1),
+            'support_level': support_level,
+            'resistance_level': resistance_level,
+            'support_tests': (panel.low[:, -100:] <= support_level[:, None] * 1.01).sum(axis=1),
+            'resistance_tests': (panel.high[:, -100:] >= resistance_level[:, None] * 0.99).sum(axis=1)
+        }
+    
+    def _panel_volume_context(self, panel: MarketPanel) -> Dict[str, np.ndarray]:
+        """Vectorized _analyze_volume_context"""
+        
+        volume = panel.volume
+        current_volume = volume[:, -1]
+        avg_volume = volume[:, -50:].mean(axis=1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(avg_volume > 0, current_volume / avg_volume, 1.0)
+            recent_vol_trend = np.where(avg_volume > 0, volume[:, -20:].mean(axis=1) / avg_volume, 1.0)
+            
+            # Mean volume of the last 20 up / down candles anywhere in history
+            price_up = panel.close > panel.open
+            volume_on_up = _mean_of_last_n(volume, price_up, 20)
+            volume_on_down = _mean_of_last_n(volume, ~price_up, 20)
+        
+        return {
+            'volume_ratio': volume_ratio,
+            'volume_trend': recent_vol_trend,
+            'volume_bias': np.where(volume_on_up > volume_on_down, 'bullish', 'bearish').astype(object),
+            'avg_volume': avg_volume
+        }
+    
     def get_regime_summary(self, analyses: Dict[str, CoinAnalysis]) -> Dict:
         """Get summary of regime distribution across analyzed coins"""
         
@@ -0,0 +1,294 @@
+"""
+Market Panel - Cross-Sectional Universe Analysis
+Aligned symbol x bar arrays for running universe-level statistics in one pass
+instead of looping over one pair DataFrame at a time
+
+Key Features:
+- open/high/low/close/volume as 2-D float arrays (symbols x bars), NaN padded
+- Symbol index for O(1) row lookup
+- Cross-sectional operators (rank, z-score, percentile, breadth)
+- Rolling operators applied to every symbol at once
+- Universe statistics: relative strength rank, volume percentile,
+  breadth and sector rotation
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+OHLCV_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class MarketPanel:
+    """
+    Symbols x bars OHLCV panel aligned on a shared timestamp index
+    """
+
+    def __init__(self, symbols: List[str], timestamps: np.ndarray, open: np.ndarray,
+                 high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.symbols = list(symbols)
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.timestamps = np.asarray(timestamps, dtype='datetime64[ms]')
+        self.open = np.asarray(open, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.low = np.asarray(low, dtype=float)
+        self.close = np.asarray(close, dtype=float)
+        self.volume = np.asarray(volume, dtype=float)
+
+        expected = (len(self.symbols), len(self.timestamps))
+        for name in OHLCV_FIELDS:
+            if getattr(self, name).shape != expected:
+                raise ValueError(f"{name} has shape {getattr(self, name).shape}, expected {expected}")
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> 'MarketPanel':
+        """
+        Build a panel from {symbol: OHLCV DataFrame}. Frames are aligned on the
+        union of their timestamps; bars a symbol is missing are NaN.
+        """
+        frames = {symbol: df for symbol, df in frames.items() if df is not None and not df.empty}
+        symbols = list(frames)
+        stamps = {symbol: _frame_timestamps(df) for symbol, df in frames.items()}
+
+        if not symbols:
+            empty = np.empty((0, 0))
+            return cls([], np.empty(0, dtype='datetime64[ms]'), empty, empty, empty, empty, empty)
+
+        timestamps = np.unique(np.concatenate(list(stamps.values())))
+        arrays = {name: np.full((len(symbols), len(timestamps)), np.nan) for name in OHLCV_FIELDS}
+
+        for row, symbol in enumerate(symbols):
+            columns = np.searchsorted(timestamps, stamps[symbol])
+            for name in OHLCV_FIELDS:
+                arrays[name][row, columns] = frames[symbol][name].to_numpy(dtype=float)
+
+        return cls(symbols, timestamps, **arrays)
+
+    @property
+    def shape(self) -> tuple:
+        return self.close.shape
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def row(self, symbol: str) -> int:
+        return self.symbol_index[symbol]
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """Per-symbol OHLCV DataFrame (bars the symbol is missing are dropped)"""
+        i = self.row(symbol)
+        df = pd.DataFrame({'timestamp': self.timestamps.astype('datetime64[ns]')})
+        for name in OHLCV_FIELDS:
+            df[name] = getattr(self, name)[i]
+        return df.dropna(subset=OHLCV_FIELDS).reset_index(drop=True)
+
+    def complete_rows(self, bars: Optional[int] = None) -> np.ndarray:
+        """Boolean mask of symbols with no missing OHLCV values over the last `bars` bars"""
+        window = slice(-bars, None) if bars else slice(None)
+        valid = np.ones(len(self.symbols), dtype=bool)
+        for name in OHLCV_FIELDS:
+            valid &= ~np.isnan(getattr(self, name)[:, window]).any(axis=1)
+        return valid
+
+    def subset(self, symbols: List[str]) -> 'MarketPanel':
+        rows = [self.row(symbol) for symbol in symbols]
+        return MarketPanel(
+            symbols, self.timestamps,
+            **{name: getattr(self, name)[rows] for name in OHLCV_FIELDS}
+        )
+
+    def tail(self, bars: int) -> 'MarketPanel':
+        return MarketPanel(
+            self.symbols, self.timestamps[-bars:],
+            **{name: getattr(self, name)[:, -bars:] for name in OHLCV_FIELDS}
+        )
+
+    def to_frame(self, values: np.ndarray) -> pd.DataFrame:
+        """Wrap a symbols x bars result as a DataFrame (rows=symbols, columns=timestamps)"""
+        return pd.DataFrame(values, index=self.symbols, columns=self.timestamps)
+
+    # ------------------------------------------------------------------
+    # Universe statistics
+    # ------------------------------------------------------------------
+
+    def returns(self, periods: int = 1) -> np.ndarray:
+        return pct_change(self.close, periods)
+
+    def relative_strength_rank(self, lookback: int = 20) -> np.ndarray:
+        """Cross-sectional percentile rank (0-1] of each symbol's lookback return"""
+        return cs_rank(self.returns(lookback))
+
+    def volume_percentile(self, window: int = 20) -> np.ndarray:
+        """Cross-sectional percentile rank of volume relative to each symbol's own average"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative_volume = self.volume / rolling_mean(self.volume, window)
+        return cs_rank(relative_volume)
+
+    def breadth(self, window: int = 50) -> Dict[str, np.ndarray]:
+        """Per-bar market breadth counts across the universe"""
+        change = self.close - shift(self.close, 1)
+        above_ma = self.close > rolling_mean(self.close, window)
+        valid = ~np.isnan(self.close)
+        return {
+            'advancing': breadth_count(change > 0),
+            'declining': breadth_count(change < 0),
+            'above_ma': breadth_count(above_ma),
+            'pct_above_ma': breadth_ratio(above_ma, valid & ~np.isnan(rolling_mean(self.close, window))),
+            'new_highs': breadth_count(self.high >= rolling_max(self.high, window)),
+            'new_lows': breadth_count(self.low <= rolling_min(self.low, window)),
+            'valid': breadth_count(valid),
+        }
+
+    def sector_rotation(self, sectors: Dict[str, str], lookback: int = 20) -> pd.DataFrame:
+        """
+        Mean lookback return, relative strength and breadth per sector at the last bar.
+        sectors maps symbol -> sector name; unmapped symbols are grouped as 'other'.
+        """
+        columns = ['symbols', 'mean_return', 'mean_rs_rank', 'pct_advancing']
+        if not self.symbols or not self.shape[1]:
+            return pd.DataFrame(columns=columns).rename_axis('sector')
+
+        labels = np.array([sectors.get(symbol, 'other') for symbol in self.symbols])
+        last_return = self.returns(lookback)[:, -1]
+        last_rank = self.relative_strength_rank(lookback)[:, -1]
+
+        rows = []
+        for sector in np.unique(labels):
+            members = labels == sector
+            sector_returns = last_return[members]
+            rows.append({
+                'sector': sector,
+                'symbols': int(members.sum()),
+                'mean_return': float(np.nanmean(sector_returns)) if np.isfinite(sector_returns).any() else np.nan,
+                'mean_rs_rank': float(np.nanmean(last_rank[members])) if np.isfinite(last_rank[members]).any() else np.nan,
+                'pct_advancing': float(np.mean(sector_returns > 0)),
+            })
+
+        result = pd.DataFrame(rows).set_index('sector')
+        return result.sort_values('mean_return', ascending=False)
+
+
+# ----------------------------------------------------------------------
+# Cross-sectional operators (axis 0 = symbols, evaluated per bar)
+# ----------------------------------------------------------------------
+
+def cs_rank(values: np.ndarray) -> np.ndarray:
+    """Percentile rank across symbols per bar (average ties, NaN stays NaN)"""
+    return pd.DataFrame(values).rank(axis=0, pct=True).to_numpy()
+
+
+def cs_zscore(values: np.ndarray) -> np.ndarray:
+    """Z-score across symbols per bar"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.nanmean(values, axis=0, keepdims=True)
+        std = np.nanstd(values, axis=0, keepdims=True)
+        zscore = np.where(std > 0, (values - mean) / std, 0.0)
+    return np.where(np.isnan(values), np.nan, zscore)
+
+
+def cs_percentile(values: np.ndarray, q: float) -> np.ndarray:
+    """q-th percentile (0-100) across symbols per bar"""
+    result = np.full(values.shape[1], np.nan)
+    has_data = ~np.isnan(values).all(axis=0)
+    if has_data.any():
+        result[has_data] = np.nanpercentile(values[:, has_data], q, axis=0)
+    return result
+
+
+def breadth_count(mask: np.ndarray) -> np.ndarray:
+    """Number of symbols where mask is True, per bar"""
+    return np.asarray(mask, dtype=bool).sum(axis=0)
+
+
+def breadth_ratio(mask: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Fraction of valid symbols where mask is True, per bar"""
+    counts = breadth_count(mask & valid)
+    totals = breadth_count(valid)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals > 0, counts / totals, np.nan)
+
+
+# ----------------------------------------------------------------------
+# Rolling operators (axis 1 = bars, evaluated for every symbol at once)
+# Windows containing NaN produce NaN, matching pandas min_periods=window.
+# ----------------------------------------------------------------------
+
+def shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    result = np.full_like(values, np.nan, dtype=float)
+    if periods > 0:
+        result[:, periods:] = values[:, :-periods]
+    elif periods < 0:
+        result[:, :periods] = values[:, -periods:]
+    else:
+        result[:] = values
+    return result
+
+
+def pct_change(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    previous = shift(values, periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return values / previous - 1
+
+
+def _rolling(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    result = np.full(values.shape, np.nan)
+    if values.shape[1] >= window:
+        result[:, window - 1:] = reducer(sliding_window_view(values, window, axis=1), axis=-1)
+    return result
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, np.sum)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, np.mean)
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    return _rolling(values, window, lambda x, axis: np.std(x, axis=axis, ddof=ddof))
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, np.max)
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling(values, window, np.min)
+
+
+def ewm_mean(values: np.ndarray, span) -> np.ndarray:
+    """
+    Exponentially weighted mean per symbol, equivalent to
+    pandas .ewm(span=span).mean() (adjust=True). Leading NaNs are skipped.
+    span may be a scalar or one span per row, so several EMAs can share a pass.
+    """
+    decay = 1 - 2 / (np.asarray(span, dtype=float) + 1)
+    numerator = np.zeros(values.shape[0])
+    denominator = np.zeros(values.shape[0])
+    result = np.full(values.shape, np.nan)
+
+    for t in range(values.shape[1]):
+        column = values[:, t]
+        valid = ~np.isnan(column)
+        numerator = decay * numerator + np.where(valid, column, 0.0)
+        denominator = decay * denominator + valid
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[:, t] = np.where(denominator > 0, numerator / denominator, np.nan)
+
+    return result
+
+
+def _frame_timestamps(df: pd.DataFrame) -> np.ndarray:
+    """Timestamps of an OHLCV frame as datetime64[ms] (ccxt ms ints or datetimes)"""
+    if 'timestamp' in df.columns:
+        raw = df['timestamp']
+        if pd.api.types.is_numeric_dtype(raw):
+            return pd.to_datetime(raw, unit='ms').to_numpy(dtype='datetime64[ms]')
+        return pd.to_datetime(raw).to_numpy(dtype='datetime64[ms]')
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df.index.to_numpy(dtype='datetime64[ms]')
+    # No time information - align bars positionally on the most recent bar
+    return np.arange(-len(df), 0).astype('datetime64[ms]')
@@ -0,0 +1,382 @@
+"""
+Screener Pipeline - Precomputed Universe Snapshots
+Recomputes volume, money-flow and per-coin regime metrics for the whole
+trading universe once per candle close, instead of on every API request
+
+Key Features:
+- Candle-close scheduling on a background thread
+- Process-pool fan-out of VolumeScanner / IndividualCoinAnalyzer work
+- Compact columnar snapshot (one NumPy array per metric)
+- Millisecond sort/filter for screener and heatmap endpoints
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.individual_coin_analyzer import IndividualCoinAnalyzer
+from src.analysis.volume_scanner import VolumeScanner
+
+# Numeric snapshot columns (float64) and categorical columns (fixed-width str)
+NUMERIC_COLUMNS = [
+    'close',
+    'change_pct',
+    'volume_score',
+    'volume_ratio_short',
+    'volume_percentile',
+    'volume_trend',
+    'accumulation_percentage',
+    'flow_strength',
+    'volume_delta_short',
+    'institutional_buying',
+    'institutional_selling',
+    'alert_count',
+    'distance_from_ath',
+    'price_percentile',
+    'position_multiplier',
+    'regime_confidence',
+    'trade_permission',
+]
+CATEGORICAL_COLUMNS = [
+    'flow_type',
+    'recommendation',
+    'regime',
+    'trend_strength',
+]
+
+
+@dataclass
+class ScreenerSnapshot:
+    """Columnar screener results for the whole universe"""
+    pairs: np.ndarray
+    columns: Dict[str, np.ndarray]
+    timeframe: str
+    candle_time: Optional[datetime] = None
+    computed_at: datetime = field(default_factory=datetime.now)
+    compute_seconds: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    @classmethod
+    def empty(cls, timeframe: str) -> 'ScreenerSnapshot':
+        columns = {name: np.empty(0, dtype=float) for name in NUMERIC_COLUMNS}
+        columns.update({name: np.empty(0, dtype='U1') for name in CATEGORICAL_COLUMNS})
+        return cls(pairs=np.empty(0, dtype='U1'), columns=columns, timeframe=timeframe)
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict], timeframe: str, **kwargs) -> 'ScreenerSnapshot':
+        """Pack per-pair metric rows into one array per column"""
+        if not rows:
+            return cls.empty(timeframe)
+
+        columns = {
+            name: np.array([row.get(name, np.nan) for row in rows], dtype=float)
+            for name in NUMERIC_COLUMNS
+        }
+        columns.update({
+            name: np.array([row.get(name, '') for row in rows], dtype=str)
+            for name in CATEGORICAL_COLUMNS
+        })
+        pairs = np.array([row['pair'] for row in rows], dtype=str)
+        return cls(pairs=pairs, columns=columns, timeframe=timeframe, **kwargs)
+
+    def top(self, column: str, limit: Optional[int] = None, descending: bool = True,
+            mask: Optional[np.ndarray] = None) -> List[Dict]:
+        """Rows sorted by a column, optionally filtered by a boolean mask"""
+        if column not in self.columns:
+            raise KeyError(f"Unknown screener column: {column}")
+
+        indices = np.arange(len(self.pairs))
+        if mask is not None:
+            indices = indices[mask]
+
+        values = self.columns[column][indices]
+        if values.dtype.kind == 'f':
+            # NaNs always sort last regardless of direction
+            keys = -values if descending else values
+            order = np.argsort(np.where(np.isnan(keys), np.inf, keys), kind='stable')
+        else:
+            order = np.argsort(values, kind='stable')
+            if descending:
+                order = order[::-1]
+
+        if limit is not None:
+            order = order[:limit]
+        return self.to_records(indices[order])
+
+    def where(self, column: str, value) -> np.ndarray:
+        """Boolean mask for rows where column equals value"""
+        return self.columns[column] == value
+
+    def to_records(self, indices: Optional[np.ndarray] = None) -> List[Dict]:
+        """Materialise rows as JSON-friendly dicts"""
+        if indices is None:
+            indices = np.arange(len(self.pairs))
+
+        records = []
+        for i in indices:
+            record = {'pair': str(self.pairs[i])}
+            for name in NUMERIC_COLUMNS:
+                value = float(self.columns[name][i])
+                record[name] = None if np.isnan(value) else value
+            for name in CATEGORICAL_COLUMNS:
+                record[name] = str(self.columns[name][i])
+            records.append(record)
+        return records
+
+    def save(self, path: Path) -> None:
+        """Persist snapshot as a compressed .npz file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = np.array([
+            self.timeframe,
+            self.candle_time.isoformat() if self.candle_time else '',
+            self.computed_at.isoformat(),
+            str(self.compute_seconds),
+        ])
+        with open(path, 'wb') as handle:
+            np.savez_compressed(handle, pairs=self.pairs, meta=meta, **self.columns)
+
+    @classmethod
+    def load(cls, path: Path) -> 'ScreenerSnapshot':
+        """Load a snapshot written by save()"""
+        with np.load(Path(path), allow_pickle=False) as data:
+            timeframe, candle_time, computed_at, compute_seconds = data['meta'].tolist()
+            columns = {
+                name: data[name]
+                for name in NUMERIC_COLUMNS + CATEGORICAL_COLUMNS
+                if name in data.files
+            }
+            return cls(
+                pairs=data['pairs'],
+                columns=columns,
+                timeframe=timeframe,
+                candle_time=datetime.fromisoformat(candle_time) if candle_time else None,
+                computed_at=datetime.fromisoformat(computed_at),
+                compute_seconds=float(compute_seconds),
+            )
+
+
+def compute_pair_metrics(pair: str, dataframe: pd.DataFrame, scanner_config: Optional[Dict] = None,
+                         change_lookback: int = 24) -> Dict:
+    """
+    Flatten volume, money-flow and regime analysis for one pair into a row.
+    Module-level so it can be shipped to worker processes.
+    """
+    row = {'pair': pair}
+    if dataframe is None or dataframe.empty:
+        return row
+
+    close = dataframe['close'].to_numpy(dtype=float)
+    row['close'] = close[-1]
+    if len(close) > change_lookback and close[-change_lookback - 1] > 0:
+        row['change_pct'] = (close[-1] / close[-change_lookback - 1] - 1) * 100
+
+    volume = VolumeScanner(scanner_config).analyze_pair_volume(pair, dataframe)
+    metrics = volume['volume_metrics']
+    flow = volume['money_flow']
+    row.update({
+        'volume_score': volume['overall_score'],
+        'volume_ratio_short': metrics.get('volume_ratio_short', np.nan),
+        'volume_percentile': metrics.get('volume_percentile', np.nan),
+        'volume_trend': metrics.get('volume_trend', np.nan),
+        'accumulation_percentage': flow.get('accumulation_percentage', np.nan),
+        'flow_strength': flow.get('flow_strength', np.nan),
+        'volume_delta_short': flow.get('volume_delta_short', np.nan),
+        'institutional_buying': float(flow.get('institutional_buying', False)),
+        'institutional_selling': float(flow.get('institutional_selling', False)),
+        'alert_count': len(volume['alerts']),
+        'flow_type': flow['flow_type'].value,
+        'recommendation': volume['recommendation'],
+    })
+
+    coin = IndividualCoinAnalyzer().analyze_coin(pair, dataframe)
+    row.update({
+        'distance_from_ath': coin.distance_from_ath,
+        'price_percentile': coin.price_percentile,
+        'position_multiplier': coin.position_multiplier,
+        'regime_confidence': coin.confidence,
+        'trade_permission': float(coin.trade_permission),
+        'regime': coin.regime.value,
+        'trend_strength': coin.trend_strength.value,
+    })
+    return row
+
+
+def _compute_pair_metrics_task(args) -> Dict:
+    """Unpack (pair, frame, config, lookback) tuples for executor.map"""
+    return compute_pair_metrics(*args)
+
+
+class ScreenerPipeline:
+    """
+    Background pipeline that refreshes a ScreenerSnapshot once per candle close
+    """
+
+    def __init__(self, fetch_universe: Callable[[], Dict[str, pd.DataFrame]],
+                 timeframe: str = '1h', config: Dict = None):
+        """
+        fetch_universe: returns {pair: OHLCV DataFrame} for every pair to screen
+        """
+        self.fetch_universe = fetch_universe
+        self.timeframe = timeframe
+        self.config = config or {}
+        self.logger = logging.getLogger(__name__)
+
+        self.max_workers = self.config.get('max_workers')
+        self.scanner_config = self.config.get('scanner_config')
+        self.change_lookback = self.config.get('change_lookback', 24)
+        self.close_delay_seconds = self.config.get('close_delay_seconds', 5)
+        self.snapshot_path = self.config.get('snapshot_path')
+
+        self.timeframe_seconds = _timeframe_to_seconds(timeframe)
+        self._snapshot = ScreenerSnapshot.empty(timeframe)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        if self.snapshot_path and Path(self.snapshot_path).exists():
+            try:
+                self._snapshot = ScreenerSnapshot.load(self.snapshot_path)
+                self.logger.info(f"Loaded screener snapshot with {len(self._snapshot)} pairs")
+            except Exception as e:
+                self.logger.warning(f"Could not load screener snapshot: {e}")
+
+    def get_snapshot(self) -> ScreenerSnapshot:
+        """Latest snapshot (swapped atomically, safe to read from any thread)"""
+        with self._lock:
+            return self._snapshot
+
+    def refresh(self) -> ScreenerSnapshot:
+        """Recompute metrics for the whole universe and publish a new snapshot"""
+        started = time.perf_counter()
+        universe = self.fetch_universe()
+        candle_time = _last_candle_time(universe)
+
+        rows = self._compute_rows(universe)
+        snapshot = ScreenerSnapshot.from_rows(
+            rows,
+            self.timeframe,
+            candle_time=candle_time,
+            compute_seconds=time.perf_counter() - started,
+        )
+
+        with self._lock:
+            self._snapshot = snapshot
+
+        if self.snapshot_path:
+            try:
+                snapshot.save(self.snapshot_path)
+            except Exception as e:
+                self.logger.warning(f"Could not persist screener snapshot: {e}")
+
+        self.logger.info(
+            f"Screener snapshot refreshed: {len(snapshot)} pairs in {snapshot.compute_seconds:.2f}s"
+        )
+        return snapshot
+
+    def _compute_rows(self, universe: Dict[str, pd.DataFrame]) -> List[Dict]:
+        tasks = [
+            (pair, dataframe, self.scanner_config, self.change_lookback)
+            for pair, dataframe in universe.items()
+        ]
+        if not tasks:
+            return []
+
+        if self.max_workers == 1 or len(tasks) == 1:
+            return [_compute_pair_metrics_task(task) for task in tasks]
+
+        try:
+            executor = self._get_executor()
+            workers = self.max_workers or os.cpu_count() or 1
+            chunksize = max(1, len(tasks) // (4 * workers))
+            return list(executor.map(_compute_pair_metrics_task, tasks, chunksize=chunksize))
+        except BrokenProcessPool as e:
+            self.logger.error(f"Screener process pool broke, falling back to serial: {e}")
+            self._shutdown_executor()
+            return [_compute_pair_metrics_task(task) for task in tasks]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _shutdown_executor(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def seconds_until_next_close(self, now: Optional[float] = None) -> float:
+        """Seconds until the next candle boundary plus the configured settle delay"""
+        now = time.time() if now is None else now
+        next_close = (now // self.timeframe_seconds + 1) * self.timeframe_seconds
+        return next_close - now + self.close_delay_seconds
+
+    def start(self, refresh_now: bool = True) -> None:
+        """Start the candle-close refresh loop on a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(refresh_now,), name='screener-pipeline', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the refresh loop and release worker processes"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._shutdown_executor()
+
+    def _run(self, refresh_now: bool) -> None:
+        if refresh_now:
+            self._safe_refresh()
+        while not self._stop_event.wait(self.seconds_until_next_close()):
+            self._safe_refresh()
+
+    def _safe_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            self.logger.error(f"Screener refresh failed: {e}")
+
+
+def _timeframe_to_seconds(timeframe: str) -> int:
+    """Convert ccxt-style timeframe strings ('15m', '1h', '1d') to seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+    try:
+        return int(timeframe[:-1]) * units[timeframe[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+
+def _last_candle_time(universe: Dict[str, pd.DataFrame]) -> Optional[datetime]:
+    """Most recent candle timestamp across the universe, if frames carry one"""
+    latest = None
+    for dataframe in universe.values():
+        if dataframe is None or dataframe.empty:
+            continue
+        if 'timestamp' in dataframe.columns:
+            raw = dataframe['timestamp'].iloc[-1]
+            # ccxt candles carry epoch milliseconds
+            value = pd.Timestamp(raw, unit='ms') if isinstance(raw, (int, np.integer)) else pd.Timestamp(raw)
+        elif isinstance(dataframe.index, pd.DatetimeIndex):
+            value = dataframe.index[-1]
+        else:
+            continue
+        if latest is None or value > latest:
+            latest = value
+    return latest.to_pydatetime() if latest is not None else None
@@ -0,0 +1,221 @@
+"""
+Multi-Timeframe Feature Alignment
+Projects features computed on higher timeframes onto a base timeframe
+index so multi-timeframe signals can be evaluated (and backtested) bar by bar
+
+Key Features:
+- Look-ahead safe: a higher-timeframe bar is visible to a base bar only
+  once it has closed, i.e. its close time <= the base bar's close time
+- Vectorized: one searchsorted over close times per timeframe
+- Feature matrices built straight from base candles via the resampler
+- LRU cache of aligned blocks keyed by symbol, timeframe and bar range
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from src.data.resampler import resample_ohlcv, timeframe_to_ms
+except ImportError:  # imported with src/ on the path
+    from data.resampler import resample_ohlcv, timeframe_to_ms
+
+FeatureFunction = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def _open_times_ms(data: pd.DataFrame) -> np.ndarray:
+    """Candle open times in epoch ms from a timestamp column or DatetimeIndex"""
+    stamps = data['timestamp'] if 'timestamp' in data.columns else data.index
+    stamps = pd.DatetimeIndex(pd.to_datetime(stamps))
+    if stamps.tz is not None:
+        stamps = stamps.tz_convert(None)
+    return stamps.to_numpy().astype('datetime64[ms]').astype(np.int64)
+
+
+def aligned_positions(
+    base_open_ms: np.ndarray,
+    base_timeframe: str,
+    feature_open_ms: np.ndarray,
+    feature_timeframe: str
+) -> np.ndarray:
+    """
+    Row of the latest closed higher-timeframe bar for every base bar (-1 if none)
+
+    Both inputs are candle open times. A base bar is evaluated at its close,
+    so it may use every higher-timeframe bar that closed at or before then.
+    """
+    base_close = base_open_ms + timeframe_to_ms(base_timeframe)
+    feature_close = feature_open_ms + timeframe_to_ms(feature_timeframe)
+    return np.searchsorted(feature_close, base_close, side='right') - 1
+
+
+def align_values(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Gather feature rows at aligned positions, NaN where no bar has closed yet"""
+    values = np.asarray(values, dtype=float)
+    aligned = values[np.clip(positions, 0, None)] if len(values) else np.full((len(positions),) + values.shape[1:], np.nan)
+    aligned[positions < 0] = np.nan
+    return aligned
+
+
+class TimeframeAligner:
+    """
+    Aligns higher-timeframe feature frames onto a base timeframe index
+    """
+
+    def __init__(self, base_timeframe: str = '1h', cache_size: int = 256):
+        self.base_timeframe = base_timeframe
+        self.base_ms = timeframe_to_ms(base_timeframe)
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Tuple, pd.DataFrame]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def align(
+        self,
+        base: pd.DataFrame,
+        features: pd.DataFrame,
+        timeframe: str,
+        key: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Project one timeframe's features onto the base bars
+
+        Args:
+            base: Base candles (timestamp column or DatetimeIndex of open times)
+            features: Higher-timeframe features indexed the same way
+            timeframe: Timeframe the features were computed on
+            key: Cache key (e.g. symbol); aligned blocks are cached when given
+
+        Returns:
+            Frame on the base index with columns suffixed by ``_{timeframe}``
+        """
+        base_ms = _open_times_ms(base)
+        feature_ms = _open_times_ms(features)
+        columns = [col for col in features.columns if col != 'timestamp']
+
+        cache_key = None
+        if key is not None:
+            cache_key = (key, timeframe, tuple(columns), _signature(base_ms), _closed_signature(
+                feature_ms, timeframe, base_ms[-1] + self.base_ms if len(base_ms) else None
+            ))
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached.set_axis(base.index)
+
+        positions = aligned_positions(base_ms, self.base_timeframe, feature_ms, timeframe)
+        values = align_values(features[columns].to_numpy(dtype=float), positions)
+        aligned = pd.DataFrame(values, index=base.index, columns=[f'{col}_{timeframe}' for col in columns])
+
+        if cache_key is not None:
+            self._cache_put(cache_key, aligned)
+        return aligned
+
+    def align_many(
+        self,
+        base: pd.DataFrame,
+        features: Dict[str, pd.DataFrame],
+        key: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Align several timeframes and concatenate them into one feature matrix"""
+        blocks = [self.align(base, frame, timeframe, key) for timeframe, frame in features.items()]
+        if not blocks:
+            return pd.DataFrame(index=base.index)
+        return pd.concat(blocks, axis=1)
+
+    def from_base(
+        self,
+        base: pd.DataFrame,
+        timeframes: Iterable[str],
+        feature_fn: FeatureFunction,
+        key: Optional[str] = None,
+        include_base: bool = True
+    ) -> pd.DataFrame:
+        """
+        Build a full multi-timeframe feature matrix from base candles
+
+        Each higher timeframe is resampled from the base candles, passed
+        through ``feature_fn`` (which must be causal: a bar's features may
+        only depend on that bar and earlier ones) and aligned back onto the
+        base bars.
+
+        Args:
+            base: Base OHLCV candles
+            timeframes: Higher timeframes to derive
+            feature_fn: Maps an OHLCV frame to a per-bar feature frame
+            key: Cache key (e.g. symbol)
+            include_base: Also include ``feature_fn`` of the base timeframe
+                (columns suffixed with the base timeframe)
+
+        Returns:
+            Feature matrix on the base index
+        """
+        base_ms = _open_times_ms(base)
+        blocks = []
+
+        if include_base:
+            block = feature_fn(base)
+            block.columns = [f'{col}_{self.base_timeframe}' for col in block.columns]
+            blocks.append(block.set_axis(base.index))
+
+        for timeframe in timeframes:
+            cache_key = None
+            if key is not None:
+                cache_key = (key, timeframe, getattr(feature_fn, '__qualname__', repr(feature_fn)),
+                             _signature(base_ms), 'from_base')
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    blocks.append(cached.set_axis(base.index))
+                    continue
+
+            candles = resample_ohlcv(base, timeframe)
+            features = feature_fn(candles).set_axis(candles.index)
+            if 'timestamp' not in features.columns:
+                features.insert(0, 'timestamp', candles['timestamp'] if 'timestamp' in candles.columns else candles.index)
+            block = self.align(base, features, timeframe)
+
+            if cache_key is not None:
+                self._cache_put(cache_key, block)
+            blocks.append(block)
+
+        if not blocks:
+            return pd.DataFrame(index=base.index)
+        return pd.concat(blocks, axis=1)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cache statistics"""
+        return {'entries': len(self._cache), 'hits': self.hits, 'misses': self.misses}
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _cache_get(self, cache_key: Tuple) -> Optional[pd.DataFrame]:
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(cache_key)
+        self.hits += 1
+        return cached
+
+    def _cache_put(self, cache_key: Tuple, block: pd.DataFrame) -> None:
+        self._cache[cache_key] = block
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _signature(open_ms: np.ndarray) -> Tuple[int, int, int]:
+    """Identify a bar range by its length and first/last open times"""
+    if not len(open_ms):
+        return (0, 0, 0)
+    return (len(open_ms), int(open_ms[0]), int(open_ms[-1]))
+
+
+def _closed_signature(open_ms: np.ndarray, timeframe: str, until_ms: Optional[int]) -> Tuple[int, int, int]:
+    """Signature of the bars closed by ``until_ms`` (a forming bar cannot affect alignment)"""
+    if until_ms is None:
+        return _signature(open_ms)
+    closed = np.searchsorted(open_ms + timeframe_to_ms(timeframe), until_ms, side='right')
+    return _signature(open_ms[:closed])
@@ -18,6 +18,8 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 
+from src.analysis.market_panel import MarketPanel
+
 @dataclass
 class VolumeAlert:
     """Volume alert data structure"""
@@ -29,6 +31,10 @@ class VolumeAlert:
     timestamp: datetime
     confidence: float
 
+def _to_scalar(value):
+    """Unwrap NumPy scalars so panel results match the per-frame dicts"""
+    return value.item() if isinstance(value, np.generic) else value
+
 class MoneyFlowType(Enum):
     """Types of money flow patterns"""
     ACCUMULATION = "accumulation"
@@ -152,29 +158,27 @@ class VolumeScanner:
     def _analyze_money_flow(self, df: pd.DataFrame, volume_metrics: Dict) -> Dict:
         """Analyze accumulation vs distribution patterns"""
         
-        # Price-Volume relationship
-        df_copy = df.copy()
-        df_copy['price_change'] = df_copy['close'] - df_copy['open']
-        df_copy['candle_range'] = df_copy['high'] - df_copy['low']
+        # Price-Volume relationship (plain arrays - no frame copy per pair)
+        open_ = df['open'].to_numpy(dtype=float)
+        high = df['high'].to_numpy(dtype=float)
+        low = df['low'].to_numpy(dtype=float)
+        close = df['close'].to_numpy(dtype=float)
+        volume = df['volume'].to_numpy(dtype=float)
+        price_change = close - open_
         
         # Volume-weighted price analysis
-        df_copy['vwap'] = (df_copy['volume'] * (df_copy['high'] + df_copy['low'] + df_copy['close']) / 3).cumsum() / df_copy['volume'].cumsum()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.cumsum(volume * (high + low + close) / 3) / np.cumsum(volume)
         
         # Accumulation/Distribution Volume
-        df_copy['accumulation_volume'] = np.where(
-            (df_copy['price_change'] > 0) & (df_copy['close'] > df_copy['vwap']),
-            df_copy['volume'], 0
-        )
-        df_copy['distribution_volume'] = np.where(
-            (df_copy['price_change'] < 0) & (df_copy['close'] < df_copy['vwap']),
-            df_copy['volume'], 0
-        )
+        accumulation_volume = np.where((price_change > 0) & (close > vwap), volume, 0.0)
+        distribution_volume = np.where((price_change < 0) & (close < vwap), volume, 0.0)
         
         # Rolling sums for trend analysis
-        acc_sum_short = df_copy['accumulation_volume'].tail(self.short_period).sum()
-        dist_sum_short = df_copy['distribution_volume'].tail(self.short_period).sum()
-        acc_sum_medium = df_copy['accumulation_volume'].tail(self.medium_period).sum()
-        dist_sum_medium = df_copy['distribution_volume'].tail(self.medium_period).sum()
+        acc_sum_short = accumulation_volume[-self.short_period:].sum()
+        dist_sum_short = distribution_volume[-self.short_period:].sum()
+        acc_sum_medium = accumulation_volume[-self.medium_period:].sum()
+        dist_sum_medium = distribution_volume[-self.medium_period:].sum()
         
         # Volume Delta
         volume_delta_short = acc_sum_short - dist_sum_short
@@ -197,13 +201,13 @@ class VolumeScanner:
         institutional_buying = (
             volume_metrics['is_institutional'] and
             flow_type == MoneyFlowType.ACCUMULATION and
-            df_copy['close'].iloc[-1] > df_copy['vwap'].iloc[-1]
+            close[-1] > vwap[-1]
         )
         
         institutional_selling = (
             volume_metrics['is_institutional'] and
             flow_type == MoneyFlowType.DISTRIBUTION and
-            df_copy['close'].iloc[-1] < df_copy['vwap'].iloc[-1]
+            close[-1] < vwap[-1]
         )
         
         return {
@@ -215,7 +219,7 @@ class VolumeScanner:
             'accumulation_percentage': acc_percentage if total_volume_short > 0 else 0.5,
             'institutional_buying': institutional_buying,
             'institutional_selling': institutional_selling,
-            'vwap_position': 'above' if df_copy['close'].iloc[-1] > df_copy['vwap'].iloc[-1] else 'below',
+            'vwap_position': 'above' if close[-1] > vwap[-1] else 'below',
             'flow_strength': abs(volume_delta_short) / (total_volume_short if total_volume_short > 0 else 1)
         }
     
@@ -268,9 +272,15 @@ class VolumeScanner:
                               volume_metrics: Dict, money_flow: Dict) -> List[VolumeAlert]:
         """Generate volume-based trading alerts"""
         
-        alerts = []
         current_price = df['close'].iloc[-1]
         price_change = (current_price - df['open'].iloc[-1]) / df['open'].iloc[-1]
+        return self._build_volume_alerts(pair, price_change, volume_metrics, money_flow)
+    
+    def _build_volume_alerts(self, pair: str, price_change: float,
+                             volume_metrics: Dict, money_flow: Dict) -> List[VolumeAlert]:
+        """Build alerts from precomputed metrics (shared by frame and panel paths)"""
+        
+        alerts = []
         
         # Institutional volume alert
         if volume_metrics['is_institutional']:
@@ -386,6 +396,11 @@ class VolumeScanner:
         for pair, dataframe in pairs_data.items():
             results[pair] = self.analyze_pair_volume(pair, dataframe)
             
+        return self._summarize_scan(results)
+    
+    def _summarize_scan(self, results: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Rank per-pair analyses and collect universe-level activity"""
+        
         # Rank by volume score
         ranked_pairs = sorted(
             results.items(), 
@@ -404,6 +419,156 @@ class VolumeScanner:
             ]
         }
     
+    def scan_panel(self, panel: MarketPanel) -> Dict[str, Dict]:
+        """
+        Panel fast path for scan_multiple_pairs: volume metrics, money flow and
+        institutional patterns are computed for every symbol in one vectorized
+        pass. Symbols with gaps or short history fall back to analyze_pair_volume.
+        """
+        n_bars = panel.shape[1]
+        complete = panel.complete_rows() if n_bars >= self.long_period else np.zeros(len(panel), dtype=bool)
+        fast_symbols = [symbol for symbol, ok in zip(panel.symbols, complete) if ok]
+        
+        results = {}
+        if fast_symbols:
+            block = panel.subset(fast_symbols) if len(fast_symbols) < len(panel) else panel
+            metrics = self._panel_volume_metrics(block.volume)
+            flow = self._panel_money_flow(block, metrics)
+            patterns = self._panel_institutional_patterns(block, metrics)
+            price_change = (block.close[:, -1] - block.open[:, -1]) / block.open[:, -1]
+            now = datetime.now()
+            
+            for i, pair in enumerate(fast_symbols):
+                volume_metrics = {key: _to_scalar(values[i]) for key, values in metrics.items()}
+                money_flow = {key: _to_scalar(values[i]) for key, values in flow.items()}
+                pair_patterns = {key: bool(values[i]) for key, values in patterns.items()}
+                
+                alerts = self._build_volume_alerts(pair, price_change[i].item(), volume_metrics, money_flow)
+                overall_score = self._calculate_volume_score(volume_metrics, money_flow, pair_patterns)
+                results[pair] = {
+                    'pair': pair,
+                    'timestamp': now,
+                    'volume_metrics': volume_metrics,
+                    'money_flow': money_flow,
+                    'institutional_patterns': pair_patterns,
+                    'alerts': alerts,
+                    'overall_score': overall_score,
+                    'recommendation': self._get_recommendation(overall_score, money_flow)
+                }
+        
+        for pair in panel.symbols:
+            if pair not in results:
+                results[pair] = self.analyze_pair_volume(pair, panel.frame(pair))
+        
+        # Keep the caller's symbol order
+        results = {pair: results[pair] for pair in panel.symbols}
+        return self._summarize_scan(results)
+    
+    def _panel_volume_metrics(self, volume: np.ndarray) -> Dict[str, np.ndarray]:
+        """Vectorized _calculate_volume_metrics over a symbols x bars volume array"""
+        
+        current_volume = volume[:, -1]
+        ma_short = volume[:, -self.short_period:].mean(axis=1)
+        ma_short_prev = volume[:, -self.short_period - 9:-9].mean(axis=1)
+        ma_medium = volume[:, -self.medium_period:].mean(axis=1)
+        ma_long = volume[:, -self.long_period:].mean(axis=1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio_short = np.where(ma_short > 0, current_volume / ma_short, 1.0)
+            ratio_medium = np.where(ma_medium > 0, current_volume / ma_medium, 1.0)
+            ratio_long = np.where(ma_long > 0, current_volume / ma_long, 1.0)
+            volume_trend = np.where(ma_short_prev > 0, (ma_short - ma_short_prev) / ma_short_prev, 0.0)
+            recent = volume[:, -50:]
+            recent_mean = recent.mean(axis=1)
+            volume_cv = np.where(recent_mean > 0, recent.std(axis=1, ddof=1) / recent_mean, 0.0)
+        
+        volume_percentile = (current_volume[:, None] > volume[:, -100:]).sum(axis=1) / 100
+        
+        return {
+            'current_volume': current_volume,
+            'volume_ma_short': ma_short,
+            'volume_ma_medium': ma_medium,
+            'volume_ma_long': ma_long,
+            'volume_ratio_short': ratio_short,
+            'volume_ratio_medium': ratio_medium,
+            'volume_ratio_long': ratio_long,
+            'volume_percentile': volume_percentile,
+            'volume_trend': volume_trend,
+            'volume_volatility': volume_cv,
+            'is_institutional': ratio_short > self.institutional_threshold,
+            'is_spike': ratio_short > self.spike_threshold
+        }
+    
+    def _panel_money_flow(self, panel: MarketPanel, metrics: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Vectorized _analyze_money_flow over every symbol in the panel"""
+        
+        close, volume = panel.close, panel.volume
+        price_change = close - panel.open
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.cumsum(volume * (panel.high + panel.low + close) / 3, axis=1) / np.cumsum(volume, axis=1)
+        
+        accumulation_volume = np.where((price_change > 0) & (close > vwap), volume, 0.0)
+        distribution_volume = np.where((price_change < 0) & (close < vwap), volume, 0.0)
+        
+        acc_sum_short = accumulation_volume[:, -self.short_period:].sum(axis=1)
+        dist_sum_short = distribution_volume[:, -self.short_period:].sum(axis=1)
+        acc_sum_medium = accumulation_volume[:, -self.medium_period:].sum(axis=1)
+        dist_sum_medium = distribution_volume[:, -self.medium_period:].sum(axis=1)
+        
+        volume_delta_short = acc_sum_short - dist_sum_short
+        total_volume_short = acc_sum_short + dist_sum_short
+        has_flow = total_volume_short > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acc_percentage = np.where(has_flow, acc_sum_short / total_volume_short, 0.5)
+        
+        flow_type = np.full(len(close), MoneyFlowType.NEUTRAL, dtype=object)
+        flow_type[has_flow & (acc_percentage > 0.65)] = MoneyFlowType.ACCUMULATION
+        flow_type[has_flow & (acc_percentage < 0.35)] = MoneyFlowType.DISTRIBUTION
+        
+        above_vwap = close[:, -1] > vwap[:, -1]
+        below_vwap = close[:, -1] < vwap[:, -1]
+        
+        return {
+            'flow_type': flow_type,
+            'accumulation_volume': acc_sum_short,
+            'distribution_volume': dist_sum_short,
+            'volume_delta_short': volume_delta_short,
+            'volume_delta_medium': acc_sum_medium - dist_sum_medium,
+            'accumulation_percentage': acc_percentage,
+            'institutional_buying': metrics['is_institutional'] & (flow_type == MoneyFlowType.ACCUMULATION) & above_vwap,
+            'institutional_selling': metrics['is_institutional'] & (flow_type == MoneyFlowType.DISTRIBUTION) & below_vwap,
+            'vwap_position': np.where(above_vwap, 'above', 'below').astype(object),
+            'flow_strength': np.abs(volume_delta_short) / np.where(has_flow, total_volume_short, 1.0)
+        }
+    
+    def _panel_institutional_patterns(self, panel: MarketPanel, metrics: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Vectorized _detect_institutional_patterns over every symbol in the panel"""
+        
+        close, high = panel.close, panel.high
+        ratio_short = metrics['volume_ratio_short']
+        percentile = metrics['volume_percentile']
+        recent_price_change = np.abs(close[:, -1] - close[:, -20]) / close[:, -20]
+        
+        return {
+            'dark_pool_prints': (ratio_short > 5.0) & (percentile > 0.95),
+            'iceberg_orders': (ratio_short > 2.0) & (recent_price_change < 0.02),
+            'sweep_patterns': (
+                (high[:, -1] > high[:, -20:].max(axis=1)) &
+                (close[:, -1] < high[:, -1] * 0.99) &
+                metrics['is_institutional']
+            ),
+            'accumulation_phase': (
+                (metrics['volume_trend'] > 0.1) &
+                (close[:, -1] > close[:, -50]) &
+                (metrics['volume_ratio_medium'] > 1.5)
+            ),
+            'distribution_phase': (
+                (ratio_short > 3.0) &
+                (close[:, -1] < close[:, -10]) &
+                (percentile > 0.8)
+            )
+        }
+    
     def get_top_volume_pairs(self, results: Dict, limit: int = 5) -> List[Tuple[str, float]]:
         """Get top pairs by volume score"""
         ranked = results.get('ranked_pairs', [])
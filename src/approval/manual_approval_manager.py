@@ -13,6 +13,13 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+try:
+    from src.monitoring.metrics import DB_WRITE_SECONDS, QUEUE_DEPTH
+    from src.monitoring.tracing import traced
+except ImportError:  # imported with src/ on the path
+    from monitoring.metrics import DB_WRITE_SECONDS, QUEUE_DEPTH
+    from monitoring.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,6 +85,9 @@ class ManualApprovalManager:
         # Initialize database
         self._init_database()
 
+        # Signals awaiting a decision, counted when metrics are scraped
+        QUEUE_DEPTH.labels("manual_approval").set_function(lambda: len(self.get_pending_signals()))
+
         # Start cleanup thread
         self.cleanup_thread = threading.Thread(
             target=self._cleanup_expired_signals, daemon=True
@@ -134,6 +144,7 @@ class ManualApprovalManager:
             logger.error(f"Failed to initialize database: {e}")
             raise
 
+    @traced('approval.intercept_signal')
     def intercept_signal(self, signal_data: Dict) -> bool:
         """
         Intercept a trading signal and queue it for manual approval
@@ -186,7 +197,7 @@ class ManualApprovalManager:
     def _store_approval(self, approval: SignalApproval) -> Optional[int]:
         """Store signal approval in database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with DB_WRITE_SECONDS.labels("sqlite", "signal_approvals").time(), sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
@@ -4,5 +4,8 @@ Central business logic and orchestration
 """
 
 from .portfolio_manager import PortfolioManager, MarketRegime, StrategyType
+from .allocation_solver import AllocationSolver, AllocationResult
+from .position_book import PositionBook, PositionView
 
-__all__ = ['PortfolioManager', 'MarketRegime', 'StrategyType']
\ No newline at end of file
+__all__ = ['PortfolioManager', 'MarketRegime', 'StrategyType', 'AllocationSolver', 'AllocationResult',
+           'PositionBook', 'PositionView']
\ No newline at end of file
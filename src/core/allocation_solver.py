@@ -0,0 +1,206 @@
+"""
+Allocation Solver
+Linear-program allocation of budgets across candidate positions
+
+Used by the DeFi portfolio optimizer (token balances across yield
+opportunities) and the hedging system (hedge budget across hedges).
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+logger = logging.getLogger(__name__)
+
+# A cap family: group id per variable (-1 = not capped) and a limit per group
+CapFamily = Tuple[np.ndarray, np.ndarray]
+
+
+@dataclass
+class AllocationResult:
+    """Solution of an allocation problem"""
+    amounts: np.ndarray
+    objective: float
+    status: str  # 'optimal', 'cached' or 'infeasible'
+    solve_seconds: float
+    rounds: int
+
+    @property
+    def selected(self) -> np.ndarray:
+        """Indices of variables with a non-zero allocation"""
+        return np.flatnonzero(self.amounts)
+
+
+class AllocationSolver:
+    """
+    Allocates budgets to positions by linear programming
+
+    maximize    sum_i value_i * x_i
+    subject to  sum_{i in budget b} x_i <= budgets_b          (per funding source)
+                sum_{i in group g} weight_i * x_i <= limit_g  (each cap family)
+                0 <= x_i <= upper_i
+
+    Minimum position sizes, minimum gains and a budget on per-position
+    fixed (gas) costs make the problem combinatorial; they are enforced by
+    re-solving with the violating positions excluded and the budget
+    remainder they were filling left idle, which converges in a couple of
+    LP calls. The sparse constraint matrix of a problem shape (variables,
+    budgets, cap groups) is built once and reused across rebalances, and
+    unchanged problems are answered from a result cache.
+    """
+
+    def __init__(self, tolerance: float = 1e-9, max_rounds: int = 10, cache_size: int = 32):
+        self.tolerance = tolerance
+        self.max_rounds = max_rounds
+        self.cache_size = cache_size
+        self._matrices: Dict[str, sparse.csr_matrix] = {}
+        self._results: Dict[str, AllocationResult] = {}
+        self.stats = {'solves': 0, 'cache_hits': 0, 'lp_calls': 0, 'total_seconds': 0.0}
+
+    def solve(self, value: np.ndarray, budget_index: np.ndarray, budgets: np.ndarray,
+              upper: Optional[np.ndarray] = None, min_size: Optional[np.ndarray] = None,
+              min_gain: Optional[np.ndarray] = None, fixed_cost: Optional[np.ndarray] = None,
+              fixed_cost_budget: float = np.inf, caps: Sequence[CapFamily] = (),
+              cap_weights: Optional[np.ndarray] = None) -> AllocationResult:
+        """
+        Solve an allocation problem
+
+        Args:
+            value: Objective gain per unit allocated to each variable
+            budget_index: Funding source of each variable (index into budgets)
+            budgets: Amount available per funding source
+            upper: Per-variable upper bound (defaults to its budget)
+            min_size: Smallest allowed non-zero allocation per variable
+            min_gain: Smallest objective gain a selected variable must make
+                (e.g. its gas cost in objective units)
+            fixed_cost: Cost charged once per selected variable
+            fixed_cost_budget: Limit on the summed fixed cost of selected variables
+            caps: Cap families as (group id per variable, limit per group)
+            cap_weights: Coefficient of each variable in the cap rows (1 by default)
+        """
+        started = time.perf_counter()
+        value = np.asarray(value, dtype=float)
+        budget_index = np.asarray(budget_index, dtype=np.int64)
+        budgets = np.asarray(budgets, dtype=float)
+        n = len(value)
+        upper = budgets[budget_index] if upper is None else np.minimum(np.asarray(upper, dtype=float), budgets[budget_index])
+        min_size = np.zeros(n) if min_size is None else np.asarray(min_size, dtype=float)
+        min_gain = np.zeros(n) if min_gain is None else np.asarray(min_gain, dtype=float)
+        fixed_cost = np.zeros(n) if fixed_cost is None else np.asarray(fixed_cost, dtype=float)
+        cap_weights = np.ones(n) if cap_weights is None else np.asarray(cap_weights, dtype=float)
+        caps = [(np.asarray(groups, dtype=np.int64), np.asarray(limits, dtype=float)) for groups, limits in caps]
+
+        self.stats['solves'] += 1
+        if n == 0:
+            return AllocationResult(np.zeros(0), 0.0, 'optimal', 0.0, 0)
+
+        shape_key = self._fingerprint(budget_index, len(budgets), cap_weights, *(groups for groups, _ in caps))
+        problem_key = self._fingerprint(
+            shape_key, value, budgets, upper, min_size, min_gain, fixed_cost, fixed_cost_budget,
+            *(limits for _, limits in caps)
+        )
+        cached = self._results.get(problem_key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return AllocationResult(cached.amounts.copy(), cached.objective, 'cached', time.perf_counter() - started, 0)
+
+        matrix = self._matrices.get(shape_key)
+        if matrix is None:
+            matrix = self._build_matrix(budget_index, len(budgets), cap_weights, caps)
+            self._remember(self._matrices, shape_key, matrix)
+        limits = np.concatenate([budgets] + [cap_limits for _, cap_limits in caps])
+
+        # Variables that can never pay for themselves are out from the start
+        excluded = (
+            (value <= 0) | (upper < np.maximum(min_size, self.tolerance)) | (value * upper < min_gain)
+            | (fixed_cost > fixed_cost_budget)
+        )
+
+        amounts = np.zeros(n)
+        status = 'optimal'
+        rounds = 0
+        while rounds < self.max_rounds:
+            rounds += 1
+            bounds = np.column_stack([np.zeros(n), np.where(excluded, 0.0, upper)])
+            self.stats['lp_calls'] += 1
+            result = linprog(-value, A_ub=matrix, b_ub=limits, bounds=bounds, method='highs')
+            if result.status != 0:
+                logger.warning(f"Allocation LP not solved: {result.message}")
+                amounts, status = np.zeros(n), 'infeasible'
+                break
+
+            amounts = np.where(result.x > self.tolerance, result.x, 0.0)
+            undersized, over_budget = self._violations(amounts, value, min_size, min_gain, fixed_cost, fixed_cost_budget)
+            if not (undersized.any() or over_budget.any()):
+                break
+            excluded |= undersized | over_budget
+            # Undersized positions are the LP filling a budget remainder; leave
+            # that remainder idle instead of handing it to the next candidate
+            np.subtract.at(limits, budget_index[undersized], amounts[undersized])
+            amounts[undersized | over_budget] = 0.0
+        else:
+            for dropped in self._violations(amounts, value, min_size, min_gain, fixed_cost, fixed_cost_budget):
+                amounts[dropped] = 0.0
+
+        solution = AllocationResult(amounts, float(value @ amounts), status, time.perf_counter() - started, rounds)
+        self._remember(self._results, problem_key, solution)
+        self.stats['total_seconds'] += solution.solve_seconds
+        return AllocationResult(amounts.copy(), solution.objective, status, solution.solve_seconds, rounds)
+
+    def _violations(self, amounts: np.ndarray, value: np.ndarray, min_size: np.ndarray, min_gain: np.ndarray,
+                    fixed_cost: np.ndarray, fixed_cost_budget: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Selected variables below their minimum size or gain, and the selected
+        variables with the least gain per unit of fixed cost that push the
+        fixed costs over budget
+        """
+        active = amounts > 0
+        undersized = active & ((amounts < min_size - self.tolerance) | (value * amounts < min_gain))
+        over_budget = np.zeros_like(active)
+
+        kept = np.flatnonzero(active & ~undersized)
+        excess = fixed_cost[kept].sum() - fixed_cost_budget
+        if excess > 0:
+            efficiency = value[kept] * amounts[kept] / np.maximum(fixed_cost[kept], self.tolerance)
+            order = kept[np.argsort(efficiency)]
+            # Drop the least efficient positions until the rest fits
+            count = np.searchsorted(np.cumsum(fixed_cost[order]), excess - self.tolerance) + 1
+            over_budget[order[:count]] = True
+        return undersized, over_budget
+
+    @staticmethod
+    def _build_matrix(budget_index: np.ndarray, n_budgets: int, cap_weights: np.ndarray,
+                      caps: Sequence[CapFamily]) -> sparse.csr_matrix:
+        n = len(budget_index)
+        columns = np.arange(n)
+        blocks = [sparse.csr_matrix((np.ones(n), (budget_index, columns)), shape=(n_budgets, n))]
+        for groups, limits in caps:
+            member = groups >= 0
+            blocks.append(sparse.csr_matrix(
+                (cap_weights[member], (groups[member], columns[member])), shape=(len(limits), n)
+            ))
+        return sparse.vstack(blocks, format='csr')
+
+    @staticmethod
+    def _fingerprint(*parts) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            digest.update(np.ascontiguousarray(part).tobytes() if isinstance(part, np.ndarray) else repr(part).encode())
+            digest.update(b'|')
+        return digest.hexdigest()
+
+    def _remember(self, store: Dict, key: str, item) -> None:
+        store.pop(key, None)
+        store[key] = item
+        while len(store) > self.cache_size:
+            store.pop(next(iter(store)))
+
+    def get_stats(self) -> Dict[str, float]:
+        """Solve counts, cache hits, LP calls and time spent"""
+        return dict(self.stats)
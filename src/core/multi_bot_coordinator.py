@@ -22,6 +22,8 @@ from pathlib import Path
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.market_analysis.regime_detector import AdvancedRegimeDetector, MarketRegime
+from src.market_data.indicator_hub import hub_environment, start_hub_process, IndicatorHubClient
+from src.monitoring.metrics import BOTS
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +67,7 @@ class MultiBotCoordinator:
     Manages 6 specialized trading bots with intelligent allocation
     """
     
-    def __init__(self, base_capital: float = 6000):
+    def __init__(self, base_capital: float = 6000, share_indicators: bool = True):
         self.base_capital = base_capital
         self.capital_per_bot = 1000  # $1000 per bot
         self.regime_detector = AdvancedRegimeDetector()
@@ -74,6 +76,15 @@ class MultiBotCoordinator:
         self.bots: Dict[str, BotConfig] = {}
         self.bot_processes: Dict[str, subprocess.Popen] = {}
         self.bot_performances: Dict[str, BotPerformance] = {}
+        BOTS.labels('configured').set_function(lambda: len(self.bots))
+        BOTS.labels('active').set_function(lambda: sum(1 for bc in self.bots.values() if bc.is_active))
+        
+        # Shared indicator hub: every bot trades the same pairs, so candles are
+        # fetched and indicator columns computed once per candle for all of them
+        self.share_indicators = share_indicators
+        self.indicator_hub_process = None
+        self.indicator_hub_client: Optional[IndicatorHubClient] = None
+        self.indicator_hub_env: Dict[str, str] = {}
         
         # Coordination state
         self.current_regime = None
@@ -176,16 +187,58 @@ class MultiBotCoordinator:
             # 2. Create bot configurations
             await self._create_bot_configurations()
             
-            # 3. Start bots based on regime allocation
+            # 3. Start the shared indicator hub the bots connect to
+            self._start_indicator_hub()
+            
+            # 4. Start bots based on regime allocation
             await self._start_allocated_bots()
             
-            # 4. Begin coordination loop
+            # 5. Begin coordination loop
             await self._start_coordination_loop()
             
         except Exception as e:
             logger.error(f"Error starting trading ecosystem: {e}")
             raise
     
+    def _start_indicator_hub(self):
+        """Start the indicator hub process and remember how bots reach it"""
+        if not self.share_indicators or self.indicator_hub_process is not None:
+            return
+        try:
+            process, address, authkey = start_hub_process(exchange_id="binance")
+            self.indicator_hub_process = process
+            self.indicator_hub_env = hub_environment(address, authkey)
+            self.indicator_hub_client = IndicatorHubClient(address, authkey, consumer="coordinator")
+            logger.info(f"📡 Indicator hub started (PID: {process.pid})")
+        except Exception as e:
+            # Bots fall back to computing their own indicators
+            logger.error(f"Error starting indicator hub: {e}")
+    
+    def _stop_indicator_hub(self):
+        """Stop the indicator hub process"""
+        if self.indicator_hub_client is not None:
+            self.indicator_hub_client.close()
+            self.indicator_hub_client = None
+        if self.indicator_hub_process is not None:
+            self.indicator_hub_process.terminate()
+            self.indicator_hub_process.join(timeout=10)
+            self.indicator_hub_process = None
+            self.indicator_hub_env = {}
+    
+    def get_indicator_hub_stats(self) -> Optional[Dict]:
+        """Shared indicator hub statistics (None when no hub is running)"""
+        if self.indicator_hub_client is None:
+            return None
+        return self.indicator_hub_client.get_stats()
+    
+    def _bot_environment(self) -> Dict[str, str]:
+        """Environment for bot processes: repo importable and pointed at the indicator hub"""
+        env = dict(os.environ)
+        repo_root = str(Path(__file__).resolve().parents[2])
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_root, env.get("PYTHONPATH")]))
+        env.update(self.indicator_hub_env)
+        return env
+    
     async def _update_market_regime(self):
         """Update market regime analysis"""
         try:
@@ -351,7 +404,8 @@ class MultiBotCoordinator:
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                cwd=os.getcwd()
+                cwd=os.getcwd(),
+                env=self._bot_environment()
             )
             
             # Store process info
@@ -467,6 +521,12 @@ class MultiBotCoordinator:
         logger.info(f"🎯 System Status: {active_count}/6 bots active | "
                    f"Regime: {regime.upper()} | "
                    f"Capital: ${self.base_capital:,.0f}")
+        
+        hub_stats = self.get_indicator_hub_stats()
+        if hub_stats:
+            logger.info(f"📡 Indicator hub: {hub_stats['hits']}/{hub_stats['requests']} columns shared "
+                       f"({hub_stats['hit_rate']:.0%}) | "
+                       f"Saved {hub_stats['saved_compute_seconds']:.2f}s of duplicate compute")
     
     async def stop_all_bots(self):
         """Stop all trading bots"""
@@ -475,6 +535,7 @@ class MultiBotCoordinator:
         for bot_id in list(self.bots.keys()):
             await self._stop_individual_bot(bot_id)
         
+        self._stop_indicator_hub()
         logger.info("✅ All bots stopped")
     
     def get_system_summary(self) -> Dict:
@@ -489,7 +550,8 @@ class MultiBotCoordinator:
             "regime_confidence": f"{self.current_regime.confidence:.1%}" if self.current_regime else "N/A",
             "allocation_weights": {bt.value: f"{w:.1%}" for bt, w in self.allocation_weights.items()},
             "active_bot_list": [bc.bot_id for bc in active_bots],
-            "system_uptime": str(pd.Timestamp.now() - self.coordinator_start_time).split('.')[0]
+            "system_uptime": str(pd.Timestamp.now() - self.coordinator_start_time).split('.')[0],
+            "indicator_hub": self.get_indicator_hub_stats()
         }
 
 # Global coordinator instance
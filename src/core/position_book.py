@@ -0,0 +1,370 @@
+"""
+Position Book
+Open positions stored as contiguous NumPy columns
+
+Used by the signal execution engine and the live trading engine. Hot
+numeric fields (prices, quantity, stops, P&L) live in one float64 column
+each, indexed by a slot per position; everything else (signal, strategy,
+take-profit ladder, exit reasons) lives in a per-slot side table. Marking
+positions to market, exit checks and portfolio P&L, exposure and risk are
+vector operations over the active slots.
+
+Each slot carries a generation that counts the positions opened in it, so
+views and slot arrays held across an await can tell whether their slot was
+reused by a position opened in the meantime.
+"""
+
+import logging
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    'entry_price', 'current_price', 'quantity', 'direction',
+    'stop_loss', 'take_profit', 'trailing_stop', 'trailing_distance',
+    'unrealized_pnl', 'realized_pnl', 'max_profit', 'max_loss',
+    'opened_at', 'updated_at', 'expires_at',
+)
+
+
+def _live_slot(view: 'PositionView') -> int:
+    """Slot of the view, unless another position has been opened in it since"""
+    if view.book.generations[view.slot] != view.generation:
+        raise LookupError(f"Slot {view.slot} was reused after the viewed position closed")
+    return view.slot
+
+
+class Column:
+    """Attribute of a position view backed by a book column"""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return float(view.book.columns[self.name][_live_slot(view)])
+
+    def __set__(self, view, value) -> None:
+        view.book.columns[self.name][_live_slot(view)] = value
+
+
+class TimeColumn(Column):
+    """Datetime attribute backed by an epoch-seconds column"""
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return datetime.fromtimestamp(view.book.columns[self.name][_live_slot(view)])
+
+    def __set__(self, view, value: datetime) -> None:
+        view.book.columns[self.name][_live_slot(view)] = value.timestamp()
+
+
+class PositionView:
+    """
+    One open position in a PositionBook
+
+    Column attributes read and write the book's arrays; any other
+    attribute is looked up in the position's side-table entry. A view is
+    only valid while its position is open; once its slot is reused, every
+    attribute but ``id`` and ``is_open`` raises LookupError.
+    """
+
+    __slots__ = ('book', 'slot', 'generation', 'id')
+
+    entry_price = Column('entry_price')
+    current_price = Column('current_price')
+    quantity = Column('quantity')
+    direction = Column('direction')
+    unrealized_pnl = Column('unrealized_pnl')
+    realized_pnl = Column('realized_pnl')
+    max_profit = Column('max_profit')
+    max_loss = Column('max_loss')
+
+    def __init__(self, book: 'PositionBook', slot: int):
+        object.__setattr__(self, 'book', book)
+        object.__setattr__(self, 'slot', slot)
+        object.__setattr__(self, 'generation', int(book.generations[slot]))
+        object.__setattr__(self, 'id', book.ids[slot])
+
+    @property
+    def symbol(self) -> str:
+        return self.book.symbols[self.book.symbol_ids[_live_slot(self)]]
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.book.active[self.slot] and self.book.generations[self.slot] == self.generation)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self.book.metadata[_live_slot(self)][name]
+        except (KeyError, TypeError):
+            raise AttributeError(f"{type(self).__name__} has no attribute {name!r}") from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if hasattr(type(self), name):
+            object.__setattr__(self, name, value)
+        else:
+            self.book.metadata[_live_slot(self)][name] = value
+
+    def __repr__(self) -> str:
+        if self.book.generations[self.slot] != self.generation:
+            return f"{type(self).__name__}({self.id!r}, closed)"
+        return f"{type(self).__name__}({self.id!r}, {self.symbol}, qty={self.quantity}, entry={self.entry_price})"
+
+
+class PositionBook(Mapping):
+    """
+    Open positions by ID, stored column-wise
+
+    Behaves as a read-only mapping of position ID to ``view_class`` views
+    (plus ``del book[id]`` to close), so existing ``items()``/``values()``
+    loops keep working. Slots of closed positions are reused and columns
+    grow by doubling.
+    """
+
+    def __init__(self, view_class: Type[PositionView] = PositionView, capacity: int = 64):
+        self.view_class = view_class
+        self.columns: Dict[str, np.ndarray] = {name: np.zeros(capacity) for name in COLUMNS}
+        self.symbol_ids = np.zeros(capacity, dtype=np.int32)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.generations = np.zeros(capacity, dtype=np.int32)
+        self.ids: List[Optional[str]] = [None] * capacity
+        self.metadata: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.symbols: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._active_slots: Optional[np.ndarray] = None
+
+    # =========================================================================
+    # Mapping interface
+    # =========================================================================
+
+    def __getitem__(self, position_id: str) -> PositionView:
+        return self.view_class(self, self._slots[position_id])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._slots))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, position_id) -> bool:
+        return position_id in self._slots
+
+    def __delitem__(self, position_id: str) -> None:
+        self.close(position_id)
+
+    # =========================================================================
+    # Opening and closing
+    # =========================================================================
+
+    def open(self, position_id: str, symbol: str, direction: float, entry_price: float, quantity: float,
+             metadata: Optional[Dict[str, Any]] = None, **columns: float) -> PositionView:
+        """
+        Add a position
+
+        Args:
+            position_id: Unique ID of the position
+            symbol: Traded symbol
+            direction: 1 for long, -1 for short
+            entry_price: Entry price (also the first mark)
+            quantity: Position size in base units
+            metadata: Side-table fields of the position
+            **columns: Initial values of other columns (stop_loss, take_profit...)
+        """
+        if position_id in self._slots:
+            raise ValueError(f"Position {position_id} is already open")
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown position columns: {sorted(unknown)}")
+
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        now = time.time()
+        values = {
+            'entry_price': entry_price, 'current_price': entry_price, 'quantity': quantity,
+            'direction': 1.0 if direction > 0 else -1.0, 'opened_at': now, 'updated_at': now,
+        }
+        values.update(columns)
+        for name, column in self.columns.items():
+            column[slot] = values.get(name, 0.0)
+
+        self.symbol_ids[slot] = self._symbol_id(symbol)
+        self.active[slot] = True
+        self.generations[slot] += 1
+        self.ids[slot] = position_id
+        self.metadata[slot] = dict(metadata or {})
+        self._slots[position_id] = slot
+        self._active_slots = None
+        return self.view_class(self, slot)
+
+    def close(self, position_id: str) -> None:
+        """Remove a position and free its slot"""
+        slot = self._slots.pop(position_id)
+        self.active[slot] = False
+        self.ids[slot] = None
+        self.metadata[slot] = None
+        self._free.append(slot)
+        self._active_slots = None
+
+    def _grow(self) -> None:
+        capacity = len(self.active)
+        for name, column in self.columns.items():
+            self.columns[name] = np.concatenate([column, np.zeros(capacity)])
+        self.symbol_ids = np.concatenate([self.symbol_ids, np.zeros(capacity, dtype=np.int32)])
+        self.active = np.concatenate([self.active, np.zeros(capacity, dtype=bool)])
+        self.generations = np.concatenate([self.generations, np.zeros(capacity, dtype=np.int32)])
+        self.ids.extend([None] * capacity)
+        self.metadata.extend([None] * capacity)
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def _symbol_id(self, symbol: str) -> int:
+        symbol_id = self._symbol_index.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return symbol_id
+
+    # =========================================================================
+    # Vector access
+    # =========================================================================
+
+    @property
+    def slots(self) -> np.ndarray:
+        """Slots of the open positions"""
+        if self._active_slots is None:
+            self._active_slots = np.flatnonzero(self.active)
+        return self._active_slots
+
+    def values_of(self, name: str, slots: Optional[np.ndarray] = None) -> np.ndarray:
+        """Column values of the given (default: all open) slots"""
+        return self.columns[name][self.slots if slots is None else slots]
+
+    def ids_of(self, slots: np.ndarray) -> List[str]:
+        return [self.ids[slot] for slot in slots]
+
+    def view(self, slot: int) -> PositionView:
+        return self.view_class(self, int(slot))
+
+    def views(self, slots: np.ndarray) -> List[PositionView]:
+        return [self.view_class(self, int(slot)) for slot in slots]
+
+    def still_open(self, slots: np.ndarray, generations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Slots, with their generations, still holding the open positions they
+        held when ``generations`` (``book.generations[slots]``) was read"""
+        keep = self.active[slots] & (self.generations[slots] == generations)
+        return slots[keep], generations[keep]
+
+    def find(self, symbol: str) -> Optional[PositionView]:
+        """First open position in a symbol"""
+        symbol_id = self._symbol_index.get(symbol)
+        if symbol_id is None:
+            return None
+        matches = self.slots[self.symbol_ids[self.slots] == symbol_id]
+        return self.view(matches[0]) if len(matches) else None
+
+    def mark(self, prices: Dict[str, float], trail: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mark open positions to market prices
+
+        Updates current prices, unrealized P&L and max profit/loss of every
+        position whose symbol has a (non-zero) price. With ``trail``, stops
+        of positions that moved in their favour follow the price at their
+        trailing distance.
+
+        Returns:
+            (marked slots, slots whose stop trailed)
+        """
+        lookup = np.full(len(self.symbols), np.nan)
+        for symbol, price in prices.items():
+            symbol_id = self._symbol_index.get(symbol)
+            if symbol_id is not None and price:
+                lookup[symbol_id] = price
+
+        slots = self.slots
+        price = lookup[self.symbol_ids[slots]]
+        priced = ~np.isnan(price)
+        slots, price = slots[priced], price[priced]
+
+        c = self.columns
+        previous = c['current_price'][slots]
+        direction = c['direction'][slots]
+        pnl = direction * (price - c['entry_price'][slots]) * c['quantity'][slots]
+        c['current_price'][slots] = price
+        c['unrealized_pnl'][slots] = pnl
+        c['max_profit'][slots] = np.maximum(c['max_profit'][slots], pnl)
+        c['max_loss'][slots] = np.minimum(c['max_loss'][slots], pnl)
+        c['updated_at'][slots] = time.time()
+
+        trailed = slots[:0]
+        if trail:
+            candidate = price - direction * c['trailing_distance'][slots]
+            moved = direction * (price - previous) > 0
+            tighter = direction * (candidate - c['stop_loss'][slots]) > 0
+            trailed = slots[moved & tighter]
+            c['stop_loss'][trailed] = candidate[moved & tighter]
+        return slots, trailed
+
+    def stops_hit(self, slots: Optional[np.ndarray] = None) -> np.ndarray:
+        """Slots at or through their stop loss"""
+        slots = self.slots if slots is None else slots
+        c = self.columns
+        stop = c['stop_loss'][slots]
+        return slots[(stop > 0) & (c['direction'][slots] * (c['current_price'][slots] - stop) <= 0)]
+
+    def targets_hit(self, slots: Optional[np.ndarray] = None) -> np.ndarray:
+        """Slots at or through their take-profit price"""
+        slots = self.slots if slots is None else slots
+        c = self.columns
+        target = c['take_profit'][slots]
+        return slots[(target > 0) & (c['direction'][slots] * (c['current_price'][slots] - target) >= 0)]
+
+    def expired(self, now: Optional[float] = None, slots: Optional[np.ndarray] = None) -> np.ndarray:
+        """Slots past their expiry time"""
+        slots = self.slots if slots is None else slots
+        expires = self.columns['expires_at'][slots]
+        return slots[(expires > 0) & (expires < (time.time() if now is None else now))]
+
+    # =========================================================================
+    # Portfolio reductions
+    # =========================================================================
+
+    def unrealized_pnl(self) -> float:
+        return float(self.values_of('unrealized_pnl').sum())
+
+    def realized_pnl(self) -> float:
+        """Realized P&L of partial closes of the open positions"""
+        return float(self.values_of('realized_pnl').sum())
+
+    def exposure(self) -> float:
+        """Gross market value of the open positions"""
+        return float(np.dot(self.values_of('quantity'), self.values_of('current_price')))
+
+    def net_exposure(self) -> float:
+        """Long minus short market value"""
+        return float(np.sum(self.values_of('direction') * self.values_of('quantity') * self.values_of('current_price')))
+
+    def entry_value(self) -> float:
+        """Market value of the open positions at their entry prices"""
+        return float(np.dot(self.values_of('quantity'), self.values_of('entry_price')))
+
+    def risk(self) -> float:
+        """Loss if every position with a stop is stopped out at its stop"""
+        stop = self.values_of('stop_loss')
+        distance = self.values_of('direction') * (self.values_of('current_price') - stop)
+        return float(np.sum(np.where(stop > 0, np.maximum(distance, 0.0) * self.values_of('quantity'), 0.0)))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the numeric columns"""
+        slot_arrays = (self.symbol_ids, self.active, self.generations)
+        return sum(column.nbytes for column in self.columns.values()) + sum(array.nbytes for array in slot_arrays)
@@ -10,6 +10,8 @@ from typing import Dict, Optional
 from dataclasses import dataclass
 
 from .config_manager import get_config
+from ..market_data.event_loop_monitor import EventLoopLagMonitor
+from ..monitoring.tracing import ORDER_STAGE, traced
 from ..strategy_framework import StrategyManager, TradingSignal
 from ..unified_data_pipeline import UnifiedDataPipeline
 
@@ -41,6 +43,9 @@ class TradingEngine:
         self.data_pipeline = UnifiedDataPipeline(self.config.__dict__)
         self.strategy_manager = StrategyManager(self.data_pipeline)
         
+        # Reports callbacks that block the event loop (> 5 ms)
+        self.loop_monitor = EventLoopLagMonitor(threshold=0.005)
+        
         # Trading symbols
         self.active_symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "ADA/USDT"]
         
@@ -58,6 +63,8 @@ class TradingEngine:
         logger.info("🚀 Starting FrickTrader trading engine")
         
         try:
+            self.loop_monitor.start()
+            
             # Initialize data pipeline
             await self.data_pipeline.start_real_time_feeds(self.active_symbols)
             
@@ -68,6 +75,7 @@ class TradingEngine:
         except Exception as e:
             logger.error(f"Error starting trading engine: {e}")
             self.state.is_running = False
+            await self.loop_monitor.stop()
             raise
     
     async def stop(self) -> None:
@@ -79,6 +87,7 @@ class TradingEngine:
         
         # Stop data feeds
         await self.data_pipeline.stop_real_time_feeds()
+        await self.loop_monitor.stop()
         
         logger.info("Trading engine stopped")
     
@@ -88,12 +97,8 @@ class TradingEngine:
         
         while self.state.is_running and not self._shutdown_requested:
             try:
-                # Process each symbol
-                for symbol in self.active_symbols:
-                    if self._shutdown_requested:
-                        break
-                        
-                    await self._process_symbol(symbol)
+                # Evaluate the whole watchlist in one batch cycle
+                await self._process_watchlist()
                 
                 # Wait before next iteration
                 await asyncio.sleep(30)  # 30 second intervals
@@ -109,18 +114,29 @@ class TradingEngine:
                     
                 await asyncio.sleep(60)  # Wait longer after error
     
-    async def _process_symbol(self, symbol: str) -> None:
-        """Process trading signals for a specific symbol."""
+    @traced('engine.cycle')
+    async def _process_watchlist(self) -> None:
+        """
+        Process trading signals for all active symbols in one batch.
+        
+        Each cycle is one trace: the batch fetch marks the newest candle
+        close, and every signal handed on is timed from it.
+        """
         try:
             # Check if we can open new positions
             if self.state.active_positions >= self.config.trading.max_open_positions:
-                logger.debug(f"Max positions reached, skipping {symbol}")
+                logger.debug("Max positions reached, skipping cycle")
                 return
             
-            # Execute all strategies for this symbol
-            signals = await self.strategy_manager.execute_all_strategies(symbol)
+            # Execute all strategies for the whole watchlist
+            signals_by_symbol = await self.strategy_manager.execute_all_strategies_batch(
+                self.active_symbols
+            )
             
-            if signals:
+            for symbol, signals in signals_by_symbol.items():
+                if not signals:
+                    continue
+                    
                 logger.info(f"Generated {len(signals)} signals for {symbol}")
                 
                 # Process each signal
@@ -130,8 +146,9 @@ class TradingEngine:
                 self.state.last_signal_time = datetime.now()
             
         except Exception as e:
-            logger.error(f"Error processing {symbol}: {e}")
+            logger.error(f"Error processing watchlist: {e}")
     
+    @traced(ORDER_STAGE)
     async def _process_signal(self, signal: TradingSignal) -> None:
         """Process a trading signal."""
         try:
@@ -163,7 +180,8 @@ class TradingEngine:
             "error_count": self.state.error_count,
             "active_symbols": self.active_symbols,
             "strategy_status": self.strategy_manager.get_strategy_status(),
-            "data_pipeline_status": self.data_pipeline.get_data_status()
+            "data_pipeline_status": self.data_pipeline.get_data_status(),
+            "event_loop": self.loop_monitor.get_stats()
         }
     
     def get_performance_metrics(self) -> Dict:
@@ -0,0 +1,464 @@
+"""
+Execution Planner
+Order-book-driven market impact and child-order schedules
+
+Slices large parent orders into TWAP, VWAP or participation-rate (POV)
+child orders:
+1. Impact curves from L2 depth: the average fill price of a marketable
+   order of any size, walking the visible levels and extrapolating past them
+2. Book resilience: liquidity taken by one child only partly refills before
+   the next, so children closer together pay more impact
+3. Timing risk: the price can move while quantity waits to be executed
+4. Optimal TWAP slicing: impact cost against timing risk for every slice
+   count at once
+5. Incremental re-planning of the remaining children on each fresh book
+"""
+
+import asyncio
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from scipy.signal import lfilter
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ('twap', 'vwap', 'pov')
+SECONDS_PER_DAY = 86400
+MAX_CHILDREN = 10_000
+
+
+class ImpactCurve:
+    """
+    Cost of marketable orders of any size against one side of an L2 book
+
+    Buys walk the asks and sells walk the bids. Past the visible depth the
+    marginal price keeps moving at the slope of the outer half of the book.
+    """
+
+    def __init__(self, levels: Sequence[Sequence[float]], side: str, mid: float):
+        levels = np.asarray([level[:2] for level in levels], dtype=float).reshape(-1, 2)
+        if not len(levels):
+            raise ValueError(f"No {'asks' if side == 'buy' else 'bids'} to estimate {side} impact from")
+
+        self.side = side
+        self.direction = 1.0 if side == 'buy' else -1.0
+        self.mid = float(mid)
+        self.prices = levels[:, 0]
+        self.cum_amount = np.cumsum(levels[:, 1])
+        self.cum_notional = np.cumsum(levels[:, 0] * levels[:, 1])
+        self.depth = float(self.cum_amount[-1])
+
+        # Marginal price move per unit beyond the visible book
+        half = len(levels) // 2
+        if len(levels) > 1 and self.depth > self.cum_amount[half - 1]:
+            move = self.direction * (self.prices[-1] - self.prices[half - 1])
+            self.slope = max(move / (self.depth - self.cum_amount[half - 1]), 0.0)
+        else:
+            self.slope = max(self.direction * (self.prices[-1] - self.mid), 0.0) / self.depth
+
+    @classmethod
+    def from_order_book(cls, order_book: Dict, side: str) -> 'ImpactCurve':
+        """Impact curve of a buy or sell against a CCXT order book"""
+        return cls(order_book['asks'] if side == 'buy' else order_book['bids'], side, mid_price(order_book))
+
+    def notional(self, quantity: Union[float, np.ndarray]) -> np.ndarray:
+        """Quote amount paid (buys) or received (sells) for marketable quantities"""
+        quantity = np.asarray(quantity, dtype=float)
+        inside = np.minimum(quantity, self.depth)
+        level = np.minimum(np.searchsorted(self.cum_amount, inside, side='left'), len(self.prices) - 1)
+        before_amount = np.where(level > 0, self.cum_amount[level - 1], 0.0)
+        before_notional = np.where(level > 0, self.cum_notional[level - 1], 0.0)
+        notional = before_notional + (inside - before_amount) * self.prices[level]
+
+        excess = quantity - inside
+        return notional + excess * (self.prices[-1] + self.direction * self.slope * excess / 2)
+
+    def cost(self, quantity: Union[float, np.ndarray], offset: Union[float, np.ndarray] = 0.0) -> np.ndarray:
+        """Impact cost against the mid of ``quantity`` taken after ``offset`` was already taken"""
+        quantity = np.asarray(quantity, dtype=float)
+        offset = np.asarray(offset, dtype=float)
+        paid = self.notional(offset + quantity) - self.notional(offset)
+        return self.direction * (paid - quantity * self.mid)
+
+    def impact(self, quantity: Union[float, np.ndarray]) -> np.ndarray:
+        """Impact of marketable quantities as a fraction of the mid"""
+        quantity = np.asarray(quantity, dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(quantity > 0, self.cost(quantity) / (quantity * self.mid), 0.0)
+
+
+def mid_price(order_book: Dict) -> float:
+    """Mid of the best bid and ask (or the one side that has orders)"""
+    bids, asks = order_book.get('bids') or [], order_book.get('asks') or []
+    if bids and asks:
+        return (bids[0][0] + asks[0][0]) / 2
+    if bids or asks:
+        return (bids or asks)[0][0]
+    raise ValueError(f"Empty order book for {order_book.get('symbol')}")
+
+
+@dataclass
+class ExecutionSchedule:
+    """A parent order sliced into child orders, one per interval"""
+    symbol: str
+    side: str
+    quantity: float
+    strategy: str
+    interval_seconds: float
+    start_ms: int
+    arrival_price: float
+    child_quantities: np.ndarray
+    expected_costs: np.ndarray
+    timing_risk: float
+    volatility: float
+    optimize_slices: bool = False
+    volume_profile: Optional[np.ndarray] = None
+    participation_rate: Optional[float] = None
+    next_child: int = 0
+    replans: int = 0
+    fills: List[Dict] = field(default_factory=list)
+
+    @property
+    def filled_quantity(self) -> float:
+        return sum(fill['quantity'] for fill in self.fills)
+
+    @property
+    def remaining_quantity(self) -> float:
+        return max(self.quantity - self.filled_quantity, 0.0)
+
+    @property
+    def average_price(self) -> Optional[float]:
+        filled = self.filled_quantity
+        return sum(fill['quantity'] * fill['price'] for fill in self.fills) / filled if filled > 0 else None
+
+    @property
+    def fees(self) -> float:
+        return sum(fill['fee'] for fill in self.fills)
+
+    @property
+    def expected_cost(self) -> float:
+        """Expected impact and fee cost of the children not yet sent"""
+        return float(self.expected_costs[self.next_child:].sum())
+
+    @property
+    def implementation_shortfall(self) -> float:
+        """Realized cost of the fills against the arrival price, fees included"""
+        if not self.fills:
+            return 0.0
+        direction = 1.0 if self.side == 'buy' else -1.0
+        return direction * (self.average_price - self.arrival_price) * self.filled_quantity + self.fees
+
+    @property
+    def done(self) -> bool:
+        return self.next_child >= len(self.child_quantities) or self.remaining_quantity <= 1e-12
+
+    def child_time(self, index: int) -> int:
+        """Scheduled send time (ms) of a child order"""
+        return self.start_ms + int(index * self.interval_seconds * 1000)
+
+    def to_dict(self) -> Dict:
+        return {
+            'symbol': self.symbol,
+            'side': self.side,
+            'strategy': self.strategy,
+            'quantity': self.quantity,
+            'children': len(self.child_quantities),
+            'sent': self.next_child,
+            'filled_quantity': self.filled_quantity,
+            'average_price': self.average_price,
+            'arrival_price': self.arrival_price,
+            'expected_cost': self.expected_cost,
+            'timing_risk': self.timing_risk,
+            'implementation_shortfall': self.implementation_shortfall,
+            'fees': self.fees,
+            'replans': self.replans
+        }
+
+
+class ExecutionPlanner:
+    """
+    Plans and executes sliced parent orders from L2 depth
+
+    TWAP splits the order evenly (into the slice count that minimizes
+    impact cost plus ``risk_aversion`` times timing risk unless a horizon
+    is given), VWAP follows an expected volume profile and POV trades a
+    fixed share of expected market volume. Children are sent as IOC limit
+    orders no worse than ``max_slippage`` from the mid, and the rest of the
+    schedule is re-planned on the book seen before each child.
+    """
+
+    def __init__(self,
+                 interval_seconds: float = 60.0,
+                 max_slices: int = 60,
+                 resilience_seconds: float = 30.0,
+                 risk_aversion: float = 1.0,
+                 taker_fee: float = 0.001,
+                 max_slippage: float = 0.01):
+        """
+        Args:
+            interval_seconds: Time between child orders
+            max_slices: Most children an optimized TWAP is split into
+            resilience_seconds: Time constant of the book refilling taken liquidity
+            risk_aversion: Weight of timing risk (one standard deviation, in
+                quote currency) against expected cost
+            taker_fee: Fee rate charged on child orders
+            max_slippage: Furthest a child's limit price may be from the mid
+        """
+        self.interval_seconds = interval_seconds
+        self.max_slices = max_slices
+        self.resilience_seconds = resilience_seconds
+        self.risk_aversion = risk_aversion
+        self.taker_fee = taker_fee
+        self.max_slippage = max_slippage
+
+        logger.info("Execution Planner initialized")
+
+    # =========================================================================
+    # Cost models
+    # =========================================================================
+
+    @property
+    def decay(self) -> float:
+        """Share of taken liquidity still missing when the next child is sent"""
+        if self.resilience_seconds <= 0:
+            return 0.0
+        return math.exp(-self.interval_seconds / self.resilience_seconds)
+
+    def child_costs(self, curve: ImpactCurve, quantities: np.ndarray) -> np.ndarray:
+        """Expected impact plus fee cost of each child of a schedule"""
+        quantities = np.asarray(quantities, dtype=float)
+        # Liquidity still missing from earlier children: o[k] = d * (o[k-1] + q[k-1])
+        offsets = lfilter([0.0, self.decay], [1.0, -self.decay], quantities)
+        return curve.cost(quantities, offsets) + self.taker_fee * quantities * curve.mid
+
+    def timing_risk(self, quantities: np.ndarray, volatility: float, price: float) -> float:
+        """Standard deviation (quote currency) of price moves on quantity waiting to execute"""
+        quantities = np.asarray(quantities, dtype=float)
+        waiting = quantities.sum() - np.cumsum(quantities)
+        sigma = volatility / math.sqrt(SECONDS_PER_DAY)
+        return float(price * sigma * math.sqrt(self.interval_seconds * np.sum(waiting ** 2)))
+
+    def optimal_slices(self, curve: ImpactCurve, quantity: float, volatility: float) -> int:
+        """Even slice count minimizing expected cost plus risk-weighted timing risk"""
+        counts = np.arange(1, self.max_slices + 1)
+        child = quantity / counts
+
+        # Equal children: o[k] = q * (d + d^2 + ... + d^k)
+        decay = self.decay
+        geometric = np.concatenate([[0.0], np.cumsum(decay ** np.arange(1, self.max_slices))])
+        offsets = child[:, None] * geometric[None, :]
+        sent = np.arange(self.max_slices)[None, :] < counts[:, None]
+        impact = np.where(sent, curve.cost(child[:, None], offsets), 0.0).sum(axis=1)
+
+        # Waiting quantity after child k is Q * (n - 1 - k) / n
+        sigma = volatility / math.sqrt(SECONDS_PER_DAY)
+        waiting_squares = quantity ** 2 * (counts - 1) * (2 * counts - 1) / (6 * counts)
+        risk = curve.mid * sigma * np.sqrt(self.interval_seconds * waiting_squares)
+
+        return int(counts[np.argmin(impact + self.risk_aversion * risk)])
+
+    # =========================================================================
+    # Planning
+    # =========================================================================
+
+    def plan(self,
+             order_book: Dict,
+             side: str,
+             quantity: float,
+             strategy: str = 'twap',
+             horizon_seconds: Optional[float] = None,
+             volume_profile: Optional[Sequence[float]] = None,
+             participation_rate: float = 0.1,
+             volatility: float = 0.03,
+             symbol: Optional[str] = None,
+             start_ms: int = 0) -> ExecutionSchedule:
+        """
+        Plan a child-order schedule for a parent order
+
+        Args:
+            order_book: CCXT order book the impact curve is built from
+            side: 'buy' or 'sell'
+            quantity: Parent order size in base currency
+            strategy: 'twap', 'vwap' or 'pov'
+            horizon_seconds: TWAP duration; None optimizes the slice count
+            volume_profile: Expected market volume per interval (VWAP weights,
+                POV volume; repeats its last value when POV needs more intervals)
+            participation_rate: POV share of market volume per interval
+            volatility: Daily volatility of the price (fraction)
+            symbol: Symbol the schedule is for
+            start_ms: Send time of the first child
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown execution strategy: {strategy}")
+        if strategy in ('vwap', 'pov') and volume_profile is None:
+            raise ValueError(f"{strategy.upper()} needs a volume profile")
+
+        curve = ImpactCurve.from_order_book(order_book, side)
+        schedule = ExecutionSchedule(
+            symbol=symbol or order_book.get('symbol'),
+            side=side,
+            quantity=quantity,
+            strategy=strategy,
+            interval_seconds=self.interval_seconds,
+            start_ms=start_ms,
+            arrival_price=curve.mid,
+            child_quantities=np.zeros(0),
+            expected_costs=np.zeros(0),
+            timing_risk=0.0,
+            volatility=volatility,
+            optimize_slices=strategy == 'twap' and horizon_seconds is None,
+            volume_profile=None if volume_profile is None else np.asarray(volume_profile, dtype=float),
+            participation_rate=participation_rate if strategy == 'pov' else None
+        )
+
+        if strategy == 'twap' and horizon_seconds is not None:
+            slices = max(int(math.ceil(horizon_seconds / self.interval_seconds)), 1)
+            children = np.full(slices, quantity / slices)
+        else:
+            children = self._children(schedule, curve, quantity, 0)
+        self._set_children(schedule, curve, children)
+
+        logger.info(f"Planned {strategy.upper()} {side} of {quantity} {schedule.symbol}: "
+                    f"{len(children)} children, expected cost {schedule.expected_cost:.2f}")
+        return schedule
+
+    def replan(self, schedule: ExecutionSchedule, order_book: Dict) -> ExecutionSchedule:
+        """
+        Re-plan the children not yet sent on a fresh order book
+
+        Sent children are kept as they are; what is still unfilled is spread
+        over the remaining intervals (re-optimized for an open-ended TWAP)
+        and their costs are re-estimated on the new book. POV keeps
+        participating past its planned intervals until the order is done.
+        """
+        curve = ImpactCurve.from_order_book(order_book, schedule.side)
+        sent = schedule.next_child
+        remaining = schedule.remaining_quantity
+        planned = schedule.child_quantities[sent:]
+
+        if schedule.optimize_slices:
+            # Re-optimized, but never past the intervals the schedule has left
+            slices = min(self.optimal_slices(curve, remaining, schedule.volatility), len(planned))
+            tail = np.full(slices, remaining / slices)
+        elif schedule.strategy == 'pov':
+            tail = self._children(schedule, curve, remaining, sent)
+        elif len(planned) and planned.sum() > 0:
+            tail = remaining * planned / planned.sum()
+        else:
+            tail = np.full(len(planned), remaining / max(len(planned), 1))
+
+        self._set_children(schedule, curve, tail, sent)
+        schedule.replans += 1
+        return schedule
+
+    def _children(self, schedule: ExecutionSchedule, curve: ImpactCurve, quantity: float, start: int) -> np.ndarray:
+        """Child quantities for ``quantity`` from interval ``start`` on"""
+        if schedule.strategy == 'twap':
+            slices = self.optimal_slices(curve, quantity, schedule.volatility)
+            return np.full(slices, quantity / slices)
+
+        profile = schedule.volume_profile
+        if schedule.strategy == 'vwap':
+            weights = profile[start:] if start < len(profile) else profile[-1:]
+            if weights.sum() <= 0:
+                weights = np.ones(len(weights))
+            return quantity * weights / weights.sum()
+
+        # POV: a fixed share of each interval's volume until the quantity is done
+        volume = schedule.participation_rate * profile
+        if volume[-1] <= 0:
+            raise ValueError("POV needs positive market volume in the last profile interval")
+        windows = volume[start:] if start < len(volume) else volume[-1:]
+        covered = np.cumsum(windows)
+        if covered[-1] < quantity:
+            extra = int(math.ceil((quantity - covered[-1]) / volume[-1]))
+            if len(windows) + extra > MAX_CHILDREN:
+                raise ValueError(f"POV schedule would need more than {MAX_CHILDREN} children")
+            windows = np.concatenate([windows, np.full(extra, volume[-1])])
+            covered = np.cumsum(windows)
+        last = int(np.searchsorted(covered, quantity - 1e-12))
+        children = windows[:last + 1].copy()
+        children[last] -= covered[last] - quantity
+        return children
+
+    def _set_children(self, schedule: ExecutionSchedule, curve: ImpactCurve,
+                      children: np.ndarray, start: int = 0) -> None:
+        schedule.child_quantities = np.concatenate([schedule.child_quantities[:start], children])
+        schedule.expected_costs = np.concatenate([schedule.expected_costs[:start], self.child_costs(curve, children)])
+        schedule.timing_risk = self.timing_risk(children, schedule.volatility, curve.mid)
+
+    # =========================================================================
+    # Execution
+    # =========================================================================
+
+    async def execute(self,
+                      exchange,
+                      symbol: str,
+                      side: str,
+                      quantity: float,
+                      strategy: str = 'twap',
+                      limit_price: Optional[float] = None,
+                      **plan_options) -> ExecutionSchedule:
+        """
+        Execute a parent order through a CCXT-compatible exchange
+
+        Waits between children on the exchange's simulation clock when it
+        has one (ExchangeSimulator), otherwise in real time. Quantity still
+        unfilled after the last child is left unexecuted.
+
+        Args:
+            exchange: CCXT-compatible exchange
+            symbol: Trading pair
+            side: 'buy' or 'sell'
+            quantity: Parent order size
+            strategy: 'twap', 'vwap' or 'pov'
+            limit_price: Worst price any child may fill at
+            **plan_options: Passed on to plan()
+        """
+        order_book = await exchange.fetch_order_book(symbol)
+        schedule = self.plan(order_book, side, quantity, strategy, symbol=symbol,
+                             start_ms=exchange.milliseconds(), **plan_options)
+        direction = 1.0 if side == 'buy' else -1.0
+
+        while not schedule.done and schedule.next_child < MAX_CHILDREN:
+            index = schedule.next_child
+            if index > 0:
+                await self._wait_until(exchange, schedule.child_time(index))
+                order_book = await exchange.fetch_order_book(symbol)
+                self.replan(schedule, order_book)
+
+            child = float(schedule.child_quantities[index])
+            price = mid_price(order_book) * (1 + direction * self.max_slippage)
+            if limit_price is not None:
+                price = min(price, limit_price) if side == 'buy' else max(price, limit_price)
+
+            try:
+                order = await exchange.create_order(symbol, 'limit', side, child, price, {'timeInForce': 'IOC'})
+                if order.get('filled'):
+                    schedule.fills.append({
+                        'child': index,
+                        'order_id': order['id'],
+                        'quantity': order['filled'],
+                        'price': order.get('average') or price,
+                        'fee': (order.get('fee') or {}).get('cost') or 0.0
+                    })
+            except Exception as e:
+                logger.warning(f"Child order {index} for {symbol} failed: {e}")
+            schedule.next_child += 1
+
+        logger.info(f"Executed {schedule.filled_quantity}/{quantity} {symbol} in {schedule.next_child} children, "
+                    f"shortfall {schedule.implementation_shortfall:.2f}")
+        return schedule
+
+    @staticmethod
+    async def _wait_until(exchange, timestamp_ms: int) -> None:
+        clock = getattr(exchange, 'clock', None)
+        if clock is not None and hasattr(clock, 'sleep_until'):
+            await clock.sleep_until(timestamp_ms)
+            return
+        delay = (timestamp_ms - exchange.milliseconds()) / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -6,10 +6,11 @@ Implements comprehensive cost modeling including:
 3. Funding costs for futures positions
 4. Network withdrawal fees
 5. Impact of order book depth
+6. Vectorized batch costs for backtests and parameter sweeps
 """
 
 import numpy as np
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Union
 from dataclasses import dataclass
 from enum import Enum
 import logging
@@ -24,6 +25,20 @@ class TradingSide(Enum):
     BUY = "buy"
     SELL = "sell"
 
+# Integer codes used by the batch API
+ORDER_TYPE_CODES = {OrderType.LIMIT: 0, OrderType.MARKET: 1}
+SIDE_CODES = {TradingSide.BUY: 0, TradingSide.SELL: 1}
+
+# Volatility regime boundaries (ATR%) and their slippage models, in code order
+VOLATILITY_REGIME_BOUNDS = (0.015, 0.03, 0.06)
+VOLATILITY_REGIMES = ('low_vol', 'normal_vol', 'high_vol', 'extreme_vol')
+
+MAJOR_PAIRS = ('BTC/USDT', 'ETH/USDT', 'BNB/USDT')
+MAX_SLIPPAGE_PERCENT = 0.005  # 0.5% max
+DEFAULT_FUNDING_RATE = 0.0001  # Typical 0.01% per 8h when no rate is given
+
+ArrayLike = Union[float, int, Sequence, np.ndarray]
+
 @dataclass
 class TradingFees:
     """Exchange fee structure"""
@@ -52,6 +67,17 @@ class TradeCost:
     total_cost: float
     cost_percent: float
     effective_price: float
+
+@dataclass
+class BatchTradeCost:
+    """Cost breakdown of many trades, one array element per trade"""
+    exchange_fees: np.ndarray
+    slippage_cost: np.ndarray
+    funding_cost: np.ndarray
+    withdrawal_cost: np.ndarray
+    total_cost: np.ndarray
+    cost_percent: np.ndarray
+    effective_price: np.ndarray
     
 class TradingCostCalculator:
     """
@@ -131,6 +157,10 @@ class TradingCostCalculator:
             5: 0.25     # 25% discount
         }
         
+        # Pair registry for the batch API (pair ID -> pair)
+        self.pairs: List[str] = []
+        self._pair_ids: Dict[str, int] = {}
+        
         logger.info("Trading Cost Calculator initialized")
     
     def calculate_trade_cost(self,
@@ -270,14 +300,7 @@ class TradingCostCalculator:
         """Calculate dynamic slippage based on market conditions"""
         
         # Determine volatility regime
-        if current_volatility < 0.015:
-            vol_regime = 'low_vol'
-        elif current_volatility < 0.03:
-            vol_regime = 'normal_vol'
-        elif current_volatility < 0.06:
-            vol_regime = 'high_vol'
-        else:
-            vol_regime = 'extreme_vol'
+        vol_regime = VOLATILITY_REGIMES[int(np.searchsorted(VOLATILITY_REGIME_BOUNDS, current_volatility, side='right'))]
         
         slippage_model = self.slippage_models[vol_regime]
         
@@ -301,7 +324,7 @@ class TradingCostCalculator:
         hours_multiplier = 1.0 if market_hours else 1.3
         
         # Major pair adjustment (better liquidity)
-        pair_adjustment = 0.8 if pair in ['BTC/USDT', 'ETH/USDT', 'BNB/USDT'] else 1.0
+        pair_adjustment = 0.8 if pair in MAJOR_PAIRS else 1.0
         
         # Calculate final slippage
         total_slippage_percent = (base_slippage * vol_adjustment * size_impact * 
@@ -309,7 +332,7 @@ class TradingCostCalculator:
                                 hours_multiplier * pair_adjustment)
         
         # Cap maximum slippage
-        total_slippage_percent = min(total_slippage_percent, 0.005)  # 0.5% max
+        total_slippage_percent = min(total_slippage_percent, MAX_SLIPPAGE_PERCENT)
         
         return notional_value * total_slippage_percent
     
@@ -512,6 +535,211 @@ class TradingCostCalculator:
             'limit_target_price': price
         }
 
+    # =========================================================================
+    # Batch API
+    # =========================================================================
+    
+    def get_pair_ids(self, pairs: Sequence[str]) -> np.ndarray:
+        """Integer pair IDs for the batch API (unseen pairs are registered)"""
+        ids = np.empty(len(pairs), dtype=np.int32)
+        for i, pair in enumerate(pairs):
+            pair_id = self._pair_ids.get(pair)
+            if pair_id is None:
+                pair_id = self._pair_ids[pair] = len(self.pairs)
+                self.pairs.append(pair)
+            ids[i] = pair_id
+        return ids
+    
+    def _pair_tables(self):
+        """Per-pair lookup arrays: slippage adjustment and withdrawal cost (USD)"""
+        pair_adjustment = np.array([0.8 if pair in MAJOR_PAIRS else 1.0 for pair in self.pairs])
+        withdrawal = np.array([
+            sum(self.withdrawal_fees.get(pair.split('/')[0], {'fixed': 0.0, 'network_fee': 0.0}).values()) * 50000
+            for pair in self.pairs
+        ])
+        return pair_adjustment, withdrawal
+    
+    def _fee_table(self, exchange: str) -> np.ndarray:
+        """Fee rates indexed by [is_futures, order type code]"""
+        if exchange not in self.exchange_fees:
+            logger.warning(f"Unknown exchange: {exchange}, using Binance fees")
+            exchange = 'binance'
+        fees = self.exchange_fees[exchange]
+        return np.array([
+            [fees.maker_fee, fees.taker_fee],
+            [fees.futures_maker_fee, fees.futures_taker_fee],
+        ])
+    
+    @staticmethod
+    def _codes(values, mapping: Dict[Enum, int]) -> np.ndarray:
+        """Integer codes from an enum, or an array that already holds codes"""
+        if isinstance(values, Enum):
+            return np.array(mapping[values], dtype=np.int8)
+        return np.asarray(values, dtype=np.int8)
+    
+    def calculate_trade_cost_batch(self,
+                                   pair_ids: ArrayLike,
+                                   sides: ArrayLike,
+                                   order_sizes: ArrayLike,
+                                   prices: ArrayLike,
+                                   volatilities: ArrayLike = 0.03,
+                                   order_types: ArrayLike = OrderType.LIMIT,
+                                   exchange: str = 'binance',
+                                   is_futures: ArrayLike = False,
+                                   market_impact_factor: ArrayLike = 1.0,
+                                   vip_tier: ArrayLike = 0,
+                                   news_event: ArrayLike = False,
+                                   market_hours: ArrayLike = True,
+                                   funding_rates: Optional[ArrayLike] = None,
+                                   position_duration_hours: ArrayLike = 24) -> BatchTradeCost:
+        """
+        Calculate trading costs for many trades at once
+        
+        Same model as calculate_trade_cost, evaluated over arrays with fee,
+        VIP, slippage-regime and per-pair lookup tables. Every argument may
+        be a scalar or an array broadcastable to the number of trades.
+        
+        Args:
+            pair_ids: Pair IDs from get_pair_ids
+            sides: TradingSide or SIDE_CODES codes (0 buy, 1 sell)
+            order_sizes: Sizes in base currency
+            prices: Trade prices
+            volatilities: Market volatility (ATR%) at each trade
+            order_types: OrderType or ORDER_TYPE_CODES codes (0 limit, 1 market)
+            exchange: Exchange name
+            is_futures: Whether each trade is a futures trade
+            market_impact_factor: Order size impact multiplier
+            vip_tier: VIP tier for fee discounts
+            news_event: Whether there's a major news event
+            market_hours: Whether trading during active hours
+            funding_rates: Funding rate per 8h for futures (DEFAULT_FUNDING_RATE if None)
+            position_duration_hours: Expected holding period for futures
+            
+        Returns:
+            BatchTradeCost with one element per trade
+        """
+        pair_ids, sizes, prices, volatilities = np.broadcast_arrays(
+            np.asarray(pair_ids, dtype=np.int64), np.asarray(order_sizes, dtype=float),
+            np.asarray(prices, dtype=float), np.asarray(volatilities, dtype=float)
+        )
+        sides = self._codes(sides, SIDE_CODES)
+        order_types = self._codes(order_types, ORDER_TYPE_CODES)
+        is_futures = np.asarray(is_futures, dtype=bool)
+        notional = sizes * prices
+        
+        # 1. Exchange fees: [market, order type] lookup with VIP discount
+        vip_discounts = np.array([self.vip_discounts[tier] for tier in sorted(self.vip_discounts)])
+        vip = vip_discounts[np.clip(np.asarray(vip_tier, dtype=np.int64), 0, len(vip_discounts) - 1)]
+        fee_rates = self._fee_table(exchange)[is_futures.astype(np.int8), order_types]
+        exchange_fees = notional * fee_rates * (1 - vip)
+        
+        # 2. Slippage: regime lookup by volatility bucket
+        regime = np.searchsorted(VOLATILITY_REGIME_BOUNDS, volatilities, side='right')
+        models = [self.slippage_models[name] for name in VOLATILITY_REGIMES]
+        base_slippage = np.array([model.base_slippage for model in models])[regime]
+        volatility_multiplier = np.array([model.volatility_multiplier for model in models])[regime]
+        size_impact_factor = np.array([model.size_impact_factor for model in models])[regime]
+        pair_adjustment, withdrawal_table = self._pair_tables()
+        
+        slippage_percent = (
+            base_slippage
+            * (1 + volatilities * volatility_multiplier)
+            * (1 + (notional / 100000) * size_impact_factor * np.asarray(market_impact_factor, dtype=float))
+            * np.where(order_types == ORDER_TYPE_CODES[OrderType.MARKET], 1.5, 1.0)
+            * np.where(np.asarray(news_event, dtype=bool), 2.0, 1.0)
+            * np.where(np.asarray(market_hours, dtype=bool), 1.0, 1.3)
+            * pair_adjustment[pair_ids]
+        )
+        slippage_cost = notional * np.minimum(slippage_percent, MAX_SLIPPAGE_PERCENT)
+        
+        # 3. Funding (futures only), charged every 8 hours
+        rates = DEFAULT_FUNDING_RATE if funding_rates is None else np.asarray(funding_rates, dtype=float)
+        funding_cost = np.where(
+            is_futures, np.abs(rates) * notional * np.asarray(position_duration_hours, dtype=float) / 8, 0.0
+        )
+        
+        # 4. Withdrawal costs only for very large positions
+        withdrawal_cost = np.where(sizes * 50000 > 100000, withdrawal_table[pair_ids], 0.0)
+        
+        total_cost = exchange_fees + slippage_cost + funding_cost + withdrawal_cost
+        direction = np.where(sides == SIDE_CODES[TradingSide.BUY], 1.0, -1.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cost_percent = total_cost / notional
+            effective_price = prices + slippage_cost / sizes * direction
+        
+        return BatchTradeCost(
+            exchange_fees=exchange_fees,
+            slippage_cost=slippage_cost,
+            funding_cost=funding_cost,
+            withdrawal_cost=withdrawal_cost,
+            total_cost=total_cost,
+            cost_percent=cost_percent,
+            effective_price=effective_price
+        )
+    
+    def calculate_round_trip_cost_batch(self,
+                                        pair_ids: ArrayLike,
+                                        order_sizes: ArrayLike,
+                                        entry_prices: ArrayLike,
+                                        exit_prices: ArrayLike,
+                                        sides: ArrayLike = TradingSide.BUY,
+                                        volatilities: ArrayLike = 0.03,
+                                        order_types: ArrayLike = OrderType.LIMIT,
+                                        exchange: str = 'binance',
+                                        is_futures: ArrayLike = False,
+                                        funding_rates: Optional[ArrayLike] = None,
+                                        position_duration_hours: ArrayLike = 24) -> Dict[str, np.ndarray]:
+        """
+        Calculate round-trip costs (entry + exit) for many trades at once
+        
+        ``sides`` is the entry side: BUY for longs, SELL for shorts. Unlike
+        calculate_round_trip_cost, futures funding is charged once for the
+        holding period rather than on each leg as well.
+        
+        Returns:
+            Dict of arrays: gross_pnl, net_pnl, total_cost, total_fees,
+            total_slippage, total_funding, cost_percent, breakeven_price,
+            entry_effective_price, exit_effective_price
+        """
+        sides = self._codes(sides, SIDE_CODES)
+        pair_ids, sizes, entry_prices, exit_prices = np.broadcast_arrays(
+            np.asarray(pair_ids, dtype=np.int64), np.asarray(order_sizes, dtype=float),
+            np.asarray(entry_prices, dtype=float), np.asarray(exit_prices, dtype=float)
+        )
+        common = dict(volatilities=volatilities, order_types=order_types, exchange=exchange, is_futures=is_futures)
+        
+        entry = self.calculate_trade_cost_batch(pair_ids, sides, sizes, entry_prices, **common)
+        exit_ = self.calculate_trade_cost_batch(pair_ids, 1 - sides, sizes, exit_prices, **common)
+        
+        rates = DEFAULT_FUNDING_RATE if funding_rates is None else np.asarray(funding_rates, dtype=float)
+        total_funding = np.where(
+            np.asarray(is_futures, dtype=bool),
+            np.abs(rates) * sizes * entry_prices * np.asarray(position_duration_hours, dtype=float) / 8,
+            0.0
+        )
+        total_fees = entry.exchange_fees + exit_.exchange_fees
+        total_slippage = entry.slippage_cost + exit_.slippage_cost
+        total_cost = total_fees + total_slippage + total_funding
+        
+        direction = np.where(sides == SIDE_CODES[TradingSide.BUY], 1.0, -1.0)
+        gross_pnl = (exit_prices - entry_prices) * sizes * direction
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cost_percent = total_cost / (sizes * entry_prices)
+            breakeven_price = entry_prices + direction * total_cost / sizes
+        
+        return {
+            'gross_pnl': gross_pnl,
+            'net_pnl': gross_pnl - total_cost,
+            'total_cost': total_cost,
+            'total_fees': total_fees,
+            'total_slippage': total_slippage,
+            'total_funding': total_funding,
+            'cost_percent': cost_percent,
+            'breakeven_price': breakeven_price,
+            'entry_effective_price': entry.effective_price,
+            'exit_effective_price': exit_.effective_price
+        }
+
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -12,6 +12,7 @@ from .historical_data_manager import HistoricalDataManager
 # Import key classes for easier access
 from .market_data_manager import MarketDataManager
 from .real_time_feeds import RealTimeFeedsManager, WebSocketFeed
+from .resampler import CandleResampler, resample_ohlcv
 
 __all__ = [
     "MarketDataManager",
@@ -19,4 +20,6 @@ __all__ = [
     "RealTimeFeedsManager",
     "WebSocketFeed",
     "HistoricalDataManager",
+    "CandleResampler",
+    "resample_ohlcv",
 ]
@@ -7,8 +7,8 @@ data integrity and quality for trading algorithms.
 
 import logging
 import re
-from datetime import timedelta
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -17,6 +17,36 @@ from .exceptions import DataValidationError
 
 logger = logging.getLogger(__name__)
 
+REQUIRED_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+NUMERIC_COLUMNS = ["open", "high", "low", "close", "volume"]
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of a fused OHLCV validation pass.
+
+    ``issues`` holds ("error" | "warning", message) pairs in check order;
+    ``stats`` holds the per-check measurements the quality report uses.
+    """
+
+    symbol: str
+    rows: int
+    issues: List[Tuple[str, str]] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def errors(self) -> List[str]:
+        return [message for level, message in self.issues if level == "error"]
+
+    @property
+    def warnings(self) -> List[str]:
+        return [message for level, message in self.issues if level == "warning"]
+
+    @property
+    def passed(self) -> bool:
+        return not self.errors
+
 
 class DataValidator:
     """Professional data quality validation for trading data."""
@@ -35,14 +65,22 @@ class DataValidator:
         self.min_volume_threshold = self.config.get("min_volume_threshold", 0.0)
         self.max_spread_pct = self.config.get("max_spread_pct", 5.0)
 
+        # Validated range per series: {series: {"first", "last", "interval"}} in ns
+        self._watermarks: Dict[str, Dict[str, int]] = {}
+
         logger.info("DataValidator initialized with config: %s", self.config)
 
-    def validate_ohlcv_data(self, data: pd.DataFrame, symbol: str) -> bool:
+    def validate_ohlcv_data(
+        self, data: pd.DataFrame, symbol: str, series: Optional[str] = None
+    ) -> bool:
         """Validate OHLCV data structure and quality.
 
         Args:
             data: DataFrame with OHLCV data
             symbol: Trading symbol for error reporting
+            series: Optional series key (e.g. ``"BTC/USDT:1h"``). Candles
+                inside the range already validated for this series are
+                skipped, so repeated polls only check newly appended rows.
 
         Returns:
             True if data passes all validation checks
@@ -53,20 +91,19 @@ class DataValidator:
         try:
             logger.debug("Validating OHLCV data for %s (%d rows)", symbol, len(data))
 
-            # Check basic structure
-            self._validate_data_structure(data, symbol)
-
-            # Check for data gaps
-            self._validate_data_continuity(data, symbol)
+            window, expected_interval = self._unvalidated_window(data, series)
+            if window is None:
+                logger.debug("All candles already validated for %s", series)
+                return True
 
-            # Check for price anomalies
-            self._validate_price_data(data, symbol)
+            result = self.check_ohlcv(window, symbol, expected_interval)
+            for level, message in result.issues:
+                if level == "error":
+                    raise DataValidationError(message, symbol)
+                logger.warning(message)
 
-            # Check volume data
-            self._validate_volume_data(data, symbol)
-
-            # Check OHLC consistency
-            self._validate_ohlc_consistency(data, symbol)
+            if series is not None:
+                self._advance_watermark(series, data, result)
 
             logger.info("✅ Data validation passed for %s", symbol)
             return True
@@ -77,149 +114,187 @@ class DataValidator:
                 f"Validation failed for {symbol}: {e}", symbol
             ) from e
 
-    def _validate_data_structure(self, data: pd.DataFrame, symbol: str) -> None:
-        """Validate basic data structure and columns."""
-        if data.empty:
-            raise DataValidationError(f"Empty dataset for {symbol}", symbol)
+    def check_ohlcv(
+        self,
+        data: pd.DataFrame,
+        symbol: str,
+        expected_interval: Optional[int] = None,
+    ) -> ValidationResult:
+        """Run every OHLCV check in one vectorized pass without raising.
 
-        required_columns = ["timestamp", "open", "high", "low", "close", "volume"]
-        missing_columns = [col for col in required_columns if col not in data.columns]
+        Args:
+            data: DataFrame with OHLCV data
+            symbol: Trading symbol for messages
+            expected_interval: Candle spacing in ns; inferred from the
+                most common timestamp difference when omitted
+
+        Returns:
+            ValidationResult with ordered issues and per-check statistics
+        """
+        result = ValidationResult(symbol=symbol, rows=len(data))
+        issues, stats = result.issues, result.stats
+
+        # Structure: these failures leave nothing numeric to check
+        if data.empty:
+            issues.append(("error", f"Empty dataset for {symbol}"))
+            return result
 
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in data.columns]
         if missing_columns:
-            raise DataValidationError(
-                f"Missing required columns for {symbol}: {missing_columns}", symbol
-            )
+            issues.append(("error", f"Missing required columns for {symbol}: {missing_columns}"))
+            return result
 
-        # Check for null values
-        null_counts = data[required_columns].isnull().sum()
+        null_counts = data[REQUIRED_COLUMNS].isnull().sum()
+        stats["null_counts"] = {col: int(null_counts[col]) for col in REQUIRED_COLUMNS}
         if null_counts.any():
-            raise DataValidationError(
+            issues.append((
+                "error",
                 f"Null values found in {symbol}: {null_counts[null_counts > 0].to_dict()}",
-                symbol,
-            )
+            ))
 
-        # Validate data types
-        numeric_columns = ["open", "high", "low", "close", "volume"]
-        for col in numeric_columns:
+        for col in NUMERIC_COLUMNS:
             if not pd.api.types.is_numeric_dtype(data[col]):
-                raise DataValidationError(
-                    f"Non-numeric data in column {col} for {symbol}", symbol
-                )
-
-    def _validate_data_continuity(self, data: pd.DataFrame, symbol: str) -> None:
-        """Check for gaps in time series data."""
-        if len(data) < 2:
-            return  # Can't check continuity with less than 2 data points
+                issues.append(("error", f"Non-numeric data in column {col} for {symbol}"))
+                return result
 
-        # Convert timestamp to datetime if needed
-        timestamps = pd.to_datetime(data["timestamp"])
-        time_diffs = timestamps.diff().dropna()
+        timestamps = _timestamps_ns(data["timestamp"])
+        open_, high, low, close, volume = (
+            data[col].to_numpy(dtype=np.float64) for col in NUMERIC_COLUMNS
+        )
 
-        # Detect gaps larger than expected
-        expected_interval = (
-            time_diffs.mode().iloc[0] if not time_diffs.empty else timedelta(minutes=1)
+        # Continuity
+        known = timestamps != _NAT
+        diffs = np.diff(timestamps)[known[1:] & known[:-1]]
+        if expected_interval is None:
+            expected_interval = _mode(diffs) if len(diffs) else 60 * 10**9
+        gaps = diffs[diffs > 2 * expected_interval]
+        stats["start"] = int(timestamps[known].min()) if known.any() else _NAT
+        stats["end"] = int(timestamps[known].max()) if known.any() else _NAT
+        stats["expected_interval"] = int(expected_interval)
+        stats["interval_count"] = len(diffs)
+        stats["regular_intervals"] = int(
+            ((diffs >= 0.5 * expected_interval) & (diffs <= 1.5 * expected_interval)).sum()
         )
-        max_allowed_gap = expected_interval * 2  # Allow up to 2x normal interval
-
-        large_gaps = time_diffs[time_diffs > max_allowed_gap]
-
-        if not large_gaps.empty:
-            gap_count = len(large_gaps)
-            largest_gap = large_gaps.max()
-
-            logger.warning(
-                "⚠️ Data gaps detected in %s: %d gaps, largest: %s",
-                symbol,
-                gap_count,
-                largest_gap,
-            )
-
-            # Only raise error for very large gaps
-            if largest_gap > timedelta(minutes=self.max_gap_minutes):
-                raise DataValidationError(
-                    f"Large data gap detected in {symbol}: {largest_gap}", symbol
-                )
-
-    def _validate_price_data(self, data: pd.DataFrame, symbol: str) -> None:
-        """Validate price data for anomalies and consistency."""
-        # Check for negative or zero prices
-        price_columns = ["open", "high", "low", "close"]
-
-        for col in price_columns:
-            invalid_prices = data[data[col] <= 0]
-            if not invalid_prices.empty:
-                raise DataValidationError(
-                    f"Invalid prices (<=0) in {col} for {symbol}: {len(invalid_prices)} rows",
-                    symbol,
-                )
-
-        # Check for extreme price movements
-        close_prices = data["close"]
-        price_changes = close_prices.pct_change().dropna()
-
-        extreme_changes = price_changes[
-            abs(price_changes) > self.max_price_change_pct / 100
-        ]
-
-        if not extreme_changes.empty:
-            max_change = extreme_changes.abs().max() * 100
-            logger.warning(
-                "⚠️ Extreme price movements in %s: max change %.2f%%", symbol, max_change
-            )
-
-            # Only raise error for extremely large movements
+        stats["gap_count"] = len(gaps)
+        stats["largest_gap"] = int(gaps.max()) if len(gaps) else 0
+        if len(gaps):
+            largest_gap = pd.Timedelta(stats["largest_gap"])
+            issues.append((
+                "warning",
+                f"⚠️ Data gaps detected in {symbol}: {len(gaps)} gaps, largest: {largest_gap}",
+            ))
+            if largest_gap > pd.Timedelta(minutes=self.max_gap_minutes):
+                issues.append(("error", f"Large data gap detected in {symbol}: {largest_gap}"))
+
+        # Prices
+        stats["nonpositive_prices"] = {}
+        for col, values in zip(PRICE_COLUMNS, (open_, high, low, close)):
+            count = int((values <= 0).sum())
+            stats["nonpositive_prices"][col] = count
+            if count:
+                issues.append(("error", f"Invalid prices (<=0) in {col} for {symbol}: {count} rows"))
+
+        # Returns over forward-filled closes, as pandas' pct_change()
+        filled = close[np.maximum.accumulate(np.where(np.isnan(close), 0, np.arange(len(close))))]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            changes = filled[1:] / filled[:-1] - 1
+        changes = changes[~np.isnan(changes)]
+        abs_changes = np.abs(changes)
+        stats["max_increase"] = float(changes.max()) if len(changes) else 0
+        stats["max_decrease"] = float(changes.min()) if len(changes) else 0
+        stats["moves_over_10pct"] = int((abs_changes > 0.1).sum())
+        extreme = abs_changes[abs_changes > self.max_price_change_pct / 100]
+        if len(extreme):
+            max_change = extreme.max() * 100
+            issues.append((
+                "warning",
+                f"⚠️ Extreme price movements in {symbol}: max change {max_change:.2f}%",
+            ))
             if max_change > self.max_price_change_pct:
-                raise DataValidationError(
-                    f"Extreme price movement in {symbol}: {max_change:.2f}%", symbol
-                )
-
-    def _validate_volume_data(self, data: pd.DataFrame, symbol: str) -> None:
-        """Validate volume data."""
-        volumes = data["volume"]
-
-        # Check for negative volumes
-        negative_volumes = volumes[volumes < 0]
-        if not negative_volumes.empty:
-            raise DataValidationError(
-                f"Negative volumes detected in {symbol}: {len(negative_volumes)} rows",
-                symbol,
-            )
-
-        # Check for suspiciously low volumes (might indicate data issues)
+                issues.append(("error", f"Extreme price movement in {symbol}: {max_change:.2f}%"))
+
+        # Volume
+        negative_volumes = int((volume < 0).sum())
+        stats["negative_volumes"] = negative_volumes
+        stats["zero_volumes"] = int((volume == 0).sum())
+        if negative_volumes:
+            issues.append(("error", f"Negative volumes detected in {symbol}: {negative_volumes} rows"))
         if self.min_volume_threshold > 0:
-            low_volume_count = (volumes < self.min_volume_threshold).sum()
+            low_volume_count = int((volume < self.min_volume_threshold).sum())
             if low_volume_count > len(data) * 0.5:  # More than 50% low volume
-                logger.warning(
-                    "⚠️ High percentage of low volume periods in %s: %.1f%%",
-                    symbol,
-                    (low_volume_count / len(data)) * 100,
-                )
-
-    def _validate_ohlc_consistency(self, data: pd.DataFrame, symbol: str) -> None:
-        """Validate OHLC price consistency (high >= low, etc.)."""
-        # High should be >= Open, Close, Low
-        invalid_high = data[
-            (data["high"] < data["open"])
-            | (data["high"] < data["close"])
-            | (data["high"] < data["low"])
-        ]
-
-        if not invalid_high.empty:
-            raise DataValidationError(
-                f"Invalid high prices in {symbol}: {len(invalid_high)} rows", symbol
-            )
+                issues.append((
+                    "warning",
+                    f"⚠️ High percentage of low volume periods in {symbol}: "
+                    f"{low_volume_count / len(data) * 100:.1f}%",
+                ))
+
+        # OHLC consistency
+        invalid_high = int(((high < open_) | (high < close) | (high < low)).sum())
+        invalid_low = int(((low > open_) | (low > close) | (low > high)).sum())
+        stats["consistent_highs"] = int((high >= np.fmax(np.fmax(open_, close), low)).sum())
+        stats["consistent_lows"] = int((low <= np.fmin(np.fmin(open_, close), high)).sum())
+        if invalid_high:
+            issues.append(("error", f"Invalid high prices in {symbol}: {invalid_high} rows"))
+        if invalid_low:
+            issues.append(("error", f"Invalid low prices in {symbol}: {invalid_low} rows"))
+
+        return result
+
+    def _unvalidated_window(
+        self, data: pd.DataFrame, series: Optional[str]
+    ) -> Tuple[Optional[pd.DataFrame], Optional[int]]:
+        """Slice off the candles a series has already validated.
+
+        Returns the rows still to check (with one preceding row so gaps and
+        price changes at the boundary are covered) and the series' known
+        candle interval, or ``(None, None)`` when nothing is new.
+        """
+        watermark = self._watermarks.get(series) if series is not None else None
+        if watermark is None or data.empty or "timestamp" not in data.columns:
+            return data, None
+
+        timestamps = _timestamps_ns(data["timestamp"])
+        if not (timestamps[0] >= watermark["first"] and timestamps[0] <= watermark["last"]) \
+                or not np.all(np.diff(timestamps) > 0):
+            return data, None
+
+        # The last validated candle is re-checked: it may have been in progress
+        position = int(np.searchsorted(timestamps, watermark["last"], side="left"))
+        if position >= len(timestamps):
+            return None, None
+        return data.iloc[max(position - 1, 0):], watermark["interval"]
+
+    def _advance_watermark(self, series: str, data: pd.DataFrame, result: ValidationResult) -> None:
+        """Extend (or restart) the validated range of a series."""
+        if not result.stats:
+            return
+        first = int(_timestamps_ns(data["timestamp"].iloc[:1])[0])
+        watermark = self._watermarks.get(series)
+        if watermark is not None and watermark["first"] <= first <= watermark["last"]:
+            first = watermark["first"]
+        self._watermarks[series] = {
+            "first": first,
+            "last": result.stats["end"],
+            "interval": result.stats["expected_interval"],
+        }
 
-        # Low should be <= Open, Close, High
-        invalid_low = data[
-            (data["low"] > data["open"])
-            | (data["low"] > data["close"])
-            | (data["low"] > data["high"])
-        ]
+    def get_watermark(self, series: str) -> Optional[Dict[str, pd.Timestamp]]:
+        """Return the validated time range of a series, if any."""
+        watermark = self._watermarks.get(series)
+        if watermark is None:
+            return None
+        return {
+            "first": pd.Timestamp(watermark["first"]),
+            "last": pd.Timestamp(watermark["last"]),
+            "interval": pd.Timedelta(watermark["interval"]),
+        }
 
-        if not invalid_low.empty:
-            raise DataValidationError(
-                f"Invalid low prices in {symbol}: {len(invalid_low)} rows", symbol
-            )
+    def reset_watermark(self, series: Optional[str] = None) -> None:
+        """Forget validated ranges for one series, or all of them."""
+        if series is None:
+            self._watermarks.clear()
+        else:
+            self._watermarks.pop(series, None)
 
     def validate_symbol_format(self, symbol: str) -> bool:
         """Validate trading symbol format.
@@ -245,12 +320,16 @@ class DataValidator:
 
         return True
 
-    def get_data_quality_report(self, data: pd.DataFrame, symbol: str) -> Dict:
+    def get_data_quality_report(
+        self, data: pd.DataFrame, symbol: str, result: Optional[ValidationResult] = None
+    ) -> Dict:
         """Generate comprehensive data quality report.
 
         Args:
             data: DataFrame with OHLCV data
             symbol: Trading symbol
+            result: Full-frame result from check_ohlcv() to reuse; computed
+                here when omitted
 
         Returns:
             Dictionary with data quality metrics
@@ -268,50 +347,46 @@ class DataValidator:
             return report
 
         try:
+            result = result or self.check_ohlcv(data, symbol)
+            stats = result.stats
+            if "start" not in stats:
+                raise DataValidationError(result.errors[0], symbol)
+
             # Date range
-            timestamps = pd.to_datetime(data["timestamp"])
+            start, end = pd.Timestamp(stats["start"]), pd.Timestamp(stats["end"])
             report["date_range"] = {
-                "start": timestamps.min().isoformat(),
-                "end": timestamps.max().isoformat(),
-                "duration_hours": (timestamps.max() - timestamps.min()).total_seconds()
-                / 3600,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "duration_hours": (end - start).total_seconds() / 3600,
             }
 
             # Data completeness
-            required_columns = ["open", "high", "low", "close", "volume"]
             completeness = {}
-            for col in required_columns:
-                null_count = data[col].isnull().sum()
+            for col in NUMERIC_COLUMNS:
+                null_count = stats["null_counts"][col]
                 completeness[col] = {
-                    "null_count": int(null_count),
-                    "completeness_pct": float(
-                        (len(data) - null_count) / len(data) * 100
-                    ),
+                    "null_count": null_count,
+                    "completeness_pct": float((len(data) - null_count) / len(data) * 100),
                 }
             report["completeness"] = completeness
 
             # Price anomalies
-            price_changes = data["close"].pct_change().dropna()
             report["anomalies"] = {
-                "max_price_increase_pct": (
-                    float(price_changes.max() * 100) if not price_changes.empty else 0
-                ),
-                "max_price_decrease_pct": (
-                    float(price_changes.min() * 100) if not price_changes.empty else 0
-                ),
-                "extreme_movements_count": int((abs(price_changes) > 0.1).sum()),
-                "zero_volume_count": int((data["volume"] == 0).sum()),
+                "max_price_increase_pct": stats["max_increase"] * 100,
+                "max_price_decrease_pct": stats["max_decrease"] * 100,
+                "extreme_movements_count": stats["moves_over_10pct"],
+                "zero_volume_count": stats["zero_volumes"],
             }
 
             # Data quality scores
-            quality_score = self._calculate_quality_score(data)
+            scores = self._scores(result)
             report["data_quality"] = {
-                "overall_score": quality_score,
+                "overall_score": scores["overall"],
                 "completeness_score": min(
                     [comp["completeness_pct"] for comp in completeness.values()]
                 ),
-                "consistency_score": self._calculate_consistency_score(data),
-                "continuity_score": self._calculate_continuity_score(data),
+                "consistency_score": scores["consistency"],
+                "continuity_score": scores["continuity"],
             }
 
         except Exception as e:
@@ -320,61 +395,53 @@ class DataValidator:
 
         return report
 
+    def _scores(self, result: ValidationResult) -> Dict[str, float]:
+        """Completeness, consistency, continuity and overall scores (0-100)."""
+        stats, rows = result.stats, result.rows
+        nulls = sum(stats["null_counts"][col] for col in NUMERIC_COLUMNS)
+        completeness = (1.0 - nulls / (rows * len(NUMERIC_COLUMNS))) * 100
+        consistency = (stats["consistent_highs"] + stats["consistent_lows"]) / (2 * rows) * 100
+        continuity = (
+            stats["regular_intervals"] / stats["interval_count"] * 100
+            if stats["interval_count"] else 100.0
+        )
+        return {
+            "completeness": float(completeness),
+            "consistency": float(consistency),
+            "continuity": float(continuity),
+            "overall": float(np.mean([completeness, consistency, continuity])),
+        }
+
     def _calculate_quality_score(self, data: pd.DataFrame) -> float:
         """Calculate overall data quality score (0-100)."""
         if data.empty:
             return 0.0
-
-        scores = []
-
-        # Completeness score
-        required_columns = ["open", "high", "low", "close", "volume"]
-        completeness = 1.0 - (
-            data[required_columns].isnull().sum().sum()
-            / (len(data) * len(required_columns))
-        )
-        scores.append(completeness * 100)
-
-        # Consistency score
-        scores.append(self._calculate_consistency_score(data))
-
-        # Continuity score
-        scores.append(self._calculate_continuity_score(data))
-
-        return float(np.mean(scores))
+        return self._scores(self.check_ohlcv(data, ""))["overall"]
 
     def _calculate_consistency_score(self, data: pd.DataFrame) -> float:
         """Calculate OHLC consistency score."""
         if len(data) == 0:
             return 0.0
-
-        # Check OHLC relationships
-        valid_high = (data["high"] >= data[["open", "close", "low"]].max(axis=1)).sum()
-        valid_low = (data["low"] <= data[["open", "close", "high"]].min(axis=1)).sum()
-
-        consistency_score = (valid_high + valid_low) / (2 * len(data)) * 100
-        return float(consistency_score)
+        return self._scores(self.check_ohlcv(data, ""))["consistency"]
 
     def _calculate_continuity_score(self, data: pd.DataFrame) -> float:
         """Calculate time series continuity score."""
         if len(data) < 2:
             return 100.0
+        return self._scores(self.check_ohlcv(data, ""))["continuity"]
 
-        timestamps = pd.to_datetime(data["timestamp"])
-        time_diffs = timestamps.diff().dropna()
 
-        if time_diffs.empty:
-            return 100.0
+_NAT = np.iinfo(np.int64).min
+
 
-        # Calculate expected interval
-        expected_interval = time_diffs.mode().iloc[0]
+def _timestamps_ns(values: pd.Series) -> np.ndarray:
+    """Timestamps as an int64 nanosecond array (NaT as int64 min)."""
+    if not pd.api.types.is_datetime64_dtype(values):
+        values = pd.to_datetime(values)
+    return values.to_numpy(dtype="datetime64[ns]").view(np.int64)
 
-        # Count intervals within acceptable range (±50% of expected)
-        acceptable_range = expected_interval * 0.5
-        acceptable_intervals = time_diffs[
-            (time_diffs >= expected_interval - acceptable_range)
-            & (time_diffs <= expected_interval + acceptable_range)
-        ]
 
-        continuity_score = len(acceptable_intervals) / len(time_diffs) * 100
-        return float(continuity_score)
+def _mode(values: np.ndarray) -> int:
+    """Most common value, smallest on ties (as pandas' mode)."""
+    unique, counts = np.unique(values, return_counts=True)
+    return int(unique[np.argmax(counts)])
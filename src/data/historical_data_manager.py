@@ -15,6 +15,11 @@ import pandas as pd
 
 from .exceptions import DataNotAvailableError, ExchangeConnectionError
 
+try:
+    from src.database.data_warehouse import ohlcv_rows, upsert_ohlcv
+except ImportError:  # imported with src/ on the path
+    from database.data_warehouse import ohlcv_rows, upsert_ohlcv
+
 logger = logging.getLogger(__name__)
 
 
@@ -189,19 +194,15 @@ class HistoricalDataManager:
             return
 
         try:
-            conn = sqlite3.connect(self.database_path)
-
-            # Convert datetime index to milliseconds for storage
-            df_to_store = df.reset_index()
-            df_to_store["timestamp"] = df_to_store["timestamp"].astype("int64") // 10**6
-
-            # Insert data into database
-            df_to_store.to_sql(
-                "ohlcv_data", conn, if_exists="append", index=False, method="multi"
-            )
+            # Duplicate keys keep the last row; stored candles are overwritten
+            rows = ohlcv_rows(df)
 
-            conn.commit()
-            conn.close()
+            conn = sqlite3.connect(self.database_path)
+            try:
+                with conn:
+                    upsert_ohlcv(conn, rows)
+            finally:
+                conn.close()
 
             logger.info("Stored %d candles in database", len(df))
 
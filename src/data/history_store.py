@@ -0,0 +1,225 @@
+"""
+Bounded History Store
+
+Fixed-capacity ring buffer of timestamped per-symbol records (signals,
+regime readings) held in one structured NumPy array.
+
+Key Features:
+- Memory is allocated once; the oldest records are overwritten when full
+- Per-symbol indexes answer "last N records for X" without scanning
+- Time-range lookups by binary search over the two sorted ring segments
+- Optional spill of records to a columnar store before they are evicted
+"""
+
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TimeLike = Union[datetime, float, int, None]
+FieldSpec = Sequence[Tuple[str, Any]]
+
+INDEX_FIELDS = [("timestamp", "f8"), ("symbol_id", "i4")]
+
+
+class HistoryStore:
+    """Ring buffer of records indexed by symbol and time."""
+
+    def __init__(
+        self,
+        fields: FieldSpec,
+        capacity: int = 10_000,
+        spill: Optional[Callable[[pd.DataFrame], Any]] = None,
+        spill_batch: Optional[int] = None,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            fields: ``(name, dtype)`` pairs of the record fields besides
+                ``timestamp`` (epoch seconds) and ``symbol_id``
+            capacity: Number of records kept in memory
+            spill: Called with a frame of records before they are evicted
+                (e.g. a ``ParquetRecordStore``)
+            spill_batch: Records per spill call (default: a quarter of capacity)
+        """
+        if capacity < 1:
+            raise ValueError("History capacity must be positive")
+
+        self.dtype = np.dtype(INDEX_FIELDS + list(fields))
+        self.fields = [name for name, _ in fields]
+        self.capacity = capacity
+        self.records = np.zeros(capacity, dtype=self.dtype)
+        self.count = 0  # records ever appended; record ``seq`` lives at ``seq % capacity``
+        self.symbols: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+        self._by_symbol: List[Deque[int]] = []
+        self._blank = np.zeros((), dtype=self.dtype)
+        self._ordered = True
+
+        self.spill = spill
+        self.spill_batch = min(spill_batch or max(capacity // 4, 1), capacity)
+        self._spilled = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def evicted(self) -> int:
+        """Records overwritten so far"""
+        return max(self.count - self.capacity, 0)
+
+    @property
+    def nbytes(self) -> int:
+        return self.records.nbytes
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, symbol: str, timestamp: TimeLike = None, **values: Any) -> int:
+        """Add a record, evicting the oldest one when full.
+
+        Args:
+            symbol: Symbol the record belongs to
+            timestamp: Record time (default: now)
+            **values: Field values; omitted fields are zero/empty
+
+        Returns:
+            Sequence number of the record
+        """
+        unknown = set(values) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown history fields: {sorted(unknown)}")
+
+        seq = self.count
+        slot = seq % self.capacity
+        if seq >= self.capacity:
+            if self.spill is not None and self._spilled == seq - self.capacity:
+                self._spill(self.spill_batch)
+            self._by_symbol[self.records["symbol_id"][slot]].popleft()
+
+        seconds = _seconds(timestamp)
+        if seq and seconds < self.records["timestamp"][(seq - 1) % self.capacity]:
+            self._ordered = False
+
+        symbol_id = self._symbol_id(symbol)
+        row = self._blank.copy()
+        row["timestamp"] = seconds
+        row["symbol_id"] = symbol_id
+        for name, value in values.items():
+            row[name] = value
+        self.records[slot] = row
+
+        self._by_symbol[symbol_id].append(seq)
+        self.count += 1
+        return seq
+
+    def flush(self) -> int:
+        """Spill every record not yet spilled; returns the number spilled."""
+        if self.spill is None:
+            return 0
+        return self._spill(self.count - self._spilled)
+
+    def _spill(self, n: int) -> int:
+        start = max(self._spilled, self.evicted)
+        stop = min(self._spilled + n, self.count)
+        if stop <= start:
+            return 0
+        try:
+            self.spill(self.to_frame(self.records[np.arange(start, stop) % self.capacity]))
+        except Exception as e:
+            logger.error(f"Error spilling {stop - start} history records: {e}")
+        self._spilled = stop
+        return stop - start
+
+    def _symbol_id(self, symbol: str) -> int:
+        symbol_id = self._symbol_index.get(symbol)
+        if symbol_id is None:
+            symbol_id = self._symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self._by_symbol.append(deque())
+        return symbol_id
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def last(self, n: int = 1, symbol: Optional[str] = None) -> np.ndarray:
+        """The ``n`` most recent records (of a symbol), oldest first."""
+        if n <= 0:
+            return self.records[:0]
+        if symbol is None:
+            seqs = np.arange(max(self.count - n, self.evicted), self.count)
+        else:
+            symbol_id = self._symbol_index.get(symbol)
+            if symbol_id is None:
+                return self.records[:0]
+            seqs = np.fromiter(islice(reversed(self._by_symbol[symbol_id]), n), dtype=np.int64)[::-1]
+        return self.records[seqs % self.capacity]
+
+    def latest(self, symbol: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The most recent record (of a symbol) as a dict, or None."""
+        records = self.last(1, symbol)
+        return self.to_dict(records[0]) if len(records) else None
+
+    def between(self, start: TimeLike = None, end: TimeLike = None, symbol: Optional[str] = None) -> np.ndarray:
+        """Records with ``start <= timestamp <= end`` (of a symbol), oldest first."""
+        lower = -np.inf if start is None else _seconds(start)
+        upper = np.inf if end is None else _seconds(end)
+        if self._ordered:
+            seqs = np.arange(self.evicted + self._rank(lower, "left"), self.evicted + self._rank(upper, "right"))
+            records = self.records[seqs % self.capacity]
+        else:
+            records = self.last(len(self))
+            records = records[(records["timestamp"] >= lower) & (records["timestamp"] <= upper)]
+
+        if symbol is not None:
+            symbol_id = self._symbol_index.get(symbol, -1)
+            records = records[records["symbol_id"] == symbol_id]
+        return records
+
+    def _rank(self, seconds: float, side: str) -> int:
+        """Stored records before ``seconds`` (``np.searchsorted`` semantics)."""
+        timestamps = self.records["timestamp"]
+        if self.count <= self.capacity:
+            return int(np.searchsorted(timestamps[:self.count], seconds, side))
+        # Full ring: [slot:] holds the older half, [:slot] the newer one
+        slot = self.count % self.capacity
+        return int(np.searchsorted(timestamps[slot:], seconds, side) + np.searchsorted(timestamps[:slot], seconds, side))
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    def to_dict(self, record: np.void) -> Dict[str, Any]:
+        """One record with its symbol and a local datetime."""
+        values = {name: record[name].item() for name in self.fields}
+        values["symbol"] = self.symbols[record["symbol_id"]]
+        values["timestamp"] = datetime.fromtimestamp(record["timestamp"])
+        return values
+
+    def to_frame(self, records: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Records (default: all stored) as a frame with UTC timestamps."""
+        records = self.last(len(self)) if records is None else records
+        frame = pd.DataFrame({
+            "timestamp": pd.to_datetime(records["timestamp"], unit="s"),
+            "symbol": np.array(self.symbols, dtype=object)[records["symbol_id"]],
+        })
+        for name in self.fields:
+            frame[name] = records[name]
+        return frame
+
+
+def _seconds(value: TimeLike) -> float:
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
@@ -18,8 +18,21 @@ from cachetools import TTLCache
 from .data_validator import DataValidator
 from .exceptions import (DataNotAvailableError, ExchangeConnectionError,
                          InvalidSymbolError)
+from .parquet_store import PYARROW_AVAILABLE, ParquetOHLCVStore
+from .resampler import CandleResampler
+
+try:
+    from src.monitoring.async_logging import HotPathLogger
+    from src.monitoring.metrics import (CACHE_REQUESTS, DB_WRITE_SECONDS, EXCHANGE_ERRORS,
+                                        EXCHANGE_LATENCY, EXCHANGE_REQUESTS)
+except ImportError:  # imported with src/ on the path
+    from monitoring.async_logging import HotPathLogger
+    from monitoring.metrics import (CACHE_REQUESTS, DB_WRITE_SECONDS, EXCHANGE_ERRORS,
+                                    EXCHANGE_LATENCY, EXCHANGE_REQUESTS)
 
 logger = logging.getLogger(__name__)
+# Per-fetch logs: at most one line per call site and minute outside debug mode
+hot_log = HotPathLogger(__name__, interval=60.0)
 
 
 class MarketDataManager:
@@ -63,6 +76,18 @@ class MarketDataManager:
         # Data storage
         self.data_dir = Path(self.config.get("data_dir", "data"))
         self.data_dir.mkdir(exist_ok=True)
+        self.store: Optional[ParquetOHLCVStore] = None
+        if PYARROW_AVAILABLE:
+            self.store = ParquetOHLCVStore(
+                self.data_dir,
+                row_group_size=self.config.get("parquet_row_group_size", 10_000),
+                compact_after_parts=self.config.get("parquet_compact_after_parts", 8),
+            )
+        else:
+            logger.warning("⚠️ pyarrow not installed - historical data will not be persisted")
+
+        # Higher timeframes are derived from one base stream per symbol
+        self.resampler = CandleResampler(self.config.get("base_timeframe", "1m"))
 
         logger.info(
             "MarketDataManager initialized for exchange: %s",
@@ -134,11 +159,11 @@ class MarketDataManager:
         cache_key = f"{symbol}_{timeframe}_{limit}_realtime"
         cached_data = self._get_from_cache(cache_key)
         if cached_data is not None:
-            logger.debug("📦 Cache hit for %s %s", symbol, timeframe)
+            hot_log.debug("📦 Cache hit for %s %s", symbol, timeframe)
             return cached_data
 
         try:
-            logger.debug(
+            hot_log.debug(
                 "📡 Fetching real-time data: %s %s (limit: %d)",
                 symbol,
                 timeframe,
@@ -152,7 +177,7 @@ class MarketDataManager:
             if not self.exchange:
                 raise ExchangeConnectionError("Exchange not initialized")
 
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            ohlcv = self._exchange_request("fetch_ohlcv", symbol, timeframe, limit=limit)
 
             if not ohlcv:
                 raise DataNotAvailableError(
@@ -162,13 +187,13 @@ class MarketDataManager:
             # Convert to DataFrame
             df = self._convert_ohlcv_to_dataframe(ohlcv)
 
-            # Validate data quality
-            self.validator.validate_ohlcv_data(df, symbol)
+            # Validate data quality (only candles newer than the series watermark)
+            self.validator.validate_ohlcv_data(df, symbol, series=f"{symbol}:{timeframe}")
 
             # Cache the data
             self._store_in_cache(cache_key, df)
 
-            logger.info(
+            hot_log.info(
                 "✅ Fetched real-time data: %s %s (%d candles)",
                 symbol,
                 timeframe,
@@ -213,27 +238,60 @@ class MarketDataManager:
         cache_key = f"{symbol}_{timeframe}_historical_{start_date}_{end_date}_{limit}"
         cached_data = self._get_from_cache(cache_key)
         if cached_data is not None:
-            logger.debug("📦 Cache hit for historical %s %s", symbol, timeframe)
+            hot_log.debug("📦 Cache hit for historical %s %s", symbol, timeframe)
             return cached_data
 
+        # Warm start from the local Parquet history
+        local = self._load_local_history(symbol, timeframe, start_date, end_date, limit)
+        if local is not None and self._is_fresh(local, timeframe, end_date):
+            df = local.head(limit) if start_date else local.tail(limit)
+            df = df.reset_index(drop=True)
+            self._store_in_cache(cache_key, df, ttl=3600)
+            hot_log.info(
+                "💽 Loaded historical data from disk: %s %s (%d candles)",
+                symbol,
+                timeframe,
+                len(df),
+            )
+            return df
+
         try:
-            logger.info("📚 Fetching historical data: %s %s", symbol, timeframe)
+            hot_log.info("📚 Fetching historical data: %s %s", symbol, timeframe)
 
-            # Calculate since timestamp if start_date provided
+            # Calculate since timestamp if start_date provided, resuming
+            # after the newest candle already on disk
             since = None
             if start_date:
                 since = int(start_date.timestamp() * 1000)
-
-            # Rate limiting
-            self._enforce_rate_limit()
+            resume = local is not None and (
+                start_date is not None or self._candles_behind(local, timeframe, end_date) <= limit
+            )
+            if resume:
+                since = int(local["timestamp"].iloc[-1].value // 1_000_000)
+            # Otherwise the stored candles are older than the newest ``limit``
+            # ones: fetch those directly and leave the gap unfilled
 
             # Fetch data from exchange
             if not self.exchange:
                 raise ExchangeConnectionError("Exchange not initialized")
 
-            ohlcv = self.exchange.fetch_ohlcv(
-                symbol, timeframe, since=since, limit=limit
-            )
+            ohlcv = []
+            while True:
+                # Rate limiting
+                self._enforce_rate_limit()
+                page = self._exchange_request(
+                    "fetch_ohlcv", symbol, timeframe, since=since, limit=limit
+                )
+                ohlcv.extend(page or [])
+                # A resumed fetch pages forward until it reaches the newest
+                # candle (or, from a start date, has enough candles)
+                if not resume or not page or len(page) < limit or page[-1][0] < since:
+                    break
+                if end_date and page[-1][0] >= end_date.timestamp() * 1000:
+                    break
+                if start_date and len(local) + len(ohlcv) >= limit:
+                    break
+                since = page[-1][0] + 1
 
             if not ohlcv:
                 raise DataNotAvailableError(
@@ -247,16 +305,22 @@ class MarketDataManager:
             if end_date:
                 df = df[df["timestamp"] <= end_date]
 
-            # Validate data quality
-            self.validator.validate_ohlcv_data(df, symbol)
+            # Validate data quality (only candles outside the validated range)
+            self.validator.validate_ohlcv_data(df, symbol, series=f"{symbol}:{timeframe}")
+
+            # Persist only the newly fetched candles
+            self._save_historical_data(symbol, timeframe, df)
+
+            if local is not None:
+                df = pd.concat([local, df], ignore_index=True)
+                df = df.drop_duplicates("timestamp", keep="last")
+                df = df.head(limit) if start_date else df.tail(limit)
+                df = df.reset_index(drop=True)
 
             # Cache the data (longer TTL for historical data)
             self._store_in_cache(cache_key, df, ttl=3600)  # 1 hour cache
 
-            # Optionally save to file for persistence
-            self._save_historical_data(symbol, timeframe, df)
-
-            logger.info(
+            hot_log.info(
                 "✅ Fetched historical data: %s %s (%d candles)",
                 symbol,
                 timeframe,
@@ -268,6 +332,31 @@ class MarketDataManager:
             logger.error("❌ Error fetching historical data for %s: %s", symbol, e)
             raise
 
+    def fetch_resampled_data(
+        self, symbol: str, timeframe: str = "1h", limit: int = 500
+    ) -> pd.DataFrame:
+        """Fetch higher-timeframe OHLCV data derived from base candles.
+
+        Only the base timeframe is fetched and persisted; the requested
+        timeframe is aggregated locally and cached by the resampler.
+
+        Args:
+            symbol: Trading symbol (e.g., 'BTC/USDT')
+            timeframe: Target timeframe (a multiple of the base timeframe)
+            limit: Number of target-timeframe candles
+
+        Returns:
+            DataFrame with resampled OHLCV data (last candle may be forming)
+        """
+        base_timeframe = self.resampler.base_timeframe
+        if timeframe == base_timeframe:
+            return self.fetch_historical_data(symbol, timeframe, limit=limit)
+
+        needed = self.resampler.base_candles_needed(timeframe, limit)
+        base = self.fetch_historical_data(symbol, base_timeframe, limit=needed)
+        self.resampler.ingest(symbol, base)
+        return self.resampler.get(symbol, timeframe, limit=limit)
+
     def get_available_symbols(self) -> List[str]:
         """Get list of available trading symbols.
 
@@ -319,7 +408,7 @@ class MarketDataManager:
             market = markets[symbol]
 
             # Get current ticker data
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = self._exchange_request("fetch_ticker", symbol)
 
             symbol_info = {
                 "symbol": symbol,
@@ -406,13 +495,28 @@ class MarketDataManager:
 
         self.last_request_time = time.time()
 
+    def _exchange_request(self, method: str, *args, **kwargs) -> Any:
+        """Call an exchange method, reporting rate, errors and latency."""
+        name = self.exchange_config["name"]
+        EXCHANGE_REQUESTS.labels(name, method).inc()
+        started = time.perf_counter()
+        try:
+            return getattr(self.exchange, method)(*args, **kwargs)
+        except Exception as e:
+            EXCHANGE_ERRORS.labels(name, method, type(e).__name__).inc()
+            raise
+        finally:
+            EXCHANGE_LATENCY.labels(name, method).observe(time.perf_counter() - started)
+
     def _get_from_cache(self, key: str) -> Optional[pd.DataFrame]:
         """Get data from cache."""
         try:
-            return self.cache.get(key)
+            data = self.cache.get(key)
         except Exception as e:
             logger.warning("⚠️ Cache retrieval error: %s", e)
-            return None
+            data = None
+        CACHE_REQUESTS.labels("market_data", "miss" if data is None else "hit").inc()
+        return data
 
     def _store_in_cache(
         self, key: str, data: pd.DataFrame, ttl: Optional[int] = None
@@ -425,28 +529,102 @@ class MarketDataManager:
             else:
                 self.cache[key] = data
 
-            logger.debug("💾 Cached data: %s", key)
+            hot_log.debug("💾 Cached data: %s", key)
         except Exception as e:
             logger.warning("⚠️ Cache storage error: %s", e)
 
     def _save_historical_data(
         self, symbol: str, timeframe: str, data: pd.DataFrame
     ) -> None:
-        """Save historical data to file for persistence."""
+        """Append historical data to the partitioned Parquet store."""
+        if self.store is None:
+            return
         try:
-            # Create symbol directory
-            symbol_dir = self.data_dir / symbol.replace("/", "_")
-            symbol_dir.mkdir(exist_ok=True)
+            with DB_WRITE_SECONDS.labels("parquet", "ohlcv").time():
+                self.store.append(symbol, timeframe, data)
+            hot_log.debug("💾 Saved historical data: %s %s", symbol, timeframe)
 
-            # Save to parquet for efficiency
-            filename = f"{timeframe}_{datetime.now().strftime('%Y%m%d')}.parquet"
-            filepath = symbol_dir / filename
+        except Exception as e:
+            logger.warning("⚠️ Failed to save historical data: %s", e)
 
-            data.to_parquet(filepath, index=False)
-            logger.debug("💾 Saved historical data: %s", filepath)
+    def load_historical_data(
+        self,
+        symbol: str,
+        timeframe: str = "1h",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """Load persisted historical data without touching the exchange.
+
+        Args:
+            symbol: Trading symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe (1m, 5m, 1h, 1d, etc.)
+            start_date: Inclusive start of the range
+            end_date: Inclusive end of the range
+            columns: OHLCV columns to load besides timestamp (default: all)
 
+        Returns:
+            DataFrame sorted by timestamp (empty if nothing is stored)
+        """
+        if self.store is None:
+            return pd.DataFrame()
+        return self.store.read(symbol, timeframe, start_date, end_date, columns)
+
+    def compact_historical_data(
+        self, symbol: Optional[str] = None, timeframe: Optional[str] = None
+    ) -> int:
+        """Merge and deduplicate pending Parquet part files.
+
+        Returns:
+            Number of partitions compacted
+        """
+        if self.store is None:
+            return 0
+        return self.store.compact(symbol, timeframe)
+
+    def _load_local_history(
+        self,
+        symbol: str,
+        timeframe: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        limit: int,
+    ) -> Optional[pd.DataFrame]:
+        """Stored candles for the request, or None if they don't cover its start."""
+        try:
+            local = self.load_historical_data(symbol, timeframe, start_date, end_date)
         except Exception as e:
-            logger.warning("⚠️ Failed to save historical data: %s", e)
+            logger.warning("⚠️ Failed to load historical data: %s", e)
+            return None
+
+        if local.empty or (start_date is None and len(local) < limit):
+            return None
+        if start_date and local["timestamp"].iloc[0] > pd.Timestamp(start_date):
+            return None
+        return local
+
+    def _is_fresh(
+        self, data: pd.DataFrame, timeframe: str, end_date: Optional[datetime]
+    ) -> bool:
+        """Whether the newest stored candle is within one interval of the range end."""
+        try:
+            interval = pd.to_timedelta(timeframe)
+        except ValueError:
+            return False
+        target = pd.Timestamp(end_date) if end_date else pd.Timestamp.utcnow().tz_localize(None)
+        return data["timestamp"].iloc[-1] >= target - interval
+
+    def _candles_behind(
+        self, data: pd.DataFrame, timeframe: str, end_date: Optional[datetime]
+    ) -> float:
+        """Number of candles between the newest stored candle and the range end."""
+        try:
+            interval = pd.to_timedelta(timeframe)
+        except ValueError:
+            return 0
+        target = pd.Timestamp(end_date) if end_date else pd.Timestamp.utcnow().tz_localize(None)
+        return (target - data["timestamp"].iloc[-1]) / interval
 
     def get_cached_data_info(self) -> Dict[str, Any]:
         """Get information about cached data."""
@@ -473,6 +651,7 @@ class MarketDataManager:
             },
             "cache": self.get_cached_data_info(),
             "data_dir": str(self.data_dir),
+            "persistence": self.store is not None,
             "rate_limit_delay": self.rate_limit_delay,
         }
 
@@ -480,7 +659,7 @@ class MarketDataManager:
         try:
             if self.exchange:
                 # Try to fetch a simple ticker
-                self.exchange.fetch_ticker("BTC/USDT")
+                self._exchange_request("fetch_ticker", "BTC/USDT")
                 status["exchange"]["status"] = "healthy"
         except Exception as e:
             status["exchange"]["status"] = f"error: {e}"
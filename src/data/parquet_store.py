@@ -0,0 +1,416 @@
+"""
+Partitioned OHLCV Parquet Store
+
+Local columnar history for market data, laid out as
+``{root}/{BASE_QUOTE}/{timeframe}/{YYYY-MM}/*.parquet``.
+
+Key Features:
+- Appends write small immutable part files; compaction merges a month's
+  parts into one file, deduplicated on timestamp (latest write wins)
+- Files are sorted by timestamp with row-group statistics, so range reads
+  skip months by directory name and row groups by min/max
+- Range reads with predicate pushdown and column projection
+- Coverage lookups from Parquet metadata without reading data
+- ``ParquetRecordStore`` keeps arbitrary timestamped records (e.g. history
+  spilled from memory) in the same month layout
+"""
+
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = ds = pq = None
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+COMPACTED_FILE = "data.parquet"
+
+TimeLike = Union[str, pd.Timestamp, datetime, int, None]
+
+
+class ParquetOHLCVStore:
+    """Symbol / timeframe / month partitioned OHLCV dataset."""
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        row_group_size: int = 10_000,
+        compact_after_parts: int = 8,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            root: Dataset root directory
+            row_group_size: Rows per Parquet row group (pruning granularity)
+            compact_after_parts: Compact a month once it has this many part files
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for the Parquet OHLCV store")
+
+        self.root = Path(root)
+        self.row_group_size = row_group_size
+        self.compact_after_parts = compact_after_parts
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, symbol: str, timeframe: str, data: pd.DataFrame) -> int:
+        """Append candles, one part file per touched month.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            data: Frame with a ``timestamp`` column and OHLCV columns
+
+        Returns:
+            Number of rows written
+        """
+        if data.empty:
+            return 0
+
+        timestamps = _to_ms(data["timestamp"])
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        columns = {
+            col: data[col].to_numpy(dtype=np.float64)[order] for col in OHLCV_COLUMNS[1:]
+        }
+
+        months = timestamps.astype("datetime64[ms]").astype("datetime64[M]")
+        boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+        series_dir = self._series_dir(symbol, timeframe)
+
+        for start, stop in zip(np.r_[0, boundaries], np.r_[boundaries, len(timestamps)]):
+            partition = series_dir / str(months[start])
+            partition.mkdir(parents=True, exist_ok=True)
+            table = _table(timestamps[start:stop], {col: values[start:stop] for col, values in columns.items()})
+            self._write(table, partition / _part_name())
+
+            if len(self._part_files(partition)) >= self.compact_after_parts:
+                self._compact_partition(partition)
+
+        logger.debug("💾 Appended %d %s %s candles to %s", len(timestamps), symbol, timeframe, series_dir)
+        return len(timestamps)
+
+    def compact(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> int:
+        """Merge and deduplicate every month that has pending part files.
+
+        Returns:
+            Number of partitions compacted
+        """
+        compacted = 0
+        for partition in self._partitions(symbol, timeframe):
+            if self._part_files(partition):
+                self._compact_partition(partition)
+                compacted += 1
+        return compacted
+
+    def _compact_partition(self, partition: Path) -> None:
+        files = self._files(partition)
+        table = pa.concat_tables([pq.read_table(path) for path in files])
+
+        # Keep the latest write of each timestamp, then restore time order
+        timestamps = table.column("timestamp").cast(pa.int64()).to_numpy()
+        _, last_from_end = np.unique(timestamps[::-1], return_index=True)
+        keep = np.sort(len(timestamps) - 1 - last_from_end)
+        table = table.take(pa.array(keep))
+
+        tmp_path = partition / f".{COMPACTED_FILE}.{uuid.uuid4().hex}"
+        self._write(table, tmp_path)
+        os.replace(tmp_path, partition / COMPACTED_FILE)
+        for path in files:
+            if path.name != COMPACTED_FILE:
+                path.unlink()
+
+        logger.debug("🗜️ Compacted %s: %d files -> %d rows", partition, len(files), table.num_rows)
+
+    def _write(self, table: "pa.Table", path: Path) -> None:
+        pq.write_table(
+            table, path, row_group_size=self.row_group_size, write_statistics=True, compression="zstd"
+        )
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Load candles in ``[start, end]``.
+
+        Months outside the range are skipped by directory, row groups by
+        their timestamp statistics, and only the requested columns are
+        decoded.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            start: Inclusive start (datetime-like or epoch ms)
+            end: Inclusive end (datetime-like or epoch ms)
+            columns: Columns to load besides ``timestamp`` (default: all)
+
+        Returns:
+            Frame sorted by timestamp with unique timestamps
+        """
+        projection = ["timestamp"] + [col for col in (columns or OHLCV_COLUMNS) if col != "timestamp"]
+        start_ms, end_ms = _optional_ms(start), _optional_ms(end)
+
+        predicate = None
+        if start_ms is not None:
+            predicate = ds.field("timestamp") >= pa.scalar(start_ms, pa.timestamp("ms"))
+        if end_ms is not None:
+            upper = ds.field("timestamp") <= pa.scalar(end_ms, pa.timestamp("ms"))
+            predicate = upper if predicate is None else predicate & upper
+
+        tables = []
+        for partition in self._partitions(symbol, timeframe, start_ms, end_ms):
+            for path in self._files(partition):
+                tables.append(pq.read_table(path, columns=projection, filters=predicate))
+
+        if not tables:
+            return pd.DataFrame(columns=projection)
+
+        df = pa.concat_tables(tables).to_pandas()
+        df["timestamp"] = df["timestamp"].astype("datetime64[ns]")
+        if len(tables) > 1:
+            df = df.drop_duplicates("timestamp", keep="last").sort_values("timestamp", kind="stable")
+        return df.reset_index(drop=True)
+
+    def coverage(self, symbol: str, timeframe: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """First and last stored timestamp, from row-group statistics only."""
+        partitions = self._partitions(symbol, timeframe)
+        if not partitions:
+            return None
+
+        bounds = []
+        for partition in (partitions[0], partitions[-1]):
+            for path in self._files(partition):
+                metadata = pq.ParquetFile(path).metadata
+                for i in range(metadata.num_row_groups):
+                    stats = metadata.row_group(i).column(0).statistics
+                    if stats is not None and stats.has_min_max:
+                        bounds.extend([stats.min, stats.max])
+
+        if not bounds:
+            return None
+        return pd.Timestamp(min(bounds)), pd.Timestamp(max(bounds))
+
+    def partitions(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Describe stored partitions (files, rows and bytes per month)."""
+        info = []
+        for partition in self._partitions(symbol, timeframe):
+            files = self._files(partition)
+            info.append({
+                "symbol": partition.parent.parent.name,
+                "timeframe": partition.parent.name,
+                "month": partition.name,
+                "files": len(files),
+                "rows": sum(pq.ParquetFile(path).metadata.num_rows for path in files),
+                "bytes": sum(path.stat().st_size for path in files),
+            })
+        return info
+
+    def delete(self, symbol: str, timeframe: Optional[str] = None) -> None:
+        """Remove a symbol's history (or one timeframe of it)."""
+        target = self.root / _symbol_dir(symbol)
+        if timeframe is not None:
+            target = target / timeframe
+        if target.exists():
+            shutil.rmtree(target)
+
+    # ------------------------------------------------------------------
+    # Layout helpers
+    # ------------------------------------------------------------------
+
+    def _series_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / _symbol_dir(symbol) / timeframe
+
+    def _partitions(
+        self,
+        symbol: Optional[str],
+        timeframe: Optional[str],
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+    ) -> List[Path]:
+        """Month directories, pruned to those overlapping [start, end]."""
+        symbol_dirs = [self.root / _symbol_dir(symbol)] if symbol else _subdirs(self.root)
+        first = _month(start_ms) if start_ms is not None else None
+        last = _month(end_ms) if end_ms is not None else None
+
+        partitions = []
+        for symbol_dir in symbol_dirs:
+            series_dirs = [symbol_dir / timeframe] if timeframe else _subdirs(symbol_dir)
+            for series_dir in series_dirs:
+                for partition in _subdirs(series_dir):
+                    if (first and partition.name < first) or (last and partition.name > last):
+                        continue
+                    partitions.append(partition)
+        return partitions
+
+    @staticmethod
+    def _part_files(partition: Path) -> List[Path]:
+        return sorted(partition.glob("part-*.parquet"))
+
+    def _files(self, partition: Path) -> List[Path]:
+        """Compacted file first, then parts in write order."""
+        compacted = partition / COMPACTED_FILE
+        return ([compacted] if compacted.exists() else []) + self._part_files(partition)
+
+
+class ParquetRecordStore:
+    """Month-partitioned dataset of timestamped records, laid out as
+    ``{root}/{YYYY-MM}/part-*.parquet`` (e.g. history spilled from memory)."""
+
+    def __init__(self, root: Union[str, Path], row_group_size: int = 10_000) -> None:
+        """Initialize the store.
+
+        Args:
+            root: Dataset root directory
+            row_group_size: Rows per Parquet row group (pruning granularity)
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for the Parquet record store")
+
+        self.root = Path(root)
+        self.row_group_size = row_group_size
+
+    def append(self, data: pd.DataFrame) -> int:
+        """Append records, one part file per touched month.
+
+        Args:
+            data: Frame with a ``timestamp`` column and any other columns
+
+        Returns:
+            Number of rows written
+        """
+        if data.empty:
+            return 0
+
+        timestamps = _to_ms(data["timestamp"])
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        data = data.iloc[order].drop(columns="timestamp").reset_index(drop=True)
+
+        months = timestamps.astype("datetime64[ms]").astype("datetime64[M]")
+        boundaries = np.flatnonzero(months[1:] != months[:-1]) + 1
+
+        for start, stop in zip(np.r_[0, boundaries], np.r_[boundaries, len(timestamps)]):
+            partition = self.root / str(months[start])
+            partition.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(data.iloc[start:stop], preserve_index=False)
+            stamps = pa.array(timestamps[start:stop], type=pa.int64()).cast(pa.timestamp("ms"))
+            pq.write_table(
+                table.add_column(0, "timestamp", stamps), partition / _part_name(),
+                row_group_size=self.row_group_size, write_statistics=True, compression="zstd",
+            )
+
+        logger.debug("💾 Appended %d records to %s", len(timestamps), self.root)
+        return len(timestamps)
+
+    __call__ = append
+
+    def read(
+        self,
+        start: TimeLike = None,
+        end: TimeLike = None,
+        symbol: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Load records in ``[start, end]``, optionally of one ``symbol``.
+
+        Args:
+            start: Inclusive start (datetime-like or epoch ms)
+            end: Inclusive end (datetime-like or epoch ms)
+            symbol: Only rows whose ``symbol`` column equals this
+            columns: Columns to load besides ``timestamp`` (default: all)
+
+        Returns:
+            Frame sorted by timestamp
+        """
+        start_ms, end_ms = _optional_ms(start), _optional_ms(end)
+        first = _month(start_ms) if start_ms is not None else None
+        last = _month(end_ms) if end_ms is not None else None
+        paths = [
+            path
+            for partition in _subdirs(self.root)
+            if not ((first and partition.name < first) or (last and partition.name > last))
+            for path in sorted(partition.glob("part-*.parquet"))
+        ]
+        if not paths:
+            return pd.DataFrame(columns=["timestamp"] + list(columns or []))
+
+        predicate = None
+        for condition in (
+            ds.field("timestamp") >= pa.scalar(start_ms, pa.timestamp("ms")) if start_ms is not None else None,
+            ds.field("timestamp") <= pa.scalar(end_ms, pa.timestamp("ms")) if end_ms is not None else None,
+            ds.field("symbol") == symbol if symbol is not None else None,
+        ):
+            if condition is not None:
+                predicate = condition if predicate is None else predicate & condition
+
+        projection = ["timestamp"] + [col for col in columns if col != "timestamp"] if columns else None
+        table = ds.dataset(paths, format="parquet").to_table(columns=projection, filter=predicate)
+        df = table.to_pandas()
+        df["timestamp"] = df["timestamp"].astype("datetime64[ns]")
+        return df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+
+
+def _symbol_dir(symbol: str) -> str:
+    return symbol.replace("/", "_")
+
+
+def _subdirs(path: Path) -> List[Path]:
+    if not path.is_dir():
+        return []
+    return sorted(child for child in path.iterdir() if child.is_dir())
+
+
+def _part_name() -> str:
+    # Nanosecond prefix keeps lexical order equal to write order
+    return f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+
+
+def _month(ms: int) -> str:
+    return str(np.datetime64(ms, "ms").astype("datetime64[M]"))
+
+
+def _to_ms(values: pd.Series) -> np.ndarray:
+    stamps = pd.DatetimeIndex(pd.to_datetime(values))
+    if stamps.tz is not None:
+        stamps = stamps.tz_convert(None)
+    return stamps.to_numpy().astype("datetime64[ms]").astype(np.int64)
+
+
+def _optional_ms(value: TimeLike) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(_to_ms(pd.Series([value]))[0])
+
+
+def _table(timestamps: np.ndarray, columns: Dict[str, np.ndarray]) -> "pa.Table":
+    arrays = [pa.array(timestamps, type=pa.int64()).cast(pa.timestamp("ms"))]
+    arrays += [pa.array(columns[col]) for col in OHLCV_COLUMNS[1:]]
+    return pa.Table.from_arrays(arrays, names=OHLCV_COLUMNS)
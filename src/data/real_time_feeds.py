@@ -11,6 +11,10 @@ from typing import Any, Callable, Dict, Optional
 import ccxt
 from typing_extensions import Protocol
 
+try:
+    from ..market_data.exchange_adapter import ExchangeAdapter
+except ImportError:  # imported as the top-level ``data`` package
+    from market_data.exchange_adapter import ExchangeAdapter
 from .exceptions import ExchangeConnectionError, RateLimitExceededError
 
 logger = logging.getLogger(__name__)
@@ -47,6 +51,7 @@ class WebSocketFeed:
 
         # Exchange connection
         self.exchange: Optional[ccxt.Exchange] = None
+        self.adapter: Optional[ExchangeAdapter] = None
         self._initialize_exchange()
 
         # Active subscriptions
@@ -69,6 +74,9 @@ class WebSocketFeed:
                     "secret": self.exchange_config.get("secret", ""),
                 }
             )
+            self.adapter = ExchangeAdapter(
+                self.exchange, timeout=self.config.get("request_timeout", 15.0)
+            )
 
             logger.info("Exchange %s initialized successfully", exchange_name)
         except Exception as e:
@@ -118,9 +126,7 @@ class WebSocketFeed:
             await asyncio.sleep(self.rate_limit_delay)
 
             # Fetch OHLCV data
-            ohlcv = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_ohlcv, symbol, timeframe, None, 2
-            )
+            ohlcv = await self.adapter.fetch_ohlcv(symbol, timeframe, None, 2)
 
             if not ohlcv or len(ohlcv) < 2:
                 return {}
@@ -166,9 +172,7 @@ class WebSocketFeed:
             await asyncio.sleep(self.rate_limit_delay)
 
             # Fetch orderbook data
-            orderbook = await asyncio.get_event_loop().run_in_executor(
-                None, self.exchange.fetch_order_book, symbol, limit
-            )
+            orderbook = await self.adapter.fetch_order_book(symbol, limit)
 
             return {
                 "bids": orderbook["bids"],
@@ -221,9 +225,7 @@ class WebSocketFeed:
         self.subscriptions.clear()
         if self.exchange:
             try:
-                await asyncio.get_event_loop().run_in_executor(
-                    None, self.exchange.close
-                )
+                await self.adapter.close()
             except Exception as e:
                 logger.warning("Error closing exchange connection: %s", e)
         logger.info("WebSocketFeed closed")
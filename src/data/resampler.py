@@ -0,0 +1,379 @@
+"""
+OHLCV Resampling Engine
+
+Derives higher-timeframe candles from a single base candle stream
+(e.g. 1m or 5m), so only one timeframe per symbol is fetched or stored.
+
+Key Features:
+- Vectorized aggregation: bucket boundaries are found once and each
+  column is reduced with ``np.ufunc.reduceat``
+- Buckets aligned like exchange candles (epoch-aligned, weeks open Monday)
+- Incremental updates: new base candles only touch the in-progress
+  higher-timeframe candle and append newly closed ones
+- Per symbol/timeframe result cache, invalidated only by new base data
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+_UNIT_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+# The epoch is a Thursday; weekly candles open on Monday
+_WEEK_OFFSET_MS = 4 * _UNIT_MS["d"]
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """Convert a timeframe string such as '5m', '4h' or '1w' to milliseconds."""
+    try:
+        return int(timeframe[:-1]) * _UNIT_MS[timeframe[-1].lower()]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported timeframe: {timeframe}") from None
+
+
+def _bucket_starts(timestamps_ms: np.ndarray, timeframe: str) -> np.ndarray:
+    """Open time of the higher-timeframe candle each base candle belongs to."""
+    interval = timeframe_to_ms(timeframe)
+    offset = _WEEK_OFFSET_MS if timeframe[-1].lower() == "w" else 0
+    return (timestamps_ms - offset) // interval * interval + offset
+
+
+def _aggregate(
+    timestamps_ms: np.ndarray, values: Dict[str, np.ndarray], timeframe: str
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Reduce time-sorted base candles into higher-timeframe candles.
+
+    Returns:
+        Bucket open times and aggregated OHLCV columns
+    """
+    buckets = _bucket_starts(timestamps_ms, timeframe)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+
+    aggregated = {
+        "open": values["open"][starts],
+        "high": np.maximum.reduceat(values["high"], starts),
+        "low": np.minimum.reduceat(values["low"], starts),
+        "close": values["close"][ends],
+        "volume": np.add.reduceat(values["volume"], starts),
+    }
+    return buckets[starts], aggregated
+
+
+def _to_ms(data: pd.DataFrame) -> Tuple[np.ndarray, bool]:
+    """Epoch-ms timestamps from a timestamp column or DatetimeIndex."""
+    if "timestamp" in data.columns:
+        stamps, indexed = data["timestamp"], False
+    else:
+        stamps, indexed = data.index, True
+    stamps = pd.DatetimeIndex(pd.to_datetime(stamps))
+    if stamps.tz is not None:
+        stamps = stamps.tz_convert(None)
+    return stamps.to_numpy().astype("datetime64[ms]").astype(np.int64), indexed
+
+
+def _frame(timestamps_ms: np.ndarray, columns: Dict[str, np.ndarray], indexed: bool) -> pd.DataFrame:
+    stamps = pd.to_datetime(timestamps_ms, unit="ms")
+    if indexed:
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(stamps, name="timestamp"))
+    return pd.DataFrame({"timestamp": stamps, **columns})
+
+
+def resample_ohlcv(
+    data: pd.DataFrame,
+    timeframe: str,
+    base_timeframe: Optional[str] = None,
+    include_partial: bool = True,
+) -> pd.DataFrame:
+    """Aggregate base OHLCV candles into ``timeframe`` candles.
+
+    Args:
+        data: Base candles with a ``timestamp`` column or DatetimeIndex
+        timeframe: Target timeframe (must be a multiple of the base)
+        base_timeframe: Base timeframe, needed to detect an unfinished
+            last candle when ``include_partial`` is False
+        include_partial: Keep the last candle even if it is still forming
+
+    Returns:
+        Higher-timeframe candles in the same layout as the input
+    """
+    if data.empty:
+        return data.iloc[0:0]
+
+    timestamps, indexed = _to_ms(data)
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order]
+    values = {col: data[col].to_numpy(dtype=np.float64)[order] for col in OHLCV_COLUMNS}
+
+    buckets, aggregated = _aggregate(timestamps, values, timeframe)
+
+    if not include_partial and base_timeframe is not None:
+        closes_at = timestamps[-1] + timeframe_to_ms(base_timeframe)
+        if closes_at < buckets[-1] + timeframe_to_ms(timeframe):
+            buckets = buckets[:-1]
+            aggregated = {col: values[:-1] for col, values in aggregated.items()}
+
+    return _frame(buckets, aggregated, indexed)
+
+
+@dataclass
+class _SeriesState:
+    """Closed candles plus the in-progress candle for one symbol/timeframe."""
+
+    closed_ts: List[np.ndarray] = field(default_factory=list)
+    closed: Dict[str, List[np.ndarray]] = field(
+        default_factory=lambda: {col: [] for col in OHLCV_COLUMNS}
+    )
+    partial_ts: Optional[int] = None
+    partial: Dict[str, float] = field(default_factory=dict)
+    frame: Optional[pd.DataFrame] = None
+
+
+class CandleResampler:
+    """Keeps one base candle stream per symbol and serves any higher timeframe."""
+
+    def __init__(self, base_timeframe: str = "1m", max_base_candles: int = 500_000):
+        """Initialize the resampler.
+
+        Args:
+            base_timeframe: Timeframe of the ingested candles
+            max_base_candles: Base candles retained per symbol
+        """
+        self.base_timeframe = base_timeframe
+        self.base_ms = timeframe_to_ms(base_timeframe)
+        self.max_base_candles = max_base_candles
+
+        self._base_ts: Dict[str, np.ndarray] = {}
+        self._base: Dict[str, Dict[str, np.ndarray]] = {}
+        self._series: Dict[Tuple[str, str], _SeriesState] = {}
+
+    def ingest(self, symbol: str, data: pd.DataFrame) -> int:
+        """Add base candles for a symbol.
+
+        Candles newer than the last one held are appended and folded into
+        every cached timeframe; a re-sent last candle (still forming on
+        the exchange) replaces the held one.
+
+        Returns:
+            Number of new base candles
+        """
+        if data.empty:
+            return 0
+
+        timestamps, _ = _to_ms(data)
+        order = np.argsort(timestamps, kind="stable")
+        timestamps = timestamps[order]
+        values = {col: data[col].to_numpy(dtype=np.float64)[order] for col in OHLCV_COLUMNS}
+
+        held = self._base_ts.get(symbol)
+        if held is None or not len(held):
+            self._set_base(symbol, *_dedupe(timestamps, values))
+            self._invalidate(symbol)
+            return len(self._base_ts[symbol])
+
+        last = held[-1]
+        if timestamps[-1] < last and np.isin(timestamps, held).all():
+            return 0
+        if (
+            timestamps[0] < held[0]
+            or timestamps[-1] < last
+            or (timestamps[0] < last and not np.isin(last, timestamps))
+        ):
+            # Backfill or revision of older candles: rebuild from scratch
+            merged_ts = np.concatenate([held, timestamps])
+            merged = {col: np.concatenate([self._base[symbol][col], values[col]]) for col in OHLCV_COLUMNS}
+            order = np.argsort(merged_ts, kind="stable")
+            merged_ts, merged = _dedupe(merged_ts[order], {c: v[order] for c, v in merged.items()})
+            self._set_base(symbol, merged_ts, merged)
+            self._invalidate(symbol)
+            return len(merged_ts) - len(held)
+
+        keep = timestamps >= last
+        timestamps, values = _dedupe(timestamps[keep], {c: v[keep] for c, v in values.items()})
+        if not len(timestamps):
+            return 0
+
+        revised_last = timestamps[0] == last
+        if revised_last:
+            held = held[:-1]
+            base = {col: self._base[symbol][col][:-1] for col in OHLCV_COLUMNS}
+        else:
+            base = self._base[symbol]
+        self._set_base(
+            symbol,
+            np.concatenate([held, timestamps]),
+            {col: np.concatenate([base[col], values[col]]) for col in OHLCV_COLUMNS},
+        )
+
+        for (series_symbol, timeframe), state in list(self._series.items()):
+            if series_symbol != symbol:
+                continue
+            self._fold(symbol, state, timeframe, timestamps, values, revised_last)
+
+        return len(timestamps) - int(revised_last)
+
+    def get(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: Optional[int] = None,
+        include_partial: bool = True,
+    ) -> pd.DataFrame:
+        """Candles for ``timeframe`` derived from the symbol's base stream.
+
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Target timeframe (a multiple of the base timeframe)
+            limit: Return only the most recent ``limit`` candles
+            include_partial: Include the candle that is still forming
+
+        Returns:
+            DataFrame with timestamp and OHLCV columns
+        """
+        if timeframe_to_ms(timeframe) % self.base_ms:
+            raise ValueError(f"{timeframe} is not a multiple of base timeframe {self.base_timeframe}")
+        if symbol not in self._base_ts:
+            return pd.DataFrame(columns=["timestamp"] + OHLCV_COLUMNS)
+
+        state = self._series.get((symbol, timeframe))
+        if state is None:
+            state = self._build(symbol, timeframe)
+            self._series[(symbol, timeframe)] = state
+
+        if state.frame is None:
+            state.frame = self._materialize(state)
+
+        frame = state.frame
+        if not include_partial and state.partial_ts is not None:
+            closes_at = self._base_ts[symbol][-1] + self.base_ms
+            if closes_at < state.partial_ts + timeframe_to_ms(timeframe):
+                frame = frame.iloc[:-1]
+        if limit is not None:
+            frame = frame.iloc[-limit:]
+        return frame.reset_index(drop=True)
+
+    def base_candles(self, symbol: str) -> int:
+        """Number of base candles held for a symbol."""
+        return len(self._base_ts.get(symbol, ()))
+
+    def last_base_timestamp(self, symbol: str) -> Optional[int]:
+        """Open time (ms) of the newest base candle held for a symbol."""
+        held = self._base_ts.get(symbol)
+        return int(held[-1]) if held is not None and len(held) else None
+
+    def base_candles_needed(self, timeframe: str, limit: int) -> int:
+        """Base candles required to produce ``limit`` candles of ``timeframe``."""
+        return limit * max(1, timeframe_to_ms(timeframe) // self.base_ms)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Drop base candles and cached timeframes (for one symbol or all)."""
+        symbols = [symbol] if symbol else list(self._base_ts)
+        for sym in symbols:
+            self._base_ts.pop(sym, None)
+            self._base.pop(sym, None)
+            self._invalidate(sym)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _set_base(self, symbol: str, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        if len(timestamps) > self.max_base_candles:
+            timestamps = timestamps[-self.max_base_candles:]
+            values = {col: v[-self.max_base_candles:] for col, v in values.items()}
+        self._base_ts[symbol] = timestamps
+        self._base[symbol] = values
+
+    def _invalidate(self, symbol: str, timeframe: Optional[str] = None) -> None:
+        for key in [k for k in self._series if k[0] == symbol and timeframe in (None, k[1])]:
+            del self._series[key]
+
+    def _build(self, symbol: str, timeframe: str) -> _SeriesState:
+        state = _SeriesState()
+        self._fold(symbol, state, timeframe, self._base_ts[symbol], self._base[symbol])
+        return state
+
+    def _fold(
+        self,
+        symbol: str,
+        state: _SeriesState,
+        timeframe: str,
+        timestamps: np.ndarray,
+        values: Dict[str, np.ndarray],
+        revised_last: bool = False,
+    ) -> None:
+        """Merge new base candles into the in-progress candle and close finished ones."""
+        if revised_last:
+            # The held last candle changed: rebuild the in-progress candle
+            # from the base stream instead of merging into it
+            held_ts = self._base_ts[symbol]
+            start = np.searchsorted(held_ts, state.partial_ts)
+            timestamps = held_ts[start:]
+            values = {col: self._base[symbol][col][start:] for col in OHLCV_COLUMNS}
+            state.partial_ts = None
+
+        buckets, aggregated = _aggregate(timestamps, values, timeframe)
+
+        if state.partial_ts is not None:
+            if buckets[0] == state.partial_ts:
+                partial = state.partial
+                aggregated["open"][0] = partial["open"]
+                aggregated["high"][0] = max(partial["high"], aggregated["high"][0])
+                aggregated["low"][0] = min(partial["low"], aggregated["low"][0])
+                aggregated["volume"][0] += partial["volume"]
+            else:
+                self._close(
+                    state,
+                    np.array([state.partial_ts]),
+                    {col: np.array([value]) for col, value in state.partial.items()},
+                )
+
+        self._close(state, buckets[:-1], {col: v[:-1] for col, v in aggregated.items()})
+        state.partial_ts = int(buckets[-1])
+        state.partial = {col: float(v[-1]) for col, v in aggregated.items()}
+        state.frame = None
+
+    @staticmethod
+    def _close(state: _SeriesState, timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> None:
+        if not len(timestamps):
+            return
+        state.closed_ts.append(timestamps)
+        for col in OHLCV_COLUMNS:
+            state.closed[col].append(values[col])
+
+    @staticmethod
+    def _materialize(state: _SeriesState) -> pd.DataFrame:
+        # Collapse the closed chunks so later reads concatenate once
+        if len(state.closed_ts) > 1:
+            state.closed_ts = [np.concatenate(state.closed_ts)]
+            state.closed = {col: [np.concatenate(chunks)] for col, chunks in state.closed.items()}
+
+        timestamps = list(state.closed_ts)
+        columns = {col: list(chunks) for col, chunks in state.closed.items()}
+        if state.partial_ts is not None:
+            timestamps.append(np.array([state.partial_ts]))
+            for col in OHLCV_COLUMNS:
+                columns[col].append(np.array([state.partial[col]]))
+
+        if not timestamps:
+            return pd.DataFrame(columns=["timestamp"] + OHLCV_COLUMNS)
+        return _frame(
+            np.concatenate(timestamps),
+            {col: np.concatenate(chunks) for col, chunks in columns.items()},
+            indexed=False,
+        )
+
+
+def _dedupe(timestamps: np.ndarray, values: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Drop repeated timestamps from sorted input, keeping the last occurrence."""
+    keep = np.r_[timestamps[1:] != timestamps[:-1], True]
+    if keep.all():
+        return timestamps, values
+    return timestamps[keep], {col: v[keep] for col, v in values.items()}
@@ -11,6 +11,11 @@ from typing import Any, Dict, Optional, Union
 
 import pandas as pd
 
+try:
+    from src.database.data_warehouse import ohlcv_rows, upsert_ohlcv
+except ImportError:  # imported with src/ on the path
+    from database.data_warehouse import ohlcv_rows, upsert_ohlcv
+
 logger = logging.getLogger(__name__)
 
 
@@ -174,29 +179,22 @@ class DataWarehouse:
 
         Args:
             df: DataFrame with OHLCV data including symbol and timeframe columns
+                (timestamps in a ``timestamp`` column or the index)
         """
         if df.empty:
             logger.warning("Attempted to store empty OHLCV DataFrame")
             return
 
         try:
-            conn = sqlite3.connect(self.db_path)
-
-            # Convert datetime index to milliseconds for storage
-            df_to_store = df.reset_index()
-            if "timestamp" in df_to_store.columns:
-                df_to_store["timestamp"] = pd.to_datetime(df_to_store["timestamp"])
-                df_to_store["timestamp"] = (
-                    df_to_store["timestamp"].astype("int64") // 10**6
-                )
-
-            # Insert data into database
-            df_to_store.to_sql(
-                "ohlcv_data", conn, if_exists="append", index=False, method="multi"
-            )
+            # Duplicate keys keep the last row; stored candles are overwritten
+            rows = ohlcv_rows(df, extra_columns=("trades", "vwap"))
 
-            conn.commit()
-            conn.close()
+            conn = sqlite3.connect(self.db_path)
+            try:
+                with conn:
+                    upsert_ohlcv(conn, rows, extra_columns=("trades", "vwap"))
+            finally:
+                conn.close()
 
             logger.info("Stored %d OHLCV data points in warehouse", len(df))
 
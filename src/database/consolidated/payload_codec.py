@@ -0,0 +1,95 @@
+"""
+Compact Payload Codec
+Binary encoding for the nested analysis data stored with trade decisions
+
+Payloads are serialized with msgpack when installed (JSON otherwise) and
+compressed with zstd when installed (zlib otherwise). A two-byte header
+records the serializer and compressor, so a blob written on one host can
+be read on any other that has the same libraries.
+"""
+
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+SERIALIZER_MSGPACK = b"M"
+SERIALIZER_JSON = b"J"
+COMPRESSOR_ZSTD = b"Z"
+COMPRESSOR_ZLIB = b"z"
+COMPRESSOR_NONE = b"-"
+
+# Payloads smaller than this are stored uncompressed
+MIN_COMPRESS_BYTES = 64
+
+
+def _default(value: Any) -> Any:
+    """Encode values the serializers do not know (numpy scalars, datetimes, sets)"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "tolist"):  # numpy scalars and arrays
+        return value.tolist()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+
+def encode_payload(payload: Dict[str, Any], level: int = 3) -> bytes:
+    """Serialize and compress a payload dict"""
+    if MSGPACK_AVAILABLE:
+        serializer = SERIALIZER_MSGPACK
+        body = msgpack.packb(payload, default=_default, use_bin_type=True)
+    else:
+        serializer = SERIALIZER_JSON
+        body = json.dumps(payload, default=_default, separators=(",", ":")).encode()
+
+    if len(body) < MIN_COMPRESS_BYTES:
+        compressor = COMPRESSOR_NONE
+    elif ZSTD_AVAILABLE:
+        compressor = COMPRESSOR_ZSTD
+        body = zstandard.ZstdCompressor(level=level).compress(body)
+    else:
+        compressor = COMPRESSOR_ZLIB
+        body = zlib.compress(body, level)
+    return serializer + compressor + body
+
+
+def decode_payload(blob: bytes) -> Dict[str, Any]:
+    """Decompress and deserialize a blob written by ``encode_payload``"""
+    if not blob:
+        return {}
+    blob = bytes(blob)
+    serializer, compressor, body = blob[:1], blob[1:2], blob[2:]
+
+    if compressor == COMPRESSOR_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is required to read this trade decision payload")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif compressor == COMPRESSOR_ZLIB:
+        body = zlib.decompress(body)
+    elif compressor != COMPRESSOR_NONE:
+        raise ValueError(f"Unknown payload compressor {compressor!r}")
+
+    if serializer == SERIALIZER_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is required to read this trade decision payload")
+        return msgpack.unpackb(body, raw=False)
+    if serializer == SERIALIZER_JSON:
+        return json.loads(body)
+    raise ValueError(f"Unknown payload serializer {serializer!r}")
@@ -3,6 +3,7 @@ Trade Decision Capturer
 Captures comprehensive decision data when trades are generated
 """
 
+import logging
 import os
 import sys
 from datetime import datetime
@@ -15,6 +16,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.trade_logic_schema import TradeLogicDBManager
 
+try:
+    from src.monitoring.async_logging import HotPathLogger
+    from src.monitoring.tracing import traced
+except ImportError:  # imported with src/ on the path
+    from monitoring.async_logging import HotPathLogger
+    from monitoring.tracing import traced
+
+logger = logging.getLogger(__name__)
+# Every signal is captured; per-capture lines are sampled outside debug mode
+hot_log = HotPathLogger(__name__, interval=60.0)
+
 
 class TradeDecisionCapturer:
     """
@@ -25,12 +37,13 @@ class TradeDecisionCapturer:
         self.db_manager = TradeLogicDBManager(db_path)
         self.signal_weights = {"technical": 0.40, "onchain": 0.35, "sentiment": 0.25}
 
+    @traced('decision.capture')
     def capture_decision(self, strategy_instance, dataframe, metadata):
         """
         Capture complete decision context when trade signal is generated
         """
         try:
-            print(f"📊 Capturing decision data for {metadata['pair']}")
+            hot_log.debug("📊 Capturing decision data for %s", metadata["pair"])
 
             decision_data = {
                 "timestamp": datetime.now(),
@@ -82,17 +95,14 @@ class TradeDecisionCapturer:
             decision_id = self.db_manager.store_decision(decision_data)
 
             if decision_id:
-                print(f"✅ Captured decision {decision_id} for {metadata['pair']}")
+                hot_log.info("✅ Captured decision %s for %s", decision_id, metadata["pair"])
                 return decision_id
             else:
-                print(f"❌ Failed to capture decision for {metadata['pair']}")
+                logger.warning("❌ Failed to capture decision for %s", metadata["pair"])
                 return None
 
         except Exception as e:
-            print(f"❌ Error capturing decision: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("❌ Error capturing decision: %s", e)
             return None
 
     def _get_latest_value(self, dataframe, column, default=None):
@@ -179,7 +189,7 @@ class TradeDecisionCapturer:
             return signals
 
         except Exception as e:
-            print(f"⚠️ Error capturing technical signals: {e}")
+            logger.warning("⚠️ Error capturing technical signals: %s", e)
             return {}
 
     def _capture_onchain_signals(self, dataframe):
@@ -244,7 +254,7 @@ class TradeDecisionCapturer:
             return signals
 
         except Exception as e:
-            print(f"⚠️ Error capturing on-chain signals: {e}")
+            logger.warning("⚠️ Error capturing on-chain signals: %s", e)
             return {}
 
     def _capture_sentiment_signals(self, dataframe):
@@ -311,7 +321,7 @@ class TradeDecisionCapturer:
             return signals
 
         except Exception as e:
-            print(f"⚠️ Error capturing sentiment signals: {e}")
+            logger.warning("⚠️ Error capturing sentiment signals: %s", e)
             return {}
 
     def _generate_technical_reasoning(self, dataframe):
@@ -380,7 +390,7 @@ class TradeDecisionCapturer:
             return reasoning
 
         except Exception as e:
-            print(f"⚠️ Error generating technical reasoning: {e}")
+            logger.warning("⚠️ Error generating technical reasoning: %s", e)
             return ["Technical analysis reasoning unavailable"]
 
     def _generate_onchain_reasoning(self, dataframe):
@@ -415,7 +425,7 @@ class TradeDecisionCapturer:
             )
 
         except Exception as e:
-            print(f"⚠️ Error generating on-chain reasoning: {e}")
+            logger.warning("⚠️ Error generating on-chain reasoning: %s", e)
             return ["On-chain analysis reasoning unavailable"]
 
     def _generate_sentiment_reasoning(self, dataframe):
@@ -450,7 +460,7 @@ class TradeDecisionCapturer:
             )
 
         except Exception as e:
-            print(f"⚠️ Error generating sentiment reasoning: {e}")
+            logger.warning("⚠️ Error generating sentiment reasoning: %s", e)
             return ["Sentiment analysis reasoning unavailable"]
 
     def _build_decision_tree(self, dataframe):
@@ -522,7 +532,7 @@ class TradeDecisionCapturer:
             return tree
 
         except Exception as e:
-            print(f"⚠️ Error building decision tree: {e}")
+            logger.warning("⚠️ Error building decision tree: %s", e)
             return {}
 
     def _analyze_thresholds(self, dataframe):
@@ -561,7 +571,7 @@ class TradeDecisionCapturer:
             return analysis
 
         except Exception as e:
-            print(f"⚠️ Error analyzing thresholds: {e}")
+            logger.warning("⚠️ Error analyzing thresholds: %s", e)
             return {}
 
     def _calculate_position_size(self, dataframe):
@@ -583,7 +593,7 @@ class TradeDecisionCapturer:
             return round(position_size, 4)
 
         except Exception as e:
-            print(f"⚠️ Error calculating position size: {e}")
+            logger.warning("⚠️ Error calculating position size: %s", e)
             return 0.05  # Default 5% position
 
     def _assess_risk(self, dataframe):
@@ -610,7 +620,7 @@ class TradeDecisionCapturer:
             return risk_assessment
 
         except Exception as e:
-            print(f"⚠️ Error assessing risk: {e}")
+            logger.warning("⚠️ Error assessing risk: %s", e)
             return {"risk_level": "unknown"}
 
     def _capture_market_context(self, dataframe):
@@ -623,7 +633,7 @@ class TradeDecisionCapturer:
                 "support_resistance": self._find_support_resistance(dataframe),
             }
         except Exception as e:
-            print(f"⚠️ Error capturing market context: {e}")
+            logger.warning("⚠️ Error capturing market context: %s", e)
             return {}
 
     def _capture_volatility(self, dataframe):
@@ -645,7 +655,7 @@ class TradeDecisionCapturer:
                 }
             return {}
         except Exception as e:
-            print(f"⚠️ Error capturing volatility: {e}")
+            logger.warning("⚠️ Error capturing volatility: %s", e)
             return {}
 
     def _capture_correlations(self, dataframe):
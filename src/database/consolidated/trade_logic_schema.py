@@ -1,21 +1,74 @@
 """
 Trade Logic Database Schema
 Creates tables for storing comprehensive trade decision data
+
+Scores, regime and outcome live in typed columns; the nested signals,
+reasoning, decision logic and market context of a decision are stored as one
+compressed binary payload (see payload_codec) that reads only decode when a
+payload field is requested.
 """
 
 import json
+import logging
 import os
 import sqlite3
 from datetime import datetime
 
+try:
+    from .payload_codec import decode_payload, encode_payload
+except ImportError:  # run as a script
+    from payload_codec import decode_payload, encode_payload
+
+logger = logging.getLogger(__name__)
+
+# Fields kept in typed columns (filterable, sortable, cheap to read)
+COLUMN_FIELDS = [
+    "id",
+    "timestamp",
+    "pair",
+    "timeframe",
+    "technical_score",
+    "onchain_score",
+    "sentiment_score",
+    "market_regime",
+    "regime_confidence",
+    "composite_score",
+    "final_decision",
+    "position_size",
+    "trade_id",
+    "outcome_profit_loss",
+    "outcome_duration",
+    "outcome_success",
+]
+
+# Fields stored in the compressed payload, with their empty value
+PAYLOAD_FIELDS = {
+    "technical_signals": dict,
+    "technical_reasoning": list,
+    "onchain_signals": dict,
+    "onchain_reasoning": list,
+    "sentiment_signals": dict,
+    "sentiment_reasoning": list,
+    "risk_assessment": dict,
+    "decision_tree": dict,
+    "threshold_analysis": dict,
+    "signal_weights": dict,
+    "market_conditions": dict,
+    "volatility_metrics": dict,
+    "correlation_data": dict,
+}
+
+SCHEMA_VERSION = 2
+
 
 class TradeLogicDBManager:
     """
     Manages the trade logic database schema and operations
     """
 
-    def __init__(self, db_path="trade_logic.db"):
+    def __init__(self, db_path="trade_logic.db", vacuum_after_migration=True):
         self.db_path = db_path
+        self.vacuum_after_migration = vacuum_after_migration
         self.init_database()
 
     def init_database(self):
@@ -23,60 +76,11 @@ class TradeLogicDBManager:
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
+        # Convert databases written with the JSON text layout in place
+        migrated = self.migrate_legacy_decisions(conn)
+
         # Create trade_decisions table
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS trade_decisions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME NOT NULL,
-                pair TEXT NOT NULL,
-                timeframe TEXT NOT NULL,
-                
-                -- Technical Analysis
-                technical_score REAL,
-                technical_signals TEXT, -- JSON
-                technical_reasoning TEXT, -- JSON array
-                
-                -- On-Chain Analysis
-                onchain_score REAL,
-                onchain_signals TEXT, -- JSON
-                onchain_reasoning TEXT, -- JSON array
-                
-                -- Sentiment Analysis
-                sentiment_score REAL,
-                sentiment_signals TEXT, -- JSON
-                sentiment_reasoning TEXT, -- JSON array
-                
-                -- Market Regime
-                market_regime TEXT,
-                regime_confidence REAL,
-                
-                -- Final Decision
-                composite_score REAL,
-                final_decision INTEGER, -- 0 or 1
-                position_size REAL,
-                risk_assessment TEXT, -- JSON
-                
-                -- Decision Logic
-                decision_tree TEXT, -- JSON
-                threshold_analysis TEXT, -- JSON
-                signal_weights TEXT, -- JSON
-                
-                -- Market Context
-                market_conditions TEXT, -- JSON
-                volatility_metrics TEXT, -- JSON
-                correlation_data TEXT, -- JSON
-                
-                -- Outcome (filled after trade completion)
-                trade_id INTEGER,
-                outcome_profit_loss REAL,
-                outcome_duration INTEGER, -- minutes
-                outcome_success BOOLEAN,
-                
-                FOREIGN KEY (trade_id) REFERENCES trades (id)
-            )
-        """
-        )
+        self._create_decisions_table(cursor, "trade_decisions")
 
         # Create signal_performance table
         cursor.execute(
@@ -146,10 +150,106 @@ class TradeLogicDBManager:
             "CREATE INDEX IF NOT EXISTS idx_signal_performance_type ON signal_performance(signal_type)"
         )
 
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_trade_decisions_pair_timestamp ON trade_decisions(pair, timestamp)"
+        )
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
         conn.commit()
+
+        if migrated and self.vacuum_after_migration:
+            # Hand the space of the old text columns back to the filesystem
+            conn.execute("VACUUM")
         conn.close()
 
-        print("✅ Trade logic database schema created successfully")
+        if migrated:
+            logger.info("✅ Migrated %d trade decisions to compact storage", migrated)
+        logger.info("✅ Trade logic database schema created successfully")
+
+    @staticmethod
+    def _create_decisions_table(cursor, table_name):
+        """Create the trade_decisions table (or a staging copy) if missing"""
+        cursor.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp DATETIME NOT NULL,
+                pair TEXT NOT NULL,
+                timeframe TEXT NOT NULL,
+                
+                -- Scores
+                technical_score REAL,
+                onchain_score REAL,
+                sentiment_score REAL,
+                
+                -- Market Regime
+                market_regime TEXT,
+                regime_confidence REAL,
+                
+                -- Final Decision
+                composite_score REAL,
+                final_decision INTEGER, -- 0 or 1
+                position_size REAL,
+                
+                -- Signals, reasoning, decision logic and market context
+                payload BLOB, -- compressed, see payload_codec
+                
+                -- Outcome (filled after trade completion)
+                trade_id INTEGER,
+                outcome_profit_loss REAL,
+                outcome_duration INTEGER, -- minutes
+                outcome_success BOOLEAN,
+                
+                FOREIGN KEY (trade_id) REFERENCES trades (id)
+            )
+        """
+        )
+
+    def migrate_legacy_decisions(self, conn, batch_size=1000):
+        """
+        Rewrite a trade_decisions table in the JSON text layout to the compact one
+
+        Decision ids are preserved (signal_performance refers to them). Columns
+        without a typed counterpart go into the payload, JSON text parsed.
+        Returns the number of migrated rows (0 when nothing needed migrating).
+        """
+        cursor = conn.cursor()
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(trade_decisions)")]
+        if not columns or "payload" in columns:
+            return 0
+
+        typed = [col for col in COLUMN_FIELDS if col in columns]
+        extra = [col for col in columns if col not in COLUMN_FIELDS]
+        cursor.execute("DROP TABLE IF EXISTS trade_decisions_compact")
+        self._create_decisions_table(cursor, "trade_decisions_compact")
+        insert = f"""
+            INSERT INTO trade_decisions_compact ({', '.join(typed)}, payload)
+            VALUES ({', '.join('?' * (len(typed) + 1))})
+        """
+
+        reader = conn.cursor()
+        reader.execute(f"SELECT {', '.join(columns)} FROM trade_decisions ORDER BY id")
+        migrated = 0
+        while True:
+            rows = reader.fetchmany(batch_size)
+            if not rows:
+                break
+            batch = []
+            for row in rows:
+                record = dict(zip(columns, row))
+                payload = {
+                    col: _parse_legacy_value(col, record[col])
+                    for col in extra
+                    if record[col] is not None
+                }
+                batch.append(tuple(record[col] for col in typed) + (encode_payload(payload),))
+            cursor.executemany(insert, batch)
+            migrated += len(batch)
+
+        cursor.execute("DROP TABLE trade_decisions")
+        cursor.execute("ALTER TABLE trade_decisions_compact RENAME TO trade_decisions")
+        conn.commit()
+        return migrated
 
     def store_decision(self, decision_data):
         """Store a complete trade decision with all analysis data"""
@@ -157,44 +257,33 @@ class TradeLogicDBManager:
         cursor = conn.cursor()
 
         try:
+            payload = {
+                field: decision_data.get(field, empty())
+                for field, empty in PAYLOAD_FIELDS.items()
+            }
             cursor.execute(
                 """
                 INSERT INTO trade_decisions (
                     timestamp, pair, timeframe,
-                    technical_score, technical_signals, technical_reasoning,
-                    onchain_score, onchain_signals, onchain_reasoning,
-                    sentiment_score, sentiment_signals, sentiment_reasoning,
+                    technical_score, onchain_score, sentiment_score,
                     market_regime, regime_confidence,
-                    composite_score, final_decision, position_size, risk_assessment,
-                    decision_tree, threshold_analysis, signal_weights,
-                    market_conditions, volatility_metrics, correlation_data
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    composite_score, final_decision, position_size,
+                    payload
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
                 (
                     decision_data["timestamp"],
                     decision_data["pair"],
                     decision_data["timeframe"],
                     decision_data.get("technical_score"),
-                    json.dumps(decision_data.get("technical_signals", {})),
-                    json.dumps(decision_data.get("technical_reasoning", [])),
                     decision_data.get("onchain_score"),
-                    json.dumps(decision_data.get("onchain_signals", {})),
-                    json.dumps(decision_data.get("onchain_reasoning", [])),
                     decision_data.get("sentiment_score"),
-                    json.dumps(decision_data.get("sentiment_signals", {})),
-                    json.dumps(decision_data.get("sentiment_reasoning", [])),
                     decision_data.get("market_regime"),
                     decision_data.get("regime_confidence"),
                     decision_data.get("composite_score"),
                     decision_data.get("final_decision"),
                     decision_data.get("position_size"),
-                    json.dumps(decision_data.get("risk_assessment", {})),
-                    json.dumps(decision_data.get("decision_tree", {})),
-                    json.dumps(decision_data.get("threshold_analysis", {})),
-                    json.dumps(decision_data.get("signal_weights", {})),
-                    json.dumps(decision_data.get("market_conditions", {})),
-                    json.dumps(decision_data.get("volatility_metrics", {})),
-                    json.dumps(decision_data.get("correlation_data", {})),
+                    encode_payload(payload),
                 ),
             )
 
@@ -223,68 +312,32 @@ class TradeLogicDBManager:
                         )
 
             conn.commit()
-            print(f"✅ Stored trade decision {decision_id} for {decision_data['pair']}")
+            logger.debug("✅ Stored trade decision %s for %s", decision_id, decision_data["pair"])
             return decision_id
 
         except Exception as e:
             conn.rollback()
-            print(f"❌ Error storing decision: {e}")
+            logger.error("❌ Error storing decision: %s", e)
             return None
         finally:
             conn.close()
 
-    def get_decision(self, decision_id):
-        """Retrieve a specific trade decision by ID"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM trade_decisions WHERE id = ?", (decision_id,))
-        row = cursor.fetchone()
-
-        if row:
-            columns = [description[0] for description in cursor.description]
-            decision = dict(zip(columns, row))
-
-            # Parse JSON fields
-            json_fields = [
-                "technical_signals",
-                "technical_reasoning",
-                "onchain_signals",
-                "onchain_reasoning",
-                "sentiment_signals",
-                "sentiment_reasoning",
-                "risk_assessment",
-                "decision_tree",
-                "threshold_analysis",
-                "signal_weights",
-                "market_conditions",
-                "volatility_metrics",
-                "correlation_data",
-            ]
-
-            for field in json_fields:
-                if decision[field]:
-                    try:
-                        decision[field] = json.loads(decision[field])
-                    except json.JSONDecodeError:
-                        decision[field] = {}
-
-            conn.close()
-            return decision
-
-        conn.close()
-        return None
+    def get_decision(self, decision_id, fields=None):
+        """
+        Retrieve a specific trade decision by ID
 
-    def get_decisions(self, filters=None, limit=100):
-        """Get trade decisions with optional filters"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        ``fields`` limits the returned fields (all by default); the payload is
+        only read and decoded when one of the requested fields is in it.
+        """
+        decisions = self._select("WHERE id = ?", [decision_id], fields)
+        return decisions[0] if decisions else None
 
-        query = "SELECT * FROM trade_decisions"
+    def get_decisions(self, filters=None, limit=100, fields=None):
+        """Get trade decisions with optional filters and field projection"""
+        conditions = []
         params = []
 
         if filters:
-            conditions = []
             if "pair" in filters:
                 conditions.append("pair = ?")
                 params.append(filters["pair"])
@@ -298,75 +351,59 @@ class TradeLogicDBManager:
                 conditions.append("composite_score >= ?")
                 params.append(filters["min_score"])
 
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-
-        query += " ORDER BY timestamp DESC LIMIT ?"
+        clause = "WHERE " + " AND ".join(conditions) if conditions else ""
         params.append(limit)
+        return self._select(f"{clause} ORDER BY timestamp DESC LIMIT ?", params, fields)
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-
-        decisions = []
-        if rows:
-            columns = [description[0] for description in cursor.description]
-            for row in rows:
-                decision = dict(zip(columns, row))
-                decisions.append(decision)
-
-        conn.close()
-        return decisions
-
-    def get_decision_by_trade_id(self, trade_id):
+    def get_decision_by_trade_id(self, trade_id, fields=None):
         """Retrieve a trade decision by trade ID"""
         if not trade_id:
             return None
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         try:
-            cursor.execute(
-                "SELECT * FROM trade_decisions WHERE trade_id = ?", (trade_id,)
-            )
-            row = cursor.fetchone()
-
-            if row:
-                columns = [description[0] for description in cursor.description]
-                decision = dict(zip(columns, row))
-
-                # Parse JSON fields
-                json_fields = [
-                    "technical_signals",
-                    "technical_reasoning",
-                    "onchain_signals",
-                    "onchain_reasoning",
-                    "sentiment_signals",
-                    "sentiment_reasoning",
-                    "decision_tree",
-                    "threshold_analysis",
-                    "signal_weights",
-                    "market_conditions",
-                    "volatility_metrics",
-                    "correlation_data",
-                    "risk_assessment",
-                ]
-
-                for field in json_fields:
-                    if decision.get(field):
-                        try:
-                            decision[field] = json.loads(decision[field])
-                        except (json.JSONDecodeError, TypeError):
-                            decision[field] = {}
-
-                return decision
-
+            decisions = self._select("WHERE trade_id = ?", [trade_id], fields)
+            return decisions[0] if decisions else None
         except Exception as e:
-            print(f"❌ Error retrieving decision by trade ID {trade_id}: {e}")
+            logger.error("❌ Error retrieving decision by trade ID %s: %s", trade_id, e)
+
+        return None
+
+    def _select(self, clause, params, fields=None):
+        """Read decisions, decoding the payload only for requested payload fields"""
+        if fields is None:
+            columns, payload_fields = COLUMN_FIELDS, list(PAYLOAD_FIELDS)
+        else:
+            unknown = [f for f in fields if f not in COLUMN_FIELDS and f not in PAYLOAD_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown trade decision fields: {', '.join(unknown)}")
+            columns = ["id"] + [f for f in fields if f in COLUMN_FIELDS and f != "id"]
+            payload_fields = [f for f in fields if f in PAYLOAD_FIELDS]
+
+        select = columns + ["payload"] if payload_fields else columns
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                f"SELECT {', '.join(select)} FROM trade_decisions {clause}", params
+            ).fetchall()
         finally:
             conn.close()
 
-        return None
+        decisions = []
+        for row in rows:
+            decision = dict(zip(columns, row))
+            if payload_fields:
+                try:
+                    payload = decode_payload(row[-1])
+                except Exception as e:
+                    logger.error("❌ Error decoding payload of decision %s: %s", decision["id"], e)
+                    payload = {}
+                for field in payload_fields:
+                    decision[field] = payload.pop(field, PAYLOAD_FIELDS[field]())
+                if fields is None:
+                    # Columns carried over from older layouts
+                    decision.update(payload)
+            decisions.append(decision)
+        return decisions
 
     def update_trade_outcome(
         self, decision_id, trade_id, profit_loss, duration, success
@@ -387,7 +424,18 @@ class TradeLogicDBManager:
         conn.commit()
         conn.close()
 
-        print(f"✅ Updated decision {decision_id} with trade outcome")
+        logger.debug("✅ Updated decision %s with trade outcome", decision_id)
+
+
+def _parse_legacy_value(column, value):
+    """Parse a JSON text column of the old layout"""
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        # Known payload fields fall back to empty, other columns keep their text
+        return PAYLOAD_FIELDS[column]() if column in PAYLOAD_FIELDS else value
 
 
 if __name__ == "__main__":
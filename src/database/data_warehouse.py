@@ -1,48 +1,240 @@
 """
 Data Warehouse Module
 Simple implementation to fix import errors
+
+OHLCV candles are ingested column-wise: timestamps and prices go from
+NumPy arrays straight into chunked executemany upserts keyed on
+(symbol, timeframe, timestamp), all in a single transaction.
 """
 
 import sqlite3
-from typing import Dict, Any, List, Optional
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence, Union
 import logging
 
+import numpy as np
+import pandas as pd
+
+try:
+    from src.monitoring.metrics import DB_WRITE_SECONDS
+except ImportError:  # imported with src/ on the path
+    from monitoring.metrics import DB_WRITE_SECONDS
+
 logger = logging.getLogger(__name__)
 
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
 class DataWarehouse:
     """Simple data warehouse implementation"""
-    
-    def __init__(self, db_path: str = "data_warehouse.db"):
+
+    def __init__(self, db_path: str = "data_warehouse.db", chunk_size: int = 5000):
         """Initialize data warehouse"""
         self.db_path = db_path
+        self.chunk_size = chunk_size
         self.conn = None
+        self.last_ingest: Dict[str, Any] = {}
         self._initialize_database()
-    
+
     def _initialize_database(self):
         """Initialize the database"""
         try:
             self.conn = sqlite3.connect(self.db_path)
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ohlcv_data (
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    open REAL NOT NULL,
+                    high REAL NOT NULL,
+                    low REAL NOT NULL,
+                    close REAL NOT NULL,
+                    volume REAL NOT NULL,
+                    PRIMARY KEY (symbol, timeframe, timestamp)
+                ) WITHOUT ROWID
+                """
+            )
+            self.conn.commit()
             logger.info("✅ Data warehouse database initialized")
         except Exception as e:
             logger.error(f"❌ Failed to initialize data warehouse: {e}")
-    
+
+    def store_ohlcv_data(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Upsert OHLCV candles from a DataFrame.
+
+        The timestamp comes from a ``timestamp`` column or the DatetimeIndex.
+        Duplicate timestamps within ``df`` keep the last row; rows already
+        stored for the same key are overwritten.
+
+        Returns:
+            Ingest stats: rows written, seconds and rows per second
+        """
+        if df is None or df.empty:
+            raise ValueError("Cannot store empty DataFrame")
+
+        start = time.perf_counter()
+        rows = ohlcv_rows(df, symbol, timeframe)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                upsert_ohlcv(conn, rows, chunk_size or self.chunk_size)
+        finally:
+            conn.close()
+
+        seconds = time.perf_counter() - start
+        DB_WRITE_SECONDS.labels("sqlite", "ohlcv_data").observe(seconds)
+        self.last_ingest = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "rows": len(rows),
+            "duplicates": len(df) - len(rows),
+            "seconds": seconds,
+            "rows_per_second": len(rows) / seconds if seconds > 0 else float("inf"),
+        }
+        logger.debug(
+            f"Stored {len(rows)} {symbol} {timeframe} candles "
+            f"({self.last_ingest['rows_per_second']:,.0f} rows/s)"
+        )
+        return self.last_ingest
+
+    def get_ohlcv_data(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: Optional[int] = None,
+        start_date: Optional[Union[str, datetime]] = None,
+        end_date: Optional[Union[str, datetime]] = None,
+    ) -> pd.DataFrame:
+        """Retrieve OHLCV candles with a ``timestamp`` column.
+
+        With ``limit`` the most recent candles are returned, newest first;
+        otherwise candles are in ascending time order.
+        """
+        query = (
+            "SELECT timestamp, open, high, low, close, volume FROM ohlcv_data "
+            "WHERE symbol = ? AND timeframe = ?"
+        )
+        params: List[Any] = [symbol, timeframe]
+        if start_date is not None:
+            query += " AND timestamp >= ?"
+            params.append(int(_to_epoch_ms([start_date])[0]))
+        if end_date is not None:
+            query += " AND timestamp <= ?"
+            params.append(int(_to_epoch_ms([end_date])[0]))
+        if limit:
+            query += " ORDER BY timestamp DESC LIMIT ?"
+            params.append(int(limit))
+        else:
+            query += " ORDER BY timestamp ASC"
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(query, params).fetchall()
+        finally:
+            conn.close()
+
+        df = pd.DataFrame(rows, columns=["timestamp"] + OHLCV_COLUMNS)
+        df["timestamp"] = pd.to_datetime(df["timestamp"].astype(np.int64), unit="ms")
+        return df
+
     def store_market_data(self, symbol: str, data: Dict[str, Any]):
         """Store market data"""
         pass
-    
+
     def get_market_data(self, symbol: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Retrieve market data"""
         return []
-    
+
     def store_trading_signal(self, signal: Dict[str, Any]):
         """Store trading signal"""
         pass
-    
+
     def get_trading_signals(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
         """Retrieve trading signals"""
         return []
-    
+
     def close(self):
         """Close database connection"""
         if self.conn:
-            self.conn.close()
\ No newline at end of file
+            self.conn.close()
+
+
+def ohlcv_rows(
+    df: pd.DataFrame,
+    symbol: Optional[str] = None,
+    timeframe: Optional[str] = None,
+    extra_columns: Sequence[str] = (),
+) -> List[tuple]:
+    """Build upsert rows from an OHLCV DataFrame.
+
+    The timestamp comes from a ``timestamp`` column or the index; symbol
+    and timeframe from the arguments or from ``symbol``/``timeframe``
+    columns. Duplicate (symbol, timeframe, timestamp) keys keep the last
+    row. Missing extra columns and NaN extras are stored as NULL.
+
+    Returns:
+        Tuples of (symbol, timeframe, timestamp, open, high, low, close,
+        volume, *extra_columns)
+    """
+    timestamps = _to_epoch_ms(df["timestamp"] if "timestamp" in df.columns else df.index)
+    symbols = np.full(len(df), symbol, dtype=object) if symbol is not None else df["symbol"].to_numpy(dtype=object)
+    timeframes = (
+        np.full(len(df), timeframe, dtype=object) if timeframe is not None else df["timeframe"].to_numpy(dtype=object)
+    )
+
+    # Keep the last occurrence of each key
+    keys = pd.DataFrame({"symbol": symbols, "timeframe": timeframes, "timestamp": timestamps})
+    keep = ~keys.duplicated(keep="last").to_numpy()
+
+    columns = [symbols[keep].tolist(), timeframes[keep].tolist(), timestamps[keep].tolist()]
+    columns += [df[column].to_numpy(dtype=np.float64)[keep].tolist() for column in OHLCV_COLUMNS]
+    for column in extra_columns:
+        if column in df.columns:
+            values = df[column].astype(object).where(df[column].notna(), None)
+            columns.append(values.to_numpy()[keep].tolist())
+        else:
+            columns.append([None] * int(keep.sum()))
+    return list(zip(*columns))
+
+
+def upsert_ohlcv(
+    conn: sqlite3.Connection,
+    rows: List[tuple],
+    chunk_size: int = 5000,
+    extra_columns: Sequence[str] = (),
+    table: str = "ohlcv_data",
+) -> None:
+    """Upsert rows from ohlcv_rows() in chunked executemany calls.
+
+    The table needs a unique key on (symbol, timeframe, timestamp); the
+    caller owns the transaction.
+    """
+    values = OHLCV_COLUMNS + list(extra_columns)
+    names = ", ".join(["symbol", "timeframe", "timestamp"] + values)
+    placeholders = ", ".join("?" * (len(values) + 3))
+    updates = ", ".join(f"{column} = excluded.{column}" for column in values)
+    sql = (
+        f"INSERT INTO {table} ({names}) VALUES ({placeholders}) "
+        f"ON CONFLICT (symbol, timeframe, timestamp) DO UPDATE SET {updates}"
+    )
+    for offset in range(0, len(rows), chunk_size):
+        conn.executemany(sql, rows[offset:offset + chunk_size])
+
+
+def _to_epoch_ms(values) -> np.ndarray:
+    """Convert datetimes (or epoch-ms integers) to an int64 epoch-ms array."""
+    values = pd.Index(values)
+    if values.dtype.kind in "iu":
+        return values.to_numpy(dtype=np.int64)
+    stamps = pd.DatetimeIndex(pd.to_datetime(values))
+    if stamps.tz is not None:
+        stamps = stamps.tz_convert(None)
+    return stamps.to_numpy().astype("datetime64[ms]").astype(np.int64)
@@ -16,6 +16,7 @@ from .models import (
     MonitoringAlert
 )
 from .opportunity_analyzer import OpportunityAnalyzer
+from .opportunity_snapshot import OpportunitySnapshot, ProtocolFanOut
 from .protocol_analyzers import (
     BaseProtocolAnalyzer,
     ProtocolAnalyzerRegistry,
@@ -45,6 +46,8 @@ __all__ = [
     # Core components
     'OpportunityAnalyzer',
     'PortfolioOptimizer',
+    'OpportunitySnapshot',
+    'ProtocolFanOut',
 
     # Protocol analyzers
     'BaseProtocolAnalyzer',
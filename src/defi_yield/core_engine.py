@@ -3,12 +3,14 @@ Core DeFi Yield Optimization Engine
 Main orchestrator for yield optimization across protocols
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 from .models import YieldOpportunity, ProtocolType, RiskLevel
 from .opportunity_analyzer import OpportunityAnalyzer
+from .opportunity_snapshot import OpportunitySnapshot, ProtocolFanOut
 from .protocol_analyzers import ProtocolAnalyzerRegistry
 from .portfolio_optimizer import PortfolioOptimizer
 
@@ -18,12 +20,36 @@ logger = logging.getLogger(__name__)
 class DeFiYieldOptimizer:
     """
     Advanced DeFi yield optimization across major protocols
+
+    Protocol queries run concurrently through a ProtocolFanOut (timeouts and
+    concurrency caps per protocol). With a snapshot enabled, per-token
+    opportunities are served from it instead of querying every protocol.
     """
 
-    def __init__(self):
+    def __init__(self, protocol_timeout: float = 5.0, max_concurrency: int = 16,
+                 per_protocol_concurrency: int = 4, snapshot: Optional[OpportunitySnapshot] = None):
         self.protocol_registry = ProtocolAnalyzerRegistry()
         self.opportunity_analyzer = OpportunityAnalyzer()
         self.portfolio_optimizer = PortfolioOptimizer()
+        self.fan_out = ProtocolFanOut(protocol_timeout, max_concurrency, per_protocol_concurrency)
+        self.snapshot = snapshot
+
+    def enable_snapshot(self, tokens: Optional[List[str]] = None, refresh_interval: float = 300.0,
+                        start: bool = True) -> OpportunitySnapshot:
+        """
+        Serve per-token opportunities from a shared, periodically refreshed snapshot
+
+        Args:
+            tokens: Tokens to keep warm (others are fetched on first request)
+            refresh_interval: Seconds between background refreshes
+            start: Start the background refresher thread
+        """
+        self.snapshot = OpportunitySnapshot(
+            self.protocol_registry, self.fan_out, tokens=tokens, refresh_interval=refresh_interval
+        )
+        if start:
+            self.snapshot.start()
+        return self.snapshot
 
     async def optimize_yield_for_portfolio(self, user_tokens: Dict[str, float], preferences: Dict[str, Any] = None) -> Dict[str, Any]:
         """
@@ -38,16 +64,19 @@ class DeFiYieldOptimizer:
         if not preferences:
             preferences = self._get_default_preferences()
 
-        # Get all opportunities for each token
+        # Get opportunities for each token and cross-token strategies concurrently
         all_opportunities = []
-
-        for token, amount in user_tokens.items():
-            if amount > 0:  # Only process tokens with positive balance
-                token_opportunities = await self.get_opportunities_for_token(token, amount, preferences)
-                all_opportunities.extend(token_opportunities)
-
-        # Find cross-token strategies
-        cross_token_opportunities = await self._find_cross_token_strategies(user_tokens, preferences)
+        held_tokens = [(token, amount) for token, amount in user_tokens.items() if amount > 0]
+
+        per_token_opportunities, cross_token_opportunities = await asyncio.gather(
+            asyncio.gather(*(
+                self.get_opportunities_for_token(token, amount, preferences)
+                for token, amount in held_tokens
+            )),
+            self._find_cross_token_strategies(user_tokens, preferences)
+        )
+        for token_opportunities in per_token_opportunities:
+            all_opportunities.extend(token_opportunities)
         all_opportunities.extend(cross_token_opportunities)
 
         # Optimize portfolio allocation
@@ -78,15 +107,21 @@ class DeFiYieldOptimizer:
         """
         Get all yield opportunities for a specific token
         """
-        opportunities = []
-
-        # Get opportunities from each protocol
-        for analyzer in self.protocol_registry.get_all_analyzers():
-            try:
-                protocol_opportunities = await analyzer.get_opportunities(token, amount, preferences)
-                opportunities.extend(protocol_opportunities)
-            except Exception as e:
-                logger.error(f"Error getting opportunities from {analyzer.__class__.__name__}: {e}")
+        if self.snapshot:
+            opportunities = self.snapshot.get(token)
+            if opportunities is None:
+                await self.snapshot.refresh([token])
+                opportunities = self.snapshot.get(token) or []
+        else:
+            # Query every protocol concurrently
+            results = await self.fan_out.gather(
+                (
+                    (name, lambda analyzer=analyzer: analyzer.get_opportunities(token, amount, preferences))
+                    for name, analyzer in self.protocol_registry.analyzers.items()
+                ),
+                default=[]
+            )
+            opportunities = [opportunity for result in results for opportunity in result or []]
 
         # Filter and rank opportunities
         filtered_opportunities = self.opportunity_analyzer.filter_opportunities(opportunities, preferences)
@@ -114,16 +149,14 @@ class DeFiYieldOptimizer:
         cross_strategies = []
 
         try:
-            # LP strategies combining user's tokens
-            lp_strategies = await self._find_lp_strategies(user_tokens, preferences)
+            # LP, delta-neutral and carry trade strategies
+            lp_strategies, delta_neutral, carry_trades = await asyncio.gather(
+                self._find_lp_strategies(user_tokens, preferences),
+                self._find_delta_neutral_strategies(user_tokens, preferences),
+                self._find_carry_trade_strategies(user_tokens, preferences)
+            )
             cross_strategies.extend(lp_strategies)
-
-            # Delta-neutral strategies
-            delta_neutral = await self._find_delta_neutral_strategies(user_tokens, preferences)
             cross_strategies.extend(delta_neutral)
-
-            # Carry trade strategies
-            carry_trades = await self._find_carry_trade_strategies(user_tokens, preferences)
             cross_strategies.extend(carry_trades)
 
         except Exception as e:
@@ -139,14 +172,17 @@ class DeFiYieldOptimizer:
         token_list = list(user_tokens.keys())
 
         # Check all pairs of user's tokens
-        for i in range(len(token_list)):
-            for j in range(i + 1, len(token_list)):
-                token_a, token_b = token_list[i], token_list[j]
-
-                if user_tokens[token_a] > 0 and user_tokens[token_b] > 0:
-                    # Find LP opportunities for this pair
-                    pair_opportunities = await self._get_lp_opportunities(token_a, token_b, user_tokens, preferences)
-                    lp_strategies.extend(pair_opportunities)
+        pairs = [
+            (token_list[i], token_list[j])
+            for i in range(len(token_list))
+            for j in range(i + 1, len(token_list))
+            if user_tokens[token_list[i]] > 0 and user_tokens[token_list[j]] > 0
+        ]
+        for pair_opportunities in await asyncio.gather(*(
+            self._get_lp_opportunities(token_a, token_b, user_tokens, preferences)
+            for token_a, token_b in pairs
+        )):
+            lp_strategies.extend(pair_opportunities)
 
         return lp_strategies
 
@@ -154,45 +190,41 @@ class DeFiYieldOptimizer:
         """
         Get LP opportunities for a specific token pair
         """
-        opportunities = []
-
-        # Get LP opportunities from relevant protocols
-        uniswap_analyzer = self.protocol_registry.get_analyzer('uniswap')
-        if uniswap_analyzer:
-            uniswap_lp = await uniswap_analyzer.get_lp_opportunity(token_a, token_b, user_tokens)
-            if uniswap_lp:
-                opportunities.append(uniswap_lp)
-
-        # Curve stable pools for stablecoin pairs
+        # Get LP opportunities from relevant protocols (Curve stable pools for stablecoin pairs)
+        protocols = ['uniswap']
         if await self._is_stable_pair(token_a, token_b):
-            curve_analyzer = self.protocol_registry.get_analyzer('curve')
-            if curve_analyzer:
-                curve_lp = await curve_analyzer.get_lp_opportunity(token_a, token_b, user_tokens)
-                if curve_lp:
-                    opportunities.append(curve_lp)
+            protocols.append('curve')
+
+        calls = []
+        for protocol in protocols:
+            analyzer = self.protocol_registry.get_analyzer(protocol)
+            if analyzer:
+                calls.append((protocol, lambda analyzer=analyzer: analyzer.get_lp_opportunity(token_a, token_b, user_tokens)))
 
-        return opportunities
+        return [opportunity for opportunity in await self.fan_out.gather(calls) if opportunity]
 
     async def _find_delta_neutral_strategies(self, user_tokens: Dict[str, float], preferences: Dict[str, Any]) -> List[YieldOpportunity]:
         """
         Find delta-neutral yield strategies
         """
         delta_neutral = []
+        calls = []
 
         # Ethena delta-neutral strategies
         if any(token in user_tokens for token in ['USDT', 'USDC']):
             ethena_analyzer = self.protocol_registry.get_analyzer('ethena')
             if ethena_analyzer:
-                ethena_strategies = await ethena_analyzer.get_delta_neutral_strategies(user_tokens)
-                delta_neutral.extend(ethena_strategies)
+                calls.append(('ethena', lambda: ethena_analyzer.get_delta_neutral_strategies(user_tokens)))
 
         # Pendle PT/YT strategies
         pendle_analyzer = self.protocol_registry.get_analyzer('pendle')
         if pendle_analyzer:
             for token, amount in user_tokens.items():
                 if amount > 0:
-                    pendle_strategies = await pendle_analyzer.get_pt_yt_strategies(token, amount)
-                    delta_neutral.extend(pendle_strategies)
+                    calls.append(('pendle', lambda token=token, amount=amount: pendle_analyzer.get_pt_yt_strategies(token, amount)))
+
+        for strategies in await self.fan_out.gather(calls, default=[]):
+            delta_neutral.extend(strategies or [])
 
         return delta_neutral
 
@@ -203,8 +235,9 @@ class DeFiYieldOptimizer:
         carry_trades = []
 
         # Get current rates
-        borrow_opportunities = await self._get_borrowing_rates()
-        lending_opportunities = await self._get_lending_rates()
+        borrow_opportunities, lending_opportunities = await asyncio.gather(
+            self._get_borrowing_rates(), self._get_lending_rates()
+        )
 
         for token, amount in user_tokens.items():
             if amount > 0:
@@ -0,0 +1,217 @@
+"""
+Protocol Fan-Out and Opportunity Snapshot
+Concurrent protocol queries and a shared, periodically refreshed view of
+per-token opportunities
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .models import YieldOpportunity
+
+logger = logging.getLogger(__name__)
+
+# Tokens kept warm in the snapshot unless configured otherwise
+DEFAULT_SNAPSHOT_TOKENS = ['ETH', 'stETH', 'BTC', 'USDT', 'USDC', 'DAI']
+
+
+class ProtocolFanOut:
+    """
+    Runs protocol analyzer calls concurrently
+
+    Every call is bounded by a timeout, a global concurrency cap and a
+    per-protocol cap, so one slow or rate-limited protocol neither stalls
+    the others nor gets flooded. Failed and timed-out calls return the
+    supplied default instead of raising.
+    """
+
+    def __init__(self, timeout: float = 5.0, max_concurrency: int = 16, per_protocol_concurrency: int = 4):
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.per_protocol_concurrency = per_protocol_concurrency
+        # Semaphores are bound to an event loop; Flask routes use a loop per request
+        self._limits = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _semaphores(self, protocol: str) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        limits = self._limits.get(loop)
+        if limits is None:
+            limits = self._limits[loop] = (asyncio.Semaphore(self.max_concurrency), {})
+        total, per_protocol = limits
+        if protocol not in per_protocol:
+            per_protocol[protocol] = asyncio.Semaphore(self.per_protocol_concurrency)
+        return total, per_protocol[protocol]
+
+    async def call(self, protocol: str, call: Callable[[], Awaitable[Any]], default: Any = None) -> Any:
+        """
+        Run one protocol call under the caps and timeout
+
+        Args:
+            protocol: Protocol name (for the per-protocol cap and stats)
+            call: Zero-argument function returning the awaitable to run
+            default: Result on error or timeout
+        """
+        total, own = self._semaphores(protocol)
+        async with own, total:
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(call(), self.timeout)
+                outcome = None
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ {protocol} did not answer within {self.timeout}s")
+                result, outcome = default, 'timeouts'
+            except Exception as e:
+                logger.error(f"Error getting opportunities from {protocol}: {e}")
+                result, outcome = default, 'errors'
+            self._record(protocol, time.perf_counter() - started, outcome)
+        return result
+
+    async def gather(self, calls: Iterable[Tuple[str, Callable[[], Awaitable[Any]]]], default: Any = None) -> List[Any]:
+        """Run (protocol, call) pairs concurrently, results in input order"""
+        return await asyncio.gather(*(self.call(protocol, call, default) for protocol, call in calls))
+
+    def _record(self, protocol: str, seconds: float, outcome: Optional[str]) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(
+                protocol, {'calls': 0, 'timeouts': 0, 'errors': 0, 'total_seconds': 0.0}
+            )
+            stats['calls'] += 1
+            stats['total_seconds'] += seconds
+            if outcome:
+                stats[outcome] += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-protocol call counts, failures and average latency"""
+        with self._stats_lock:
+            return {
+                protocol: {
+                    **stats,
+                    'avg_seconds': stats['total_seconds'] / stats['calls'] if stats['calls'] else 0.0,
+                }
+                for protocol, stats in self._stats.items()
+            }
+
+
+class OpportunitySnapshot:
+    """
+    Latest protocol opportunities per token, shared across requests
+
+    A refresh queries every (protocol, token) pair concurrently through a
+    ProtocolFanOut and swaps the results in atomically. Listings are taken
+    without a position size or preferences; callers apply their own
+    filtering (OpportunityAnalyzer) to the snapshot entries.
+    """
+
+    def __init__(self, registry, fan_out: Optional[ProtocolFanOut] = None, tokens: Optional[List[str]] = None,
+                 refresh_interval: float = 300.0, max_age: Optional[float] = None):
+        self.registry = registry
+        self.fan_out = fan_out or ProtocolFanOut()
+        self.tokens = list(tokens or DEFAULT_SNAPSHOT_TOKENS)
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age if max_age is not None else refresh_interval * 2
+
+        self._entries: Dict[str, Tuple[float, List[YieldOpportunity]]] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.refresh_count = 0
+        self.last_refresh_seconds = 0.0
+        self.last_refresh_at: Optional[datetime] = None
+
+    async def refresh(self, tokens: Optional[List[str]] = None) -> int:
+        """
+        Re-query all protocols for the given tokens (all tracked tokens by default)
+
+        Returns:
+            Number of opportunities found
+        """
+        tokens = list(tokens or self.tokens)
+        analyzers = list(self.registry.analyzers.items())
+        started = time.perf_counter()
+
+        results = await self.fan_out.gather(
+            (
+                (name, lambda analyzer=analyzer, token=token: analyzer.get_opportunities(token, 0.0, {}))
+                for token in tokens
+                for name, analyzer in analyzers
+            ),
+            default=[],
+        )
+
+        fetched_at = time.monotonic()
+        entries = {token: (fetched_at, []) for token in tokens}
+        owners = (token for token in tokens for _ in analyzers)
+        for token, opportunities in zip(owners, results):
+            entries[token][1].extend(opportunities or [])
+
+        with self._lock:
+            self._entries = {**self._entries, **entries}
+            self.refresh_count += 1
+            self.last_refresh_seconds = time.perf_counter() - started
+            self.last_refresh_at = datetime.now()
+
+        found = sum(len(opportunities) for _, opportunities in entries.values())
+        logger.info(f"📸 Opportunity snapshot refreshed: {found} opportunities for {len(tokens)} tokens "
+                    f"in {self.last_refresh_seconds:.2f}s")
+        return found
+
+    def get(self, token: str) -> Optional[List[YieldOpportunity]]:
+        """Opportunities for a token, or None when missing or older than max_age"""
+        with self._lock:
+            entry = self._entries.get(token)
+        if entry is None or time.monotonic() - entry[0] > self.max_age:
+            return None
+        return list(entry[1])
+
+    def start(self) -> None:
+        """Refresh in a background thread every refresh_interval seconds"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='defi-opportunity-snapshot', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background refresher"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    loop.run_until_complete(self.refresh())
+                except Exception as e:
+                    logger.error(f"Error refreshing opportunity snapshot: {e}")
+                self._stop_event.wait(self.refresh_interval)
+        finally:
+            loop.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Snapshot freshness, coverage and per-protocol call statistics"""
+        now = time.monotonic()
+        with self._lock:
+            entries = dict(self._entries)
+        return {
+            'tokens': {
+                token: {'opportunities': len(opportunities), 'age_seconds': round(now - fetched_at, 1)}
+                for token, (fetched_at, opportunities) in entries.items()
+            },
+            'refresh_count': self.refresh_count,
+            'refresh_interval': self.refresh_interval,
+            'last_refresh_seconds': round(self.last_refresh_seconds, 3),
+            'last_refresh_at': self.last_refresh_at.isoformat() if self.last_refresh_at else None,
+            'background_refresh': bool(self._thread and self._thread.is_alive()),
+            'protocols': self.fan_out.get_stats(),
+        }
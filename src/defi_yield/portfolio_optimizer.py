@@ -5,16 +5,56 @@ Handles allocation optimization across DeFi opportunities
 
 import logging
 from typing import Dict, List, Any
+
+import numpy as np
+
+from src.core.allocation_solver import AllocationSolver
 from .models import YieldOpportunity, RiskLevel
 
 logger = logging.getLogger(__name__)
 
+STABLECOINS = {'USDT', 'USDC', 'DAI', 'FRAX', 'BUSD', 'TUSD', 'SUSD', 'LUSD', 'USDE'}
+
+# Allocation strategies as constraint profiles for the allocation LP:
+#   deploy_fraction        share of each token balance that may be deployed
+#   max_position_fraction  share of a token balance in a single opportunity
+#   max_protocol_fraction  share of a token balance in a single protocol
+#   risk_aversion          APY points given up per risk-score point
+#   risk_levels            admissible risk levels (None = all)
+# Any of these can be overridden through the preferences
+ALLOCATION_PROFILES = {
+    'balanced': {
+        'deploy_fraction': 0.8, 'max_position_fraction': 0.5, 'max_protocol_fraction': 0.5,
+        'risk_aversion': 0.1, 'risk_levels': None,
+    },
+    'conservative': {
+        'deploy_fraction': 0.6, 'max_position_fraction': 0.6, 'max_protocol_fraction': 0.6,
+        'risk_aversion': 0.3, 'risk_levels': (RiskLevel.VERY_LOW, RiskLevel.LOW),
+    },
+    'aggressive': {
+        'deploy_fraction': 0.9, 'max_position_fraction': 0.9, 'max_protocol_fraction': 0.9,
+        'risk_aversion': 0.0, 'risk_levels': None,
+    },
+    'max_diversification': {
+        'deploy_fraction': 0.8, 'max_position_fraction': 0.2, 'max_protocol_fraction': 0.25,
+        'risk_aversion': 0.1, 'risk_levels': None,
+    },
+}
+
 
 class PortfolioOptimizer:
     """
     Optimize DeFi portfolio allocation across opportunities
+
+    Allocations are solved as a linear program (AllocationSolver) over
+    (token, opportunity) pairs: risk-adjusted APY is maximized subject to
+    per-token budgets, position and protocol concentration caps, minimum
+    deposits, the lockup limit and the gas budget.
     """
 
+    def __init__(self, solver: AllocationSolver = None):
+        self.solver = solver or AllocationSolver()
+
     async def optimize_allocation(self, opportunities: List[YieldOpportunity], user_tokens: Dict[str, float], preferences: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Optimize allocation across opportunities
@@ -169,124 +209,98 @@ class PortfolioOptimizer:
         """
         Balanced allocation strategy - moderate diversification and risk
         """
-        allocation = []
-
-        for token, amount in user_tokens.items():
-            if amount > 0 and token in token_opportunities:
-                opps = token_opportunities[token]
-
-                if opps:
-                    # Take top 2-3 opportunities for diversification
-                    selected_opps = opps[:min(3, len(opps))]
-
-                    # Allocate with decreasing weights
-                    weights = [0.5, 0.3, 0.2][:len(selected_opps)]
-                    remaining_amount = amount
-
-                    for i, opp in enumerate(selected_opps):
-                        allocation_amount = remaining_amount * weights[i]
-
-                        if allocation_amount >= opp.minimum_deposit:
-                            allocation.append({
-                                'token': token,
-                                'opportunity': opp.__dict__,
-                                'allocated_amount': allocation_amount,
-                                'allocation_percent': allocation_amount / amount
-                            })
-                            remaining_amount -= allocation_amount
-
-        return allocation
+        return self._solve_allocation(token_opportunities, user_tokens, preferences, 'balanced')
 
     async def _conservative_allocation(self, token_opportunities: Dict[str, List[YieldOpportunity]], user_tokens: Dict[str, float], preferences: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Conservative allocation - prioritize low risk, proven protocols
         """
-        allocation = []
-
-        for token, amount in user_tokens.items():
-            if amount > 0 and token in token_opportunities:
-                # Filter for low-risk opportunities
-                low_risk_opps = [opp for opp in token_opportunities[token] if opp.risk_level in [RiskLevel.VERY_LOW, RiskLevel.LOW]]
-
-                if low_risk_opps:
-                    # Take the best low-risk opportunity
-                    best_opp = low_risk_opps[0]
-                    allocation_amount = amount * 0.6  # Conservative 60% allocation
-
-                    if allocation_amount >= best_opp.minimum_deposit:
-                        allocation.append({
-                            'token': token,
-                            'opportunity': best_opp.__dict__,
-                            'allocated_amount': allocation_amount,
-                            'allocation_percent': 0.6
-                        })
-
-        return allocation
+        return self._solve_allocation(token_opportunities, user_tokens, preferences, 'conservative')
 
     async def _aggressive_allocation(self, token_opportunities: Dict[str, List[YieldOpportunity]], user_tokens: Dict[str, float], preferences: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Aggressive allocation - maximize yield, accept higher risk
         """
-        allocation = []
-
-        for token, amount in user_tokens.items():
-            if amount > 0 and token in token_opportunities:
-                opps = token_opportunities[token]
-
-                if opps:
-                    # Take the highest APY opportunity
-                    best_opp = max(opps, key=lambda x: x.total_apy)
-                    allocation_amount = amount * 0.9  # Aggressive 90% allocation
-
-                    if allocation_amount >= best_opp.minimum_deposit:
-                        allocation.append({
-                            'token': token,
-                            'opportunity': best_opp.__dict__,
-                            'allocated_amount': allocation_amount,
-                            'allocation_percent': 0.9
-                        })
-
-        return allocation
+        return self._solve_allocation(token_opportunities, user_tokens, preferences, 'aggressive')
 
     async def _max_diversification_allocation(self, token_opportunities: Dict[str, List[YieldOpportunity]], user_tokens: Dict[str, float], preferences: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Maximum diversification - spread across many protocols and strategies
         """
-        allocation = []
+        return self._solve_allocation(token_opportunities, user_tokens, preferences, 'max_diversification')
+
+    def _solve_allocation(self, token_opportunities: Dict[str, List[YieldOpportunity]], user_tokens: Dict[str, float],
+                          preferences: Dict[str, Any], strategy: str) -> List[Dict[str, Any]]:
+        """
+        Allocate token balances across opportunities with the allocation LP
 
-        # Collect all unique opportunities across all tokens
-        all_opportunities = []
-        for token, opps in token_opportunities.items():
-            for opp in opps:
-                if user_tokens.get(token, 0) > 0:
-                    all_opportunities.append((token, opp))
-
-        # Remove duplicates based on protocol and pool
-        unique_opportunities = []
-        seen = set()
-
-        for token, opp in all_opportunities:
-            key = (opp.protocol, opp.pool_id)
-            if key not in seen:
-                unique_opportunities.append((token, opp))
-                seen.add(key)
-
-        # Allocate equally across all unique opportunities
-        if unique_opportunities:
-            equal_weight = 1.0 / len(unique_opportunities)
-
-            for token, opp in unique_opportunities:
-                available_amount = user_tokens[token]
-                allocation_amount = available_amount * equal_weight * 0.8  # 80% of equal weight
-
-                if allocation_amount >= opp.minimum_deposit:
-                    allocation.append({
-                        'token': token,
-                        'opportunity': opp.__dict__,
-                        'allocated_amount': allocation_amount,
-                        'allocation_percent': allocation_amount / available_amount
-                    })
+        Variables are (token, opportunity) pairs. Gas must be recovered by
+        the position's yield over ``holding_period_days`` (for tokens with a
+        known USD price: stablecoins or ``token_prices``) and the summed gas
+        of all positions must fit ``gas_budget``.
+        """
+        profile = {**ALLOCATION_PROFILES[strategy], **{key: preferences[key] for key in ALLOCATION_PROFILES[strategy] if key in preferences}}
+        max_lockup_days = preferences.get('max_lockup_days')
+        prices = {token: 1.0 for token in STABLECOINS}
+        prices.update(preferences.get('token_prices', {}))
+        holding_years = preferences.get('holding_period_days', 90) / 365
+
+        tokens = [token for token, amount in user_tokens.items() if amount > 0 and token_opportunities.get(token)]
+        pairs = [
+            (t, opp)
+            for t, token in enumerate(tokens)
+            for opp in token_opportunities[token]
+            if (profile['risk_levels'] is None or opp.risk_level in profile['risk_levels'])
+            and (max_lockup_days is None or not opp.lockup_period or opp.lockup_period <= max_lockup_days)
+        ]
+        if not pairs:
+            return []
 
+        token_index = np.array([t for t, _ in pairs])
+        balances = np.array([user_tokens[token] for token in tokens], dtype=float)
+        price = np.array([prices.get(tokens[t], np.nan) for t, _ in pairs])
+        apy = np.array([opp.total_apy for _, opp in pairs])
+        risk = np.array([opp.risk_score for _, opp in pairs])
+        gas = np.array([opp.estimated_gas_cost or 0.0 for _, opp in pairs])
+
+        # Objective: risk-adjusted yield over the holding period, in USD where priced
+        yield_per_unit = np.nan_to_num(price, nan=1.0) * apy / 100 * holding_years
+        value = np.nan_to_num(price, nan=1.0) * (apy - profile['risk_aversion'] * risk) / 100 * holding_years
+        # Gas must be earned back by the actual yield, in objective units
+        gas_recovery = np.where(np.isnan(price), 0.0, gas * value / np.maximum(yield_per_unit, 1e-12))
+        upper = balances[token_index] * profile['max_position_fraction']
+        deposit_cap = np.array([opp.deposit_cap if opp.deposit_cap else np.inf for _, opp in pairs])
+        upper = np.minimum(upper, np.where(np.isnan(price), np.inf, deposit_cap / np.nan_to_num(price, nan=1.0)))
+
+        # Protocol caps per token
+        protocol_keys = {}
+        protocol_groups = np.array([protocol_keys.setdefault((t, opp.protocol), len(protocol_keys)) for t, opp in pairs])
+        protocol_limits = np.array([balances[t] * profile['max_protocol_fraction'] for t, _ in protocol_keys])
+
+        result = self.solver.solve(
+            value=value,
+            budget_index=token_index,
+            budgets=balances * profile['deploy_fraction'],
+            upper=upper,
+            min_size=np.array([opp.minimum_deposit or 0.0 for _, opp in pairs]),
+            min_gain=gas_recovery,
+            fixed_cost=gas,
+            fixed_cost_budget=preferences.get('gas_budget', np.inf),
+            caps=[(protocol_groups, protocol_limits)],
+        )
+
+        allocation = []
+        for i in result.selected[np.lexsort((-result.amounts[result.selected], token_index[result.selected]))]:
+            token = tokens[token_index[i]]
+            allocation.append({
+                'token': token,
+                'opportunity': pairs[i][1].__dict__,
+                'allocated_amount': float(result.amounts[i]),
+                'allocation_percent': float(result.amounts[i] / user_tokens[token])
+            })
+
+        logger.info(f"Allocated {len(allocation)} positions across {len(tokens)} tokens "
+                    f"({strategy}, {result.solve_seconds * 1000:.1f}ms)")
         return allocation
 
     def _calculate_concentration_risk(self, allocations: List[Dict[str, Any]]) -> float:
@@ -10,8 +10,14 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+import numpy as np
+
+try:
+    from src.core.allocation_solver import AllocationSolver
+except ImportError:  # imported with src/ on the path
+    from core.allocation_solver import AllocationSolver
 
 
 class AdvancedHedgingSystem:
@@ -23,6 +29,8 @@ class AdvancedHedgingSystem:
         self.vix_threshold = 25  # VIX level for crash protection
         self.correlation_threshold = 0.8  # Portfolio correlation limit
         self.drawdown_threshold = 0.05  # 5% drawdown trigger
+        self.min_hedge_fraction = 0.25  # Smallest partial hedge worth placing
+        self.solver = AllocationSolver()
 
     def analyze_portfolio_risk(self, active_trades: List[Dict]) -> Dict:
         """Comprehensive portfolio risk analysis"""
@@ -259,7 +267,7 @@ class AdvancedHedgingSystem:
 
         effectiveness_models = {
             "correlation_hedge": {
-                "risk_reduction": min(0.8, portfolio_risk["correlation_risk"] * 0.9),
+                "risk_reduction": min(0.8, portfolio_risk.get("correlation_risk", 0.0) * 0.9),
                 "cost_estimate": 0.02,  # 2% of hedged amount annually
                 "success_probability": 0.85,
                 "max_loss_reduction": 0.6,
@@ -277,7 +285,7 @@ class AdvancedHedgingSystem:
                 "max_loss_reduction": 0.3,
             },
             "concentration_hedge": {
-                "risk_reduction": portfolio_risk["concentration_risk"] * 0.8,
+                "risk_reduction": portfolio_risk.get("concentration_risk", 0.0) * 0.8,
                 "cost_estimate": 0.01,  # 1% cost
                 "success_probability": 0.9,
                 "max_loss_reduction": 0.5,
@@ -295,23 +303,29 @@ class AdvancedHedgingSystem:
         )
 
     def optimize_hedge_portfolio(
-        self, recommendations: List[Dict], budget_limit: float
+        self,
+        recommendations: List[Dict],
+        budget_limit: float,
+        portfolio_risk: Optional[Dict] = None,
     ) -> List[Dict]:
-        """Optimize hedge portfolio for maximum risk reduction within budget"""
+        """Optimize hedge portfolio for maximum risk reduction within budget
+
+        Hedges may be placed partially: the budget is split by linear
+        program over the dollars spent on each hedge, weighted by risk
+        reduction per dollar and priority. Partial hedges smaller than
+        min_hedge_fraction of the recommended size are not placed.
+        """
 
         if not recommendations or budget_limit <= 0:
             return []
 
-        # Calculate risk-adjusted return for each hedge
-        optimized_hedges = []
-        remaining_budget = budget_limit
-
-        # Sort by priority and effectiveness
         priority_weights = {"critical": 4, "high": 3, "medium": 2, "low": 1}
 
         for hedge in recommendations:
             priority_score = priority_weights.get(hedge["priority"], 1)
-            effectiveness = self.calculate_hedge_effectiveness(hedge["type"], {})
+            effectiveness = self.calculate_hedge_effectiveness(
+                hedge["type"], portfolio_risk or {}
+            )
 
             # Calculate efficiency score (risk reduction per dollar)
             cost = hedge["size_usd"] * effectiveness["cost_estimate"]
@@ -323,16 +337,40 @@ class AdvancedHedgingSystem:
             hedge["estimated_cost"] = cost
             hedge["expected_risk_reduction"] = effectiveness["risk_reduction"]
 
-        # Sort by efficiency score
-        sorted_hedges = sorted(
-            recommendations, key=lambda x: x["efficiency_score"], reverse=True
+        costs = np.array([hedge["estimated_cost"] for hedge in recommendations])
+        free = costs <= 0
+        result = self.solver.solve(
+            value=np.array(
+                [
+                    hedge["expected_risk_reduction"]
+                    * priority_weights.get(hedge["priority"], 1)
+                    for hedge in recommendations
+                ]
+            )
+            / np.maximum(costs, 1e-9),
+            budget_index=np.zeros(len(recommendations), dtype=int),
+            budgets=[budget_limit],
+            upper=np.where(free, 0.0, costs),
+            min_size=costs * self.min_hedge_fraction,
         )
+        fractions = np.where(free, 1.0, result.amounts / np.maximum(costs, 1e-9))
 
-        # Select hedges within budget
-        for hedge in sorted_hedges:
-            if hedge["estimated_cost"] <= remaining_budget:
-                optimized_hedges.append(hedge)
-                remaining_budget -= hedge["estimated_cost"]
+        optimized_hedges = []
+        for i in np.argsort([-hedge["efficiency_score"] for hedge in recommendations]):
+            if fractions[i] <= 0:
+                continue
+            hedge = recommendations[i]
+            fraction = min(float(fractions[i]), 1.0)
+            optimized_hedges.append(
+                {
+                    **hedge,
+                    "hedge_fraction": fraction,
+                    "size_usd": hedge["size_usd"] * fraction,
+                    "estimated_cost": hedge["estimated_cost"] * fraction,
+                    "expected_risk_reduction": hedge["expected_risk_reduction"]
+                    * fraction,
+                }
+            )
 
         return optimized_hedges
 
@@ -447,12 +485,14 @@ def main():
 
     # Optimize hedge portfolio
     budget = 500  # $500 hedge budget
-    optimized = hedging_system.optimize_hedge_portfolio(recommendations, budget)
+    optimized = hedging_system.optimize_hedge_portfolio(
+        recommendations, budget, risk_analysis
+    )
     print(f"\n💰 Optimized Hedges (Budget: ${budget}):")
 
     for hedge in optimized:
         print(
-            f"   • {hedge['type']}: ${hedge['estimated_cost']:.0f} cost, {hedge['expected_risk_reduction']:.1%} risk reduction"
+            f"   • {hedge['type']} ({hedge['hedge_fraction']:.0%}): ${hedge['estimated_cost']:.0f} cost, {hedge['expected_risk_reduction']:.1%} risk reduction"
         )
 
     # Create execution plan
@@ -12,24 +12,32 @@ from typing import Dict, List, Optional
 import logging
 import sqlite3
 from dataclasses import dataclass
+from src.core.position_book import Column, PositionBook, PositionView, TimeColumn
 from src.custom_strategy_manager import list_custom_strategies, load_custom_strategy
+from src.monitoring.metrics import OPEN_POSITIONS
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
-class Position:
-    """Represents an open position"""
-    strategy_name: str
-    symbol: str
-    entry_price: float
-    entry_time: datetime
-    position_size: float
-    position_type: str  # 'LONG' or 'SHORT'
-    stop_loss: float = 0.0
-    take_profit: float = 0.0
-    trailing_stop: float = 0.0
+class Position(PositionView):
+    """Represents an open position (a view into the engine's PositionBook)"""
+    __slots__ = ()
+    
+    stop_loss = Column('stop_loss')
+    take_profit = Column('take_profit')
+    trailing_stop = Column('trailing_stop')
+    entry_time = TimeColumn('opened_at')
+    # strategy_name is a side-table field
+    
+    @property
+    def position_size(self) -> float:
+        """Position size in quote currency at entry"""
+        return self.quantity * self.entry_price
+    
+    @property
+    def position_type(self) -> str:
+        return 'LONG' if self.direction > 0 else 'SHORT'
 
 @dataclass
 class Trade:
@@ -51,10 +59,17 @@ class LiveTradingEngine:
     Main live trading engine that manages multiple strategies
     """
     
-    def __init__(self, initial_capital: float = 10000.0):
+    def __init__(self, initial_capital: float = 10000.0, exchange=None):
+        """
+        Args:
+            initial_capital: Starting capital
+            exchange: CCXT-compatible exchange (e.g. ExchangeSimulator) to read
+                candles from; mock data is generated without one
+        """
+        self.exchange = exchange
         self.initial_capital = initial_capital
         self.current_capital = initial_capital
-        self.active_positions: Dict[str, Position] = {}  # position_id -> Position
+        self.active_positions = PositionBook(Position)  # position_id -> Position
         self.completed_trades: List[Trade] = []
         self.strategy_instances = {}
         self.market_data_cache = {}
@@ -64,6 +79,7 @@ class LiveTradingEngine:
         self.max_positions = 10
         self.max_risk_per_trade = 0.02  # 2% max risk per trade
         self.max_portfolio_risk = 0.20  # 20% max portfolio risk
+        OPEN_POSITIONS.labels('live_trading').set_function(lambda: len(self.active_positions))
         
         # Initialize database for trade logging
         self.init_database()
@@ -134,9 +150,18 @@ class LiveTradingEngine:
     async def get_market_data(self, symbol: str, timeframe: str = "1m", limit: int = 100) -> pd.DataFrame:
         """
         Get real-time market data for a symbol
-        This is a mock implementation - replace with real API calls
+        Candles come from the configured exchange, or are mocked without one
         """
         try:
+            if self.exchange is not None:
+                candles = await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+                df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+                df.set_index('timestamp', inplace=True)
+                df = self.add_technical_indicators(df)
+                self.market_data_cache[f"{symbol}_{timeframe}"] = df
+                return df
+            
             # Mock data generation - replace with real API
             dates = pd.date_range(
                 start=datetime.now() - timedelta(minutes=limit),
@@ -331,22 +356,16 @@ class LiveTradingEngine:
                 stop_loss
             )
             
-            # Create position
-            position = Position(
-                strategy_name=signal['strategy_name'],
-                symbol=signal['symbol'],
-                entry_price=entry_price,
-                entry_time=datetime.now(),
-                position_size=position_size,
-                position_type=signal['action'],
+            # Create and store position
+            position = self.active_positions.open(
+                position_key, signal['symbol'], 1 if signal['action'] in ('BUY', 'LONG') else -1,
+                entry_price, position_size / entry_price,
+                metadata={'strategy_name': signal['strategy_name']},
                 stop_loss=stop_loss,
                 take_profit=take_profit,
                 trailing_stop=stop_loss
             )
             
-            # Store position
-            self.active_positions[position_key] = position
-            
             # Log to database
             self.log_position_to_db(position)
             
@@ -368,10 +387,7 @@ class LiveTradingEngine:
             position = self.active_positions[position_key]
             
             # Calculate P&L
-            if position.position_type == 'LONG':
-                pnl = position.position_size * (exit_price - position.entry_price) / position.entry_price
-            else:
-                pnl = position.position_size * (position.entry_price - exit_price) / position.entry_price
+            pnl = position.direction * position.quantity * (exit_price - position.entry_price)
             
             return_pct = pnl / position.position_size * 100
             
@@ -399,15 +415,15 @@ class LiveTradingEngine:
             # Log to database
             self.log_trade_to_db(trade)
             
+            logger.info(f"🏁 CLOSED {position.position_type} position: {position.strategy_name} | "
+                       f"{position.symbol} | P&L: ${pnl:.2f} ({return_pct:.2f}%) | Reason: {exit_reason}")
+            
             # Remove position
             del self.active_positions[position_key]
             
             # Remove from position database
             self.remove_position_from_db(position_key)
             
-            logger.info(f"🏁 CLOSED {position.position_type} position: {position.strategy_name} | "
-                       f"{position.symbol} | P&L: ${pnl:.2f} ({return_pct:.2f}%) | Reason: {exit_reason}")
-            
             return True
             
         except Exception as e:
@@ -474,47 +490,36 @@ class LiveTradingEngine:
     async def monitor_positions(self):
         """Monitor open positions and manage exits"""
         try:
-            for position_key, position in list(self.active_positions.items()):
-                # Get current market data
-                market_data = await self.get_market_data(position.symbol, "1m", 50)
-                if market_data.empty:
-                    continue
-                
-                current_price = market_data['close'].iloc[-1]
-                
-                # Check exit conditions
-                should_exit = False
-                exit_reason = ""
-                
-                if position.position_type == 'LONG':
-                    # Take profit
-                    if current_price >= position.take_profit:
-                        should_exit = True
-                        exit_reason = "Take profit"
-                    # Stop loss
-                    elif current_price <= position.stop_loss:
-                        should_exit = True
-                        exit_reason = "Stop loss"
-                    # Update trailing stop
-                    else:
-                        new_trailing = current_price * 0.97  # 3% trailing
-                        if new_trailing > position.trailing_stop:
-                            position.trailing_stop = new_trailing
-                        elif current_price <= position.trailing_stop:
-                            should_exit = True
-                            exit_reason = "Trailing stop"
-                
-                else:  # SHORT position
-                    if current_price <= position.take_profit:
-                        should_exit = True
-                        exit_reason = "Take profit"
-                    elif current_price >= position.stop_loss:
-                        should_exit = True
-                        exit_reason = "Stop loss"
-                
-                # Exit if needed
-                if should_exit:
-                    self.close_position(position_key, current_price, exit_reason)
+            book = self.active_positions
+            
+            # Get current market data once per symbol
+            prices = {}
+            for symbol in {position.symbol for position in book.values()}:
+                market_data = await self.get_market_data(symbol, "1m", 50)
+                if not market_data.empty:
+                    prices[symbol] = market_data['close'].iloc[-1]
+            
+            marked, _ = book.mark(prices)
+            c = book.columns
+            price = c['current_price'][marked]
+            long = c['direction'][marked] > 0
+            
+            # Take profit and stop loss (both sides)
+            take_profit = book.targets_hit(marked)
+            stop_loss = np.setdiff1d(book.stops_hit(marked), take_profit)
+            
+            # Longs trail a 3% stop that only moves up
+            holding = long & ~np.isin(marked, take_profit) & ~np.isin(marked, stop_loss)
+            new_trailing = price * 0.97
+            raised = holding & (new_trailing > c['trailing_stop'][marked])
+            c['trailing_stop'][marked[raised]] = new_trailing[raised]
+            trailing_stop = marked[holding & ~raised & (price <= c['trailing_stop'][marked])]
+            
+            # Exit if needed
+            for slots, exit_reason in ((take_profit, "Take profit"), (stop_loss, "Stop loss"),
+                                       (trailing_stop, "Trailing stop")):
+                for slot in slots:
+                    self.close_position(book.ids[slot], c['current_price'][slot], exit_reason)
                     
         except Exception as e:
             logger.error(f"❌ Error monitoring positions: {e}")
@@ -525,7 +530,7 @@ class LiveTradingEngine:
             total_pnl = sum(trade.pnl for trade in self.completed_trades)
             total_return_pct = total_pnl / self.initial_capital * 100
             
-            active_value = sum(pos.position_size for pos in self.active_positions.values())
+            active_value = self.active_positions.entry_value()
             
             return {
                 'initial_capital': self.initial_capital,
@@ -534,6 +539,8 @@ class LiveTradingEngine:
                 'total_return_pct': total_return_pct,
                 'active_positions': len(self.active_positions),
                 'active_value': active_value,
+                'unrealized_pnl': self.active_positions.unrealized_pnl(),
+                'risk_to_stops': self.active_positions.risk(),
                 'completed_trades': len(self.completed_trades),
                 'win_rate': len([t for t in self.completed_trades if t.pnl > 0]) / len(self.completed_trades) * 100 if self.completed_trades else 0,
                 'strategies_running': len(self.strategy_instances),
@@ -12,8 +12,27 @@ from enum import Enum
 import logging
 from datetime import datetime
 
+from .regime_engine import RegimeEngine
+
+try:
+    from ..data.history_store import HistoryStore
+    from ..data.resampler import resample_ohlcv
+except ImportError:  # imported as top-level ``market_analysis``
+    from data.history_store import HistoryStore
+    from data.resampler import resample_ohlcv
+
 logger = logging.getLogger(__name__)
 
+# The analyzer reads the whole market, so its readings share one history key
+MARKET_HISTORY_KEY = 'CRYPTO'
+
+# Columns of the bounded regime history (one row per analysis)
+REGIME_HISTORY_FIELDS = [
+    ('market_regime', 'U12'), ('volatility_regime', 'U10'), ('risk_environment', 'U8'),
+    ('fundamental_health', 'U13'), ('confidence_score', 'f8'),
+    ('regime_start', 'f8'), ('regime_duration', 'i4'),
+]
+
 class MarketRegime(Enum):
     BULL = "bull"
     BEAR = "bear"
@@ -59,11 +78,17 @@ class CryptoMarketRegimeAnalyzer:
     
     def __init__(self, 
                  lookback_days: int = 30,
-                 regime_confidence_threshold: float = 0.7):
+                 regime_confidence_threshold: float = 0.7,
+                 history_size: int = 10_000,
+                 history_spill=None):
         self.lookback_days = lookback_days
         self.regime_confidence_threshold = regime_confidence_threshold
-        self._current_regime = None
         self._regime_start_date = None
+        # Fixed-size ring of readings; evicted rows go to history_spill if set
+        self.regime_history = HistoryStore(REGIME_HISTORY_FIELDS, history_size, spill=history_spill)
+        # Rolling BTC features, so repeated calls only process new candles;
+        # ATR and RSI keep this analyzer's 14-bar rolling means
+        self._engine = RegimeEngine(smoothing='sma')
         
     def analyze_market_regime(self, data: Dict[str, pd.DataFrame]) -> MarketRegimeResult:
         """
@@ -82,6 +107,8 @@ class CryptoMarketRegimeAnalyzer:
             if btc_data is None or len(btc_data) < 50:
                 raise ValueError("Insufficient BTC data for regime analysis")
             
+            features = self._engine.sync(btc_data)
+            
             # 1. Analyze weekly/monthly trends (highest timeframes)
             higher_tf_signals = self._analyze_higher_timeframes(btc_data)
             
@@ -89,13 +116,13 @@ class CryptoMarketRegimeAnalyzer:
             market_structure = self._analyze_market_structure(btc_data, eth_data)
             
             # 3. Analyze volatility regime
-            volatility_analysis = self._analyze_volatility_regime(btc_data)
+            volatility_analysis = self._analyze_volatility_regime(features)
             
             # 4. Risk environment analysis
-            risk_analysis = self._analyze_risk_environment(btc_data, market_cap_data)
+            risk_analysis = self._analyze_risk_environment(features, market_cap_data)
             
             # 5. Volume and momentum analysis
-            volume_momentum = self._analyze_volume_momentum(btc_data)
+            volume_momentum = self._analyze_volume_momentum(features)
             
             # 6. Combine all signals
             combined_signals = {
@@ -118,7 +145,7 @@ class CryptoMarketRegimeAnalyzer:
             # 9. Track regime duration
             regime_duration = self._update_regime_duration(market_regime)
             
-            return MarketRegimeResult(
+            result = MarketRegimeResult(
                 market_regime=market_regime,
                 volatility_regime=volatility_regime,
                 risk_environment=risk_environment,
@@ -128,6 +155,8 @@ class CryptoMarketRegimeAnalyzer:
                 signals=combined_signals,
                 timestamp=datetime.now()
             )
+            self._record_regime(result)
+            return result
             
         except Exception as e:
             logger.error(f"Error in market regime analysis: {e}")
@@ -138,14 +167,8 @@ class CryptoMarketRegimeAnalyzer:
         """Analyze weekly/monthly trends from highest timeframes"""
         signals = {}
         
-        # Resample to weekly data for higher timeframe analysis
-        btc_weekly = btc_data.resample('1W').agg({
-            'open': 'first',
-            'high': 'max', 
-            'low': 'min',
-            'close': 'last',
-            'volume': 'sum'
-        }).dropna()
+        # Derive weekly candles from the base candles for higher timeframe analysis
+        btc_weekly = resample_ohlcv(btc_data, '1w')
         
         if len(btc_weekly) < 12:  # Need at least 3 months of weekly data
             signals['higher_tf_trend'] = 0.0
@@ -193,16 +216,18 @@ class CryptoMarketRegimeAnalyzer:
         # Swing highs and lows analysis  
         swing_period = 10
         
-        # Find swing highs/lows
-        highs = btc_data['high'].rolling(swing_period*2+1, center=True).max()
-        lows = btc_data['low'].rolling(swing_period*2+1, center=True).min()
+        # Find swing highs/lows - only the last 3 swing periods can
+        # affect the centered windows of the last 20 bars
+        recent = btc_data.tail(swing_period * 3)
+        highs = recent['high'].rolling(swing_period*2+1, center=True).max()
+        lows = recent['low'].rolling(swing_period*2+1, center=True).min()
         
-        swing_highs = (btc_data['high'] == highs).tail(20)
-        swing_lows = (btc_data['low'] == lows).tail(20)
+        swing_highs = (recent['high'] == highs).tail(20)
+        swing_lows = (recent['low'] == lows).tail(20)
         
         # Count higher highs vs lower highs
-        high_prices = btc_data['high'][swing_highs].dropna()
-        low_prices = btc_data['low'][swing_lows].dropna()
+        high_prices = recent['high'].tail(20)[swing_highs].dropna()
+        low_prices = recent['low'].tail(20)[swing_lows].dropna()
         
         if len(high_prices) > 2 and len(low_prices) > 2:
             # Higher highs pattern
@@ -231,34 +256,18 @@ class CryptoMarketRegimeAnalyzer:
         
         return signals
     
-    def _analyze_volatility_regime(self, btc_data: pd.DataFrame) -> Dict[str, float]:
+    def _analyze_volatility_regime(self, features: Dict[str, float]) -> Dict[str, float]:
         """Analyze volatility regime and patterns"""
         signals = {}
         
-        # ATR analysis across multiple periods
-        btc_data = btc_data.copy()
-        btc_data['atr_14'] = self._calculate_atr(btc_data, 14)
-        btc_data['atr_30'] = self._calculate_atr(btc_data, 30)
-        
-        # ATR percentile ranking (current vs historical)
-        atr_current = btc_data['atr_14'].iloc[-1]
-        atr_percentile = (btc_data['atr_14'].tail(100) <= atr_current).mean()
+        # ATR percentile ranking (current vs last 100 bars)
+        atr_percentile = features['atr_percentile']
         
         # Volatility trend (increasing/decreasing)
-        vol_trend = btc_data['atr_14'].tail(10).pct_change().mean()
-        
-        # Bollinger Band squeeze analysis
-        bb_period = 20
-        bb_std = 2
+        vol_trend = features['volatility_trend']
         
-        bb_middle = btc_data['close'].rolling(bb_period).mean()
-        bb_std_dev = btc_data['close'].rolling(bb_period).std()
-        bb_upper = bb_middle + (bb_std_dev * bb_std)
-        bb_lower = bb_middle - (bb_std_dev * bb_std)
-        
-        # Band width (measure of volatility)
-        band_width = (bb_upper - bb_lower) / bb_middle
-        band_width_percentile = (band_width.tail(100) <= band_width.iloc[-1]).mean()
+        # Bollinger Band width percentile (squeeze detection)
+        band_width_percentile = features['band_width_percentile']
         
         # Determine volatility regime signals
         if atr_percentile > 0.8:
@@ -275,23 +284,20 @@ class CryptoMarketRegimeAnalyzer:
         
         return signals
     
-    def _analyze_risk_environment(self, btc_data: pd.DataFrame, 
+    def _analyze_risk_environment(self, features: Dict[str, float],
                                 market_cap_data: Optional[pd.DataFrame]) -> Dict[str, float]:
         """Analyze risk-on vs risk-off environment"""
         signals = {}
         
         # BTC momentum as risk proxy
-        btc_returns = btc_data['close'].pct_change()
-        momentum_10d = btc_returns.tail(10).mean()
-        momentum_30d = btc_returns.tail(30).mean()
+        momentum_10d = features['momentum_10d']
+        momentum_30d = features['momentum_30d']
         
-        # Volume analysis (risk-on = higher volume)
-        volume_ma = btc_data['volume'].rolling(20).mean()
-        volume_current = btc_data['volume'].tail(5).mean()
-        volume_ratio = volume_current / volume_ma.iloc[-1]
+        # Volume analysis (risk-on = higher volume), 5-bar vs 20-bar average
+        volume_ratio = features['volume_ratio']
         
-        # Price stability analysis
-        price_stability = 1 - btc_data['close'].tail(7).std() / btc_data['close'].tail(7).mean()
+        # Price stability analysis (last 7 bars)
+        price_stability = features['price_stability']
         
         # Risk environment scoring
         risk_score = (
@@ -307,26 +313,19 @@ class CryptoMarketRegimeAnalyzer:
         
         return signals
     
-    def _analyze_volume_momentum(self, btc_data: pd.DataFrame) -> Dict[str, float]:
+    def _analyze_volume_momentum(self, features: Dict[str, float]) -> Dict[str, float]:
         """Analyze volume and momentum patterns"""
         signals = {}
         
         # Volume trend analysis
-        volume_ma_5 = btc_data['volume'].rolling(5).mean()
-        volume_ma_20 = btc_data['volume'].rolling(20).mean()
-        volume_trend = (volume_ma_5 / volume_ma_20 - 1).iloc[-1]
-        
-        # Price-volume relationship
-        price_change = btc_data['close'].pct_change().tail(10)
-        volume_change = btc_data['volume'].pct_change().tail(10)
+        volume_trend = features['volume_ratio'] - 1
         
-        # Positive correlation = healthy (price up with volume up)
-        pv_correlation = price_change.corr(volume_change)
+        # Positive price-volume correlation = healthy (price up with volume up)
+        pv_correlation = features['price_volume_correlation']
         
         # RSI momentum
-        rsi = self._calculate_rsi(btc_data['close'], 14)
-        rsi_current = rsi.iloc[-1]
-        rsi_trend = rsi.tail(5).mean() - rsi.tail(10).head(5).mean()
+        rsi_current = features['rsi_14']
+        rsi_trend = features['rsi_trend']
         
         signals['volume_trend'] = np.clip(volume_trend, -1.0, 1.0)
         signals['price_volume_correlation'] = pv_correlation if not np.isnan(pv_correlation) else 0.0
@@ -420,16 +419,28 @@ class CryptoMarketRegimeAnalyzer:
         return round(confidence, 2)
     
     def _update_regime_duration(self, current_regime: MarketRegime) -> int:
-        """Track how long we've been in current regime"""
-        if self._current_regime != current_regime:
-            self._current_regime = current_regime
+        """Track how long we've been in current regime, from the last recorded reading"""
+        previous = self.regime_history.latest(MARKET_HISTORY_KEY)
+        if previous is None or previous['market_regime'] != current_regime.value:
             self._regime_start_date = datetime.now()
             return 1
-        elif self._regime_start_date:
-            days_in_regime = (datetime.now() - self._regime_start_date).days
-            return max(1, days_in_regime)
-        else:
-            return 1
+        self._regime_start_date = datetime.fromtimestamp(previous['regime_start'])
+        days_in_regime = (datetime.now() - self._regime_start_date).days
+        return max(1, days_in_regime)
+    
+    def _record_regime(self, result: MarketRegimeResult):
+        """Append a reading to the bounded regime history"""
+        self.regime_history.append(
+            MARKET_HISTORY_KEY,
+            result.timestamp,
+            market_regime=result.market_regime.value,
+            volatility_regime=result.volatility_regime.value,
+            risk_environment=result.risk_environment.value,
+            fundamental_health=result.fundamental_health.value,
+            confidence_score=result.confidence_score,
+            regime_start=self._regime_start_date.timestamp(),
+            regime_duration=result.regime_duration
+        )
     
     def _get_neutral_regime(self) -> MarketRegimeResult:
         """Return neutral regime on error"""
@@ -443,25 +454,6 @@ class CryptoMarketRegimeAnalyzer:
             signals={},
             timestamp=datetime.now()
         )
-    
-    def _calculate_atr(self, data: pd.DataFrame, period: int) -> pd.Series:
-        """Calculate Average True Range"""
-        high_low = data['high'] - data['low']
-        high_close = np.abs(data['high'] - data['close'].shift())
-        low_close = np.abs(data['low'] - data['close'].shift())
-        
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        
-        return true_range.rolling(period).mean()
-    
-    def _calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
-        """Calculate RSI"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
 
 
 def get_strategy_permissions(regime_result: MarketRegimeResult) -> Dict[str, Dict[str, float]]:
@@ -0,0 +1,488 @@
+"""
+Regime Engine - Shared Incremental Regime Features
+Computes every feature the regime analyzers need in one vectorized pass
+over the OHLCV arrays and keeps rolling state between calls, so new
+candles are folded in without rescanning the full history.
+
+Key Features:
+- One pass for trend, volatility, structure, volume, smart money and
+  momentum features (EMAs, ATR, Bollinger width, RSI, VWAP, percentiles)
+- update() folds in one candle touching only fixed-size trailing
+  windows, so its cost does not grow with the history length
+- sync() feeds only the candles a caller has not passed before
+- history() returns a per-bar regime series for backtests
+"""
+
+import logging
+from collections import deque
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+EMA_SPANS = (8, 21, 50, 200)
+
+FEATURE_COLUMNS = (
+    'close', 'ema_8', 'ema_21', 'ema_50', 'ema_200', 'ema_21_slope', 'ema_50_slope',
+    'atr_14', 'atr_rank_50', 'atr_percentile', 'volatility_trend',
+    'band_width', 'band_width_percentile', 'rsi_14', 'rsi_trend',
+    'momentum_10', 'momentum_10d', 'momentum_30d', 'volume_ratio',
+    'price_stability', 'price_volume_correlation', 'structure',
+    'volume_flow', 'vwap_strength', 'smart_money_activity',
+)
+
+SIGNAL_WEIGHTS = {
+    'trend': 0.3,
+    'structure': 0.25,
+    'smart_money': 0.2,
+    'momentum': 0.15,
+    'volume': 0.1,
+    'volatility': 0.1,
+}
+
+# ATR and RSI period; smoothed with Wilder's EWM (alpha=1/n, like TA-Lib)
+# or a simple moving average, per engine
+SMOOTHING_PERIOD = 14
+SMOOTHING_METHODS = ('wilder', 'sma')
+
+# Trailing values kept per series so update() can window them
+_STATE_WINDOWS = {
+    'close': 20, 'high': 5, 'low': 5, 'volume': 20,
+    'true_range': 14, 'gain': 14, 'loss': 14, 'returns': 30,
+    'volume_change': 10, 'typical_volume': 20, 'atr_14': 100, 'atr_pct': 50,
+    'band_width': 100, 'rsi_14': 10, 'high_5': 10, 'low_5': 10,
+    'flow': 10, 'vwap_distance': 5, 'efficient_volume': 10,
+    'ema_21': 5, 'ema_50': 10,
+}
+
+
+def _trailing_windows(values: np.ndarray, size: int) -> np.ndarray:
+    """One row of the trailing `size` values per bar, NaN padded before the first bar"""
+    padded = np.concatenate([np.full(size - 1, np.nan), values])
+    return sliding_window_view(padded, size)
+
+
+def _average_rank_pct(windows: np.ndarray) -> np.ndarray:
+    """pandas rolling rank(pct=True) of the last value in each window"""
+    current = windows[:, -1:]
+    less = (windows < current).sum(axis=-1)
+    equal = (windows == current).sum(axis=-1)
+    result = (less + (equal + 1) / 2) / windows.shape[-1]
+    result[np.isnan(windows).any(axis=-1)] = np.nan
+    return result
+
+
+def _share_at_or_below(windows: np.ndarray, bars: np.ndarray) -> np.ndarray:
+    """Share of the trailing values (up to the window size) at or below the last one"""
+    at_or_below = (windows <= windows[:, -1:]).sum(axis=-1)
+    return at_or_below / np.minimum(bars, windows.shape[-1])
+
+
+def _row_corr(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    dx = x - x.mean(axis=-1, keepdims=True)
+    dy = y - y.mean(axis=-1, keepdims=True)
+    return (dx * dy).sum(axis=-1) / np.sqrt((dx * dx).sum(axis=-1) * (dy * dy).sum(axis=-1))
+
+
+def _structure_score(highs: np.ndarray, lows: np.ndarray) -> np.ndarray:
+    """Higher highs/lows minus lower highs/lows across the window, scaled to [-0.9, 0.9]"""
+    high_diff = np.diff(highs, axis=-1)
+    low_diff = np.diff(lows, axis=-1)
+    bullish = (high_diff > 0).sum(axis=-1) + (low_diff > 0).sum(axis=-1)
+    bearish = (high_diff < 0).sum(axis=-1) + (low_diff < 0).sum(axis=-1)
+    return (bullish - bearish) / 20
+
+
+def _wilder_series(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder-smoothed series (NaN until `period` values have been seen)"""
+    return pd.Series(values).ewm(
+        alpha=1 / period, adjust=False, ignore_na=True, min_periods=period
+    ).mean().to_numpy(dtype=float)
+
+
+def _derive_features(window: Callable[[str, int], np.ndarray],
+                     emit: Callable[[str, np.ndarray], None],
+                     smooth: Callable[[str, np.ndarray], np.ndarray],
+                     emas: Dict[int, np.ndarray],
+                     bars: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Feature formulas shared by the vectorized and incremental paths.
+
+    window(name, size) returns the trailing values of a series as rows
+    (one per bar, oldest first); emit(name, values) records a derived
+    series so later stages can window it; smooth(name, values) records
+    a bar-level series and returns its ATR/RSI smoothing. The raw
+    close/high/low/volume series must already be available.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        close_pair = window('close', 2)
+        close, prev_close = close_pair[:, 1], close_pair[:, 0]
+        high = window('high', 1)[:, 0]
+        low = window('low', 1)[:, 0]
+        volume_pair = window('volume', 2)
+        volume = volume_pair[:, 1]
+
+        # Bar-level inputs
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        delta = close - prev_close
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+        returns = close / prev_close - 1
+        emit('returns', returns)
+        emit('volume_change', volume / volume_pair[:, 0] - 1)
+        emit('typical_volume', (high + low + close) / 3 * volume)
+
+        # Volatility
+        atr = smooth('true_range', true_range)
+        emit('atr_14', atr)
+        emit('atr_pct', atr / close * 100)
+        atr_history = window('atr_14', 100)
+        atr_recent = atr_history[:, -10:]
+
+        closes = window('close', 20)
+        bb_middle = closes.mean(axis=-1)
+        bb_std = closes.std(axis=-1, ddof=1)
+        band_width = ((bb_middle + bb_std * 2) - (bb_middle - bb_std * 2)) / bb_middle
+        emit('band_width', band_width)
+
+        # Momentum
+        average_gain = smooth('gain', gain)
+        average_loss = smooth('loss', loss)
+        rsi = 100 - 100 / (1 + average_gain / average_loss)
+        emit('rsi_14', rsi)
+        rsi_recent = window('rsi_14', 10)
+
+        # Volume and structure
+        volumes = window('volume', 20)
+        volume_ma_20 = volumes.mean(axis=-1)
+        recent_closes = closes[:, -7:]
+
+        emit('high_5', window('high', 5).max(axis=-1))
+        emit('low_5', window('low', 5).min(axis=-1))
+        emit('flow', returns * (volume / volume_ma_20))
+
+        # Smart money: VWAP distance and large volume on tight ranges
+        vwap = window('typical_volume', 20).sum(axis=-1) / volumes.sum(axis=-1)
+        emit('vwap_distance', (close - vwap) / vwap)
+        large_volume = volume > np.quantile(volumes, 0.8, axis=-1)
+        efficient = (high - low) / close < 0.02
+        emit('efficient_volume', (large_volume & efficient).astype(float))
+
+        emit('ema_21', emas[21])
+        emit('ema_50', emas[50])
+
+        return {
+            'close': close,
+            'ema_8': emas[8],
+            'ema_21': emas[21],
+            'ema_50': emas[50],
+            'ema_200': emas[200],
+            'ema_21_slope': emas[21] / window('ema_21', 5)[:, 0] - 1,
+            'ema_50_slope': emas[50] / window('ema_50', 10)[:, 0] - 1,
+            'atr_14': atr,
+            'atr_rank_50': _average_rank_pct(window('atr_pct', 50)),
+            'atr_percentile': _share_at_or_below(atr_history, bars),
+            'volatility_trend': (atr_recent[:, 1:] / atr_recent[:, :-1] - 1).mean(axis=-1),
+            'band_width': band_width,
+            'band_width_percentile': _share_at_or_below(window('band_width', 100), bars),
+            'rsi_14': rsi,
+            'rsi_trend': rsi_recent[:, 5:].mean(axis=-1) - rsi_recent[:, :5].mean(axis=-1),
+            'momentum_10': close / window('close', 11)[:, 0] - 1,
+            'momentum_10d': window('returns', 10).mean(axis=-1),
+            'momentum_30d': window('returns', 30).mean(axis=-1),
+            'volume_ratio': volumes[:, -5:].mean(axis=-1) / volume_ma_20,
+            'price_stability': 1 - recent_closes.std(axis=-1, ddof=1) / recent_closes.mean(axis=-1),
+            'price_volume_correlation': _row_corr(window('returns', 10), window('volume_change', 10)),
+            'structure': _structure_score(window('high_5', 10), window('low_5', 10)),
+            'volume_flow': window('flow', 10).mean(axis=-1),
+            'vwap_strength': window('vwap_distance', 5).mean(axis=-1),
+            'smart_money_activity': window('efficient_volume', 10).mean(axis=-1),
+        }
+
+
+def regime_signals(features: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Per-bar regime signals in [-1, 1] (bull positive) from engine features.
+    Features still warming up read as neutral (0).
+    """
+    f = {key: np.asarray(value, dtype=float) for key, value in features.items()}
+    close = f['close']
+
+    with np.errstate(invalid='ignore'):
+        # Trend: price above each EMA plus EMA slope adjustments
+        trend_score = sum((close > f[f'ema_{span}']) * 0.25 for span in EMA_SPANS)
+        trend_score = trend_score + np.select(
+            [f['ema_21_slope'] > 0.02, f['ema_21_slope'] < -0.02], [0.1, -0.1], 0.0
+        )
+        trend_score = trend_score + np.select(
+            [f['ema_50_slope'] > 0.01, f['ema_50_slope'] < -0.01], [0.05, -0.05], 0.0
+        )
+
+        # High vol = transition/bear, low vol = sideways, medium vol = bull
+        volatility = np.select([f['atr_rank_50'] > 0.8, f['atr_rank_50'] < 0.2], [-0.5, 0.0], 0.3)
+
+        momentum = ((f['rsi_14'] - 50) / 50 + f['momentum_10'] * 10) / 2
+
+        signals = {
+            'trend': np.clip(trend_score * 2 - 1, -1, 1),
+            'volatility': volatility,
+            'structure': f['structure'],
+            'volume': np.clip(f['volume_flow'] * 10, -1, 1),
+            'smart_money': np.clip(f['vwap_strength'] + f['smart_money_activity'], -1, 1),
+            'momentum': np.clip(momentum, -1, 1),
+        }
+
+    return {key: np.nan_to_num(value, nan=0.0) for key, value in signals.items()}
+
+
+def composite_regime(signals: Mapping[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Weighted composite score and regime per bar.
+
+    Returns:
+        (composite, regime, confidence, strength) where regime holds
+        'bull', 'bear', 'sideways' or 'transition'
+    """
+    values = {key: np.asarray(value, dtype=float) for key, value in signals.items()}
+    composite = sum(values[key] * weight for key, weight in SIGNAL_WEIGHTS.items() if key in values)
+    composite = np.asarray(composite, dtype=float)
+
+    conditions = [composite > 0.3, composite < -0.3, np.abs(composite) < 0.15]
+    regime = np.select(conditions, ['bull', 'bear', 'sideways'], 'transition')
+    confidence = np.select(
+        conditions,
+        [np.minimum(composite, 0.95), np.minimum(np.abs(composite), 0.95), 1 - np.abs(composite) * 3],
+        0.6,
+    )
+
+    # Strength scales confidence by how much the individual signals agree
+    agreement = 1 - np.std(np.stack(list(values.values())), axis=0) / 2
+    return composite, regime, confidence, confidence * agreement
+
+
+def _run_lengths(labels: np.ndarray) -> np.ndarray:
+    """Bars since each label's run started (0 on the bar the label changes)"""
+    if len(labels) == 0:
+        return np.zeros(0, dtype=int)
+    positions = np.arange(len(labels))
+    changed = np.concatenate([[True], labels[1:] != labels[:-1]])
+    run_start = np.maximum.accumulate(np.where(changed, positions, 0))
+    return positions - run_start
+
+
+def _row_state(row: pd.Series) -> Dict[str, object]:
+    state = {key: float(value) for key, value in row.items() if key not in ('regime', 'duration')}
+    state['regime'] = str(row['regime'])
+    state['duration'] = int(row['duration'])
+    return state
+
+
+def _bar_keys(df: pd.DataFrame) -> np.ndarray:
+    if 'timestamp' in df.columns:
+        return df['timestamp'].to_numpy()
+    return df.index.to_numpy()
+
+
+class RegimeEngine:
+    """
+    Rolling regime feature state for one market.
+
+    history() computes the full feature and regime series in one
+    vectorized pass and seeds the rolling state from its tail; update()
+    then folds in one candle at a time with the same formulas, and
+    sync() feeds only the candles that are new since the last call.
+    """
+
+    def __init__(self, rebuild_after: int = 16, smoothing: str = 'wilder'):
+        """
+        Args:
+            rebuild_after: sync() recomputes via history() instead of
+                looping update() when more new candles than this arrive
+            smoothing: 'wilder' (TA-Lib ATR/RSI) or 'sma' (14-bar rolling
+                means, as the pandas-based analyzers compute them)
+        """
+        if smoothing not in SMOOTHING_METHODS:
+            raise ValueError(f"Unknown smoothing {smoothing!r}, expected one of {SMOOTHING_METHODS}")
+        self.rebuild_after = rebuild_after
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self._series = {name: deque(maxlen=size) for name, size in _STATE_WINDOWS.items()}
+        self._ema_state = {span: [0.0, 0.0] for span in EMA_SPANS}
+        # Wilder series -> [smoothed value, values seen]
+        self._wilder_state: Dict[str, list] = {}
+        self._bars = 0
+        self._last_key = None
+        self._latest: Dict[str, object] = {}
+
+    @property
+    def bars(self) -> int:
+        """Number of candles folded into the state"""
+        return self._bars
+
+    @property
+    def latest(self) -> Dict[str, object]:
+        """Features, signals and regime of the most recent candle"""
+        return dict(self._latest)
+
+    def history(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feature, signal and regime series for every bar of df in one pass.
+        Also resets the rolling state to the end of df.
+        """
+        series = {name: df[name].to_numpy(dtype=float) for name in ('close', 'high', 'low', 'volume')}
+        bars = np.arange(1, len(df) + 1)
+        emas = {span: df['close'].ewm(span=span).mean().to_numpy(dtype=float) for span in EMA_SPANS}
+        wilder_inputs: Dict[str, np.ndarray] = {}
+
+        def smooth(name: str, values: np.ndarray) -> np.ndarray:
+            series[name] = values
+            if self.smoothing == 'sma':
+                return _trailing_windows(values, SMOOTHING_PERIOD).mean(axis=-1)
+            wilder_inputs[name] = values
+            return _wilder_series(values, SMOOTHING_PERIOD)
+
+        features = _derive_features(
+            lambda name, size: _trailing_windows(series[name], size),
+            series.__setitem__, smooth, emas, bars,
+        )
+        signals = regime_signals(features)
+        composite, regime, confidence, strength = composite_regime(signals)
+
+        frame = pd.DataFrame({key: features[key] for key in FEATURE_COLUMNS}, index=df.index)
+        for key, values in signals.items():
+            frame[key] = values
+        frame['composite'] = composite
+        frame['regime'] = regime
+        frame['confidence'] = confidence
+        frame['strength'] = strength
+        frame['duration'] = _run_lengths(regime)
+
+        self._seed_state(series, df['close'].to_numpy(dtype=float), wilder_inputs)
+        self._last_key = _bar_keys(df)[-1] if len(df) else None
+        self._latest = _row_state(frame.iloc[-1]) if len(df) else {}
+        return frame
+
+    def update(self, candle: Mapping[str, float]) -> Dict[str, object]:
+        """Fold one closed candle (high/low/close/volume) into the state"""
+        for name in ('close', 'high', 'low', 'volume'):
+            self._series[name].append(float(candle[name]))
+        self._bars += 1
+
+        close = float(candle['close'])
+        emas = {}
+        for span, state in self._ema_state.items():
+            decay = 1 - 2 / (span + 1)
+            valid = not np.isnan(close)
+            state[0] = decay * state[0] + (close if valid else 0.0)
+            state[1] = decay * state[1] + valid
+            emas[span] = np.array([state[0] / state[1] if state[1] > 0 else np.nan])
+
+        features = _derive_features(self._window, self._emit, self._smooth, emas, np.array([self._bars]))
+        signals = regime_signals(features)
+        composite, regime, confidence, strength = composite_regime(signals)
+
+        previous_regime = self._latest.get('regime')
+        latest = {key: float(features[key][0]) for key in FEATURE_COLUMNS}
+        latest.update({key: float(value[0]) for key, value in signals.items()})
+        latest['composite'] = float(composite[0])
+        latest['regime'] = str(regime[0])
+        latest['confidence'] = float(confidence[0])
+        latest['strength'] = float(strength[0])
+        latest['duration'] = self._latest.get('duration', 0) + 1 if previous_regime == latest['regime'] else 0
+
+        self._last_key = candle.get('timestamp') if hasattr(candle, 'get') else None
+        self._latest = latest
+        return dict(latest)
+
+    def sync(self, df: pd.DataFrame) -> Dict[str, object]:
+        """
+        Bring the state up to the last bar of df.
+
+        Only candles after the last one seen are folded in; if df does not
+        extend the data seen so far (or too many candles are new), the
+        state is rebuilt with history().
+        """
+        if df is None or len(df) == 0:
+            return self.latest
+
+        keys = _bar_keys(df)
+        start = self._resume_position(keys, df['close'].to_numpy(dtype=float))
+        if start is None or len(df) - start > self.rebuild_after:
+            self.history(df)
+            return self.latest
+
+        if start < len(df):
+            new_rows = df.iloc[start:]
+            for row in new_rows[['close', 'high', 'low', 'volume']].itertuples(index=False):
+                self.update(row._asdict())
+            self._last_key = keys[-1]
+        return self.latest
+
+    def _resume_position(self, keys: np.ndarray, close: np.ndarray) -> Optional[int]:
+        if self._last_key is None or not self._series['close']:
+            return None
+        matches = np.flatnonzero(keys == self._last_key)
+        if len(matches) == 0:
+            return None
+        position = matches[-1]
+        # Same key but a different close means the caller's data changed
+        if close[position] != self._series['close'][-1]:
+            return None
+        return position + 1
+
+    def _seed_state(self, series: Dict[str, np.ndarray], close: np.ndarray,
+                    wilder_inputs: Dict[str, np.ndarray]):
+        for name, size in _STATE_WINDOWS.items():
+            self._series[name] = deque(series[name][-size:].tolist(), maxlen=size)
+        self._bars = len(close)
+
+        # Last smoothed value (before the min_periods mask) and values seen
+        self._wilder_state = {}
+        for name, values in wilder_inputs.items():
+            valid = values[~np.isnan(values)]
+            if len(valid):
+                last = pd.Series(valid).ewm(alpha=1 / SMOOTHING_PERIOD, adjust=False).mean().iloc[-1]
+                self._wilder_state[name] = [float(last), len(valid)]
+
+        # Recover the adjust=True EMA numerator/denominator at the last bar
+        valid = ~np.isnan(close)
+        for span in EMA_SPANS:
+            decay = 1 - 2 / (span + 1)
+            weights = decay ** np.arange(len(close) - 1, -1, -1)
+            self._ema_state[span] = [
+                float(np.sum(weights[valid] * close[valid])),
+                float(np.sum(weights[valid])),
+            ]
+
+    def _window(self, name: str, size: int) -> np.ndarray:
+        values = self._series[name]
+        row = np.full(size, np.nan)
+        tail = list(values)[-size:]
+        if tail:
+            row[size - len(tail):] = tail
+        return row[None, :]
+
+    def _emit(self, name: str, values: np.ndarray):
+        self._series[name].append(float(values[0]))
+
+    def _smooth(self, name: str, values: np.ndarray) -> np.ndarray:
+        self._emit(name, values)
+        if self.smoothing == 'sma':
+            return self._window(name, SMOOTHING_PERIOD).mean(axis=-1)
+
+        value = float(values[0])
+        state = self._wilder_state.get(name)
+        if not np.isnan(value):
+            if state is None:
+                state = self._wilder_state[name] = [value, 0]
+            else:
+                state[0] += (value - state[0]) / SMOOTHING_PERIOD
+            state[1] += 1
+        if state is None or state[1] < SMOOTHING_PERIOD:
+            return np.array([np.nan])
+        return np.array([state[0]])
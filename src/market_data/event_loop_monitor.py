@@ -0,0 +1,114 @@
+"""
+Event Loop Lag Monitor
+
+Detects callbacks that block the asyncio event loop. A probe coroutine
+sleeps for a fixed interval and measures how late it wakes up; any lag
+beyond the threshold means something held the loop for that long.
+
+Key Features:
+- Lag samples, stall count and worst stall for status endpoints
+- Optional asyncio debug mode so the slow callback itself gets logged
+- Usable as an async context manager around any workload
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopLagMonitor:
+    """Periodic probe that reports event-loop stalls."""
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.005,
+        identify_callbacks: bool = False,
+        on_stall: Optional[Callable[[float], None]] = None,
+    ):
+        """Configure the monitor.
+
+        Args:
+            interval: Seconds between probes
+            threshold: Lag in seconds reported as a stall
+            identify_callbacks: Enable asyncio debug mode so the callback
+                responsible for a stall is logged by name (adds overhead)
+            on_stall: Called with the lag in seconds for every stall
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.identify_callbacks = identify_callbacks
+        self.on_stall = on_stall
+        self._task: Optional[asyncio.Task] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear collected statistics."""
+        self.samples = 0
+        self.stalls = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.last_stall: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start probing the running loop."""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        if self.identify_callbacks:
+            loop.set_debug(True)
+            loop.slow_callback_duration = self.threshold
+        self._task = loop.create_task(self._probe(loop))
+
+    async def stop(self) -> None:
+        """Stop probing."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _probe(self, loop: asyncio.AbstractEventLoop) -> None:
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self._record(max(0.0, loop.time() - started - self.interval))
+
+    def _record(self, lag: float) -> None:
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.threshold:
+            self.stalls += 1
+            self.last_stall = lag
+            logger.warning(f"⏱️ Event loop blocked for {lag * 1000:.1f} ms")
+            if self.on_stall:
+                self.on_stall(lag)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lag statistics in milliseconds."""
+        return {
+            "running": self.running,
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "threshold_ms": self.threshold * 1000,
+            "mean_lag_ms": self.total_lag / self.samples * 1000 if self.samples else 0.0,
+            "max_lag_ms": self.max_lag * 1000,
+            "last_stall_ms": self.last_stall * 1000 if self.last_stall is not None else None,
+        }
+
+    async def __aenter__(self) -> "EventLoopLagMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
@@ -0,0 +1,160 @@
+"""
+Async Exchange Adapter
+
+Gives async code a non-blocking interface to CCXT exchanges. Synchronous
+CCXT clients run on a small per-exchange thread pool so a slow response
+only ties up one worker, never the event loop; ``ccxt.async_support``
+clients are awaited directly.
+
+Key Features:
+- One shared adapter (and worker pool) per exchange via get_exchange_adapter()
+- Per-call timeouts on every request
+- Call, timeout and error counters for monitoring, also reported to the
+  metrics registry with request latency and in-flight (queued) calls
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import ccxt
+    CCXT_AVAILABLE = True
+except ImportError:
+    CCXT_AVAILABLE = False
+    ccxt = None
+
+try:
+    from src.monitoring.metrics import EXCHANGE_ERRORS, EXCHANGE_IN_FLIGHT, EXCHANGE_LATENCY, EXCHANGE_REQUESTS
+except ImportError:  # imported with src/ on the path
+    from monitoring.metrics import EXCHANGE_ERRORS, EXCHANGE_IN_FLIGHT, EXCHANGE_LATENCY, EXCHANGE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+class ExchangeAdapter:
+    """Async wrapper around a single CCXT exchange instance."""
+
+    def __init__(self, exchange: Any, max_workers: int = 4, timeout: float = 15.0):
+        """Wrap an exchange.
+
+        Args:
+            exchange: CCXT exchange instance (sync or async_support)
+            max_workers: Concurrent blocking requests allowed for this exchange
+            timeout: Default per-call timeout in seconds
+        """
+        self.exchange = exchange
+        self.timeout = timeout
+        self.name = getattr(exchange, "id", None) or type(exchange).__name__
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"exchange-{self.name}"
+        )
+        self.stats = {"calls": 0, "timeouts": 0, "errors": 0}
+        self._in_flight = EXCHANGE_IN_FLIGHT.labels(self.name)
+
+    async def call(self, method: str, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Call an exchange method without blocking the event loop.
+
+        Raises:
+            asyncio.TimeoutError: If the call takes longer than ``timeout``.
+                A blocking request that times out keeps its worker until
+                CCXT's own HTTP timeout releases it.
+        """
+        func = getattr(self.exchange, method)
+        timeout = self.timeout if timeout is None else timeout
+        self.stats["calls"] += 1
+        EXCHANGE_REQUESTS.labels(self.name, method).inc()
+
+        self._in_flight.inc()
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(func):
+                pending = func(*args, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                pending = loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+            return await asyncio.wait_for(pending, timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            EXCHANGE_ERRORS.labels(self.name, method, "timeout").inc()
+            logger.warning(f"{self.name}.{method} timed out after {timeout:.1f}s")
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            EXCHANGE_ERRORS.labels(self.name, method, type(e).__name__).inc()
+            raise
+        finally:
+            self._in_flight.dec()
+            EXCHANGE_LATENCY.labels(self.name, method).observe(time.perf_counter() - started)
+
+    async def fetch_ohlcv(
+        self, symbol: str, timeframe: str = "1m", since: Optional[int] = None,
+        limit: Optional[int] = None, timeout: Optional[float] = None,
+    ) -> List[List[float]]:
+        """Fetch OHLCV candles."""
+        return await self.call("fetch_ohlcv", symbol, timeframe, since, limit, timeout=timeout)
+
+    async def fetch_order_book(
+        self, symbol: str, limit: Optional[int] = None, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Fetch the order book."""
+        return await self.call("fetch_order_book", symbol, limit, timeout=timeout)
+
+    async def fetch_ticker(self, symbol: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Fetch the 24h ticker."""
+        return await self.call("fetch_ticker", symbol, timeout=timeout)
+
+    async def fetch_status(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Fetch exchange status."""
+        return await self.call("fetch_status", timeout=timeout)
+
+    async def load_markets(self, reload: bool = False, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Load (or return cached) markets."""
+        return await self.call("load_markets", reload, timeout=timeout)
+
+    async def close(self) -> None:
+        """Close the exchange session and release the worker pool."""
+        closer = getattr(self.exchange, "close", None)
+        try:
+            if asyncio.iscoroutinefunction(closer):
+                await closer()
+            elif callable(closer):
+                await asyncio.get_running_loop().run_in_executor(self._executor, closer)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+_adapters: Dict[Tuple[str, str], ExchangeAdapter] = {}
+_adapters_lock = threading.Lock()
+
+
+def get_exchange_adapter(
+    exchange_id: str = "binance",
+    config: Optional[Dict[str, Any]] = None,
+    max_workers: int = 4,
+    timeout: float = 15.0,
+) -> ExchangeAdapter:
+    """Return the shared adapter for an exchange, creating it on first use.
+
+    Adapters are keyed on exchange id and API key, so public-data clients
+    share one connection while authenticated clients get their own.
+
+    Raises:
+        RuntimeError: If CCXT is not installed
+    """
+    config = config or {}
+    key = (exchange_id, config.get("apiKey", ""))
+    with _adapters_lock:
+        adapter = _adapters.get(key)
+        if adapter is None:
+            if not CCXT_AVAILABLE:
+                raise RuntimeError("CCXT not available")
+            exchange = getattr(ccxt, exchange_id)(config)
+            adapter = ExchangeAdapter(exchange, max_workers=max_workers, timeout=timeout)
+            _adapters[key] = adapter
+            logger.info(f"Exchange adapter created for {exchange_id}")
+        return adapter
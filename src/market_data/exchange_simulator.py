@@ -0,0 +1,926 @@
+"""
+Local Exchange Simulator
+
+An in-process exchange with a CCXT-compatible async surface for paper
+trading and load-testing the execution stack offline. Each symbol has a
+price-time-priority limit order book driven by a stream of market trades
+(recorded, rebuilt from OHLCV candles, or synthetic).
+
+Key Features:
+- Market depth around the last trade price that aggressive orders walk
+  through, so large orders pay for their size (market impact)
+- Partial fills, IOC/FOK/post-only limit orders and stop orders
+- Queue position for resting orders: market trades at an order's price
+  fill the liquidity ahead of it first
+- Maker/taker fee schedules with volume tiers
+- Injected order latency on a simulation clock that runs at an
+  accelerated wall-clock speed, or only when advanced explicitly
+
+Usage:
+    sim = ExchangeSimulator(
+        markets=[SimulatedMarket("BTC/USDT", tick_size=0.5, level_amount=2.0)],
+        trades={"BTC/USDT": synthetic_trades(45000, seed=1)},
+        balances={"USDT": 100_000},
+        latency_ms=25,
+    )
+    order = await sim.create_order("BTC/USDT", "limit", "buy", 0.5, 44990)
+    sim.advance(60)  # replay a minute of market trades
+    order = await sim.fetch_order(order["id"])
+"""
+
+import asyncio
+import bisect
+import heapq
+import itertools
+import logging
+import math
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from ccxt.base.errors import BadSymbol, InsufficientFunds, InvalidOrder, OrderNotFound
+    CCXT_AVAILABLE = True
+except ImportError:
+    CCXT_AVAILABLE = False
+
+    class BadSymbol(Exception):
+        pass
+
+    class InsufficientFunds(Exception):
+        pass
+
+    class InvalidOrder(Exception):
+        pass
+
+    class OrderNotFound(Exception):
+        pass
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAME_MS = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+EPSILON = 1e-12
+
+
+@dataclass
+class FeeSchedule:
+    """Maker/taker fee rates, optionally tiered by traded quote volume.
+
+    Tiers are (minimum traded volume, maker rate, taker rate); the highest
+    tier reached applies.
+    """
+
+    maker: float = 0.001
+    taker: float = 0.001
+    tiers: Sequence[Tuple[float, float, float]] = ()
+
+    def rates(self, traded_volume: float) -> Tuple[float, float]:
+        maker, taker = self.maker, self.taker
+        for minimum, tier_maker, tier_taker in sorted(self.tiers):
+            if traded_volume >= minimum:
+                maker, taker = tier_maker, tier_taker
+        return maker, taker
+
+
+@dataclass
+class SimulatedMarket:
+    """Trading rules and market depth of one symbol.
+
+    The book shows ``depth_levels`` price levels of ``level_amount`` each on
+    both sides of the last market trade. Liquidity taken by orders
+    refills by ``refill_rate`` on every market trade.
+    """
+
+    symbol: str
+    tick_size: float = 0.01
+    min_amount: float = 0.0
+    depth_levels: int = 20
+    level_amount: float = 1.0
+    refill_rate: float = 0.5
+
+    @property
+    def base(self) -> str:
+        return self.symbol.split("/")[0]
+
+    @property
+    def quote(self) -> str:
+        return self.symbol.split("/")[1].split(":")[0]
+
+
+class SimulationClock:
+    """Simulation time in epoch milliseconds.
+
+    With a ``speed`` the clock runs that many times faster than the wall
+    clock; without one it only moves when advanced.
+    """
+
+    def __init__(self, start_ms: int, speed: Optional[float] = None):
+        self.speed = speed
+        self._start_ms = start_ms
+        self._manual_ms = start_ms
+        self._wall_start = time.perf_counter()
+
+    def now_ms(self) -> int:
+        if self.speed is None:
+            return self._manual_ms
+        return self._start_ms + int((time.perf_counter() - self._wall_start) * 1000 * self.speed)
+
+    def advance_to(self, ms: int) -> None:
+        if self.speed is not None:
+            raise RuntimeError("An accelerated clock cannot be advanced manually")
+        self._manual_ms = max(self._manual_ms, int(ms))
+
+    async def sleep_until(self, ms: int) -> None:
+        """Wait until simulation time ``ms`` (scaled wall time, or a manual jump)"""
+        if self.speed is None:
+            self.advance_to(ms)
+        else:
+            delay = (ms - self.now_ms()) / 1000 / self.speed
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+
+class _Order:
+    """Exchange-side order state; rendered in CCXT format by ``to_ccxt``."""
+
+    __slots__ = (
+        "id", "client_id", "symbol", "type", "side", "price", "ticks", "amount", "filled", "cost",
+        "fee", "fee_currency", "status", "timestamp", "last_trade_ts", "time_in_force", "post_only",
+        "stop_price", "reserve_per_unit", "trades",
+    )
+
+    def __init__(self, order_id, symbol, order_type, side, amount, price, ticks, timestamp, params, fee_currency):
+        self.id = order_id
+        self.client_id = params.get("clientOrderId")
+        self.symbol = symbol
+        self.type = order_type
+        self.side = side
+        self.price = price
+        self.ticks = ticks
+        self.amount = amount
+        self.filled = 0.0
+        self.cost = 0.0
+        self.fee = 0.0
+        self.fee_currency = fee_currency
+        self.status = "open"
+        self.timestamp = timestamp
+        self.last_trade_ts = None
+        self.post_only = bool(params.get("postOnly")) or params.get("timeInForce") == "PO"
+        self.time_in_force = "PO" if self.post_only else params.get("timeInForce", "GTC" if order_type == "limit" else "IOC")
+        self.stop_price = params.get("stopPrice", params.get("triggerPrice"))
+        self.reserve_per_unit = 0.0
+        self.trades: List[Dict[str, Any]] = []
+
+    @property
+    def remaining(self) -> float:
+        return max(self.amount - self.filled, 0.0)
+
+    def to_ccxt(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "clientOrderId": self.client_id,
+            "timestamp": self.timestamp,
+            "datetime": _iso(self.timestamp),
+            "lastTradeTimestamp": self.last_trade_ts,
+            "symbol": self.symbol,
+            "type": self.type,
+            "timeInForce": self.time_in_force,
+            "postOnly": self.post_only,
+            "side": self.side,
+            "price": self.price,
+            "stopPrice": self.stop_price,
+            "triggerPrice": self.stop_price,
+            "average": self.cost / self.filled if self.filled else None,
+            "amount": self.amount,
+            "filled": self.filled,
+            "remaining": self.remaining,
+            "cost": self.cost,
+            "status": self.status,
+            "fee": {"cost": self.fee, "currency": self.fee_currency},
+            "trades": list(self.trades),
+            "info": {},
+        }
+
+
+class _Level:
+    """Resting orders at one price, behind ``ahead`` of market liquidity."""
+
+    __slots__ = ("ahead", "orders")
+
+    def __init__(self, ahead: float):
+        self.ahead = ahead
+        self.orders: deque = deque()
+
+
+class _BookSide:
+    """One side of a book, keyed so that lower keys are better prices.
+
+    Asks use the price in ticks as key and bids its negation, so both
+    sides are walked in ascending key order.
+    """
+
+    def __init__(self, sign: int):
+        self.sign = sign
+        self.keys: List[int] = []
+        self.levels: Dict[int, _Level] = {}
+        self.consumed: Dict[int, float] = {}
+
+    def add(self, key: int, ahead: float) -> _Level:
+        level = self.levels.get(key)
+        if level is None:
+            level = self.levels[key] = _Level(ahead)
+            bisect.insort(self.keys, key)
+        return level
+
+    def discard_if_empty(self, key: int) -> None:
+        level = self.levels.get(key)
+        if level is not None and not level.orders:
+            del self.levels[key]
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+
+class _SymbolBook:
+    """Order book, market state and candles of one simulated symbol."""
+
+    def __init__(self, market: SimulatedMarket, trades: Optional[Iterable[Dict[str, Any]]]):
+        self.market = market
+        self.bids = _BookSide(-1)
+        self.asks = _BookSide(1)
+        self.last: Optional[int] = None  # last market trade, in ticks
+        self.last_side = "buy"
+        self.stops: List[_Order] = []
+        self.stream: Optional[Iterator[Dict[str, Any]]] = iter(trades) if trades is not None else None
+        self.recent_trades: deque = deque(maxlen=1000)
+        self.candles: deque = deque(maxlen=10_000)  # 1m [ts, open, high, low, close, volume]
+
+    def to_ticks(self, price: float) -> int:
+        return int(round(price / self.market.tick_size))
+
+    def to_price(self, ticks: int) -> float:
+        return round(ticks * self.market.tick_size, 12)
+
+    def market_amount(self, side: _BookSide, key: int) -> float:
+        """Market liquidity shown at a key (zero off the depth ladder)"""
+        if self.last is None:
+            return 0.0
+        distance = key - side.sign * self.last
+        if 1 <= distance <= self.market.depth_levels:
+            return max(self.market.level_amount - side.consumed.get(key, 0.0), 0.0)
+        return 0.0
+
+    def queue_ahead(self, side: _BookSide, key: int) -> float:
+        """Market liquidity a new resting order at ``key`` queues behind"""
+        if self.last is None or key - side.sign * self.last < 1:
+            return 0.0
+        return self.market_amount(side, key) if key - side.sign * self.last <= self.market.depth_levels \
+            else self.market.level_amount
+
+
+def _iso(timestamp: Optional[int]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _timeframe_ms(timeframe: str) -> int:
+    try:
+        return int(timeframe[:-1]) * TIMEFRAME_MS[timeframe[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported timeframe {timeframe}")
+
+
+class ExchangeSimulator:
+    """In-process exchange with a CCXT-compatible async interface.
+
+    One instance is one venue with one trading account. Market trades are
+    replayed as the simulation clock moves; orders reach the matching
+    engine ``latency_ms`` (plus jitter) after they are sent.
+    """
+
+    id = "simulator"
+    name = "Exchange Simulator"
+
+    def __init__(
+        self,
+        markets: Sequence[SimulatedMarket],
+        trades: Optional[Dict[str, Iterable[Dict[str, Any]]]] = None,
+        balances: Optional[Dict[str, float]] = None,
+        fees: Optional[FeeSchedule] = None,
+        latency_ms: float = 0.0,
+        latency_jitter_ms: float = 0.0,
+        speed: Optional[float] = None,
+        start_ms: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        """Create a simulated venue.
+
+        Args:
+            markets: Symbols to list and their trading rules
+            trades: Market trade stream per symbol; dicts with timestamp (ms),
+                price, amount and optionally side (the aggressor)
+            balances: Starting balances per currency
+            fees: Fee schedule (0.1% maker and taker by default)
+            latency_ms: One-way order latency in simulation milliseconds
+            latency_jitter_ms: Uniform random latency added on top
+            speed: Simulation speed relative to the wall clock; None runs
+                the clock only through ``advance`` and order latency
+            start_ms: Simulation start time (first trade, or now, by default)
+            seed: Seed for latency jitter
+        """
+        trades = trades or {}
+        self.books: Dict[str, _SymbolBook] = {m.symbol: _SymbolBook(m, trades.get(m.symbol)) for m in markets}
+        self.fees = fees or FeeSchedule()
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self._random = random.Random(seed)
+
+        self._total: Dict[str, float] = defaultdict(float, balances or {})
+        self._used: Dict[str, float] = defaultdict(float)
+        self.traded_volume = 0.0
+
+        self.orders: Dict[str, _Order] = {}
+        self.my_trades: deque = deque(maxlen=100_000)
+        self._order_ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+
+        # Pending market trades, merged across symbols by timestamp
+        self._pending: List[Tuple[int, int, str, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        for symbol in self.books:
+            self._queue_next(symbol)
+        if start_ms is None:
+            start_ms = self._pending[0][0] if self._pending else int(time.time() * 1000)
+        self.clock = SimulationClock(start_ms, speed)
+
+        self.markets = {
+            symbol: {
+                "id": symbol.replace("/", ""),
+                "symbol": symbol,
+                "base": book.market.base,
+                "quote": book.market.quote,
+                "active": True,
+                "spot": True,
+                "type": "spot",
+                "maker": self.fees.maker,
+                "taker": self.fees.taker,
+                "precision": {"price": book.market.tick_size},
+                "limits": {"amount": {"min": book.market.min_amount}},
+            }
+            for symbol, book in self.books.items()
+        }
+        self.symbols = list(self.markets)
+        self.stats = {"orders": 0, "fills": 0, "cancels": 0, "rejects": 0, "market_trades": 0}
+
+    # ------------------------------------------------------------------
+    # Simulation control
+    # ------------------------------------------------------------------
+
+    def milliseconds(self) -> int:
+        """Current simulation time (CCXT-style)"""
+        return self.clock.now_ms()
+
+    def advance(self, seconds: float) -> int:
+        """Move a manual clock forward, replaying market trades; returns trades replayed"""
+        return self.advance_to(self.clock.now_ms() + int(seconds * 1000))
+
+    def advance_to(self, timestamp_ms: int) -> int:
+        """Move a manual clock to ``timestamp_ms``, replaying market trades"""
+        self.clock.advance_to(timestamp_ms)
+        return self._replay(self.clock.now_ms())
+
+    def _sync(self) -> None:
+        self._replay(self.clock.now_ms())
+
+    def _queue_next(self, symbol: str) -> None:
+        stream = self.books[symbol].stream
+        if stream is None:
+            return
+        trade = next(stream, None)
+        if trade is None:
+            self.books[symbol].stream = None
+            return
+        heapq.heappush(self._pending, (int(trade["timestamp"]), next(self._sequence), symbol, trade))
+
+    def _replay(self, until_ms: int) -> int:
+        replayed = 0
+        while self._pending and self._pending[0][0] <= until_ms:
+            timestamp, _, symbol, trade = heapq.heappop(self._pending)
+            self._on_market_trade(self.books[symbol], timestamp, trade)
+            self._queue_next(symbol)
+            replayed += 1
+        self.stats["market_trades"] += replayed
+        return replayed
+
+    async def _reach_exchange(self) -> int:
+        """Wait out the order latency; returns the arrival time"""
+        latency = self.latency_ms
+        if self.latency_jitter_ms:
+            latency += self._random.uniform(0, self.latency_jitter_ms)
+        arrival = self.clock.now_ms() + int(latency)
+        await self.clock.sleep_until(arrival)
+        self._replay(arrival)
+        return arrival
+
+    # ------------------------------------------------------------------
+    # Market trades
+    # ------------------------------------------------------------------
+
+    def _on_market_trade(self, book: _SymbolBook, timestamp: int, trade: Dict[str, Any]) -> None:
+        ticks = book.to_ticks(float(trade["price"]))
+        amount = float(trade["amount"])
+        side = trade.get("side")
+        if side not in ("buy", "sell"):
+            # Tick rule: upticks are buyer initiated
+            side = book.last_side if book.last is None or ticks == book.last else ("buy" if ticks > book.last else "sell")
+
+        # Resting orders the market traded through fill completely; at the
+        # trade price the trade first takes the liquidity queued ahead of them
+        for book_side, hit in ((book.bids, side == "sell"), (book.asks, side == "buy")):
+            key = book_side.sign * ticks
+            while book_side.keys and book_side.keys[0] < key:
+                self._fill_level(book, book_side, book_side.keys[0], math.inf, timestamp)
+            if hit and book_side.keys and book_side.keys[0] == key:
+                level = book_side.levels[key]
+                taken = min(level.ahead, amount)
+                level.ahead -= taken
+                if amount - taken > EPSILON:
+                    self._fill_level(book, book_side, key, amount - taken, timestamp)
+
+        # Depth re-centres on the trade and taken liquidity partially refills
+        for book_side in (book.bids, book.asks):
+            if book_side.consumed:
+                keep = 1.0 - book.market.refill_rate
+                book_side.consumed = {
+                    key: left for key, taken in book_side.consumed.items() if (left := taken * keep) > EPSILON
+                }
+        book.last, book.last_side = ticks, side
+
+        price = book.to_price(ticks)
+        book.recent_trades.append({
+            "id": str(trade.get("id", "")), "timestamp": timestamp, "datetime": _iso(timestamp),
+            "symbol": book.market.symbol, "side": side, "price": price, "amount": amount, "cost": price * amount,
+        })
+        minute = timestamp - timestamp % 60_000
+        candle = book.candles[-1] if book.candles else None
+        if candle is None or candle[0] != minute:
+            book.candles.append([minute, price, price, price, price, amount])
+        else:
+            candle[2] = max(candle[2], price)
+            candle[3] = min(candle[3], price)
+            candle[4] = price
+            candle[5] += amount
+
+        if book.stops:
+            self._trigger_stops(book, price, timestamp)
+
+    def _fill_level(self, book: _SymbolBook, book_side: _BookSide, key: int, amount: float, timestamp: int) -> None:
+        """Fill resting orders at a level in time priority, up to ``amount``"""
+        level = book_side.levels[key]
+        while level.orders and amount > EPSILON:
+            order = level.orders[0]
+            quantity = min(order.remaining, amount)
+            self._settle(order, book, key * book_side.sign, quantity, False, timestamp)
+            amount -= quantity
+            if order.remaining <= EPSILON:
+                order.status = "closed"
+                level.orders.popleft()
+        book_side.discard_if_empty(key)
+
+    def _trigger_stops(self, book: _SymbolBook, price: float, timestamp: int) -> None:
+        triggered = [
+            order for order in book.stops
+            if (order.side == "buy" and price >= order.stop_price) or (order.side == "sell" and price <= order.stop_price)
+        ]
+        if not triggered:
+            return
+        book.stops = [order for order in book.stops if order not in triggered]
+        for order in triggered:
+            try:
+                self._check_funds(book, order)
+                self._execute(book, order, timestamp)
+            except InsufficientFunds as e:
+                logger.warning(f"Stop order {order.id} canceled on trigger: {e}")
+                order.status = "canceled"
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def _plan(self, book: _SymbolBook, order: _Order) -> List[Tuple[int, float, Optional[_Order]]]:
+        """Fills an aggressive order would get: (key, amount, resting order or None for market depth)"""
+        opposite = book.asks if order.side == "buy" else book.bids
+        limit = opposite.sign * order.ticks if order.ticks is not None else math.inf
+        fills = []
+        remaining = order.amount - order.filled
+        index = 0
+        depth_key = opposite.sign * book.last + 1 if book.last is not None else None
+        depth_end = depth_key + book.market.depth_levels - 1 if depth_key is not None else None
+
+        while remaining > EPSILON:
+            while depth_key is not None and depth_key <= depth_end and book.market_amount(opposite, depth_key) <= EPSILON:
+                depth_key += 1
+            if depth_key is not None and depth_key > depth_end:
+                depth_key = None
+            user_key = opposite.keys[index] if index < len(opposite.keys) else None
+            candidates = [key for key in (depth_key, user_key) if key is not None]
+            if not candidates or min(candidates) > limit:
+                break
+            key = min(candidates)
+            if key == depth_key:
+                quantity = min(remaining, book.market_amount(opposite, key))
+                fills.append((key, quantity, None))
+                remaining -= quantity
+                depth_key += 1
+            if key == user_key:
+                for resting in opposite.levels[key].orders:
+                    if remaining <= EPSILON:
+                        break
+                    quantity = min(remaining, resting.remaining)
+                    fills.append((key, quantity, resting))
+                    remaining -= quantity
+                index += 1
+        return fills
+
+    def _execute(self, book: _SymbolBook, order: _Order, timestamp: int) -> None:
+        """Match an order against the book and rest, expire or close it"""
+        fills = self._plan(book, order)
+        if order.post_only and fills:
+            order.status = "canceled"
+            self._release(book, order)
+            return
+        if order.time_in_force == "FOK" and sum(quantity for _, quantity, _ in fills) < order.remaining - EPSILON:
+            order.status = "canceled"
+            self._release(book, order)
+            return
+
+        opposite = book.asks if order.side == "buy" else book.bids
+        for key, quantity, resting in fills:
+            if resting is None:
+                opposite.consumed[key] = opposite.consumed.get(key, 0.0) + quantity
+                level = opposite.levels.get(key)
+                if level is not None:
+                    level.ahead = max(level.ahead - quantity, 0.0)
+            else:
+                self._settle(resting, book, key * opposite.sign, quantity, False, timestamp)
+                if resting.remaining <= EPSILON:
+                    resting.status = "closed"
+                    opposite.levels[key].orders.remove(resting)
+                    opposite.discard_if_empty(key)
+            self._settle(order, book, key * opposite.sign, quantity, True, timestamp)
+
+        if order.remaining <= EPSILON:
+            order.status = "closed"
+        elif order.type == "market" or order.time_in_force in ("IOC", "FOK"):
+            order.status = "canceled"
+            self._release(book, order)
+        else:
+            own = book.bids if order.side == "buy" else book.asks
+            key = own.sign * order.ticks
+            own.add(key, book.queue_ahead(own, key)).orders.append(order)
+
+    def _settle(self, order: _Order, book: _SymbolBook, ticks: int, quantity: float, taker: bool, timestamp: int) -> None:
+        """Book a fill: balances, fees, order state and the account's trade list"""
+        price = book.to_price(ticks)
+        maker_rate, taker_rate = self.fees.rates(self.traded_volume)
+        rate = taker_rate if taker else maker_rate
+        cost = price * quantity
+        fee = cost * rate
+        base, quote = book.market.base, book.market.quote
+
+        if order.side == "buy":
+            self._total[quote] -= cost + fee
+            self._total[base] += quantity
+            self._used[quote] = max(self._used[quote] - order.reserve_per_unit * quantity, 0.0)
+        else:
+            self._total[base] -= quantity
+            self._total[quote] += cost - fee
+            self._used[base] = max(self._used[base] - order.reserve_per_unit * quantity, 0.0)
+
+        order.filled += quantity
+        order.cost += cost
+        order.fee += fee
+        order.last_trade_ts = timestamp
+        self.traded_volume += cost
+        self.stats["fills"] += 1
+
+        trade = {
+            "id": str(next(self._trade_ids)),
+            "order": order.id,
+            "timestamp": timestamp,
+            "datetime": _iso(timestamp),
+            "symbol": order.symbol,
+            "type": order.type,
+            "side": order.side,
+            "takerOrMaker": "taker" if taker else "maker",
+            "price": price,
+            "amount": quantity,
+            "cost": cost,
+            "fee": {"cost": fee, "currency": quote, "rate": rate},
+            "info": {},
+        }
+        order.trades.append(trade)
+        self.my_trades.append(trade)
+
+    def _check_funds(self, book: _SymbolBook, order: _Order) -> None:
+        """Reserve funds for a limit order, or check a market order can be paid for"""
+        base, quote = book.market.base, book.market.quote
+        _, taker_rate = self.fees.rates(self.traded_volume)
+        fee_rate = max(self.fees.rates(self.traded_volume))
+
+        if order.type == "limit":
+            if order.side == "buy":
+                per_unit, currency = order.price * (1 + fee_rate), quote
+            else:
+                per_unit, currency = 1.0, base
+            required = per_unit * order.remaining
+            if required > self._free(currency) + EPSILON:
+                raise InsufficientFunds(f"{currency} balance {self._free(currency):.8f} is below {required:.8f}")
+            order.reserve_per_unit = per_unit
+            self._used[currency] += required
+            return
+
+        if order.side == "buy":
+            cost = sum(book.to_price(key * book.asks.sign) * quantity for key, quantity, _ in self._plan(book, order))
+            required, currency = cost * (1 + taker_rate), quote
+        else:
+            required, currency = order.remaining, base
+        if required > self._free(currency) + EPSILON:
+            raise InsufficientFunds(f"{currency} balance {self._free(currency):.8f} is below {required:.8f}")
+
+    def _release(self, book: _SymbolBook, order: _Order) -> None:
+        currency = book.market.quote if order.side == "buy" else book.market.base
+        self._used[currency] = max(self._used[currency] - order.reserve_per_unit * order.remaining, 0.0)
+
+    def _free(self, currency: str) -> float:
+        return self._total[currency] - self._used[currency]
+
+    def _book(self, symbol: str) -> _SymbolBook:
+        book = self.books.get(symbol)
+        if book is None:
+            raise BadSymbol(f"{self.id} does not have market symbol {symbol}")
+        return book
+
+    # ------------------------------------------------------------------
+    # CCXT unified API
+    # ------------------------------------------------------------------
+
+    async def load_markets(self, reload: bool = False, params: Optional[Dict] = None) -> Dict[str, Dict[str, Any]]:
+        return self.markets
+
+    async def create_order(
+        self, symbol: str, type: str, side: str, amount: float,
+        price: Optional[float] = None, params: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Place an order; the response reflects fills on arrival at the matching engine
+
+        Supported params: timeInForce (GTC, IOC, FOK, PO), postOnly,
+        stopPrice/triggerPrice and clientOrderId.
+
+        Raises:
+            InvalidOrder: For unknown types or sides, a missing limit price
+                or an amount below the market minimum
+            InsufficientFunds: When the balance cannot cover the order
+        """
+        params = params or {}
+        book = self._book(symbol)
+        type, side = type.lower(), side.lower()
+        if type not in ("market", "limit") or side not in ("buy", "sell"):
+            raise InvalidOrder(f"Unsupported order {type} {side}")
+        if type == "limit" and price is None:
+            raise InvalidOrder("Limit orders need a price")
+        if amount <= 0 or amount < book.market.min_amount:
+            raise InvalidOrder(f"Amount {amount} is below the {symbol} minimum of {book.market.min_amount}")
+
+        timestamp = await self._reach_exchange()
+        ticks = book.to_ticks(price) if type == "limit" else None
+        order = _Order(
+            str(next(self._order_ids)), symbol, type, side, float(amount),
+            book.to_price(ticks) if ticks is not None else None, ticks, timestamp, params, book.market.quote,
+        )
+        self.stats["orders"] += 1
+
+        if order.stop_price is not None:
+            self.orders[order.id] = order
+            book.stops.append(order)
+            return order.to_ccxt()
+
+        try:
+            self._check_funds(book, order)
+        except InsufficientFunds:
+            self.stats["rejects"] += 1
+            raise
+        self.orders[order.id] = order
+        self._execute(book, order, timestamp)
+        return order.to_ccxt()
+
+    async def create_market_order(self, symbol, side, amount, price=None, params=None):
+        return await self.create_order(symbol, "market", side, amount, price, params)
+
+    async def create_limit_order(self, symbol, side, amount, price, params=None):
+        return await self.create_order(symbol, "limit", side, amount, price, params)
+
+    async def cancel_order(self, id: str, symbol: Optional[str] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
+        """Cancel an open order (partial fills are kept)
+
+        Raises:
+            OrderNotFound: For unknown orders and orders no longer open
+        """
+        timestamp = await self._reach_exchange()
+        order = self.orders.get(id)
+        if order is None or order.status != "open":
+            raise OrderNotFound(f"Order {id} is not open")
+        book = self.books[order.symbol]
+        if order in book.stops:
+            book.stops.remove(order)
+        else:
+            side = book.bids if order.side == "buy" else book.asks
+            key = side.sign * order.ticks
+            side.levels[key].orders.remove(order)
+            side.discard_if_empty(key)
+            self._release(book, order)
+        order.status = "canceled"
+        order.last_trade_ts = order.last_trade_ts or timestamp
+        self.stats["cancels"] += 1
+        return order.to_ccxt()
+
+    async def fetch_order(self, id: str, symbol: Optional[str] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
+        self._sync()
+        order = self.orders.get(id)
+        if order is None:
+            raise OrderNotFound(f"Order {id} not found")
+        return order.to_ccxt()
+
+    async def fetch_open_orders(self, symbol: Optional[str] = None, since: Optional[int] = None,
+                                limit: Optional[int] = None, params: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        self._sync()
+        orders = [
+            order.to_ccxt() for order in self.orders.values()
+            if order.status == "open" and (symbol is None or order.symbol == symbol)
+            and (since is None or order.timestamp >= since)
+        ]
+        return orders[-limit:] if limit else orders
+
+    async def fetch_my_trades(self, symbol: Optional[str] = None, since: Optional[int] = None,
+                              limit: Optional[int] = None, params: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        self._sync()
+        trades = [
+            trade for trade in self.my_trades
+            if (symbol is None or trade["symbol"] == symbol) and (since is None or trade["timestamp"] >= since)
+        ]
+        return trades[-limit:] if limit else trades
+
+    async def fetch_balance(self, params: Optional[Dict] = None) -> Dict[str, Any]:
+        self._sync()
+        currencies = sorted(set(self._total) | set(self._used))
+        balance = {"info": {}, "timestamp": self.clock.now_ms(), "free": {}, "used": {}, "total": {}}
+        for currency in currencies:
+            entry = {"free": self._free(currency), "used": self._used[currency], "total": self._total[currency]}
+            balance[currency] = entry
+            for key, value in entry.items():
+                balance[key][currency] = value
+        return balance
+
+    async def fetch_ticker(self, symbol: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        self._sync()
+        book = self._book(symbol)
+        order_book = self._order_book(book, 1)
+        timestamp = self.clock.now_ms()
+        last = book.to_price(book.last) if book.last is not None else None
+        day = [candle for candle in book.candles if candle[0] > timestamp - 86_400_000]
+        return {
+            "symbol": symbol,
+            "timestamp": timestamp,
+            "datetime": _iso(timestamp),
+            "high": max((candle[2] for candle in day), default=None),
+            "low": min((candle[3] for candle in day), default=None),
+            "bid": order_book["bids"][0][0] if order_book["bids"] else None,
+            "bidVolume": order_book["bids"][0][1] if order_book["bids"] else None,
+            "ask": order_book["asks"][0][0] if order_book["asks"] else None,
+            "askVolume": order_book["asks"][0][1] if order_book["asks"] else None,
+            "open": day[0][1] if day else None,
+            "close": last,
+            "last": last,
+            "baseVolume": sum(candle[5] for candle in day),
+            "info": {},
+        }
+
+    async def fetch_order_book(self, symbol: str, limit: Optional[int] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
+        self._sync()
+        return self._order_book(self._book(symbol), limit)
+
+    def _order_book(self, book: _SymbolBook, limit: Optional[int]) -> Dict[str, Any]:
+        result = {"symbol": book.market.symbol, "timestamp": self.clock.now_ms(), "nonce": None}
+        for name, side in (("bids", book.bids), ("asks", book.asks)):
+            amounts: Dict[int, float] = defaultdict(float)
+            if book.last is not None:
+                for distance in range(1, book.market.depth_levels + 1):
+                    key = side.sign * book.last + distance
+                    amounts[key] += book.market_amount(side, key)
+            for key, level in side.levels.items():
+                amounts[key] += sum(order.remaining for order in level.orders)
+            levels = [[book.to_price(key * side.sign), amount] for key, amount in sorted(amounts.items()) if amount > EPSILON]
+            result[name] = levels[:limit] if limit else levels
+        result["datetime"] = _iso(result["timestamp"])
+        return result
+
+    async def fetch_trades(self, symbol: str, since: Optional[int] = None, limit: Optional[int] = None,
+                           params: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        self._sync()
+        trades = [trade for trade in self._book(symbol).recent_trades if since is None or trade["timestamp"] >= since]
+        return trades[-limit:] if limit else trades
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = "1m", since: Optional[int] = None,
+                          limit: Optional[int] = None, params: Optional[Dict] = None) -> List[List[float]]:
+        """Candles built from the replayed market trades"""
+        self._sync()
+        period = _timeframe_ms(timeframe)
+        candles: List[List[float]] = []
+        for minute, open_, high, low, close, volume in self._book(symbol).candles:
+            bucket = minute - minute % period
+            if candles and candles[-1][0] == bucket:
+                candle = candles[-1]
+                candle[2], candle[3] = max(candle[2], high), min(candle[3], low)
+                candle[4] = close
+                candle[5] += volume
+            else:
+                candles.append([bucket, open_, high, low, close, volume])
+        if since is not None:
+            candles = [candle for candle in candles if candle[0] >= since]
+        return candles[-limit:] if limit else candles
+
+    async def close(self) -> None:
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Order, fill and replay counters for load tests"""
+        return {
+            **self.stats,
+            "open_orders": sum(1 for order in self.orders.values() if order.status == "open"),
+            "traded_volume": self.traded_volume,
+            "simulation_time": _iso(self.clock.now_ms()),
+        }
+
+
+def synthetic_trades(
+    start_price: float,
+    start_ms: Optional[int] = None,
+    trades_per_second: float = 10.0,
+    volatility: float = 0.0005,
+    mean_amount: float = 0.1,
+    seed: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Endless random-walk trade stream with Poisson arrivals.
+
+    Args:
+        start_price: First trade price
+        start_ms: First trade time (now by default)
+        trades_per_second: Mean arrival rate
+        volatility: Standard deviation of the log return between trades
+        mean_amount: Mean trade size (exponentially distributed)
+        seed: Random seed for reproducible streams
+    """
+    rng = random.Random(seed)
+    timestamp = float(start_ms if start_ms is not None else int(time.time() * 1000))
+    price = start_price
+    while True:
+        step = rng.gauss(0.0, volatility)
+        price *= math.exp(step)
+        yield {
+            "timestamp": int(timestamp),
+            "price": price,
+            "amount": rng.expovariate(1.0 / mean_amount),
+            "side": "buy" if step >= 0 else "sell",
+        }
+        timestamp += rng.expovariate(trades_per_second) * 1000
+
+
+def trades_from_ohlcv(candles: Any, timeframe: str = "1m") -> Iterator[Dict[str, Any]]:
+    """Approximate trade stream from OHLCV candles.
+
+    Each candle becomes four trades (open, then high and low in the order
+    the candle's direction suggests, then close) with a quarter of its
+    volume each.
+
+    Args:
+        candles: CCXT-style [timestamp, open, high, low, close, volume] rows,
+            or a DataFrame with those columns and a timestamp column or
+            DatetimeIndex
+        timeframe: Candle period, used to spread the four trades
+    """
+    step = _timeframe_ms(timeframe) // 4
+    if hasattr(candles, "itertuples"):
+        frame = candles if "timestamp" in candles.columns else candles.rename_axis("timestamp").reset_index()
+        timestamps = frame["timestamp"]
+        if not str(timestamps.dtype).startswith(("int", "float")):
+            timestamps = timestamps.astype("datetime64[ms]").astype("int64")
+        rows = zip(timestamps, frame["open"], frame["high"], frame["low"], frame["close"], frame["volume"])
+    else:
+        rows = candles
+
+    for timestamp, open_, high, low, close, volume in rows:
+        path = (open_, low, high, close) if close >= open_ else (open_, high, low, close)
+        for i, price in enumerate(path):
+            yield {"timestamp": int(timestamp) + i * step, "price": float(price), "amount": float(volume) / 4}
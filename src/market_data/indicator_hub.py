@@ -0,0 +1,634 @@
+"""
+Shared Indicator Hub
+Fetches candles and computes indicator columns once per candle and serves
+them to every strategy process (freqtrade bots, backtest workers,
+MultiStrategyTrader) over local IPC
+
+Key Features:
+- One computation per (pair, timeframe, indicator, params, candle window);
+  every other consumer of the same column gets the cached arrays
+- One exchange fetch per (pair, timeframe, limit, candle period) when the
+  hub has a candle source; consumers asking for the same candles share it
+- Per-key locks so bots closing the same candle at the same time never
+  compute the same column or fetch the same candles twice
+- Stdlib IPC (multiprocessing.connection over a unix socket or localhost
+  TCP) with an auth key; no extra services to run
+- Clients fall back to computing (or fetching) locally when the hub is
+  unreachable, so a hub restart never stops a bot
+- Reports hits, computes and the time saved by deduplication net of the
+  clients' IPC round trips
+"""
+
+import logging
+import os
+import secrets
+import socket
+import tempfile
+import threading
+import time
+import multiprocessing as mp
+from collections import OrderedDict
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import talib.abstract as ta
+    TALIB_AVAILABLE = True
+except ImportError:
+    ta = None
+    TALIB_AVAILABLE = False
+
+try:
+    from src.data.resampler import timeframe_to_ms
+except ImportError:  # imported with src/ on the path
+    from data.resampler import timeframe_to_ms
+
+logger = logging.getLogger(__name__)
+
+HUB_ADDRESS_ENV = 'INDICATOR_HUB_ADDRESS'
+HUB_AUTHKEY_ENV = 'INDICATOR_HUB_AUTHKEY'
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+Outputs = Dict[str, np.ndarray]
+Address = Union[str, Tuple[str, int]]
+# (pair, timeframe, limit=...) -> ccxt-style [timestamp, open, high, low, close, volume] rows
+CandleSource = Callable[..., List[List[float]]]
+
+
+# Pandas versions of the indicators the strategies use, for hosts without
+# TA-Lib. Wilder smoothing is an EWM with alpha=1/n, so values converge to
+# TA-Lib's after the warm-up period.
+
+def _price(inputs: pd.DataFrame, params: Dict[str, Any]) -> pd.Series:
+    return inputs[params.get('price', 'close')]
+
+
+def _sma(inputs, params):
+    return _price(inputs, params).rolling(int(params.get('timeperiod', 30))).mean()
+
+
+def _ema(inputs, params):
+    period = int(params.get('timeperiod', 30))
+    return _price(inputs, params).ewm(span=period, adjust=False, min_periods=period).mean()
+
+
+def _rsi(inputs, params):
+    period = int(params.get('timeperiod', 14))
+    delta = _price(inputs, params).diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+def _mom(inputs, params):
+    return _price(inputs, params).diff(int(params.get('timeperiod', 10)))
+
+
+def _atr(inputs, params):
+    period = int(params.get('timeperiod', 14))
+    prev_close = inputs['close'].shift(1)
+    true_range = pd.concat([
+        inputs['high'] - inputs['low'],
+        (inputs['high'] - prev_close).abs(),
+        (inputs['low'] - prev_close).abs()
+    ], axis=1).max(axis=1)
+    return true_range.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+
+def _macd(inputs, params):
+    price = _price(inputs, params)
+    slow_period = int(params.get('slowperiod', 26))
+    signal_period = int(params.get('signalperiod', 9))
+    macd = (price.ewm(span=int(params.get('fastperiod', 12)), adjust=False).mean()
+            - price.ewm(span=slow_period, adjust=False).mean())
+    signal = macd.ewm(span=signal_period, adjust=False).mean()
+    frame = pd.DataFrame({'macd': macd, 'macdsignal': signal, 'macdhist': macd - signal})
+    # TA-Lib leaves all three outputs empty until the signal line is warm
+    frame.iloc[:slow_period + signal_period - 2] = np.nan
+    return frame
+
+
+def _bbands(inputs, params):
+    period = int(params.get('timeperiod', 5))
+    price = _price(inputs, params)
+    middle = price.rolling(period).mean()
+    std = price.rolling(period).std(ddof=0)
+    return pd.DataFrame({
+        'upperband': middle + float(params.get('nbdevup', 2.0)) * std,
+        'middleband': middle,
+        'lowerband': middle - float(params.get('nbdevdn', 2.0)) * std
+    })
+
+
+FALLBACK_INDICATORS = {
+    'SMA': _sma,
+    'EMA': _ema,
+    'RSI': _rsi,
+    'MOM': _mom,
+    'ATR': _atr,
+    'MACD': _macd,
+    'BBANDS': _bbands,
+}
+
+
+def compute_indicator(name: str, inputs: pd.DataFrame, params: Dict[str, Any]) -> Outputs:
+    """
+    Compute one indicator on OHLCV inputs
+
+    Uses TA-Lib's abstract API when installed (same call as
+    ``ta.<NAME>(dataframe, **params)``), otherwise the pandas fallbacks.
+
+    Returns:
+        Output name -> float array; single-output indicators use ``real``
+    """
+    name = name.upper()
+    if TALIB_AVAILABLE:
+        result = getattr(ta, name)(inputs, **params)
+    elif name in FALLBACK_INDICATORS:
+        result = FALLBACK_INDICATORS[name](inputs, params)
+    else:
+        raise ValueError(f"Indicator {name} needs TA-Lib, which is not installed")
+
+    if isinstance(result, pd.DataFrame):
+        return {str(col): result[col].to_numpy(dtype=float) for col in result.columns}
+    return {'real': np.asarray(result, dtype=float)}
+
+
+def candle_window(dataframe: pd.DataFrame) -> Tuple:
+    """
+    Identify the candles an indicator is computed over
+
+    Recursive indicators (EMA, RSI, ...) depend on where the history starts,
+    so the window is the row count, first and last candle time plus the last
+    close and volume (which catches a revised latest candle).
+    """
+    if dataframe.empty:
+        return (0,)
+    if 'date' in dataframe.columns:
+        stamps = dataframe['date'].to_numpy()
+    elif 'timestamp' in dataframe.columns:
+        stamps = dataframe['timestamp'].to_numpy()
+    else:
+        stamps = dataframe.index.to_numpy()
+    return (
+        len(dataframe), pd.Timestamp(stamps[0]).value, pd.Timestamp(stamps[-1]).value,
+        float(dataframe['close'].iloc[-1]), float(dataframe['volume'].iloc[-1])
+    )
+
+
+def indicator_key(pair: str, timeframe: str, name: str, params: Dict[str, Any], window: Tuple) -> Tuple:
+    """Cache key for one indicator column"""
+    return (pair, timeframe, name.upper(), tuple(sorted(params.items())), window)
+
+
+def candles_key(pair: str, timeframe: str, limit: int, period: int) -> Tuple:
+    """Cache key for the candles of one candle period (shaped like an indicator key)"""
+    return indicator_key(pair, timeframe, 'OHLCV', {'limit': limit}, (period,))
+
+
+def ccxt_candle_source(exchange_id: str) -> CandleSource:
+    """Candle source backed by a rate-limited ccxt exchange"""
+    import ccxt
+
+    return getattr(ccxt, exchange_id)({'enableRateLimit': True}).fetch_ohlcv
+
+
+def default_address() -> Address:
+    """Unix socket in the temp dir where supported, otherwise an ephemeral localhost port"""
+    if hasattr(socket, 'AF_UNIX'):
+        return os.path.join(tempfile.gettempdir(), f'fricktrader-indicators-{os.getpid()}.sock')
+    return ('127.0.0.1', 0)
+
+
+def format_address(address: Address) -> str:
+    return address if isinstance(address, str) else f'{address[0]}:{address[1]}'
+
+
+def parse_address(value: str) -> Address:
+    host, sep, port = value.rpartition(':')
+    if sep and port.isdigit() and '/' not in value:
+        return (host, int(port))
+    return value
+
+
+class IndicatorHub:
+    """
+    Indicator cache served to strategy processes over local IPC
+    """
+
+    def __init__(self, address: Optional[Address] = None, authkey: Optional[bytes] = None,
+                 max_entries: int = 4096, candle_source: Optional[CandleSource] = None):
+        self.address = address or default_address()
+        self.authkey = authkey or secrets.token_bytes(16)
+        self.max_entries = max_entries
+        self.candle_source = candle_source
+
+        # key -> (outputs, compute seconds)
+        self._cache: 'OrderedDict[Tuple, Tuple[Outputs, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[Tuple, threading.Lock] = {}
+        self._listener: Optional[Listener] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        self.requests = 0
+        self.hits = 0
+        self.computes = 0
+        self.compute_seconds = 0.0
+        self.saved_seconds = 0.0
+        self.ipc_seconds = 0.0
+        self.consumers: Dict[str, int] = {}
+        self.per_indicator: Dict[str, Dict[str, int]] = {}
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def lookup(self, key: Tuple, consumer: str = 'local') -> Optional[Outputs]:
+        """Cached outputs for a key, or None (counted as a request either way)"""
+        with self._lock:
+            self.requests += 1
+            self.consumers[consumer] = self.consumers.get(consumer, 0) + 1
+            return self._hit(key)
+
+    def compute(self, key: Tuple, inputs: pd.DataFrame, consumer: str = 'local',
+                counted: bool = False) -> Outputs:
+        """
+        Outputs for a key, computing them at most once across all consumers
+
+        Args:
+            key: Key from ``indicator_key``
+            inputs: OHLCV columns the indicator is computed on
+            consumer: Name of the requesting strategy/bot
+            counted: The request was already counted by a ``lookup`` miss
+        """
+        return self._compute(key, inputs, consumer, counted)[0]
+
+    def candles(self, pair: str, timeframe: str, limit: int = 500, consumer: str = 'local') -> Outputs:
+        """
+        OHLCV columns of a pair, fetched at most once per candle period
+
+        Every consumer asking for the same pair, timeframe and limit within
+        one candle period gets the same fetch; the next period refetches.
+
+        Returns:
+            Column name (timestamp, open, high, low, close, volume) -> array
+        """
+        return self._candles(pair, timeframe, limit, consumer)[0]
+
+    def _compute(self, key: Tuple, inputs: pd.DataFrame, consumer: str,
+                 counted: bool) -> Tuple[Outputs, float]:
+        _, _, name, params, _ = key
+        return self._once(key, consumer, counted, lambda: compute_indicator(name, inputs, dict(params)))
+
+    def _candles(self, pair: str, timeframe: str, limit: int, consumer: str) -> Tuple[Outputs, float]:
+        if self.candle_source is None:
+            raise ValueError("Indicator hub has no candle source")
+        period = int(time.time() * 1000) // timeframe_to_ms(timeframe)
+
+        def fetch() -> Outputs:
+            rows = np.asarray(self.candle_source(pair, timeframe, limit=limit), dtype=float).reshape(-1, 6)
+            columns = {'timestamp': rows[:, 0].astype(np.int64)}
+            columns.update((col, rows[:, i + 1]) for i, col in enumerate(OHLCV_COLUMNS))
+            return columns
+
+        return self._once(candles_key(pair, timeframe, limit, period), consumer, False, fetch)
+
+    def _once(self, key: Tuple, consumer: str, counted: bool,
+              produce: Callable[[], Outputs]) -> Tuple[Outputs, float]:
+        """
+        Cached outputs for a key, producing them at most once across consumers
+
+        Returns:
+            (outputs, seconds spent producing them in this call; 0 on a hit)
+        """
+        with self._lock:
+            if not counted:
+                self.requests += 1
+                self.consumers[consumer] = self.consumers.get(consumer, 0) + 1
+            cached = self._hit(key)
+            if cached is not None:
+                return cached, 0.0
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                with self._lock:
+                    # Another consumer may have produced it while we waited
+                    cached = self._hit(key)
+                if cached is not None:
+                    return cached, 0.0
+
+                started = time.perf_counter()
+                outputs = produce()
+                elapsed = time.perf_counter() - started
+
+                with self._lock:
+                    self._cache[key] = (outputs, elapsed)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+                    self.computes += 1
+                    self.compute_seconds += elapsed
+                    self._indicator_stats(key[2])['computes'] += 1
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+        return outputs, elapsed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Deduplication statistics"""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'computes': self.computes,
+                'hits': self.hits,
+                'hit_rate': self.hits / self.requests if self.requests else 0.0,
+                'duplicate_computes_avoided': self.hits,
+                'compute_seconds': round(self.compute_seconds, 6),
+                'saved_compute_seconds': round(self.saved_seconds, 6),
+                # Client round trips to the hub, less the hub's compute time
+                'ipc_seconds': round(self.ipc_seconds, 6),
+                'net_saved_seconds': round(self.saved_seconds - self.ipc_seconds, 6),
+                'entries': len(self._cache),
+                'consumers': dict(self.consumers),
+                'indicators': {name: dict(counts) for name, counts in self.per_indicator.items()},
+                'talib': TALIB_AVAILABLE
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _hit(self, key: Tuple) -> Optional[Outputs]:
+        """Record a cache hit; caller holds the lock"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        self._cache.move_to_end(key)
+        self.hits += 1
+        self.saved_seconds += entry[1]
+        self._indicator_stats(key[2])['hits'] += 1
+        return entry[0]
+
+    def _indicator_stats(self, name: str) -> Dict[str, int]:
+        return self.per_indicator.setdefault(name, {'computes': 0, 'hits': 0})
+
+    # ------------------------------------------------------------------
+    # IPC server
+    # ------------------------------------------------------------------
+
+    def start(self) -> Address:
+        """Serve on a background thread; returns the bound address"""
+        self._listen()
+        self._thread = threading.Thread(target=self._accept_loop, name='indicator-hub', daemon=True)
+        self._thread.start()
+        return self.address
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until ``stop``"""
+        self._listen()
+        self._accept_loop()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._listener is not None:
+            try:
+                self._listener.close()
+            except OSError:
+                pass
+            self._listener = None
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def _listen(self) -> None:
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        self._listener = Listener(self.address, authkey=self.authkey)
+        self.address = self._listener.address
+        self._running = True
+        logger.info(f"📡 Indicator hub listening on {format_address(self.address)}")
+
+    def _accept_loop(self) -> None:
+        while self._running:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):
+                if self._running:
+                    logger.warning("Indicator hub listener failed", exc_info=True)
+                break
+            except mp.AuthenticationError:
+                logger.warning("Indicator hub rejected a client with a bad auth key")
+                continue
+            threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def _serve_client(self, conn) -> None:
+        with conn:
+            while self._running:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                # Every message carries the client's IPC time not yet reported
+                op, consumer, ipc_seconds, *args = message
+                with self._lock:
+                    self.ipc_seconds += ipc_seconds
+                try:
+                    if op == 'get':
+                        outputs = self.lookup(args[0], consumer)
+                        conn.send(('hit', outputs) if outputs is not None else ('miss',))
+                    elif op == 'compute':
+                        key, columns = args
+                        conn.send(('ok', *self._compute(key, pd.DataFrame(columns), consumer, counted=True)))
+                    elif op == 'candles':
+                        conn.send(('ok', *self._candles(*args, consumer)))
+                    elif op == 'stats':
+                        conn.send(('ok', self.get_stats()))
+                    elif op == 'close':
+                        return
+                    else:
+                        conn.send(('error', f'unknown operation {op!r}'))
+                except Exception as e:
+                    logger.error(f"Indicator hub failed to serve {op}: {e}")
+                    conn.send(('error', str(e)))
+
+
+def _run_hub(address: Address, authkey: bytes, max_entries: int, exchange_id: Optional[str]) -> None:
+    candle_source = ccxt_candle_source(exchange_id) if exchange_id else None
+    IndicatorHub(address, authkey, max_entries, candle_source).serve_forever()
+
+
+def start_hub_process(address: Optional[Address] = None, authkey: Optional[bytes] = None,
+                      max_entries: int = 4096,
+                      exchange_id: Optional[str] = None) -> Tuple[mp.Process, Address, bytes]:
+    """
+    Run an IndicatorHub in its own process
+
+    Args:
+        exchange_id: ccxt exchange the hub fetches shared candles from
+            (without one, clients fetch their own candles)
+
+    Returns:
+        (process, address, authkey); export the last two to consumers with
+        ``hub_environment``
+    """
+    address = address or default_address()
+    if isinstance(address, tuple) and address[1] == 0:
+        raise ValueError("A hub process needs a fixed address; pass a port or a socket path")
+    authkey = authkey or secrets.token_bytes(16)
+
+    process = mp.get_context('spawn').Process(
+        target=_run_hub, args=(address, authkey, max_entries, exchange_id), name='indicator-hub', daemon=True
+    )
+    process.start()
+    return process, address, authkey
+
+
+def hub_environment(address: Address, authkey: bytes) -> Dict[str, str]:
+    """Environment variables that point consumer processes at a hub"""
+    return {HUB_ADDRESS_ENV: format_address(address), HUB_AUTHKEY_ENV: authkey.hex()}
+
+
+class IndicatorHubClient:
+    """
+    Strategy-side client of an IndicatorHub
+
+    ``indicator`` mirrors ``ta.<NAME>(dataframe, **params)``: it returns a
+    Series for single-output indicators and a DataFrame otherwise. When the
+    hub cannot be reached the indicator is computed locally and the hub is
+    retried after ``retry_after`` seconds. ``candles`` does the same for
+    OHLCV fetches.
+    """
+
+    def __init__(self, address: Address, authkey: bytes, consumer: str = 'strategy',
+                 retry_after: float = 30.0):
+        self.address = address
+        self.authkey = authkey
+        self.consumer = consumer
+        self.retry_after = retry_after
+
+        self._conn = None
+        self._lock = threading.Lock()
+        self._offline_until = 0.0
+
+        self.remote_hits = 0
+        self.remote_computes = 0
+        self.local_computes = 0
+        self.remote_candles = 0
+        self.local_fetches = 0
+        self.ipc_seconds = 0.0
+        self._unreported_ipc = 0.0
+
+    def indicator(self, pair: str, timeframe: str, dataframe: pd.DataFrame, name: str,
+                  **params) -> Union[pd.Series, pd.DataFrame]:
+        """Indicator column(s) for a pair's candles, shared with every other consumer"""
+        key = indicator_key(pair, timeframe, name, params, candle_window(dataframe))
+        outputs = self._remote(key, dataframe)
+        if outputs is None:
+            self.local_computes += 1
+            outputs = compute_indicator(name, dataframe, params)
+
+        if list(outputs) == ['real']:
+            return pd.Series(outputs['real'], index=dataframe.index)
+        return pd.DataFrame(outputs, index=dataframe.index)
+
+    def candles(self, pair: str, timeframe: str, limit: int = 500,
+                fetch: Optional[CandleSource] = None) -> Optional[pd.DataFrame]:
+        """
+        Candles shared through the hub's single fetch per candle period
+
+        Args:
+            fetch: Local candle source used when the hub is unreachable or has
+                no candle source of its own
+
+        Returns:
+            DataFrame with timestamp (ms) and OHLCV columns, or None when
+            neither the hub nor ``fetch`` can provide candles
+        """
+        with self._lock:
+            reply = self._request(('candles', pair, timeframe, limit))
+        if reply is not None and reply[0] == 'ok':
+            self.remote_candles += 1
+            return pd.DataFrame(reply[1])
+        if fetch is None:
+            return None
+        self.local_fetches += 1
+        rows = fetch(pair, timeframe, limit=limit)
+        return pd.DataFrame(rows, columns=['timestamp', *OHLCV_COLUMNS])
+
+    def get_stats(self) -> Optional[Dict[str, Any]]:
+        """Hub statistics, or None when the hub is unreachable"""
+        with self._lock:
+            reply = self._request(('stats',))
+        return reply[1] if reply and reply[0] == 'ok' else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.send(('close', self.consumer, self._unreported_ipc))
+                    self._conn.close()
+                except OSError:
+                    pass
+                self._conn = None
+
+    def _remote(self, key: Tuple, dataframe: pd.DataFrame) -> Optional[Outputs]:
+        with self._lock:
+            reply = self._request(('get', key))
+            if reply is None:
+                return None
+            if reply[0] == 'hit':
+                self.remote_hits += 1
+                return reply[1]
+
+            # Only the first consumer of a candle ships the inputs
+            columns = {col: dataframe[col].to_numpy(dtype=float) for col in OHLCV_COLUMNS}
+            reply = self._request(('compute', key, columns))
+            if reply is None or reply[0] != 'ok':
+                return None
+            self.remote_computes += 1
+            return reply[1]
+
+    def _request(self, request: Tuple) -> Optional[Tuple]:
+        """Send one request and wait for the reply; caller holds the lock"""
+        if self._conn is None:
+            if time.monotonic() < self._offline_until:
+                return None
+            try:
+                self._conn = Client(self.address, authkey=self.authkey)
+            except (OSError, EOFError, mp.AuthenticationError) as e:
+                logger.warning(f"Indicator hub unavailable ({e}), computing locally")
+                self._offline_until = time.monotonic() + self.retry_after
+                return None
+        op, *args = request
+        started = time.perf_counter()
+        try:
+            self._conn.send((op, self.consumer, self._unreported_ipc, *args))
+            self._unreported_ipc = 0.0
+            reply = self._conn.recv()
+        except (OSError, EOFError) as e:
+            logger.warning(f"Lost indicator hub connection ({e}), computing locally")
+            self._conn = None
+            self._offline_until = time.monotonic() + self.retry_after
+            return None
+
+        # Round trip less the time the hub spent computing or fetching for us
+        elapsed = time.perf_counter() - started
+        if op in ('compute', 'candles') and reply[0] == 'ok':
+            elapsed = max(elapsed - reply[2], 0.0)
+        self.ipc_seconds += elapsed
+        self._unreported_ipc += elapsed
+        return reply
+
+
+def hub_client_from_env(consumer: str = 'strategy') -> Optional[IndicatorHubClient]:
+    """Client for the hub named in the environment, or None when no hub is configured"""
+    address = os.environ.get(HUB_ADDRESS_ENV)
+    authkey = os.environ.get(HUB_AUTHKEY_ENV)
+    if not address or not authkey:
+        return None
+    return IndicatorHubClient(parse_address(address), bytes.fromhex(authkey), consumer=consumer)
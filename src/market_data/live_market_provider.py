@@ -2,9 +2,11 @@
 """Live market data provider using direct exchange APIs"""
 
 import requests
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,7 +23,15 @@ except ImportError:
 class LiveMarketProvider:
     """Live market data from working exchanges"""
     
-    def __init__(self):
+    def __init__(self, fetch_mode: str = 'hedged', hedge_delay: float = 0.3, hedge_timeout: float = 12.0):
+        """
+        Args:
+            fetch_mode: 'hedged' races the best-ranked sources, 'sequential'
+                tries them one after another
+            hedge_delay: Seconds to wait on a source before also asking the
+                next one (0 queries every source at once)
+            hedge_timeout: Overall deadline for a hedged price refresh
+        """
         # Use reliable exchanges that work from most locations
         self.exchanges = {
             'cryptocompare': {
@@ -95,6 +105,24 @@ class LiveMarketProvider:
         self.cache = {}
         self.cache_timeout = 10  # 10 seconds cache
         
+        # Price sources in their default order of reliability; the live order
+        # adapts to measured latency and error rates
+        self.price_sources = {
+            'CryptoCompare': '_get_cryptocompare_prices',
+            'CoinPaprika': '_get_coinpaprika_prices',
+            'Binance': '_get_binance_prices',
+            'CoinGecko': '_get_coingecko_prices'
+        }
+        self.fetch_mode = fetch_mode
+        self.hedge_delay = hedge_delay
+        self.hedge_timeout = hedge_timeout
+        self.latency_prior = 1.0  # assumed latency (s) of a source never measured
+        self.unhealthy_after = 3  # consecutive failures before a source is demoted
+        self.unhealthy_cooldown = 60  # seconds a demoted source stays at the back
+        self.source_stats = {name: self._new_source_stats() for name in self.price_sources}
+        self._stats_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
     def get_live_prices(self) -> Dict:
         """Get live prices for all symbols with persistent caching"""
         now = time.time()
@@ -112,28 +140,22 @@ class LiveMarketProvider:
                 logger.info(f"📦 Using {len(cached_prices)} cached prices")
                 return cached_prices
         
-        # Try live APIs in order of reliability
-        for api_name, api_method in [
-            ('CryptoCompare', self._get_cryptocompare_prices),
-            ('CoinPaprika', self._get_coinpaprika_prices),
-            ('Binance', self._get_binance_prices),
-            ('CoinGecko', self._get_coingecko_prices)
-        ]:
-            try:
-                prices = api_method()
-                if prices:
-                    # Store in both caches
-                    self.cache['prices'] = prices
-                    self.cache['prices_time'] = now
-                    
-                    # Store in persistent cache
-                    if PERSISTENT_CACHE_AVAILABLE:
-                        market_cache.cache_prices(prices)
-                    
-                    logger.info(f"✅ Got {len(prices)} prices from {api_name}")
-                    return prices
-            except Exception as e:
-                logger.warning(f"{api_name} failed: {e}")
+        if self.fetch_mode == 'hedged':
+            api_name, prices = self._fetch_prices_hedged()
+        else:
+            api_name, prices = self._fetch_prices_sequential()
+        
+        if prices:
+            # Store in both caches
+            self.cache['prices'] = prices
+            self.cache['prices_time'] = now
+            
+            # Store in persistent cache
+            if PERSISTENT_CACHE_AVAILABLE:
+                market_cache.cache_prices(prices)
+            
+            logger.info(f"✅ Got {len(prices)} prices from {api_name}")
+            return prices
         
         # Last resort: try older cached data (up to 1 hour)
         if PERSISTENT_CACHE_AVAILABLE:
@@ -145,6 +167,155 @@ class LiveMarketProvider:
         logger.error("❌ All price sources failed and no cached data available")
         return {}
     
+    def _fetch_prices_sequential(self) -> Tuple[Optional[str], Dict]:
+        """Try sources one after another, best-ranked first"""
+        for api_name in self._ranked_sources():
+            prices = self._timed_fetch(api_name)
+            if self._valid_prices(prices):
+                return api_name, prices
+        return None, {}
+    
+    def _fetch_prices_hedged(self) -> Tuple[Optional[str], Dict]:
+        """
+        Race the best-ranked sources and return the first valid answer
+        
+        The best source is queried first; each further source is started
+        once the ones in flight have been quiet for ``hedge_delay`` seconds,
+        or immediately when a source fails. Sources not yet started are
+        cancelled as soon as one answers; requests already in flight are
+        left to finish in the background and still update the statistics.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=2 * len(self.price_sources), thread_name_prefix='price-source'
+            )
+        
+        queue = self._ranked_sources()
+        in_flight = {}
+        deadline = time.monotonic() + self.hedge_timeout
+        
+        def launch():
+            if queue:
+                api_name = queue.pop(0)
+                in_flight[self._executor.submit(self._timed_fetch, api_name)] = api_name
+        
+        launch()
+        while self.hedge_delay <= 0 and queue:
+            launch()
+        
+        while in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            timeout = min(self.hedge_delay, remaining) if queue else remaining
+            done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            if not done:
+                # Slow answer: hedge with the next source
+                launch()
+                continue
+            
+            for future in done:
+                api_name = in_flight.pop(future)
+                prices = future.result()
+                if self._valid_prices(prices):
+                    for other in in_flight:
+                        other.cancel()
+                    return api_name, prices
+                launch()
+        
+        for other in in_flight:
+            other.cancel()
+        if in_flight:
+            logger.warning(f"Price sources timed out after {self.hedge_timeout}s: {', '.join(in_flight.values())}")
+        return None, {}
+    
+    def _timed_fetch(self, api_name: str) -> Dict:
+        """Call one price source and record its latency and outcome"""
+        started = time.perf_counter()
+        error = None
+        try:
+            prices = getattr(self, self.price_sources[api_name])()
+        except Exception as e:
+            logger.warning(f"{api_name} failed: {e}")
+            prices, error = {}, str(e)
+        
+        valid = self._valid_prices(prices)
+        self._record_source_result(api_name, time.perf_counter() - started, valid,
+                                   None if valid else error or 'no valid prices')
+        return prices
+    
+    @staticmethod
+    def _valid_prices(prices: Dict) -> bool:
+        return bool(prices) and any(quote.get('price', 0) > 0 for quote in prices.values())
+    
+    @staticmethod
+    def _new_source_stats() -> Dict:
+        return {
+            'requests': 0,
+            'successes': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'latency_ewma': None,
+            'success_rate': 1.0,
+            'last_latency': None,
+            'last_error': None,
+            'last_failure_time': None
+        }
+    
+    def _record_source_result(self, api_name: str, latency: float, success: bool, error: Optional[str] = None):
+        """Fold one call into the source's latency / error-rate averages"""
+        alpha = 0.3
+        with self._stats_lock:
+            stats = self.source_stats[api_name]
+            stats['requests'] += 1
+            stats['last_latency'] = latency
+            stats['success_rate'] = (1 - alpha) * stats['success_rate'] + alpha * float(success)
+            if success:
+                stats['successes'] += 1
+                stats['consecutive_failures'] = 0
+                stats['latency_ewma'] = latency if stats['latency_ewma'] is None else (
+                    (1 - alpha) * stats['latency_ewma'] + alpha * latency
+                )
+            else:
+                stats['failures'] += 1
+                stats['consecutive_failures'] += 1
+                stats['last_error'] = error
+                stats['last_failure_time'] = time.time()
+    
+    def _ranked_sources(self) -> List[str]:
+        """
+        Sources ordered by expected time to a valid answer
+        
+        Expected latency is divided by the recent success rate; sources that
+        keep failing are moved to the back until their cooldown expires.
+        Unmeasured sources keep their default order at ``latency_prior``.
+        """
+        now = time.time()
+        with self._stats_lock:
+            def rank(item):
+                order, api_name = item
+                stats = self.source_stats[api_name]
+                demoted = (stats['consecutive_failures'] >= self.unhealthy_after
+                           and now - (stats['last_failure_time'] or 0) < self.unhealthy_cooldown)
+                latency = stats['latency_ewma'] if stats['latency_ewma'] is not None else self.latency_prior
+                return (demoted, latency / max(stats['success_rate'], 0.05), order)
+            
+            return [api_name for _, api_name in sorted(enumerate(self.price_sources), key=rank)]
+    
+    def close(self):
+        """Release the hedging worker threads (recreated if prices are fetched again)"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            # Requests already running cannot be interrupted; don't wait for them
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def get_source_stats(self) -> Dict[str, Dict]:
+        """Per-source latency and error statistics, in current ranking order"""
+        with self._stats_lock:
+            stats = {name: dict(values) for name, values in self.source_stats.items()}
+        return {name: stats[name] for name in self._ranked_sources()}
+    
     def _get_binance_prices(self) -> Dict:
         """Get prices from Binance"""
         try:
@@ -43,6 +43,10 @@ class OpenBBMarketDataProvider:
         """Get institutional data"""
         return await self.analyzer.get_institutional_data(symbol)
 
+    async def get_ohlcv_data(self, symbol: str, timeframe: str = "1h", periods: int = 100):
+        """Get OHLCV candles from the best available source"""
+        return await self.analyzer._get_ohlcv_data(symbol, timeframe, periods)
+
     async def get_comprehensive_analysis(self, symbol: str):
         """Get comprehensive market analysis"""
         return await self.analyzer.get_comprehensive_analysis(symbol)
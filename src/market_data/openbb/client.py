@@ -127,7 +127,7 @@ class OpenBBClient:
         try:
             await self._rate_limit()
             # Get quote data from OpenBB
-            quote = obb.equity.price.quote(symbol=symbol.upper())
+            quote = await asyncio.to_thread(obb.equity.price.quote, symbol=symbol.upper())
 
             if quote and hasattr(quote, "results") and quote.results:
                 data = quote.results[0]
@@ -174,7 +174,8 @@ class OpenBBClient:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=max(periods, 30))  # Ensure we have enough data
 
-            data = obb.equity.price.historical(
+            data = await asyncio.to_thread(
+                obb.equity.price.historical,
                 symbol=symbol.upper(),
                 start_date=start_date.strftime("%Y-%m-%d"),
                 end_date=end_date.strftime("%Y-%m-%d"),
@@ -226,7 +227,9 @@ class OpenBBClient:
 
         try:
             await self._rate_limit()
-            ownership_data = obb.equity.ownership.institutional(symbol=symbol.upper())
+            ownership_data = await asyncio.to_thread(
+                obb.equity.ownership.institutional, symbol=symbol.upper()
+            )
 
             if ownership_data and hasattr(ownership_data, "results") and ownership_data.results:
                 # Calculate total institutional ownership
@@ -277,7 +280,9 @@ class OpenBBClient:
 
         try:
             await self._rate_limit()
-            short_data = obb.equity.short_interest.short_interest(symbol=symbol.upper())
+            short_data = await asyncio.to_thread(
+                obb.equity.short_interest.short_interest, symbol=symbol.upper()
+            )
 
             if short_data and hasattr(short_data, "results") and short_data.results:
                 latest_short = short_data.results[0]
@@ -321,7 +326,7 @@ class OpenBBClient:
             period_map = {"1m": "1d", "5m": "5d", "1h": "1mo", "1d": "1y"}
             period = period_map.get(timeframe, "1mo")
 
-            hist = ticker.history(period=period, interval=timeframe)
+            hist = await asyncio.to_thread(ticker.history, period=period, interval=timeframe)
             if not hist.empty:
                 ohlcv = []
                 for idx, row in hist.iterrows():
@@ -15,6 +15,7 @@ except ImportError:
     CCXT_AVAILABLE = False
     ccxt = None
 
+from ..exchange_adapter import get_exchange_adapter
 from .data_formatter import MarketDepthData
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,7 @@ class CryptoDataProvider:
         """
         self.openbb_client = openbb_client
         self.exchange = None
+        self.adapter = None
         self._rate_limiter = {"last_call": 0, "min_interval": 0.1}  # Rate limiting
         self._init_ccxt_exchange()
 
@@ -49,21 +51,24 @@ class CryptoDataProvider:
             return
 
         try:
-            # Initialize CCXT for crypto data (no API keys needed for public data)
-            self.exchange = ccxt.binance({
+            # Shared public-data adapter (no API keys needed for public data)
+            self.adapter = get_exchange_adapter("binance", {
                 "enableRateLimit": True,
                 "sandbox": False,  # Use live data for public endpoints
                 "timeout": 15000,  # 15 second timeout
                 "rateLimit": 1200,  # 1.2 seconds between requests
                 "verbose": False,  # Reduce logging noise
             })
+            self.exchange = self.adapter.exchange
 
             # Test the connection
-            self.exchange.load_markets()
+            if not self.exchange.markets:
+                self.exchange.load_markets()
             logger.info("📈 CCXT exchange initialized successfully")
 
         except Exception as e:
             logger.error(f"Failed to initialize CCXT exchange: {e}", exc_info=True)
+            self.adapter = None
             self.exchange = None
 
     def is_crypto_symbol(self, symbol: str) -> bool:
@@ -116,7 +121,7 @@ class CryptoDataProvider:
         try:
             await self._rate_limit()
             # Get order book
-            orderbook = self.exchange.fetch_order_book(symbol.upper(), limit=20)
+            orderbook = await self.adapter.fetch_order_book(symbol.upper(), limit=20)
 
             # Process bids and asks safely
             bids = []
@@ -198,7 +203,7 @@ class CryptoDataProvider:
             ccxt_timeframe = timeframe_map.get(timeframe, timeframe)
 
             # Fetch OHLCV data
-            ohlcv = self.exchange.fetch_ohlcv(
+            ohlcv = await self.adapter.fetch_ohlcv(
                 symbol.upper(),
                 ccxt_timeframe,
                 limit=min(periods, 1000)  # Limit to prevent excessive requests
@@ -239,7 +244,7 @@ class CryptoDataProvider:
                     alt_symbol = symbol.replace("/", "")
                     logger.debug(f"Trying alternative symbol format: {alt_symbol}")
                     await self._rate_limit()
-                    ohlcv = self.exchange.fetch_ohlcv(alt_symbol, ccxt_timeframe, limit=min(periods, 1000))
+                    ohlcv = await self.adapter.fetch_ohlcv(alt_symbol, ccxt_timeframe, limit=min(periods, 1000))
                     if ohlcv and len(ohlcv) > 0:
                         logger.info(f"✅ Got {len(ohlcv)} candles for {alt_symbol}")
                         return ohlcv
@@ -267,7 +272,7 @@ class CryptoDataProvider:
 
         try:
             await self._rate_limit()
-            ticker = self.exchange.fetch_ticker(symbol.upper())
+            ticker = await self.adapter.fetch_ticker(symbol.upper())
             if ticker:
                 def safe_float(value, default=0.0):
                     try:
@@ -305,7 +310,7 @@ class CryptoDataProvider:
 
         try:
             await self._rate_limit()
-            markets = self.exchange.load_markets()
+            markets = await self.adapter.load_markets()
             if not markets:
                 logger.warning("No markets loaded from exchange")
                 return []
@@ -353,7 +358,7 @@ class CryptoDataProvider:
 
         try:
             await self._rate_limit()
-            status = self.exchange.fetch_status()
+            status = await self.adapter.fetch_status()
 
             result = {
                 "status": status.get("status", "unknown"),
@@ -368,7 +373,7 @@ class CryptoDataProvider:
             if result["status"] == "unknown":
                 # Try a simple market check to verify connectivity
                 try:
-                    markets = self.exchange.load_markets()
+                    markets = await self.adapter.load_markets()
                     result["status"] = "ok" if markets else "degraded"
                     result["markets_count"] = len(markets) if markets else 0
                 except Exception:
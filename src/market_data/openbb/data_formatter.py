@@ -22,6 +22,11 @@ except ImportError:
     PANDAS_AVAILABLE = False
     pd = None
 
+try:
+    from src.monitoring.metrics import CACHE_REQUESTS
+except ImportError:  # imported with src/ on the path
+    from monitoring.metrics import CACHE_REQUESTS
+
 logger = logging.getLogger(__name__)
 
 
@@ -169,9 +174,12 @@ class DataFormatter:
         """
         if self._is_cached(key, duration):
             try:
-                return self.cache[key]["data"]
+                data = self.cache[key]["data"]
+                CACHE_REQUESTS.labels("openbb_formatter", "hit").inc()
+                return data
             except KeyError:
-                return None
+                pass
+        CACHE_REQUESTS.labels("openbb_formatter", "miss").inc()
         return None
 
     def cache_data(self, key: str, data: Any) -> None:
@@ -0,0 +1,13 @@
+"""
+FrickTrader Monitoring
+Latency tracing, the process-wide metrics registry and asynchronous logging
+"""
+
+from .async_logging import HotPathLogger, configure_logging, set_hot_path_debug, stop_logging
+from .metrics import MetricsRegistry, registry
+from .tracing import LatencyHistogram, Span, Tracer, traced, tracer
+
+__all__ = [
+    'HotPathLogger', 'LatencyHistogram', 'MetricsRegistry', 'Span', 'Tracer', 'configure_logging',
+    'registry', 'set_hot_path_debug', 'stop_logging', 'traced', 'tracer',
+]
@@ -0,0 +1,192 @@
+"""
+Asynchronous Logging
+Keeps log formatting and file I/O off the trading hot path
+
+configure_logging() installs a single queue handler on the root logger;
+a background listener thread formats records and writes them to the real
+handlers. Records cross the queue unformatted (message template plus
+args), so callers only pay for building the record.
+
+Log calls inside hot loops go through a HotPathLogger, which samples
+per call site (and optional key, e.g. the pair) and reports how many
+records it suppressed. Sampling can be switched off per module at
+runtime with set_hot_path_debug(), which also enables its DEBUG output.
+
+Usage:
+    hot_log = HotPathLogger(__name__, interval=60.0)
+    hot_log.info('📊 Calculated %d indicators', len(indicators))
+    hot_log.info('🚀 Entry for %s', pair, key=pair)
+
+    set_hot_path_debug('src.data.market_data_manager')
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from .metrics import QUEUE_DEPTH, registry
+
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Comma-separated modules whose hot-path logs start unsampled at DEBUG
+DEBUG_MODULES_ENV = 'FRICKTRADER_DEBUG_MODULES'
+
+LOG_RECORDS_DROPPED = registry.counter(
+    'fricktrader_log_records_dropped_total', 'Log records dropped because the log queue was full')
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+_unsampled: Set[str] = set()
+
+
+class _LazyQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener and never blocks"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the writer thread; args must not be mutated
+        # after the call (pass values, not objects the caller keeps changing)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def configure_logging(level: int = logging.INFO, fmt: str = DEFAULT_FORMAT,
+                      log_file: Optional[str] = None, queue_size: int = 10_000,
+                      force: bool = False) -> Optional[logging.handlers.QueueListener]:
+    """
+    Route all logging through a queue to a background writer thread
+
+    Like logging.basicConfig(), does nothing when the root logger already
+    has handlers unless ``force`` is set.
+
+    Args:
+        level: Root logger level
+        fmt: Format of the console (and file) handler
+        log_file: Also append records to this file
+        queue_size: Records buffered before new ones are dropped
+        force: Replace existing root handlers
+
+    Returns:
+        The running listener, or None if logging was already configured
+    """
+    global _listener
+    root = logging.getLogger()
+    with _listener_lock:
+        if root.handlers and not force:
+            return None
+        if force:
+            _stop_listener()
+            for handler in root.handlers[:]:
+                root.removeHandler(handler)
+                handler.close()
+
+        formatter = logging.Formatter(fmt)
+        handlers: List[logging.Handler] = [logging.StreamHandler()]
+        if log_file:
+            handlers.append(logging.FileHandler(log_file))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        records: queue.Queue = queue.Queue(maxsize=queue_size)
+        root.addHandler(_LazyQueueHandler(records))
+        root.setLevel(level)
+        _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        QUEUE_DEPTH.labels('log_records').set_function(records.qsize)
+
+    for module in filter(None, os.environ.get(DEBUG_MODULES_ENV, '').split(',')):
+        set_hot_path_debug(module.strip())
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    with _listener_lock:
+        _stop_listener()
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()  # drains the queue before returning
+        _listener = None
+
+
+atexit.register(stop_logging)
+
+
+def set_hot_path_debug(module: str, enabled: bool = True) -> None:
+    """
+    Turn unsampled DEBUG logging of a module (and its children) on or off
+
+    Args:
+        module: Logger name, e.g. 'src.data.market_data_manager' or 'src.data'
+        enabled: False restores the inherited level and sampling
+    """
+    logging.getLogger(module).setLevel(logging.DEBUG if enabled else logging.NOTSET)
+    if enabled:
+        _unsampled.add(module)
+    else:
+        _unsampled.discard(module)
+
+
+def _sampling_disabled(name: str) -> bool:
+    return any(name == module or name.startswith(module + '.') for module in _unsampled)
+
+
+class HotPathLogger:
+    """Logger for call sites inside hot loops, sampled per call site"""
+
+    def __init__(self, name: str, interval: Optional[float] = None, every: Optional[int] = None):
+        """
+        Args:
+            name: Logger name (usually ``__name__``)
+            interval: Emit at most one record per call site every ``interval`` seconds
+            every: Emit one record out of every ``every`` calls per call site
+        """
+        self.logger = logging.getLogger(name)
+        self.interval = interval
+        self.every = every
+        # (code, line, key) -> [monotonic time of last emit, records suppressed since]
+        self._sites: Dict[Tuple, List] = {}
+
+    def debug(self, msg: str, *args, key: Optional[str] = None) -> None:
+        self._log(logging.DEBUG, msg, args, key)
+
+    def info(self, msg: str, *args, key: Optional[str] = None) -> None:
+        self._log(logging.INFO, msg, args, key)
+
+    def warning(self, msg: str, *args, key: Optional[str] = None) -> None:
+        self._log(logging.WARNING, msg, args, key)
+
+    def _log(self, level: int, msg: str, args: tuple, key: Optional[str]) -> None:
+        logger = self.logger
+        if not logger.isEnabledFor(level):
+            return
+        if not (_unsampled and _sampling_disabled(logger.name)):
+            frame = sys._getframe(2)
+            site = (frame.f_code, frame.f_lineno, key)
+            now = time.monotonic()
+            state = self._sites.get(site)
+            if state is None:
+                state = self._sites[site] = [now, 0]
+            elif ((self.interval is not None and now - state[0] < self.interval)
+                  or (self.every is not None and state[1] + 1 < self.every)):
+                state[1] += 1
+                return
+            else:
+                if state[1]:
+                    msg, args = msg + ' (%d similar suppressed)', args + (state[1],)
+                state[0], state[1] = now, 0
+        # stacklevel points the record's location at the caller, not this wrapper
+        logger.log(level, msg, *args, stacklevel=3)
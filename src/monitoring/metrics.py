@@ -0,0 +1,338 @@
+"""
+Metrics Registry
+Counters, gauges and histograms with labels, scraped as Prometheus text
+
+Subsystems declare their metrics once at import time and update cached
+label children on the hot path (one uncontended lock and an add). Gauges
+for sizes that are cheap to read but change constantly (queue depths,
+open positions) are backed by callbacks evaluated only when scraped, and
+collectors registered on the registry run just before each scrape.
+
+Usage:
+    CACHE_REQUESTS.labels('market_data', 'hit').inc()
+    with DB_WRITE_SECONDS.labels('sqlite', 'ohlcv_data').time():
+        ...
+    registry.render()  # text exposition format 0.0.4
+"""
+
+import bisect
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; spans sub-millisecond DB writes to multi-second exchange calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class CounterChild:
+    """Monotonically increasing value of one label combination"""
+
+    __slots__ = ('_lock', 'value')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+    def get(self) -> float:
+        return self.value
+
+
+class GaugeChild:
+    """Value that goes up and down, or a callback read at scrape time"""
+
+    __slots__ = ('_lock', 'value', '_function')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Report ``function()`` instead of the stored value"""
+        self._function = function
+
+    def get(self) -> float:
+        if self._function is None:
+            return self.value
+        try:
+            return float(self._function())
+        except Exception as e:
+            logger.debug(f"Gauge callback failed: {e}")
+            return math.nan
+
+
+class _Timer:
+    """Context manager observing its elapsed seconds into a histogram"""
+
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child: 'HistogramChild'):
+        self.child = child
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.child.observe(time.perf_counter() - self.start)
+
+
+class HistogramChild:
+    """Bucketed distribution of one label combination"""
+
+    __slots__ = ('_lock', 'upper_bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Sequence[float]):
+        self._lock = threading.Lock()
+        self.upper_bounds = list(buckets)
+        self.counts = [0] * (len(self.upper_bounds) + 1)  # last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> _Timer:
+        return _Timer(self)
+
+    def get(self) -> float:
+        return self.count
+
+
+class Metric:
+    """A named metric family with one child per label-value combination"""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str, **labels: str):
+        """Child for the given label values (positional or by name)"""
+        if labels:
+            values = tuple(labels[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterator[Sample]:
+        for key, child in list(self._children.items()):
+            yield self.name, dict(zip(self.labelnames, key)), child.get()
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def samples(self) -> Iterator[Sample]:
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, 'le': _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, child.sum
+            yield f"{self.name}_count", labels, child.count
+
+
+class MetricsRegistry:
+    """Process-wide set of metric families"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **options) -> Metric:
+        """Create a metric, or return the existing one of the same name and shape"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **options)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind} {metric.labelnames}")
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before every scrape (to refresh derived gauges)"""
+        self._collectors.append(collector)
+
+    def collect(self) -> List[Metric]:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.error(f"Metrics collector {collector.__name__} failed: {e}")
+        return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value))
+
+
+# Process-wide registry every subsystem reports into
+registry = MetricsRegistry()
+
+# =============================================================================
+# Subsystem metrics
+# =============================================================================
+
+CACHE_REQUESTS = registry.counter(
+    'fricktrader_cache_requests_total', 'Cache lookups by cache and result (hit or miss)', ('cache', 'result'))
+EXCHANGE_REQUESTS = registry.counter(
+    'fricktrader_exchange_requests_total', 'Exchange API requests sent', ('exchange', 'method'))
+EXCHANGE_ERRORS = registry.counter(
+    'fricktrader_exchange_request_errors_total', 'Failed exchange API requests by error kind',
+    ('exchange', 'method', 'error'))
+EXCHANGE_LATENCY = registry.histogram(
+    'fricktrader_exchange_request_seconds', 'Exchange API request duration', ('exchange', 'method'))
+EXCHANGE_IN_FLIGHT = registry.gauge(
+    'fricktrader_exchange_requests_in_flight', 'Exchange requests queued or running', ('exchange',))
+DB_WRITE_SECONDS = registry.histogram(
+    'fricktrader_db_write_seconds', 'Database write duration', ('store', 'table'))
+QUEUE_DEPTH = registry.gauge(
+    'fricktrader_queue_depth', 'Items waiting in work queues', ('queue',))
+SIGNALS = registry.counter(
+    'fricktrader_signals_total', 'Trading signals generated by source and type', ('source', 'type'))
+SIGNAL_DECISIONS = registry.counter(
+    'fricktrader_signal_decisions_total', 'Signals processed by execution engines, by outcome', ('engine', 'action'))
+OPEN_POSITIONS = registry.gauge(
+    'fricktrader_open_positions', 'Open positions by engine', ('engine',))
+BOTS = registry.gauge(
+    'fricktrader_bots', 'Bots managed by the multi-bot coordinator', ('state',))
+
+_STAGE_LATENCY = registry.gauge(
+    'fricktrader_stage_latency_seconds', 'Hot-path stage latency quantiles from the tracer', ('stage', 'quantile'))
+
+
+def _collect_stage_latencies() -> None:
+    """Copy the tracer's per-stage percentiles into gauges"""
+    for stage, histogram in tracer.stage_histograms().items():
+        for quantile in (50, 99):
+            _STAGE_LATENCY.labels(stage, f"{quantile / 100:g}").set(histogram.percentile(quantile) / 1e9)
+
+
+registry.add_collector(_collect_stage_latencies)
+QUEUE_DEPTH.labels('trace_export').set_function(tracer.export_queue_depth)
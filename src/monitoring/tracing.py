@@ -0,0 +1,343 @@
+"""
+Latency Tracing
+Where the time goes between a candle closing and an order being sent
+
+Spans time hot-path stages with the monotonic nanosecond clock and nest
+through a context variable, so the current span follows ``await`` and
+the tasks spawned inside it. Every finished span feeds a fixed-size
+log-bucket histogram for its stage (p50/p99 kept in memory); finished
+traces are buffered and appended to a JSON-lines file when an export
+path is configured.
+
+Usage:
+    @traced('strategy.analyze')
+    async def analyze(...): ...
+
+    with tracer.span('bot.cycle', origin=candle_close_epoch):
+        ...
+"""
+
+import atexit
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stage whose end marks an order leaving the process, and the histogram of
+# its wall-clock latency from the close of the candle that triggered it
+ORDER_STAGE = 'execution.place_order'
+CANDLE_TO_ORDER = 'candle_close_to_order'
+
+# Spans kept per trace for export; long-lived roots stop collecting children
+MAX_TRACE_SPANS = 1_000
+
+_current_span: contextvars.ContextVar[Optional['Span']] = contextvars.ContextVar('current_span', default=None)
+_span_ids = itertools.count(1)
+_TRACE_PREFIX = os.urandom(4).hex()
+
+
+class LatencyHistogram:
+    """Log-bucketed latency distribution from 1 µs to 100 s (~7% bucket width)"""
+
+    MIN_NS = 1_000
+    DECADES = 8
+    BUCKETS_PER_DECADE = 32
+
+    def __init__(self):
+        # Bucket 0 is below MIN_NS, the last one above MIN_NS * 10**DECADES
+        self.counts = [0] * (self.DECADES * self.BUCKETS_PER_DECADE + 2)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int) -> None:
+        if ns < self.MIN_NS:
+            index = 0
+        else:
+            index = min(int(math.log10(ns / self.MIN_NS) * self.BUCKETS_PER_DECADE) + 1, len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> float:
+        """Approximate q-th percentile in nanoseconds (bucket geometric midpoint)"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        if index == 0:
+            return float(min(self.max_ns, self.MIN_NS))
+        midpoint = self.MIN_NS * 10 ** ((index - 0.5) / self.BUCKETS_PER_DECADE)
+        return float(min(midpoint, self.max_ns))
+
+    def snapshot(self) -> Dict[str, float]:
+        """Count and latency summary in milliseconds"""
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ns / self.count / 1e6 if self.count else 0.0,
+            'p50_ms': self.percentile(50) / 1e6,
+            'p90_ms': self.percentile(90) / 1e6,
+            'p99_ms': self.percentile(99) / 1e6,
+            'max_ms': self.max_ns / 1e6,
+        }
+
+
+class Trace:
+    """Spans sharing one root, with the wall-clock time the root started"""
+
+    __slots__ = ('trace_id', 'started_at', 'origin', 'spans')
+
+    def __init__(self, origin: Optional[float] = None):
+        self.trace_id = f"{_TRACE_PREFIX}{next(_span_ids):x}"
+        self.started_at = 0.0  # set when the root span is entered
+        self.origin = origin  # epoch seconds of the triggering event (candle close)
+        self.spans: List['Span'] = []
+
+
+class Span:
+    """One timed stage; use as a (sync or async-safe) context manager"""
+
+    __slots__ = ('tracer', 'name', 'trace', 'parent', 'span_id', 'start_ns', 'end_ns', 'attributes', 'error', '_token')
+
+    def __init__(self, tracer: 'Tracer', name: str, origin: Optional[float], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.parent = _current_span.get()
+        self.trace = self.parent.trace if self.parent is not None else Trace(origin)
+        if origin is not None and self.trace.origin is None:
+            self.trace.origin = origin
+        self.span_id = next(_span_ids)
+        self.attributes = attributes
+        self.start_ns = self.end_ns = 0
+        self.error = False
+
+    def __enter__(self) -> 'Span':
+        self._token = _current_span.set(self)
+        if self.parent is None:
+            self.trace.started_at = time.time()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        self.error = exc_type is not None
+        self.tracer._finish(self)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    def end_time(self) -> float:
+        """Wall-clock end, from the trace start plus monotonic offsets"""
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return self.trace.started_at + (self.end_ns - root.start_ns) / 1e9
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class Tracer:
+    """Creates spans, keeps per-stage histograms and exports finished traces"""
+
+    def __init__(self, export_path: Optional[str] = None, export_batch: int = 100, enabled: bool = True):
+        self.enabled = enabled
+        self.export_path = export_path
+        self.export_batch = export_batch
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.traces_finished = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+
+    def configure(self, export_path: Optional[str] = None, export_batch: Optional[int] = None,
+                  enabled: Optional[bool] = None) -> None:
+        """Change export target, batch size or enable/disable tracing"""
+        self.flush()
+        if export_path is not None:
+            self.export_path = export_path
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+        if export_batch is not None:
+            self.export_batch = export_batch
+        if enabled is not None:
+            self.enabled = enabled
+
+    # =========================================================================
+    # Spans
+    # =========================================================================
+
+    def span(self, name: str, origin: Optional[float] = None, **attributes: Any):
+        """
+        Time a stage as a child of the current span (or as a new trace)
+
+        Args:
+            name: Stage name the histogram is kept under
+            origin: Epoch seconds of the event that started the trace
+            **attributes: Exported with the span (symbol, order id...)
+        """
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, origin, attributes)
+
+    def mark_origin(self, origin: float) -> None:
+        """Set the triggering event time of the current trace if not yet known"""
+        span = _current_span.get()
+        if span is not None and span.trace.origin is None:
+            span.trace.origin = origin
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            histogram = self.histograms.get(span.name)
+            if histogram is None:
+                histogram = self.histograms[span.name] = LatencyHistogram()
+            histogram.record(span.duration_ns)
+
+            trace = span.trace
+            if len(trace.spans) < MAX_TRACE_SPANS or span.parent is None:
+                trace.spans.append(span)
+            if span.name == ORDER_STAGE and trace.origin is not None:
+                lag_ns = int((span.end_time() - trace.origin) * 1e9)
+                self.histograms.setdefault(CANDLE_TO_ORDER, LatencyHistogram()).record(max(lag_ns, 0))
+
+            if span.parent is None:
+                self.traces_finished += 1
+                if self.export_path:
+                    self._pending.append(self._trace_record(span))
+                    flush = len(self._pending) >= self.export_batch
+                else:
+                    flush = False
+            else:
+                flush = False
+        if flush:
+            self.flush()
+
+    @staticmethod
+    def _trace_record(root: Span) -> Dict[str, Any]:
+        trace = root.trace
+        spans = []
+        for span in trace.spans:
+            record = {
+                'name': span.name,
+                'span_id': span.span_id,
+                'parent_id': span.parent.span_id if span.parent is not None else None,
+                'offset_ms': (span.start_ns - root.start_ns) / 1e6,
+                'duration_ms': span.duration_ns / 1e6,
+            }
+            if span.error:
+                record['error'] = True
+            if span.attributes:
+                record['attributes'] = span.attributes
+            spans.append(record)
+        return {
+            'trace_id': trace.trace_id,
+            'name': root.name,
+            'started_at': datetime.fromtimestamp(trace.started_at).isoformat(),
+            'duration_ms': root.duration_ns / 1e6,
+            'origin_lag_ms': (trace.started_at - trace.origin) * 1e3 if trace.origin is not None else None,
+            'spans': spans,
+        }
+
+    # =========================================================================
+    # Export and reporting
+    # =========================================================================
+
+    def flush(self) -> int:
+        """Append buffered traces to the export file; returns traces written"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending or not self.export_path:
+            return 0
+        try:
+            with open(self.export_path, 'a') as f:
+                for record in pending:
+                    f.write(json.dumps(record, default=str) + '\n')
+        except OSError as e:
+            logger.error(f"Error exporting {len(pending)} traces to {self.export_path}: {e}")
+            return 0
+        return len(pending)
+
+    def stage_histograms(self) -> Dict[str, LatencyHistogram]:
+        """Snapshot of the per-stage histograms (stage name -> histogram)"""
+        with self._lock:
+            return dict(self.histograms)
+
+    def export_queue_depth(self) -> int:
+        """Finished traces waiting to be exported"""
+        return len(self._pending)
+
+    def latency_report(self) -> Dict[str, Any]:
+        """Per-stage latency percentiles for the dashboard"""
+        with self._lock:
+            stages = {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        return {
+            'enabled': self.enabled,
+            'traces_finished': self.traces_finished,
+            'export_path': self.export_path,
+            'stages': dict(sorted(stages.items())),
+            'timestamp': datetime.now().isoformat(),
+        }
+
+    def reset(self) -> None:
+        """Drop all histograms and unexported traces"""
+        with self._lock:
+            self.histograms.clear()
+            self._pending.clear()
+            self.traces_finished = 0
+
+
+# Process-wide tracer used by @traced; configure() it to export traces
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable:
+    """Decorator timing every call of a sync or async function as a span"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -7,19 +7,18 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List
 import requests
 import subprocess
 
 from src.core.portfolio_manager import PortfolioManager
+from src.market_data.indicator_hub import hub_client_from_env
 from src.market_data.live_market_provider import LiveMarketProvider
 from src.analysis.individual_coin_analyzer import IndividualCoinAnalyzer
+from src.monitoring.async_logging import configure_logging
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Setup logging (records are written by a background thread)
+configure_logging(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class MultiStrategyTrader:
@@ -36,6 +35,8 @@ class MultiStrategyTrader:
         self.portfolio_manager = PortfolioManager(self.config.get('portfolio', {}))
         self.market_provider = LiveMarketProvider()
         self.coin_analyzer = IndividualCoinAnalyzer()
+        # Candles shared with the other bots when a market-data hub is running
+        self.market_hub = hub_client_from_env("multi_strategy_trader")
         
         # Freqtrade API settings
         self.api_base = "http://127.0.0.1:8080/api/v1"
@@ -88,7 +89,7 @@ class MultiStrategyTrader:
             for pair in major_pairs:
                 try:
                     # Get OHLCV data (last 100 candles for analysis)
-                    ohlcv = self.market_provider.get_kline_data(pair, '1h', limit=100)
+                    ohlcv = self._get_candles(pair, '1h', limit=100)
                     
                     if ohlcv:
                         market_data[pair] = {
@@ -110,6 +111,14 @@ class MultiStrategyTrader:
             logger.error(f"Error getting market data: {e}")
             return {}
     
+    def _get_candles(self, pair: str, timeframe: str, limit: int) -> List[Dict]:
+        """Candles from the shared hub when one is configured, else from the market provider"""
+        if self.market_hub is not None:
+            candles = self.market_hub.candles(pair, timeframe, limit)
+            if candles is not None and not candles.empty:
+                return candles.to_dict('records')
+        return self.market_provider.get_kline_data(pair, timeframe, limit=limit)
+    
     def get_freqtrade_performance(self) -> Dict:
         """Get performance data from running Freqtrade instances"""
         try:
@@ -405,6 +414,10 @@ class MultiStrategyTrader:
         for strategy_name in list(self.strategy_processes.keys()):
             self.stop_strategy_instance(strategy_name)
         
+        self.market_provider.close()
+        if self.market_hub is not None:
+            self.market_hub.close()
+        
         logger.info("All strategies stopped")
     
     def get_status(self) -> Dict:
@@ -5,6 +5,7 @@ Provides blockchain data analysis, whale tracking,
 and on-chain metrics for trading signal generation.
 """
 
-from .etherscan_client import EtherscanClient
+from .block_indexer import BlockIndexer, FileBlockSource
+from .etherscan_client import EtherscanClient, OnChainAnalyzer
 
-__all__ = ["EtherscanClient"]
+__all__ = ["EtherscanClient", "OnChainAnalyzer", "BlockIndexer", "FileBlockSource"]
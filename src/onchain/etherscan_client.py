@@ -4,12 +4,15 @@ Tracks whale movements, exchange flows, and network activity
 """
 
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
 import requests
 
+from .block_indexer import HOUR, PYARROW_AVAILABLE, BlockIndexer
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +27,7 @@ class EtherscanClient:
         self.base_url = "https://api.etherscan.io/api"
         self.rate_limit_delay = 0.2  # 5 calls per second
         self.last_call_time = 0
+        self._rate_lock = threading.Lock()
 
         # Major exchange wallet addresses for flow monitoring
         self.exchange_wallets = {
@@ -52,12 +56,13 @@ class EtherscanClient:
         }
 
     def _rate_limit(self):
-        """Enforce rate limiting"""
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-        if time_since_last_call < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last_call)
-        self.last_call_time = time.time()
+        """Enforce rate limiting (thread-safe: concurrent callers queue for slots)"""
+        with self._rate_lock:
+            slot = max(time.time(), self.last_call_time + self.rate_limit_delay)
+            self.last_call_time = slot
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
 
     def _make_request(self, params: Dict) -> Optional[Dict]:
         """Make API request with rate limiting and error handling"""
@@ -70,6 +75,12 @@ class EtherscanClient:
             response.raise_for_status()
             data = response.json()
 
+            if "jsonrpc" in data:
+                # Proxy (JSON-RPC) responses carry no status field
+                if "error" in data:
+                    logger.warning(f"Etherscan RPC error: {data['error']}")
+                    return None
+                return data.get("result")
             if data.get("status") == "1":
                 return data.get("result")
             else:
@@ -202,6 +213,14 @@ class EtherscanClient:
 
         return min(1.0, max(0.0, activity_score))
 
+    def get_latest_block_number(self) -> Optional[int]:
+        """Current chain height (block source interface for BlockIndexer)"""
+        return self._get_latest_block_number()
+
+    def get_block(self, block_number: int) -> Optional[Dict]:
+        """Block with full transactions (block source interface for BlockIndexer)"""
+        return self._get_block_by_number(block_number)
+
     def _get_latest_block_number(self) -> Optional[int]:
         """Get the latest block number"""
         params = {"module": "proxy", "action": "eth_blockNumber"}
@@ -303,14 +322,117 @@ class DeFiTVLTracker:
 class OnChainAnalyzer:
     """
     Main on-chain data analyzer that combines all sources
+
+    Whale and exchange-flow scores are read-only queries against the local
+    block index. A daemon thread (``start_index_sync``, started by the first
+    score) brings the index forward in chunks of ``sync_blocks`` blocks and
+    then every ``sync_interval`` seconds. While the index does not reach back
+    over a score's whole window, or its newest block is more than
+    ``max_index_lag`` seconds old, scores fall back to sampling the Etherscan
+    API; ``get_index_status`` reports the lag.
     """
 
-    def __init__(self, etherscan_api_key: Optional[str] = None):
+    WHALE_WINDOW_HOURS = 6
+    FLOW_WINDOW_HOURS = 12
+    BLOCK_TIME = 12  # seconds per Ethereum block
+
+    def __init__(
+        self,
+        etherscan_api_key: Optional[str] = None,
+        indexer: Optional[BlockIndexer] = None,
+        index_dir: Optional[str] = "data/onchain",
+        sync_blocks: int = 300,
+        sync_interval: float = 60.0,
+        max_index_lag: Optional[float] = 3600.0,
+    ):
         self.etherscan = EtherscanClient(etherscan_api_key)
         self.defi_tracker = DeFiTVLTracker()
         self.cache = {}
         self.cache_duration = 300  # 5 minutes cache
 
+        self.sync_blocks = sync_blocks
+        self.sync_interval = sync_interval
+        self.max_index_lag = max_index_lag  # None accepts any lag (replays)
+        self._sync_lock = threading.Lock()
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+
+        if indexer is None and index_dir and PYARROW_AVAILABLE:
+            indexer = BlockIndexer(
+                self.etherscan,
+                index_dir,
+                exchange_wallets=self.etherscan.exchange_wallets,
+                thresholds_eth=(self.etherscan.whale_thresholds["ETH"] / 1e18, 1000, 10000),
+                # First sync reaches back over the longest scoring window
+                backfill_blocks=self.FLOW_WINDOW_HOURS * HOUR // self.BLOCK_TIME,
+            )
+        self.indexer = indexer
+
+    def sync_index(self, max_blocks: Optional[int] = None) -> int:
+        """Index new blocks; returns the number of blocks indexed"""
+        if self.indexer is None:
+            return 0
+        with self._sync_lock:
+            indexed = self.indexer.sync(max_blocks)
+        if indexed:
+            self.cache.clear()
+        return indexed
+
+    def index_lag(self) -> Optional[float]:
+        """Seconds between now and the newest indexed block (None when empty)"""
+        if self.indexer is None or self.indexer.last_timestamp is None:
+            return None
+        return max(time.time() - self.indexer.last_timestamp, 0.0)
+
+    def get_index_status(self) -> Dict:
+        """Index coverage and staleness"""
+        status = self.indexer.get_status() if self.indexer is not None else {}
+        status["lag_seconds"] = self.index_lag()
+        return status
+
+    def start_index_sync(self) -> None:
+        """Start the background index sync on a daemon thread"""
+        if self.indexer is None or (self._sync_thread and self._sync_thread.is_alive()):
+            return
+        self._sync_stop.clear()
+        self._sync_thread = threading.Thread(target=self._run_index_sync, name="onchain-index-sync", daemon=True)
+        self._sync_thread.start()
+
+    def stop_index_sync(self, timeout: float = 5.0) -> None:
+        """Stop the background index sync after its current chunk"""
+        self._sync_stop.set()
+        if self._sync_thread:
+            self._sync_thread.join(timeout=timeout)
+
+    def _run_index_sync(self) -> None:
+        while not self._sync_stop.is_set():
+            try:
+                # Chunks of sync_blocks keep a backfill responsive to stop_index_sync
+                while self.sync_index(self.sync_blocks) >= self.sync_blocks:
+                    if self._sync_stop.is_set():
+                        return
+            except Exception as e:
+                logger.warning(f"⛓️ On-chain index sync failed: {e}")
+            self._sync_stop.wait(self.sync_interval)
+
+    def _use_index(self, hours_back: int) -> bool:
+        """Whether the index is current and covers the window; never syncs itself"""
+        if self.indexer is None:
+            return False
+        if self._sync_thread is None:
+            self.start_index_sync()
+
+        lag = self.index_lag()
+        if lag is None:
+            return False
+        if self.max_index_lag is not None and lag > self.max_index_lag:
+            logger.warning(f"⛓️ On-chain index is {lag / 3600:.1f}h behind, sampling the API instead")
+            return False
+        if not self.indexer.covers(hours_back):
+            logger.info(f"⛓️ On-chain index does not cover the last {hours_back}h yet, sampling the API instead")
+            return False
+        return True
+
     def get_whale_activity_score(self, pair: str) -> float:
         """
         Calculate whale activity score for a trading pair
@@ -321,21 +443,25 @@ class OnChainAnalyzer:
             return self.cache[cache_key]["data"]
 
         try:
-            # Get whale transactions
-            whale_txs = self.etherscan.get_whale_transactions(hours_back=6)
+            if self._use_index(self.WHALE_WINDOW_HOURS):
+                activity = self.indexer.whale_activity(hours_back=self.WHALE_WINDOW_HOURS)
+                whale_count, total_volume = activity["count"], activity["volume_eth"]
+            else:
+                whale_txs = self.etherscan.get_whale_transactions(hours_back=self.WHALE_WINDOW_HOURS)
+                whale_count = len(whale_txs)
+                total_volume = sum(tx["value_eth"] for tx in whale_txs)
 
-            if not whale_txs:
+            if not whale_count:
                 score = 0.0
             else:
                 # Analyze whale transaction patterns
-                total_volume = sum(tx["value_eth"] for tx in whale_txs)
 
                 # Score based on volume and frequency
                 # More transactions = higher activity
                 # Larger average size = more significant moves
                 volume_score = min(total_volume / 10000, 1.0)  # Normalize to 10k ETH
                 frequency_score = min(
-                    len(whale_txs) / 50, 1.0
+                    whale_count / 50, 1.0
                 )  # Normalize to 50 transactions
 
                 score = (volume_score + frequency_score) / 2
@@ -361,7 +487,10 @@ class OnChainAnalyzer:
             return self.cache[cache_key]["data"]
 
         try:
-            flows = self.etherscan.get_exchange_flows(hours_back=12)
+            if self._use_index(self.FLOW_WINDOW_HOURS):
+                flows = self.indexer.exchange_flows(hours_back=self.FLOW_WINDOW_HOURS)
+            else:
+                flows = self.etherscan.get_exchange_flows(hours_back=self.FLOW_WINDOW_HOURS)
 
             if not flows:
                 score = 0.0
@@ -14,6 +14,11 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
 
+try:
+    from src.monitoring.tracing import traced
+except ImportError:  # imported with src/ on the path
+    from monitoring.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -89,6 +94,7 @@ class AdvancedRiskManager:
         logger.info(f"Max Portfolio Risk: {self.max_portfolio_risk:.1%}")
         logger.info(f"Max Single Trade Risk: {self.max_single_trade_risk:.1%}")
     
+    @traced('risk.evaluate_trade_proposal')
     def evaluate_trade_proposal(self,
                                pair: str,
                                side: str,
@@ -5,12 +5,20 @@ Executes signals with sophisticated entry/exit logic and position management
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
 from enum import Enum
 
 from advanced_signal_engine import TradingSignal, SignalType, SignalStrength
+from core.position_book import Column, PositionBook, PositionView, TimeColumn
+
+try:
+    from src.monitoring.metrics import OPEN_POSITIONS, SIGNAL_DECISIONS
+    from src.monitoring.tracing import ORDER_STAGE, traced
+except ImportError:  # imported with src/ on the path
+    from monitoring.metrics import OPEN_POSITIONS, SIGNAL_DECISIONS
+    from monitoring.tracing import ORDER_STAGE, traced
 
 logger = logging.getLogger(__name__)
 
@@ -28,47 +36,86 @@ class OrderType(Enum):
     STOP_LIMIT = "STOP_LIMIT"
     TRAILING_STOP = "TRAILING_STOP"
 
-@dataclass
-class Position:
-    id: str
-    symbol: str
-    signal: TradingSignal
-    status: PositionStatus
-    entry_price: float
-    current_price: float
-    quantity: float
-    unrealized_pnl: float
-    realized_pnl: float
-    stop_loss_price: float
-    trailing_stop_distance: float
-    take_profit_levels: List[Tuple[float, float]]  # (price, quantity_to_close)
-    entry_time: datetime
-    last_update: datetime
-    exit_reasons: List[str]
-    max_profit: float
-    max_loss: float
+# Max hold time based on signal strength
+MAX_HOLD_HOURS = {
+    SignalStrength.WEAK: 24,
+    SignalStrength.MODERATE: 72,
+    SignalStrength.STRONG: 168,  # 1 week
+    SignalStrength.VERY_STRONG: 336  # 2 weeks
+}
+
+class Position(PositionView):
+    """
+    Open position, a view into the engine's PositionBook
+    
+    Prices, quantity, stops and P&L are book columns; signal, status,
+    take_profit_levels ((price, quantity_to_close) list), max_hold_hours,
+    exit_reasons and the resting exit orders (stop_order_id,
+    take_profit_order_ids and exit_fills, the fill already booked per
+    order id) are side-table fields.
+    """
+    __slots__ = ()
+    
+    stop_loss_price = Column('stop_loss')
+    trailing_stop_distance = Column('trailing_distance')
+    next_take_profit = Column('take_profit')
+    entry_time = TimeColumn('opened_at')
+    last_update = TimeColumn('updated_at')
     
     def to_dict(self) -> Dict:
-        return asdict(self)
+        return {
+            'id': self.id,
+            'symbol': self.symbol,
+            'signal': {
+                'signal_type': self.signal.signal_type.value,
+                'strength': self.signal.strength.name,
+                'confidence': self.signal.confidence
+            },
+            'status': self.status,
+            'entry_price': self.entry_price,
+            'current_price': self.current_price,
+            'quantity': self.quantity,
+            'unrealized_pnl': self.unrealized_pnl,
+            'realized_pnl': self.realized_pnl,
+            'stop_loss_price': self.stop_loss_price,
+            'trailing_stop_distance': self.trailing_stop_distance,
+            'take_profit_levels': list(self.take_profit_levels),
+            'entry_time': self.entry_time,
+            'last_update': self.last_update,
+            'exit_reasons': list(self.exit_reasons),
+            'max_profit': self.max_profit,
+            'max_loss': self.max_loss
+        }
 
 class SignalExecutionEngine:
     """
     Advanced signal execution with automated position management
     """
     
-    def __init__(self):
-        self.active_positions: Dict[str, Position] = {}
-        self.closed_positions: List[Position] = []
+    def __init__(self, exchange=None, execution_planner=None):
+        """
+        Args:
+            exchange: CCXT-compatible exchange (e.g. ExchangeSimulator) that
+                orders are sent to; without one orders are filled by a mock
+            execution_planner: ExecutionPlanner that slices entry orders into
+                child orders on the exchange
+        """
+        self.exchange = exchange
+        self.execution_planner = execution_planner
+        self.active_positions = PositionBook(Position)
+        self.closed_positions: List[Dict] = []  # Position.to_dict() snapshots
         self.execution_history: List[Dict] = []
         self.portfolio_balance = 100000.0  # Starting balance
         self.max_position_size = 0.1  # Max 10% per position
         self.max_total_exposure = 0.5  # Max 50% total exposure
         self.risk_per_trade = 0.02  # Max 2% risk per trade
+        OPEN_POSITIONS.labels('signal_execution').set_function(lambda: len(self.active_positions))
         
     # =============================================================================
     # 1. SIGNAL EXECUTION SYSTEM
     # =============================================================================
     
+    @traced('execution.process_signals')
     async def process_signals(self, signals: List[TradingSignal]) -> List[Dict]:
         """
         Process and execute trading signals with risk management
@@ -112,6 +159,8 @@ class SignalExecutionEngine:
                     'timestamp': datetime.now()
                 })
         
+        for result in execution_results:
+            SIGNAL_DECISIONS.labels('signal_execution', result['action']).inc()
         return execution_results
     
     async def _assess_signal_risk(self, signal: TradingSignal) -> bool:
@@ -130,7 +179,7 @@ class SignalExecutionEngine:
                 return False
             
             # Check current exposure
-            current_exposure = sum(pos.quantity * pos.current_price for pos in self.active_positions.values())
+            current_exposure = self.active_positions.exposure()
             exposure_ratio = current_exposure / self.portfolio_balance
             
             if exposure_ratio >= self.max_total_exposure:
@@ -204,29 +253,28 @@ class SignalExecutionEngine:
                     'timestamp': datetime.now()
                 }
             
-            # Create position object
-            position = Position(
-                id=position_id,
-                symbol=signal.symbol,
-                signal=signal,
-                status=PositionStatus.ACTIVE,
-                entry_price=entry_result['fill_price'],
-                current_price=entry_result['fill_price'],
-                quantity=position_size,
-                unrealized_pnl=0.0,
-                realized_pnl=0.0,
-                stop_loss_price=signal.stop_loss,
-                trailing_stop_distance=abs(entry_result['fill_price'] - signal.stop_loss),
-                take_profit_levels=[(tp, position_size / len(signal.take_profit_levels)) for tp in signal.take_profit_levels],
-                entry_time=datetime.now(),
-                last_update=datetime.now(),
-                exit_reasons=[],
-                max_profit=0.0,
-                max_loss=0.0
-            )
-            
             # Add to active positions
-            self.active_positions[position_id] = position
+            quantity = entry_result.get('fill_quantity', position_size)
+            direction = 1 if signal.signal_type == SignalType.ENTRY_LONG else -1
+            take_profit_levels = [(tp, quantity / len(signal.take_profit_levels)) for tp in signal.take_profit_levels]
+            max_hold = MAX_HOLD_HOURS.get(signal.strength, 72)
+            position = self.active_positions.open(
+                position_id, signal.symbol, direction, entry_result['fill_price'], quantity,
+                metadata={
+                    'signal': signal,
+                    'status': PositionStatus.ACTIVE,
+                    'take_profit_levels': take_profit_levels,
+                    'max_hold_hours': max_hold,
+                    'exit_reasons': [],
+                    'stop_order_id': None,
+                    'take_profit_order_ids': [None] * len(take_profit_levels),
+                    'exit_fills': {}
+                },
+                stop_loss=signal.stop_loss,
+                trailing_distance=abs(entry_result['fill_price'] - signal.stop_loss),
+                take_profit=self._next_take_profit(take_profit_levels, direction),
+                expires_at=time.time() + max_hold * 3600
+            )
             
             # Place stop loss order
             await self._place_stop_loss_order(position)
@@ -241,7 +289,7 @@ class SignalExecutionEngine:
                 'action': 'EXECUTED',
                 'position_id': position_id,
                 'entry_price': entry_result['fill_price'],
-                'quantity': position_size,
+                'quantity': position.quantity,
                 'timestamp': datetime.now()
             }
             
@@ -258,6 +306,7 @@ class SignalExecutionEngine:
     # 2. ORDER MANAGEMENT SYSTEM
     # =============================================================================
     
+    @traced(ORDER_STAGE)
     async def _place_entry_order(self, signal: TradingSignal, quantity: float, position_id: str) -> Dict:
         """
         Place entry order (market or limit)
@@ -277,14 +326,22 @@ class SignalExecutionEngine:
                 else:
                     order_price = signal.entry_price * 1.001  # Sell slightly above
             
-            # Simulate order execution
-            execution_result = await self._simulate_order_execution(
+            order = dict(
                 symbol=signal.symbol,
                 side='BUY' if signal.signal_type == SignalType.ENTRY_LONG else 'SELL',
                 quantity=quantity,
                 order_type=order_type,
                 price=order_price
             )
+            if self.exchange is not None and self.execution_planner is not None:
+                execution_result = await self._submit_planned_order(**order)
+            else:
+                # Simulate order execution
+                execution_result = await self._simulate_order_execution(**order)
+            
+            # Entries do not wait for resting limit orders: keep what filled, cancel the rest
+            if execution_result['status'] in ('OPEN', 'PARTIALLY_FILLED'):
+                execution_result = await self._cancel_unfilled(signal.symbol, execution_result)
             
             # Log execution
             self.execution_history.append({
@@ -292,7 +349,7 @@ class SignalExecutionEngine:
                 'action': 'ENTRY',
                 'symbol': signal.symbol,
                 'side': 'BUY' if signal.signal_type == SignalType.ENTRY_LONG else 'SELL',
-                'quantity': quantity,
+                'quantity': execution_result.get('fill_quantity', quantity),
                 'price': execution_result.get('fill_price', order_price),
                 'order_type': order_type.value,
                 'timestamp': datetime.now()
@@ -319,6 +376,7 @@ class SignalExecutionEngine:
                 order_type=OrderType.STOP,
                 price=position.stop_loss_price
             )
+            position.stop_order_id = result.get('order_id')
             
             logger.info(f"Stop loss placed for {position.id}: {position.stop_loss_price}")
             return result
@@ -330,6 +388,10 @@ class SignalExecutionEngine:
     async def _place_take_profit_orders(self, position: Position) -> List[Dict]:
         """
         Place multiple take profit orders for staged exits
+        
+        With the stop they form a one-cancels-the-other group: sync_orders()
+        shrinks the stop when a take profit fills and cancels the take
+        profits when the stop fills.
         """
         results = []
         
@@ -337,6 +399,8 @@ class SignalExecutionEngine:
             side = 'SELL' if position.signal.signal_type == SignalType.ENTRY_LONG else 'BUY'
             
             for i, (tp_price, tp_quantity) in enumerate(position.take_profit_levels):
+                if tp_quantity <= 0:
+                    continue
                 result = await self._simulate_order_execution(
                     symbol=position.symbol,
                     side=side,
@@ -345,6 +409,7 @@ class SignalExecutionEngine:
                     price=tp_price
                 )
                 
+                position.take_profit_order_ids[i] = result.get('order_id')
                 results.append(result)
                 logger.info(f"Take profit {i+1} placed for {position.id}: {tp_price}")
             
@@ -363,8 +428,11 @@ class SignalExecutionEngine:
         price: float
     ) -> Dict:
         """
-        Simulate order execution (replace with real exchange API)
+        Simulate order execution, or send the order to the exchange when one is configured
         """
+        if self.exchange is not None:
+            return await self._submit_exchange_order(symbol, side, quantity, order_type, price)
+        
         try:
             # Mock execution with realistic slippage
             slippage_factor = 0.001 if order_type == OrderType.MARKET else 0.0
@@ -391,6 +459,118 @@ class SignalExecutionEngine:
                 'error': str(e)
             }
     
+    async def _submit_exchange_order(
+        self, 
+        symbol: str, 
+        side: str, 
+        quantity: float, 
+        order_type: OrderType, 
+        price: float
+    ) -> Dict:
+        """
+        Send an order to the exchange and report it in the execution result format
+        """
+        try:
+            params = {}
+            if order_type in (OrderType.STOP, OrderType.TRAILING_STOP):
+                exchange_type, params['stopPrice'] = 'market', price
+            elif order_type == OrderType.STOP_LIMIT:
+                exchange_type, params['stopPrice'] = 'limit', price
+            else:
+                exchange_type = order_type.value.lower()
+            
+            order = await self.exchange.create_order(
+                symbol, exchange_type, side.lower(), quantity,
+                None if exchange_type == 'market' else price, params
+            )
+            return self._execution_result(order, price)
+            
+        except Exception as e:
+            logger.error(f"Error sending {order_type.value} order for {symbol}: {e}")
+            return {
+                'status': 'FAILED',
+                'error': str(e)
+            }
+    
+    async def _submit_planned_order(
+        self, 
+        symbol: str, 
+        side: str, 
+        quantity: float, 
+        order_type: OrderType, 
+        price: float
+    ) -> Dict:
+        """
+        Execute an order as a schedule of child orders through the execution planner
+        """
+        try:
+            schedule = await self.execution_planner.execute(
+                self.exchange, symbol, side.lower(), quantity,
+                limit_price=price if order_type == OrderType.LIMIT else None
+            )
+        except Exception as e:
+            logger.error(f"Error executing planned {order_type.value} order for {symbol}: {e}")
+            return {
+                'status': 'FAILED',
+                'error': str(e)
+            }
+        
+        filled = schedule.filled_quantity
+        return {
+            'status': 'FILLED' if filled > 0 else 'CANCELED',
+            'order_id': None,
+            'fill_price': schedule.average_price or price,
+            'fill_quantity': filled,
+            'fill_time': datetime.now(),
+            'fees': schedule.fees,
+            'error': None if filled > 0 else 'No child order filled',
+            'schedule': schedule.to_dict()
+        }
+    
+    async def _cancel_unfilled(self, symbol: str, execution_result: Dict) -> Dict:
+        """
+        Cancel the unfilled part of an exchange order
+        """
+        order = await self._cancel_order(execution_result['order_id'], symbol)
+        result = self._execution_result(order, execution_result['fill_price'])
+        if result['fill_quantity'] > 0:
+            result['status'] = 'FILLED'
+        return result
+    
+    async def _cancel_order(self, order_id: str, symbol: str) -> Dict:
+        """
+        Cancel an exchange order and return its final state
+        """
+        try:
+            return await self.exchange.cancel_order(order_id, symbol)
+        except Exception as e:
+            # Filled (or gone) in the meantime
+            logger.info(f"Could not cancel order {order_id}: {e}")
+            return await self.exchange.fetch_order(order_id, symbol)
+    
+    @staticmethod
+    def _execution_result(order: Dict, price: float) -> Dict:
+        """
+        Map a CCXT order to the execution result format
+        """
+        filled = order.get('filled') or 0.0
+        if order['status'] == 'closed':
+            status = 'FILLED'
+        elif filled > 0:
+            status = 'PARTIALLY_FILLED' if order['status'] == 'open' else 'FILLED'
+        else:
+            status = 'OPEN' if order['status'] == 'open' else 'CANCELED'
+        
+        return {
+            'status': status,
+            'order_id': order['id'],
+            'fill_price': order.get('average') or price,
+            'fill_quantity': filled,
+            'fill_time': datetime.now(),
+            'fees': (order.get('fee') or {}).get('cost') or 0.0,
+            'error': f"Order {order['status']} without fills" if status == 'CANCELED' else None
+        }
+    
     # =============================================================================
     # 3. POSITION MANAGEMENT & TRAILING STOPS
     # =============================================================================
@@ -399,87 +579,173 @@ class SignalExecutionEngine:
         """
         Update all active positions with current prices and manage exits
         """
-        for position_id, position in list(self.active_positions.items()):
+        book = self.active_positions
+        
+        # Book exits the exchange already filled (errors are handled per position)
+        await self.sync_orders()
+        
+        # Mark to market and trail stops in the positions' favour
+        try:
+            marked, trailed = book.mark(market_prices, trail=True)
+        except Exception as e:
+            logger.error(f"Error marking positions to market: {e}")
+            return
+        # Slots can be closed and reused by new positions while exits await the exchange
+        generations = book.generations[marked]
+        
+        for position in book.views(trailed):
             try:
-                current_price = market_prices.get(position.symbol)
-                if not current_price:
-                    continue
-                
-                # Update position metrics
-                old_price = position.current_price
-                position.current_price = current_price
-                position.last_update = datetime.now()
-                
-                # Calculate P&L
-                if position.signal.signal_type == SignalType.ENTRY_LONG:
-                    position.unrealized_pnl = (current_price - position.entry_price) * position.quantity
-                else:
-                    position.unrealized_pnl = (position.entry_price - current_price) * position.quantity
-                
-                # Track max profit/loss
-                position.max_profit = max(position.max_profit, position.unrealized_pnl)
-                position.max_loss = min(position.max_loss, position.unrealized_pnl)
-                
-                # Update trailing stop
-                await self._update_trailing_stop(position, old_price, current_price)
-                
-                # Check for exit conditions
-                await self._check_exit_conditions(position)
-                
+                if position.is_open:
+                    logger.info(f"Trailing stop updated for {position.id}: {position.stop_loss_price:.4f}")
+                    await self._replace_stop_order(position)
             except Exception as e:
-                logger.error(f"Error updating position {position_id}: {e}")
+                logger.error(f"Error replacing trailed stop for {position.id}: {e}")
+        marked, generations = book.still_open(marked, generations)
+        
+        # 1. Stop Loss Hit
+        for position in book.views(book.stops_hit(marked)):
+            try:
+                if position.is_open:
+                    await self._close_position(position, "Stop loss triggered", position.current_price)
+            except Exception as e:
+                logger.error(f"Error closing stopped position {position.id}: {e}")
+        marked, generations = book.still_open(marked, generations)
+        
+        # 2. Take Profit Levels
+        for position in book.views(book.targets_hit(marked)):
+            try:
+                if position.is_open:
+                    await self._check_take_profit_levels(position)
+            except Exception as e:
+                logger.error(f"Error taking profit on {position.id}: {e}")
+        marked, generations = book.still_open(marked, generations)
+        
+        # 3. Time-based exits
+        for position in book.views(book.expired(slots=marked)):
+            try:
+                if position.is_open:
+                    await self._close_position(position, f"Max hold time ({position.max_hold_hours}h) reached", position.current_price)
+            except Exception as e:
+                logger.error(f"Error closing expired position {position.id}: {e}")
+        marked, generations = book.still_open(marked, generations)
+        
+        # 4. Momentum-based exits: over 5% profit but 30% of the max profit given back
+        pnl = book.values_of('unrealized_pnl', marked)
+        fading = (pnl > book.values_of('entry_price', marked) * 0.05) & (pnl < book.values_of('max_profit', marked) * 0.7)
+        for position in book.views(marked[fading]):
+            try:
+                if position.is_open:
+                    await self._close_position(position, "Momentum exit - profit protection", position.current_price)
+            except Exception as e:
+                logger.error(f"Error closing fading position {position.id}: {e}")
     
-    async def _update_trailing_stop(self, position: Position, old_price: float, new_price: float):
+    async def sync_orders(self):
         """
-        Update trailing stop loss based on price movement
+        Book fills of the resting stop and take profit orders on the exchange
+        
+        A take profit fill partially closes the position and shrinks the stop
+        to the remaining quantity; a stop fill closes it and cancels the take
+        profits still resting.
         """
-        try:
-            if position.signal.signal_type == SignalType.ENTRY_LONG:
-                # Long position: trail stop up as price rises
-                if new_price > old_price:
-                    new_stop = new_price - position.trailing_stop_distance
-                    if new_stop > position.stop_loss_price:
-                        position.stop_loss_price = new_stop
-                        logger.info(f"Trailing stop updated for {position.id}: {new_stop:.4f}")
-            else:
-                # Short position: trail stop down as price falls
-                if new_price < old_price:
-                    new_stop = new_price + position.trailing_stop_distance
-                    if new_stop < position.stop_loss_price:
-                        position.stop_loss_price = new_stop
-                        logger.info(f"Trailing stop updated for {position.id}: {new_stop:.4f}")
+        if self.exchange is None:
+            return
+        
+        for position in list(self.active_positions.values()):
+            if not position.is_open:
+                continue  # closed while an earlier position awaited the exchange
+            try:
+                for i, order_id in enumerate(position.take_profit_order_ids):
+                    if order_id is None:
+                        continue
+                    order = await self.exchange.fetch_order(order_id, position.symbol)
+                    if order['status'] != 'open':
+                        position.take_profit_order_ids[i] = None
+                    filled = self._new_fill(position, order)
+                    if filled > 0:
+                        tp_price, tp_quantity = position.take_profit_levels[i]
+                        position.take_profit_levels[i] = (tp_price, max(tp_quantity - filled, 0.0))
+                        position.next_take_profit = self._next_take_profit(position.take_profit_levels, position.direction)
+                        await self._partial_close_position(
+                            position, filled, f"Take profit {i+1} filled", order.get('average') or tp_price, executed=True
+                        )
+                        if not position.is_open:
+                            break
+                
+                if position.is_open and position.stop_order_id is not None:
+                    order = await self.exchange.fetch_order(position.stop_order_id, position.symbol)
+                    if order['status'] != 'open':
+                        position.stop_order_id = None
+                    filled = self._new_fill(position, order)
+                    if filled > 0:
+                        await self._partial_close_position(
+                            position, filled, "Stop loss triggered", order.get('average') or position.stop_loss_price,
+                            executed=True
+                        )
+                    elif position.stop_order_id is None:
+                        # Rejected on trigger: put protection back
+                        await self._replace_stop_order(position)
                         
-        except Exception as e:
-            logger.error(f"Error updating trailing stop: {e}")
+            except Exception as e:
+                logger.error(f"Error syncing exit orders for {position.id}: {e}")
+    
+    @staticmethod
+    def _new_fill(position: Position, order: Dict) -> float:
+        """Quantity an exit order filled since it was last booked"""
+        filled = order.get('filled') or 0.0
+        booked = position.exit_fills.get(order['id'], 0.0)
+        position.exit_fills[order['id']] = max(filled, booked)
+        return filled - booked
     
-    async def _check_exit_conditions(self, position: Position):
+    async def _cancel_exit_orders(self, position: Position) -> List[Tuple[float, float]]:
         """
-        Check various exit conditions for position
+        Cancel the resting stop and take profit orders of a position
+        
+        Returns (quantity, price) of fills not booked yet, from orders that
+        filled before they could be canceled
         """
-        try:
-            current_price = position.current_price
-            
-            # 1. Stop Loss Hit
-            if position.signal.signal_type == SignalType.ENTRY_LONG:
-                if current_price <= position.stop_loss_price:
-                    await self._close_position(position, "Stop loss triggered", current_price)
-                    return
-            else:
-                if current_price >= position.stop_loss_price:
-                    await self._close_position(position, "Stop loss triggered", current_price)
+        order_ids = [position.stop_order_id] + list(position.take_profit_order_ids)
+        position.stop_order_id = None
+        position.take_profit_order_ids = [None] * len(position.take_profit_order_ids)
+        
+        fills = []
+        for order_id in order_ids:
+            if order_id is None:
+                continue
+            order = await self._cancel_order(order_id, position.symbol)
+            filled = self._new_fill(position, order)
+            if filled > 0:
+                fills.append((filled, order.get('average') or order.get('price')))
+        return fills
+    
+    async def _replace_stop_order(self, position: Position):
+        """
+        Move the exchange stop to the position's current stop price and quantity
+        """
+        if self.exchange is None or not position.is_open:
+            return
+        
+        if position.stop_order_id is not None:
+            order = await self._cancel_order(position.stop_order_id, position.symbol)
+            position.stop_order_id = None
+            filled = self._new_fill(position, order)
+            if filled > 0:
+                # Stopped out before the stop could be moved
+                await self._partial_close_position(
+                    position, filled, "Stop loss triggered", order.get('average') or position.stop_loss_price,
+                    executed=True
+                )
+                if not position.is_open:
                     return
-            
-            # 2. Take Profit Levels
-            await self._check_take_profit_levels(position)
-            
-            # 3. Time-based exits
-            await self._check_time_based_exits(position)
-            
-            # 4. Momentum-based exits
-            await self._check_momentum_exits(position)
-            
-        except Exception as e:
-            logger.error(f"Error checking exit conditions: {e}")
+        
+        await self._place_stop_loss_order(position)
+    
+    @staticmethod
+    def _next_take_profit(take_profit_levels: List[Tuple[float, float]], direction: int) -> float:
+        """Nearest take profit level still to be executed (0 when none is left)"""
+        pending = [tp_price for tp_price, tp_quantity in take_profit_levels if tp_quantity > 0]
+        if not pending:
+            return 0.0
+        return min(pending) if direction > 0 else max(pending)
     
     async def _check_take_profit_levels(self, position: Position):
         """
@@ -496,101 +762,107 @@ class SignalExecutionEngine:
                 else:
                     should_execute = current_price <= tp_price
                 
-                if should_execute and tp_quantity > 0:
+                # Levels resting on the exchange are booked by sync_orders()
+                if should_execute and tp_quantity > 0 and position.take_profit_order_ids[i] is None:
                     # Execute partial close
                     await self._partial_close_position(position, tp_quantity, f"Take profit {i+1} hit", current_price)
+                    if not position.is_open:
+                        return
                     
                     # Mark this TP level as executed
                     position.take_profit_levels[i] = (tp_price, 0)
-                    
-        except Exception as e:
-            logger.error(f"Error checking take profit levels: {e}")
-    
-    async def _check_time_based_exits(self, position: Position):
-        """
-        Check time-based exit conditions
-        """
-        try:
-            time_since_entry = datetime.now() - position.entry_time
-            
-            # Max hold time based on signal strength
-            max_hold_hours = {
-                SignalStrength.WEAK: 24,
-                SignalStrength.MODERATE: 72,
-                SignalStrength.STRONG: 168,  # 1 week
-                SignalStrength.VERY_STRONG: 336  # 2 weeks
-            }
             
-            max_hold = max_hold_hours.get(position.signal.strength, 72)
-            
-            if time_since_entry > timedelta(hours=max_hold):
-                await self._close_position(position, f"Max hold time ({max_hold}h) reached", position.current_price)
-                
-        except Exception as e:
-            logger.error(f"Error checking time-based exits: {e}")
-    
-    async def _check_momentum_exits(self, position: Position):
-        """
-        Check momentum-based exit conditions
-        """
-        try:
-            # Exit if profit target hit but momentum is weakening
-            profit_threshold = position.entry_price * 0.05  # 5% profit
-            
-            if position.unrealized_pnl > profit_threshold:
-                # Check if we should exit due to weakening momentum
-                # This would normally involve analyzing recent price action
-                # For now, use a simple trailing profit protection
-                
-                if position.unrealized_pnl < position.max_profit * 0.7:  # Gave back 30% of max profit
-                    await self._close_position(position, "Momentum exit - profit protection", position.current_price)
+            position.next_take_profit = self._next_take_profit(position.take_profit_levels, position.direction)
                     
         except Exception as e:
-            logger.error(f"Error checking momentum exits: {e}")
+            logger.error(f"Error checking take profit levels: {e}")
     
-    async def _partial_close_position(self, position: Position, quantity: float, reason: str, price: float):
+    async def _partial_close_position(self, position: Position, quantity: float, reason: str, price: float,
+                                      executed: bool = False):
         """
         Partially close position (take partial profits)
+        
+        With an exchange, a market exit is sent unless the exit already
+        executed there (a resting take profit or stop filled).
         """
         try:
             if quantity >= position.quantity:
                 # Close entire position
-                await self._close_position(position, reason, price)
+                await self._close_position(position, reason, price, executed)
                 return
             
-            # Calculate realized P&L for the closed portion
-            if position.signal.signal_type == SignalType.ENTRY_LONG:
-                realized_pnl = (price - position.entry_price) * quantity
-            else:
-                realized_pnl = (position.entry_price - price) * quantity
-            
-            # Update position
-            position.quantity -= quantity
-            position.realized_pnl += realized_pnl
-            position.status = PositionStatus.PARTIAL_CLOSE
+            if self.exchange is not None and not executed:
+                result = await self._send_exit_order(position, quantity, price)
+                if not result.get('fill_quantity'):
+                    logger.error(f"Partial close of {position.id} not filled: {result.get('error')}")
+                    return
+                quantity, price = result['fill_quantity'], result['fill_price']
             
-            # Log the partial close
-            self.execution_history.append({
-                'position_id': position.id,
-                'action': 'PARTIAL_CLOSE',
-                'symbol': position.symbol,
-                'quantity': quantity,
-                'price': price,
-                'reason': reason,
-                'realized_pnl': realized_pnl,
-                'timestamp': datetime.now()
-            })
+            self._book_partial_close(position, quantity, reason, price)
             
-            logger.info(f"Partial close: {position.id}, qty: {quantity}, P&L: ${realized_pnl:.2f}")
+            # One-cancels-the-other: the stop only covers what is left
+            await self._replace_stop_order(position)
             
         except Exception as e:
             logger.error(f"Error partially closing position: {e}")
     
-    async def _close_position(self, position: Position, reason: str, price: float):
+    def _book_partial_close(self, position: Position, quantity: float, reason: str, price: float):
+        """
+        Record the realized P&L of a partial exit
+        """
+        # Calculate realized P&L for the closed portion
+        if position.signal.signal_type == SignalType.ENTRY_LONG:
+            realized_pnl = (price - position.entry_price) * quantity
+        else:
+            realized_pnl = (position.entry_price - price) * quantity
+        
+        # Update position
+        position.quantity -= quantity
+        position.realized_pnl += realized_pnl
+        position.status = PositionStatus.PARTIAL_CLOSE
+        
+        # Log the partial close
+        self.execution_history.append({
+            'position_id': position.id,
+            'action': 'PARTIAL_CLOSE',
+            'symbol': position.symbol,
+            'quantity': quantity,
+            'price': price,
+            'reason': reason,
+            'realized_pnl': realized_pnl,
+            'timestamp': datetime.now()
+        })
+        
+        logger.info(f"Partial close: {position.id}, qty: {quantity}, P&L: ${realized_pnl:.2f}")
+    
+    async def _close_position(self, position: Position, reason: str, price: float, executed: bool = False):
         """
         Completely close position
+        
+        With an exchange, the resting exit orders are canceled and a market
+        exit is sent for the rest unless the exit already executed there.
         """
         try:
+            if self.exchange is not None:
+                for filled, fill_price in await self._cancel_exit_orders(position):
+                    if executed:
+                        logger.warning(f"⚠️ Exit orders of {position.id} overfilled by {filled}")
+                    elif filled < position.quantity:
+                        self._book_partial_close(position, filled, "Exit order filled", fill_price)
+                    else:
+                        executed, price = True, fill_price
+                
+                if not executed:
+                    result = await self._send_exit_order(position, position.quantity, price)
+                    if result.get('fill_quantity', 0) < position.quantity:
+                        # Keep the unfilled rest open and protected
+                        if result.get('fill_quantity'):
+                            self._book_partial_close(position, result['fill_quantity'], reason, result['fill_price'])
+                        await self._replace_stop_order(position)
+                        logger.error(f"Close of {position.id} not completely filled: {result.get('error')}")
+                        return
+                    price = result['fill_price']
+            
             # Calculate final P&L
             if position.signal.signal_type == SignalType.ENTRY_LONG:
                 final_pnl = (price - position.entry_price) * position.quantity
@@ -614,17 +886,25 @@ class SignalExecutionEngine:
             })
             
             # Move to closed positions
-            self.closed_positions.append(position)
-            del self.active_positions[position.id]
+            closed = position.to_dict()
+            self.closed_positions.append(closed)
+            del self.active_positions[closed['id']]
             
             # Update portfolio balance
-            self.portfolio_balance += position.realized_pnl
+            self.portfolio_balance += closed['realized_pnl']
             
-            logger.info(f"Position closed: {position.id}, Reason: {reason}, P&L: ${position.realized_pnl:.2f}")
+            logger.info(f"Position closed: {closed['id']}, Reason: {reason}, P&L: ${closed['realized_pnl']:.2f}")
             
         except Exception as e:
             logger.error(f"Error closing position: {e}")
     
+    async def _send_exit_order(self, position: Position, quantity: float, price: float) -> Dict:
+        """
+        Market order on the exchange reducing the position by ``quantity``
+        """
+        side = 'SELL' if position.direction > 0 else 'BUY'
+        return await self._submit_exchange_order(position.symbol, side, quantity, OrderType.MARKET, price)
+    
     # =============================================================================
     # 4. PORTFOLIO & RISK MANAGEMENT
     # =============================================================================
@@ -634,14 +914,14 @@ class SignalExecutionEngine:
         Get comprehensive portfolio summary
         """
         try:
-            total_unrealized_pnl = sum(pos.unrealized_pnl for pos in self.active_positions.values())
-            total_realized_pnl = sum(pos.realized_pnl for pos in self.closed_positions)
+            total_unrealized_pnl = self.active_positions.unrealized_pnl()
+            total_realized_pnl = sum(pos['realized_pnl'] for pos in self.closed_positions)
             
-            active_positions_value = sum(pos.quantity * pos.current_price for pos in self.active_positions.values())
+            active_positions_value = self.active_positions.exposure()
             
             win_rate = 0
             if self.closed_positions:
-                winning_trades = len([pos for pos in self.closed_positions if pos.realized_pnl > 0])
+                winning_trades = len([pos for pos in self.closed_positions if pos['realized_pnl'] > 0])
                 win_rate = winning_trades / len(self.closed_positions)
             
             return {
@@ -654,6 +934,7 @@ class SignalExecutionEngine:
                 'portfolio_return': ((self.portfolio_balance + total_unrealized_pnl) / 100000 - 1) * 100,
                 'active_positions_value': active_positions_value,
                 'exposure_ratio': active_positions_value / self.portfolio_balance,
+                'risk_to_stops': self.active_positions.risk(),
                 'win_rate': win_rate,
                 'positions': [pos.to_dict() for pos in self.active_positions.values()]
             }
@@ -664,10 +945,7 @@ class SignalExecutionEngine:
     
     def _get_position_for_symbol(self, symbol: str) -> Optional[Position]:
         """Get active position for symbol"""
-        for position in self.active_positions.values():
-            if position.symbol == symbol:
-                return position
-        return None
+        return self.active_positions.find(symbol)
     
     async def _check_market_conditions(self) -> bool:
         """
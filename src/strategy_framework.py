@@ -5,15 +5,20 @@ Unified architecture for all trading strategies with standardized data access
 
 import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from src.analysis.market_panel import ewm_mean, rolling_mean, rolling_std, shift
+from src.analysis.timeframe_alignment import TimeframeAligner
+from src.monitoring.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 
@@ -87,6 +92,35 @@ class DataProvider(ABC):
     async def get_real_time_data(self, symbol: str) -> Dict[str, Any]:
         """Get real-time market data"""
         pass
+    
+    async def get_market_data_batch(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame,
+        periods: int = 100,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, MarketData]:
+        """
+        Get market data for a whole watchlist
+        
+        Fetches symbols concurrently, at most max_concurrency at a time.
+        A symbol that fails gets an empty MarketData instead of failing the batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or 16)
+        
+        async def fetch(symbol: str) -> MarketData:
+            async with semaphore:
+                return await self.get_market_data(symbol, timeframe, periods)
+        
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols), return_exceptions=True)
+        
+        batch = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Market data failed for {symbol}: {result}")
+                result = MarketData(symbol=symbol, ohlcv=pd.DataFrame())
+            batch[symbol] = result
+        return batch
 
 
 class TradingStrategy(ABC):
@@ -109,6 +143,7 @@ class TradingStrategy(ABC):
         # Strategy state
         self.is_active = True
         self.last_signal_time: Optional[datetime] = None
+        self.symbol_signal_times: Dict[str, datetime] = {}
         self.performance_metrics = {}
         
     @abstractmethod
@@ -129,6 +164,35 @@ class TradingStrategy(ABC):
         """
         pass
     
+    async def analyze_batch(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame = TimeFrame.H1,
+        market_data: Optional[Dict[str, MarketData]] = None
+    ) -> Dict[str, Optional[TradingSignal]]:
+        """
+        Analyze a whole watchlist
+        
+        Default runs analyze() per symbol concurrently, bounded by the
+        "max_concurrency" config. Strategies that can score prefetched
+        market_data in one vectorized pass override this.
+        """
+        semaphore = asyncio.Semaphore(self.config.get("max_concurrency", 16))
+        
+        async def run(symbol: str) -> Optional[TradingSignal]:
+            async with semaphore:
+                return await self.analyze(symbol, timeframe)
+        
+        results = await asyncio.gather(*(run(symbol) for symbol in symbols), return_exceptions=True)
+        
+        signals = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Analysis failed for {symbol}: {result}")
+                result = None
+            signals[symbol] = result
+        return signals
+    
     @abstractmethod
     def get_required_indicators(self) -> List[str]:
         """Return list of required technical indicators"""
@@ -148,15 +212,21 @@ class TradingStrategy(ABC):
             self.logger.warning(f"Invalid confidence: {signal.confidence}")
             return False
             
-        # Time-based validation (prevent spam)
+        # Time-based validation (prevent spam), per symbol so a watchlist
+        # cycle can emit one signal for each symbol
         min_interval = self.config.get("min_signal_interval", 300)  # 5 minutes default
-        if (self.last_signal_time and 
-            (datetime.now() - self.last_signal_time).seconds < min_interval):
-            self.logger.info("Signal suppressed - too soon after last signal")
+        last_signal_time = self.symbol_signal_times.get(signal.symbol)
+        if (last_signal_time and 
+            (datetime.now() - last_signal_time).seconds < min_interval):
+            self.logger.info(f"Signal suppressed for {signal.symbol} - too soon after last signal")
             return False
             
         return True
     
+    def _record_signal(self, signal: TradingSignal):
+        self.last_signal_time = datetime.now()
+        self.symbol_signal_times[signal.symbol] = self.last_signal_time
+    
     async def execute_strategy(
         self, 
         symbol: str, 
@@ -173,7 +243,7 @@ class TradingStrategy(ABC):
             signal = await self.analyze(symbol, timeframe)
             
             if signal and self.validate_signal(signal):
-                self.last_signal_time = datetime.now()
+                self._record_signal(signal)
                 self.logger.info(
                     f"Generated {signal.signal_type.value} signal: "
                     f"strength={signal.strength:.2f}, confidence={signal.confidence:.2f}"
@@ -186,6 +256,34 @@ class TradingStrategy(ABC):
         except Exception as e:
             self.logger.error(f"Strategy execution failed: {e}")
             return None
+    
+    async def execute_strategy_batch(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame = TimeFrame.H1,
+        market_data: Optional[Dict[str, MarketData]] = None
+    ) -> List[TradingSignal]:
+        """Execute strategy over a watchlist with error handling and logging"""
+        try:
+            if not self.is_active:
+                return []
+            
+            self.logger.info(f"Executing {self.name} strategy for {len(symbols)} symbols")
+            
+            results = await self.analyze_batch(symbols, timeframe, market_data)
+            
+            signals = []
+            for signal in results.values():
+                if signal and self.validate_signal(signal):
+                    self._record_signal(signal)
+                    signals.append(signal)
+            
+            self.logger.info(f"Generated {len(signals)} signals across {len(symbols)} symbols")
+            return signals
+            
+        except Exception as e:
+            self.logger.error(f"Batch strategy execution failed: {e}")
+            return []
 
 
 class MultiSignalStrategy(TradingStrategy):
@@ -209,6 +307,10 @@ class MultiSignalStrategy(TradingStrategy):
         self.buy_threshold = config.get("buy_threshold", 0.7)
         self.sell_threshold = config.get("sell_threshold", 0.3)
         
+        # Higher timeframes projected onto the analysis timeframe
+        self.higher_timeframes = config.get("higher_timeframes", ["4h", "1d"])
+        self._aligners: Dict[str, TimeframeAligner] = {}
+        
     def get_required_indicators(self) -> List[str]:
         """Required technical indicators"""
         return [
@@ -217,6 +319,7 @@ class MultiSignalStrategy(TradingStrategy):
             "volume_sma", "atr"
         ]
     
+    @traced('strategy.analyze')
     async def analyze(
         self, 
         symbol: str, 
@@ -229,45 +332,93 @@ class MultiSignalStrategy(TradingStrategy):
             symbol, timeframe, periods=200
         )
         
-        if market_data.ohlcv.empty:
-            self.logger.warning(f"No market data available for {symbol}")
-            return None
+        return self._score_batch({symbol: market_data}, timeframe)[symbol]
+    
+    async def analyze_batch(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame = TimeFrame.H1,
+        market_data: Optional[Dict[str, MarketData]] = None
+    ) -> Dict[str, Optional[TradingSignal]]:
+        """Score a whole watchlist in one vectorized pass"""
+        if market_data is None:
+            market_data = await self.data_provider.get_market_data_batch(
+                symbols, timeframe, periods=200,
+                max_concurrency=self.config.get("max_concurrency")
+            )
+        
+        missing = {symbol: MarketData(symbol=symbol, ohlcv=pd.DataFrame())
+                   for symbol in symbols if symbol not in market_data}
+        return self._score_batch({**market_data, **missing}, timeframe)
+    
+    def _score_batch(
+        self,
+        market_data: Dict[str, MarketData],
+        timeframe: TimeFrame
+    ) -> Dict[str, Optional[TradingSignal]]:
+        """Combine technical, order flow, sentiment and volume scores for every symbol"""
+        signals: Dict[str, Optional[TradingSignal]] = {}
+        
+        usable = {}
+        for symbol, data in market_data.items():
+            signals[symbol] = None
+            if data.ohlcv is None or data.ohlcv.empty:
+                self.logger.warning(f"No market data available for {symbol}")
+            else:
+                usable[symbol] = data
+        
+        if not usable:
+            return signals
+        
+        symbols = list(usable)
+        frames = [usable[symbol].ohlcv for symbol in symbols]
+        high, low, close, volume = (
+            self._stack_latest(frames, column) for column in ('high', 'low', 'close', 'volume')
+        )
         
         # Calculate technical indicators
-        technical_score = self._calculate_technical_score(market_data.ohlcv)
+        technical_scores, atr = self._calculate_technical_scores(high, low, close)
         
         # Analyze market depth and delta
-        orderflow_score = self._analyze_order_flow(market_data)
+        orderflow_scores = np.array([self._analyze_order_flow(usable[symbol]) for symbol in symbols])
         
         # Sentiment analysis
-        sentiment_score = self._analyze_sentiment(market_data)
+        sentiment_scores = np.array([self._analyze_sentiment(usable[symbol]) for symbol in symbols])
         
         # Volume analysis
-        volume_score = self._analyze_volume(market_data.ohlcv)
+        volume_scores = self._analyze_volume(close, volume)
         
         # Combine signals with weights
-        total_score = (
-            technical_score * self.weights["technical"] +
-            sentiment_score * self.weights["sentiment"] +
-            volume_score * self.weights["volume"] +
-            orderflow_score * self.weights["momentum"]
+        total_scores = (
+            technical_scores * self.weights["technical"] +
+            sentiment_scores * self.weights["sentiment"] +
+            volume_scores * self.weights["volume"] +
+            orderflow_scores * self.weights["momentum"]
         )
         
-        # Generate signal
-        current_price = float(market_data.ohlcv['close'].iloc[-1])
-        
-        signal_type = SignalType.HOLD
-        if total_score >= self.buy_threshold:
-            signal_type = SignalType.BUY
-        elif total_score <= self.sell_threshold:
-            signal_type = SignalType.SELL
-        
-        # Calculate confidence based on signal consensus
-        confidence = abs(total_score - 0.5) * 2  # Scale to 0-1
-        
-        # Create signal
-        if signal_type != SignalType.HOLD:
-            return TradingSignal(
+        for i, symbol in enumerate(symbols):
+            total_score = float(total_scores[i])
+            
+            # Generate signal
+            signal_type = SignalType.HOLD
+            if total_score >= self.buy_threshold:
+                signal_type = SignalType.BUY
+            elif total_score <= self.sell_threshold:
+                signal_type = SignalType.SELL
+            
+            if signal_type == SignalType.HOLD:
+                continue
+            
+            current_price = float(close[i, -1])
+            technical_score = float(technical_scores[i])
+            sentiment_score = float(sentiment_scores[i])
+            volume_score = float(volume_scores[i])
+            orderflow_score = float(orderflow_scores[i])
+            
+            # Calculate confidence based on signal consensus
+            confidence = abs(total_score - 0.5) * 2  # Scale to 0-1
+            
+            signals[symbol] = TradingSignal(
                 symbol=symbol,
                 signal_type=signal_type,
                 strength=abs(total_score - 0.5) * 2,  # Distance from neutral
@@ -286,51 +437,82 @@ class MultiSignalStrategy(TradingStrategy):
                     "total_score": total_score,
                     "timeframe": timeframe.value
                 },
-                stop_loss=self._calculate_stop_loss(market_data.ohlcv, signal_type),
-                take_profit=self._calculate_take_profit(market_data.ohlcv, signal_type)
+                stop_loss=self._calculate_stop_loss(current_price, float(atr[i]), signal_type),
+                take_profit=self._calculate_take_profit(current_price, float(atr[i]), signal_type)
             )
         
-        return None
+        return signals
     
-    def _calculate_technical_score(self, df: pd.DataFrame) -> float:
-        """Calculate technical analysis score"""
-        try:
-            # Calculate indicators
-            df = self._add_technical_indicators(df)
-            
-            latest = df.iloc[-1]
-            score = 0.5  # Start neutral
+    def build_feature_matrix(
+        self,
+        ohlcv: pd.DataFrame,
+        timeframe: TimeFrame = TimeFrame.H1,
+        higher_timeframes: Optional[List[str]] = None,
+        symbol: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Per-bar technical indicators on the analysis timeframe plus the same
+        indicators from higher timeframes, aligned without look-ahead
+        
+        Higher timeframes are resampled from ``ohlcv``; each bar only sees
+        higher-timeframe bars that had closed by its own close.
+        """
+        aligner = self._aligners.get(timeframe.value)
+        if aligner is None:
+            aligner = self._aligners[timeframe.value] = TimeframeAligner(timeframe.value)
+        if higher_timeframes is None:
+            higher_timeframes = self.higher_timeframes
+        return aligner.from_base(ohlcv, higher_timeframes, self._bar_indicators, key=symbol)
+    
+    def _bar_indicators(self, ohlcv: pd.DataFrame) -> pd.DataFrame:
+        """Technical indicators for every bar of one OHLCV frame"""
+        high, low, close = (
+            ohlcv[column].to_numpy(dtype=float)[np.newaxis, :] for column in ('high', 'low', 'close')
+        )
+        indicators = self._calculate_technical_indicators(high, low, close)
+        return pd.DataFrame({name: values[0] for name, values in indicators.items()}, index=ohlcv.index)
+    
+    @staticmethod
+    def _stack_latest(frames: List[pd.DataFrame], column: str) -> np.ndarray:
+        """Stack one column of every frame into a symbols x bars array, aligned on the latest bar"""
+        length = max(len(df) for df in frames)
+        stacked = np.full((len(frames), length), np.nan)
+        for i, df in enumerate(frames):
+            stacked[i, length - len(df):] = df[column].to_numpy(dtype=float)
+        return stacked
+    
+    def _calculate_technical_scores(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Technical analysis score and ATR per symbol (latest bar)"""
+        indicators = self._calculate_technical_indicators(high, low, close)
+        latest = {name: values[:, -1] for name, values in indicators.items()}
+        price = close[:, -1]
+        
+        with np.errstate(invalid='ignore'):
+            score = np.full(len(price), 0.5)  # Start neutral
             
             # Moving average signals
-            if latest['close'] > latest['sma_20']:
-                score += 0.1
-            if latest['close'] > latest['sma_50']:
-                score += 0.1
-            if latest['sma_20'] > latest['sma_50']:
-                score += 0.1
-                
-            # RSI
-            if 30 <= latest['rsi'] <= 70:  # Not overbought/oversold
-                if latest['rsi'] > 50:
-                    score += 0.05
-                else:
-                    score -= 0.05
-                    
+            score = score + np.where(price > latest['sma_20'], 0.1, 0.0)
+            score = score + np.where(price > latest['sma_50'], 0.1, 0.0)
+            score = score + np.where(latest['sma_20'] > latest['sma_50'], 0.1, 0.0)
+            
+            # RSI - only when not overbought/oversold
+            rsi = latest['rsi']
+            score = score + np.where((rsi >= 30) & (rsi <= 70), np.where(rsi > 50, 0.05, -0.05), 0.0)
+            
             # MACD
-            if latest['macd'] > latest['macd_signal']:
-                score += 0.1
-                
-            # Bollinger Bands
-            if latest['close'] < latest['bb_lower']:
-                score += 0.05  # Oversold, potential bounce
-            elif latest['close'] > latest['bb_upper']:
-                score -= 0.05  # Overbought
-                
-            return max(0, min(1, score))
+            score = score + np.where(latest['macd'] > latest['macd_signal'], 0.1, 0.0)
             
-        except Exception as e:
-            self.logger.error(f"Error calculating technical score: {e}")
-            return 0.5
+            # Bollinger Bands: oversold potential bounce / overbought
+            score = score + np.where(
+                price < latest['bb_lower'], 0.05, np.where(price > latest['bb_upper'], -0.05, 0.0)
+            )
+        
+        return np.clip(score, 0, 1), latest['atr']
     
     def _analyze_order_flow(self, market_data: MarketData) -> float:
         """Analyze order flow and market depth"""
@@ -386,97 +568,75 @@ class MultiSignalStrategy(TradingStrategy):
             self.logger.error(f"Error analyzing sentiment: {e}")
             return 0.5
     
-    def _analyze_volume(self, df: pd.DataFrame) -> float:
-        """Analyze volume patterns"""
-        try:
-            score = 0.5
+    def _analyze_volume(self, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+        """Analyze volume patterns per symbol (latest bar)"""
+        volume_sma_20 = rolling_mean(volume, 20)[:, -1]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # High volume confirmation - check if price is moving in same direction
+            high_volume = volume[:, -1] > volume_sma_20 * 1.5
+            price_change = (close[:, -1] - close[:, -2]) / close[:, -2] if close.shape[1] > 1 else np.zeros(len(close))
             
-            # Volume moving average
-            df['volume_sma_20'] = df['volume'].rolling(20).mean()
-            
-            latest = df.iloc[-1]
-            
-            # High volume confirmation
-            if latest['volume'] > latest['volume_sma_20'] * 1.5:
-                # High volume - check if price is moving in same direction
-                price_change = (latest['close'] - df.iloc[-2]['close']) / df.iloc[-2]['close']
-                if price_change > 0:
-                    score += 0.1
-                else:
-                    score -= 0.1
-                    
-            return max(0, min(1, score))
-            
-        except Exception as e:
-            self.logger.error(f"Error analyzing volume: {e}")
-            return 0.5
+        return 0.5 + np.where(high_volume, np.where(price_change > 0, 0.1, -0.1), 0.0)
     
-    def _add_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add technical indicators to dataframe"""
+    def _calculate_technical_indicators(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Technical indicators for symbols x bars arrays (NaN before each symbol's first bar)"""
+        indicators = {}
+        
         # Simple Moving Averages
-        df['sma_20'] = df['close'].rolling(20).mean()
-        df['sma_50'] = df['close'].rolling(50).mean()
+        indicators['sma_20'] = rolling_mean(close, 20)
+        indicators['sma_50'] = rolling_mean(close, 50)
         
         # Exponential Moving Averages
-        df['ema_12'] = df['close'].ewm(span=12).mean()
-        df['ema_26'] = df['close'].ewm(span=26).mean()
-        
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
-        
-        # MACD
-        df['macd'] = df['ema_12'] - df['ema_26']
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        
-        # Bollinger Bands
-        df['bb_middle'] = df['close'].rolling(20).mean()
-        bb_std = df['close'].rolling(20).std()
-        df['bb_upper'] = df['bb_middle'] + (bb_std * 2)
-        df['bb_lower'] = df['bb_middle'] - (bb_std * 2)
-        
-        # ATR
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        df['atr'] = true_range.rolling(14).mean()
-        
-        return df
+        indicators['ema_12'] = ewm_mean(close, 12)
+        indicators['ema_26'] = ewm_mean(close, 26)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # RSI (the first bar of each symbol counts as no change)
+            previous_close = shift(close, 1)
+            delta = close - previous_close
+            no_change = np.where(np.isnan(close), np.nan, 0.0)
+            gain = rolling_mean(np.where(delta > 0, delta, no_change), 14)
+            loss = rolling_mean(np.where(delta < 0, -delta, no_change), 14)
+            indicators['rsi'] = 100 - (100 / (1 + gain / loss))
+            
+            # MACD
+            indicators['macd'] = indicators['ema_12'] - indicators['ema_26']
+            indicators['macd_signal'] = ewm_mean(indicators['macd'], 9)
+            
+            # Bollinger Bands
+            indicators['bb_middle'] = indicators['sma_20']
+            bb_std = rolling_std(close, 20)
+            indicators['bb_upper'] = indicators['bb_middle'] + (bb_std * 2)
+            indicators['bb_lower'] = indicators['bb_middle'] - (bb_std * 2)
+            
+            # ATR
+            true_range = np.fmax(
+                high - low,
+                np.fmax(np.abs(high - previous_close), np.abs(low - previous_close))
+            )
+            indicators['atr'] = rolling_mean(true_range, 14)
+        
+        return indicators
     
-    def _calculate_stop_loss(self, df: pd.DataFrame, signal_type: SignalType) -> float:
+    def _calculate_stop_loss(self, current_price: float, atr: float, signal_type: SignalType) -> float:
         """Calculate stop loss level"""
-        try:
-            current_price = float(df['close'].iloc[-1])
-            atr = float(df['atr'].iloc[-1]) if 'atr' in df else current_price * 0.02
-            
-            if signal_type == SignalType.BUY:
-                return current_price - (2 * atr)  # 2 ATR stop loss
-            else:
-                return current_price + (2 * atr)
-                
-        except Exception as e:
-            self.logger.error(f"Error calculating stop loss: {e}")
-            return None
+        if signal_type == SignalType.BUY:
+            return current_price - (2 * atr)  # 2 ATR stop loss
+        else:
+            return current_price + (2 * atr)
     
-    def _calculate_take_profit(self, df: pd.DataFrame, signal_type: SignalType) -> float:
+    def _calculate_take_profit(self, current_price: float, atr: float, signal_type: SignalType) -> float:
         """Calculate take profit level"""
-        try:
-            current_price = float(df['close'].iloc[-1])
-            atr = float(df['atr'].iloc[-1]) if 'atr' in df else current_price * 0.02
-            
-            if signal_type == SignalType.BUY:
-                return current_price + (3 * atr)  # 3 ATR take profit (1:1.5 R:R)
-            else:
-                return current_price - (3 * atr)
-                
-        except Exception as e:
-            self.logger.error(f"Error calculating take profit: {e}")
-            return None
+        if signal_type == SignalType.BUY:
+            return current_price + (3 * atr)  # 3 ATR take profit (1:1.5 R:R)
+        else:
+            return current_price - (3 * atr)
     
     def _generate_reasoning(
         self, 
@@ -524,6 +684,7 @@ class StrategyManager:
         self.data_provider = data_provider
         self.strategies: List[TradingStrategy] = []
         self.logger = logging.getLogger(__name__)
+        self.last_cycle_seconds: Optional[float] = None
         
     def add_strategy(self, strategy: TradingStrategy):
         """Add a strategy to the manager"""
@@ -561,6 +722,52 @@ class StrategyManager:
         
         return signals
     
+    @traced('strategy.execute_all_strategies_batch')
+    async def execute_all_strategies_batch(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame = TimeFrame.H1,
+        periods: int = 200,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, List[TradingSignal]]:
+        """
+        Execute all active strategies over a watchlist in one cycle
+        
+        Market data is fetched once for all symbols (shared inputs once,
+        per-symbol inputs concurrently) and handed to every strategy.
+        """
+        cycle_start = time.perf_counter()
+        signals: Dict[str, List[TradingSignal]] = {symbol: [] for symbol in symbols}
+        
+        active_strategies = [s for s in self.strategies if s.is_active]
+        if not active_strategies:
+            return signals
+        
+        market_data = await self.data_provider.get_market_data_batch(
+            symbols, timeframe, periods, max_concurrency
+        )
+        fetch_seconds = time.perf_counter() - cycle_start
+        
+        results = await asyncio.gather(
+            *(strategy.execute_strategy_batch(symbols, timeframe, market_data)
+              for strategy in active_strategies),
+            return_exceptions=True
+        )
+        
+        for strategy, result in zip(active_strategies, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Strategy {strategy.name} failed: {result}")
+                continue
+            for signal in result:
+                signals.setdefault(signal.symbol, []).append(signal)
+        
+        self.last_cycle_seconds = time.perf_counter() - cycle_start
+        self.logger.info(
+            f"Batch cycle over {len(symbols)} symbols took {self.last_cycle_seconds:.2f}s "
+            f"(data {fetch_seconds:.2f}s)"
+        )
+        return signals
+    
     def get_strategy_status(self) -> Dict[str, Any]:
         """Get status of all strategies"""
         return {
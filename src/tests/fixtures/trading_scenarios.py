@@ -6,6 +6,7 @@ bear markets, high volatility, flash crashes, and more.
 """
 
 from datetime import datetime, timedelta
+from typing import Dict
 
 import numpy as np
 import pandas as pd
@@ -364,6 +365,33 @@ class TradingScenarios:
 
         return pd.DataFrame(data)
 
+    @staticmethod
+    def generate_multi_symbol_universe(
+        n_symbols: int = 4, n_bars: int = 200, seed: int = 7
+    ) -> Dict[str, pd.DataFrame]:
+        """Generate aligned hourly OHLCV frames for several symbols with different drifts."""
+
+        rng = np.random.default_rng(seed)
+        timestamps = pd.date_range("2024-01-01", periods=n_bars, freq="1h")
+        universe = {}
+
+        for i in range(n_symbols):
+            close = 100 * np.exp(np.cumsum(rng.normal(0.001 * (i - 1), 0.01, n_bars)))
+            open_ = np.roll(close, 1)
+            open_[0] = close[0]
+            universe[f"C{i}/USDT"] = pd.DataFrame(
+                {
+                    "timestamp": timestamps,
+                    "open": open_,
+                    "high": np.maximum(open_, close) * 1.002,
+                    "low": np.minimum(open_, close) * 0.998,
+                    "close": close,
+                    "volume": rng.uniform(500, 1500, n_bars),
+                }
+            )
+
+        return universe
+
 
 # Pytest fixtures using the scenarios
 @pytest.fixture
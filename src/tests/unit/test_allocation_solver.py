@@ -0,0 +1,228 @@
+"""
+Unit tests for the LP allocation solver and its DeFi and hedging users.
+
+Tests that the solver beats greedy selection, respects budgets, caps,
+minimum sizes and the gas budget, answers repeated problems from its
+cache, and that the DeFi profiles and hedge budget selection use it.
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.core.allocation_solver import AllocationSolver
+from src.defi_yield.models import ProtocolType, RiskLevel, YieldOpportunity
+from src.defi_yield.portfolio_optimizer import PortfolioOptimizer
+from src.hedging.advanced_hedging_system import AdvancedHedgingSystem
+
+
+def make_opportunity(pool_id, protocol, tokens, apy, risk=20, minimum=10, gas=20, lockup=None):
+    """Build an opportunity with the fields the allocator reads."""
+    return YieldOpportunity(
+        protocol=protocol,
+        protocol_type=ProtocolType.LENDING,
+        pool_id=pool_id,
+        pool_name=pool_id,
+        asset_pair=tokens,
+        base_apy=apy,
+        boosted_apy=0.0,
+        total_apy=apy,
+        tvl=1e9,
+        volume_24h=1e7,
+        risk_score=risk,
+        risk_level=RiskLevel.LOW if risk < 30 else RiskLevel.MEDIUM,
+        impermanent_loss_risk=0.0,
+        smart_contract_risk=0.1,
+        liquidity_risk=0.1,
+        reward_tokens=[],
+        entry_requirements={},
+        exit_conditions={},
+        fees={},
+        lockup_period=lockup,
+        auto_compound=False,
+        verified_strategy=True,
+        historical_performance={},
+        current_utilization=0.5,
+        deposit_cap=None,
+        minimum_deposit=minimum,
+        estimated_gas_cost=gas,
+    )
+
+
+class TestAllocationSolver:
+    """Test suite for AllocationSolver."""
+
+    @pytest.mark.unit
+    def test_beats_greedy_on_shared_budget(self):
+        """Test the LP routes a shared budget to where it earns most overall."""
+        # Token 0 can fund either position; only it can fund position 1
+        solver = AllocationSolver()
+        result = solver.solve(
+            value=[0.10, 0.09, 0.08],
+            budget_index=[0, 0, 1],
+            budgets=[100.0, 100.0],
+            upper=[100.0, 100.0, 100.0],
+            caps=[(np.array([0, 0, -1]), np.array([100.0]))],
+        )
+        np.testing.assert_allclose(result.amounts, [100.0, 0.0, 100.0], atol=1e-6)
+        assert result.objective == pytest.approx(18.0)
+
+    @pytest.mark.unit
+    def test_budgets_caps_and_bounds_hold_at_scale(self):
+        """Test thousands of variables solve within every limit."""
+        rng = np.random.default_rng(7)
+        n, tokens, protocols = 3000, 20, 40
+        budget_index = rng.integers(0, tokens, n)
+        budgets = rng.uniform(1e3, 1e5, tokens)
+        upper = budgets[budget_index] * 0.3
+        groups = rng.integers(0, protocols, n)
+        limits = np.full(protocols, budgets.sum() * 0.05)
+
+        result = AllocationSolver().solve(
+            value=rng.normal(0.05, 0.05, n), budget_index=budget_index, budgets=budgets,
+            upper=upper, min_size=np.full(n, 500.0), caps=[(groups, limits)],
+        )
+
+        assert result.status == "optimal"
+        spent = np.bincount(budget_index, result.amounts, tokens)
+        assert (spent <= budgets + 1e-6).all()
+        assert (np.bincount(groups, result.amounts, protocols) <= limits + 1e-6).all()
+        assert (result.amounts <= upper + 1e-6).all()
+        selected = result.amounts[result.selected]
+        assert (selected >= 500.0 - 1e-6).all()
+
+    @pytest.mark.unit
+    def test_minimum_size_and_gas_budget(self):
+        """Test undersized positions leave their remainder idle and gas is budgeted."""
+        solver = AllocationSolver()
+        # 150 of budget: 100 fills the first position, the 50 left is below min size
+        result = solver.solve(
+            value=[0.2, 0.1], budget_index=[0, 0], budgets=[150.0],
+            upper=[100.0, 100.0], min_size=[10.0, 80.0],
+        )
+        np.testing.assert_allclose(result.amounts, [100.0, 0.0], atol=1e-6)
+
+        # Three positions but gas for two: the least gain per gas is dropped
+        result = solver.solve(
+            value=[0.3, 0.2, 0.1], budget_index=[0, 1, 2], budgets=[100.0, 100.0, 100.0],
+            fixed_cost=[10.0, 10.0, 10.0], fixed_cost_budget=25.0,
+        )
+        np.testing.assert_allclose(result.amounts, [100.0, 100.0, 0.0], atol=1e-6)
+
+        # A position that cannot earn back its gas is never opened
+        result = solver.solve(value=[0.01], budget_index=[0], budgets=[100.0], min_gain=[5.0])
+        assert result.selected.size == 0
+
+    @pytest.mark.unit
+    def test_repeated_problem_is_cached(self):
+        """Test an unchanged rebalance is answered without another LP call."""
+        solver = AllocationSolver()
+        problem = dict(value=[0.1, 0.2], budget_index=[0, 0], budgets=[50.0], upper=[40.0, 40.0])
+
+        first = solver.solve(**problem)
+        calls = solver.stats["lp_calls"]
+        second = solver.solve(**problem)
+
+        assert second.status == "cached"
+        np.testing.assert_allclose(second.amounts, first.amounts)
+        assert solver.stats["lp_calls"] == calls
+        assert solver.get_stats()["cache_hits"] == 1
+
+        # A changed budget reuses the matrix but solves again
+        solver.solve(**{**problem, "budgets": [60.0]})
+        assert solver.stats["lp_calls"] == calls + 1
+        assert len(solver._matrices) == 1
+
+
+class TestDeFiAllocation:
+    """Test suite for the DeFi allocation profiles."""
+
+    OPPORTUNITIES = [
+        make_opportunity("aave_usdc", "Aave", ["USDC"], apy=5.0, risk=10, gas=5),
+        make_opportunity("ethena_usdc", "Ethena", ["USDC"], apy=20.0, risk=45),
+        make_opportunity("ethena_vault_usdc", "Ethena", ["USDC"], apy=18.0, risk=40),
+        make_opportunity("pendle_usdc", "Pendle", ["USDC"], apy=25.0, risk=40, lockup=180),
+    ]
+
+    def allocate(self, strategy, **preferences):
+        optimizer = PortfolioOptimizer()
+        allocation = asyncio.run(optimizer.optimize_allocation(
+            self.OPPORTUNITIES, {"USDC": 10000}, {"allocation_strategy": strategy, **preferences}
+        ))
+        return {item["opportunity"]["pool_id"]: item["allocated_amount"] for item in allocation}
+
+    @pytest.mark.unit
+    def test_profiles_respect_their_limits(self):
+        """Test each profile deploys within its budget and concentration caps."""
+        balanced = self.allocate("balanced", max_lockup_days=30)
+        assert "pendle_usdc" not in balanced
+        assert sum(balanced.values()) == pytest.approx(8000)
+        assert balanced["ethena_usdc"] + balanced.get("ethena_vault_usdc", 0) <= 5000 + 1e-6
+
+        conservative = self.allocate("conservative")
+        assert set(conservative) == {"aave_usdc"}
+        assert conservative["aave_usdc"] == pytest.approx(6000)
+
+        diversified = self.allocate("max_diversification")
+        assert all(amount <= 2000 + 1e-6 for amount in diversified.values())
+        assert len(diversified) >= 3
+
+    @pytest.mark.unit
+    def test_gas_budget_limits_positions(self):
+        """Test the gas budget caps how many positions are opened."""
+        assert len(self.allocate("max_diversification", gas_budget=30)) == 2
+
+    @pytest.mark.unit
+    def test_allocation_keeps_output_shape(self):
+        """Test allocations keep the dict shape the engine and routes read."""
+        optimizer = PortfolioOptimizer()
+        allocation = asyncio.run(optimizer.optimize_allocation(
+            self.OPPORTUNITIES, {"USDC": 10000}, {}
+        ))
+        assert allocation
+        for item in allocation:
+            assert set(item) == {"token", "opportunity", "allocated_amount", "allocation_percent"}
+            assert item["allocation_percent"] == pytest.approx(item["allocated_amount"] / 10000)
+
+
+class TestHedgeBudget:
+    """Test suite for hedge selection within a budget."""
+
+    @pytest.mark.unit
+    def test_partial_hedges_fill_budget(self):
+        """Test the budget is spent on the best hedges, the last one partially."""
+        system = AdvancedHedgingSystem()
+        recommendations = [
+            {"type": "drawdown_protection", "priority": "critical", "size_usd": 10000},
+            {"type": "volatility_hedge", "priority": "medium", "size_usd": 10000},
+            {"type": "correlation_hedge", "priority": "high", "size_usd": 10000},
+        ]
+        risk = {"correlation_risk": 0.9, "concentration_risk": 0.5}
+
+        hedges = system.optimize_hedge_portfolio(recommendations, 400, risk)
+
+        assert sum(hedge["estimated_cost"] for hedge in hedges) == pytest.approx(400)
+        by_type = {hedge["type"]: hedge for hedge in hedges}
+        assert by_type["correlation_hedge"]["hedge_fraction"] == pytest.approx(1.0)
+        assert by_type["drawdown_protection"]["hedge_fraction"] == pytest.approx(200 / 300)
+        assert by_type["drawdown_protection"]["size_usd"] == pytest.approx(10000 * 200 / 300)
+        assert "volatility_hedge" not in by_type
+
+        plan = system.create_hedge_execution_plan(hedges)
+        assert plan["total_cost"] == pytest.approx(400)
+
+    @pytest.mark.unit
+    def test_without_portfolio_risk(self):
+        """Test hedges can be optimized without a risk analysis."""
+        system = AdvancedHedgingSystem()
+        hedges = system.optimize_hedge_portfolio(
+            [{"type": "correlation_hedge", "priority": "high", "size_usd": 1000},
+             {"type": "sector_rotation", "priority": "low", "size_usd": 1000}],
+            100,
+        )
+        assert [hedge["type"] for hedge in hedges] == ["sector_rotation"]
@@ -0,0 +1,176 @@
+"""
+Unit tests for asynchronous logging.
+
+Tests the queue handler and background writer, per-call-site sampling of
+hot-path log calls, the runtime per-module debug switch (directly and via
+the dashboard endpoint), and trade-decision storage logging instead of
+printing.
+"""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from src.monitoring import async_logging
+from src.monitoring.async_logging import (
+    HotPathLogger,
+    configure_logging,
+    set_hot_path_debug,
+    stop_logging,
+)
+from src.monitoring.metrics import registry
+
+LOGGER = "fricktrader.tests.hot"
+
+
+@contextmanager
+def bare_root():
+    """Root logger without pytest's capture handlers, restored afterwards."""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    for handler in handlers:
+        root.removeHandler(handler)
+    try:
+        yield root
+    finally:
+        stop_logging()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+
+
+@pytest.fixture
+def hot_debug():
+    """Undo per-module debug switches made by a test."""
+    yield
+    for module in list(async_logging._unsampled):
+        set_hot_path_debug(module, False)
+
+
+class TestQueueLogging:
+    """Test suite for the queue handler and background writer."""
+
+    @pytest.mark.unit
+    def test_records_are_formatted_on_the_writer_thread(self, tmp_path):
+        """Test log calls only enqueue and the listener formats and writes them."""
+        log_file = tmp_path / "bot.log"
+        formatted_on = []
+
+        class Payload:
+            def __str__(self):
+                formatted_on.append(threading.current_thread())
+                return "payload"
+
+        with bare_root():
+            assert configure_logging(log_file=str(log_file)) is not None
+            assert configure_logging() is None  # already configured, like basicConfig
+            logging.getLogger(LOGGER).info("📦 Stored %s", Payload())
+            stop_logging()
+
+        assert "📦 Stored payload" in log_file.read_text()
+        assert formatted_on and threading.main_thread() not in formatted_on
+
+    @pytest.mark.unit
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test records beyond the queue size are counted, not waited for."""
+        dropped = registry.get("fricktrader_log_records_dropped_total").labels()
+        before = dropped.get()
+        handler = async_logging._LazyQueueHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord(LOGGER, logging.INFO, __file__, 1, "tick %d", (1,), None)
+
+        handler.handle(record)
+        handler.handle(record)
+
+        assert handler.queue.qsize() == 1 and handler.queue.get().args == (1,)
+        assert dropped.get() == before + 1
+
+
+class TestHotPathLogger:
+    """Test suite for sampled hot-path logging."""
+
+    @pytest.mark.unit
+    def test_samples_per_call_site_and_key(self, caplog):
+        """Test each call site and key emits once per interval or every N calls."""
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        throttled = HotPathLogger(LOGGER, interval=3600)
+        sampled = HotPathLogger(LOGGER, every=3)
+
+        for i in range(5):
+            throttled.info("📊 Calculated %d indicators", i)
+            for pair in ("BTC/USDT", "ETH/USDT"):
+                throttled.info("🚀 Entry for %s", pair, key=pair)
+        for i in range(7):
+            sampled.info("tick %d", i)
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages == [
+            "📊 Calculated 0 indicators", "🚀 Entry for BTC/USDT", "🚀 Entry for ETH/USDT",
+            "tick 0", "tick 3 (2 similar suppressed)", "tick 6 (2 similar suppressed)",
+        ]
+        assert {record.funcName for record in caplog.records} == {"test_samples_per_call_site_and_key"}
+
+    @pytest.mark.unit
+    def test_runtime_debug_switch(self, caplog, hot_debug):
+        """Test a module's debug switch emits every record and can be turned off."""
+        caplog.set_level(logging.INFO, logger=LOGGER)
+        caplog.handler.setLevel(logging.DEBUG)  # the logger level decides
+        hot_log = HotPathLogger(f"{LOGGER}.engine", interval=3600)
+
+        def burst():
+            for i in range(3):
+                hot_log.debug("debug %d", i)
+                hot_log.info("info %d", i)
+
+        burst()
+        set_hot_path_debug(LOGGER)
+        burst()
+        set_hot_path_debug(LOGGER, False)
+        burst()
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages == ["info 0", "debug 0", "info 0", "debug 1", "info 1", "debug 2", "info 2"]
+
+    @pytest.mark.unit
+    def test_debug_endpoint(self, hot_debug):
+        """Test the dashboard can switch a module's hot-path debug logging."""
+        from src.web_ui.blueprints.metrics_routes import metrics_bp
+
+        app = Flask(__name__)
+        app.register_blueprint(metrics_bp)
+        client = app.test_client()
+
+        response = client.post("/api/metrics/logging/debug", json={"module": LOGGER})
+        assert response.get_json() == {"module": LOGGER, "enabled": True}
+        assert logging.getLogger(LOGGER).level == logging.DEBUG
+        assert client.post("/api/metrics/logging/debug", json={}).status_code == 400
+
+        client.post("/api/metrics/logging/debug", json={"module": LOGGER, "enabled": False})
+        assert logging.getLogger(LOGGER).level == logging.NOTSET
+
+
+class TestDecisionStorageLogging:
+    """Test suite for trade decision storage reporting through logging."""
+
+    @pytest.mark.unit
+    def test_store_decision_logs_instead_of_printing(self, tmp_path, caplog, capsys):
+        """Test storing and failing to store decisions write log records, not stdout."""
+        from src.database.consolidated.trade_logic_schema import TradeLogicDBManager
+
+        caplog.set_level(logging.DEBUG, logger="src.database.consolidated.trade_logic_schema")
+        manager = TradeLogicDBManager(str(tmp_path / "trade_logic.db"))
+        decision_id = manager.store_decision({
+            "timestamp": datetime.now(), "pair": "BTC/USDT", "timeframe": "1h", "composite_score": 0.7,
+        })
+        assert manager.store_decision({"pair": "BTC/USDT"}) is None
+
+        assert capsys.readouterr().out == ""
+        messages = [(record.levelname, record.getMessage()) for record in caplog.records]
+        assert ("DEBUG", f"✅ Stored trade decision {decision_id} for BTC/USDT") in messages
+        assert any(level == "ERROR" and "Error storing decision" in message for level, message in messages)
@@ -0,0 +1,275 @@
+"""
+Unit tests for the on-chain block indexer.
+
+Tests incremental ingestion from a file-backed fake RPC, the hourly whale
+and exchange-flow aggregates against brute-force scans, crash recovery and
+OnChainAnalyzer scoring from the local index (background sync, API
+fallback for a stale index or one that does not cover the scoring window,
+no directory until the first sync).
+"""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.onchain.block_indexer import BlockIndexer, FileBlockSource
+from src.onchain.etherscan_client import EtherscanClient, OnChainAnalyzer
+
+BINANCE = "0x3f5ce5fbfe3e9af3971dd833d26ba9b5c936f0be"
+KRAKEN = "0x2910543af39aba0cd09dbb2d50200b3e800a63d2"
+WALLETS = {"binance": [BINANCE], "kraken": [KRAKEN]}
+GENESIS = 1_704_067_200  # 2024-01-01 00:00 UTC
+
+
+def write_chain(path, blocks=600, seed=0, block_time=12):
+    """Write JSON-RPC style blocks (block_time seconds apart) and return their transfers."""
+    rng = np.random.default_rng(seed)
+    addresses = [f"0x{i:040x}" for i in range(1, 30)] + [BINANCE, KRAKEN]
+    rows = []
+    with open(path, "w") as f:
+        for number in range(blocks):
+            timestamp = GENESIS + number * block_time
+            transactions = []
+            for i in range(int(rng.integers(0, 6))):
+                value = float(rng.choice([0.0, 0.5, 20.0, 150.0, 2500.0]))
+                sender, receiver = rng.choice(addresses, 2, replace=False)
+                tx = {
+                    "hash": f"0x{number:08x}{i:02x}",
+                    "from": sender.upper().replace("0X", "0x"),
+                    "to": receiver,
+                    "value": hex(int(value * 1e18)),
+                    "gasPrice": hex(30 * 10**9),
+                }
+                transactions.append(tx)
+                if value:
+                    rows.append((number, timestamp, tx["hash"], sender, receiver, value))
+            f.write(json.dumps({"number": hex(number), "timestamp": hex(timestamp), "transactions": transactions}) + "\n")
+    return pd.DataFrame(rows, columns=["block_number", "timestamp", "hash", "from", "to", "value_eth"])
+
+
+def make_indexer(source, root, **kwargs):
+    options = dict(exchange_wallets=WALLETS, confirmations=2, backfill_blocks=10_000, batch_size=40)
+    options.update(kwargs)
+    return BlockIndexer(source, root, **options)
+
+
+def expected_flows(transfers, last_block):
+    """Brute-force exchange flows over indexed blocks."""
+    indexed = transfers[transfers["block_number"] <= last_block]
+    flows = {}
+    for exchange, wallet in (("binance", BINANCE), ("kraken", KRAKEN)):
+        inflow = indexed.loc[indexed["to"] == wallet, "value_eth"].sum()
+        outflow = indexed.loc[indexed["from"] == wallet, "value_eth"].sum()
+        count = ((indexed["to"] == wallet) | (indexed["from"] == wallet)).sum()
+        flows[exchange] = (inflow, outflow, count)
+    return flows
+
+
+class TestBlockIndexer:
+    """Test suite for BlockIndexer ingestion and queries."""
+
+    @pytest.mark.unit
+    def test_incremental_sync_fetches_only_new_blocks(self, tmp_path):
+        """Test a second sync resumes from the last indexed height."""
+        transfers = write_chain(tmp_path / "chain.jsonl")
+        source = FileBlockSource(tmp_path / "chain.jsonl", head=300)
+        indexer = make_indexer(source, tmp_path / "index")
+
+        assert indexer.sync() == 299
+        assert indexer.last_block == 298
+        assert source.calls == 299
+
+        source.head = 599
+        assert indexer.sync() == 299
+        assert indexer.last_block == 597
+        assert source.calls == 598
+        assert indexer.sync() == 0
+
+        indexed = transfers[transfers["block_number"] <= 597]
+        assert indexer.hourly["transfers"].sum() == len(indexed)
+        assert indexer.hourly["volume_eth"].sum() == pytest.approx(indexed["value_eth"].sum())
+
+    @pytest.mark.unit
+    def test_queries_match_brute_force(self, tmp_path):
+        """Test whale and flow queries against a scan of the raw transfers."""
+        transfers = write_chain(tmp_path / "chain.jsonl")
+        indexer = make_indexer(FileBlockSource(tmp_path / "chain.jsonl"), tmp_path / "index")
+        indexer.sync()
+
+        as_of = GENESIS + 6000
+        window = transfers[(transfers["timestamp"] > as_of - 3600) & (transfers["timestamp"] <= as_of)]
+        whales = indexer.whale_transactions(hours_back=1, as_of=as_of)
+        assert sorted(tx["hash"] for tx in whales) == sorted(window.loc[window["value_eth"] >= 100, "hash"])
+        assert [tx["block_number"] for tx in whales] == sorted((tx["block_number"] for tx in whales), reverse=True)
+        assert whales[0]["gas_price"] == pytest.approx(30.0)
+
+        activity = indexer.whale_activity(hours_back=24)
+        large = transfers[(transfers["block_number"] <= indexer.last_block) & (transfers["value_eth"] >= 100)]
+        assert activity["count"] == len(large)
+        assert activity["volume_eth"] == pytest.approx(large["value_eth"].sum())
+
+        flows = indexer.exchange_flows(hours_back=24)
+        for exchange, (inflow, outflow, count) in expected_flows(transfers, indexer.last_block).items():
+            assert flows[exchange]["inflow"] == pytest.approx(inflow)
+            assert flows[exchange]["outflow"] == pytest.approx(outflow)
+            assert flows[exchange]["net_flow"] == pytest.approx(inflow - outflow)
+            assert flows[exchange]["transaction_count"] == count
+
+    @pytest.mark.unit
+    def test_reopen_and_recover_from_interrupted_sync(self, tmp_path):
+        """Test state reloads, stray parts are dropped and stale aggregates rebuilt."""
+        write_chain(tmp_path / "chain.jsonl")
+        source = FileBlockSource(tmp_path / "chain.jsonl", head=300)
+        indexer = make_indexer(source, tmp_path / "index")
+        indexer.sync()
+        hourly, flows = indexer.hourly.copy(), indexer.flows.copy()
+
+        # A sync that wrote parts and aggregates but died before saving its height
+        source.head = 599
+        with patch.object(BlockIndexer, "_save_state"):
+            indexer.sync()
+
+        reopened = make_indexer(source, tmp_path / "index")
+        assert reopened.last_block == 298
+        assert reopened.first_timestamp == GENESIS
+        pd.testing.assert_frame_equal(reopened.flows, flows, check_dtype=False)
+        pd.testing.assert_frame_equal(reopened.hourly.loc[hourly.index], hourly, check_dtype=False)
+        assert reopened.hourly["transfers"].sum() == hourly["transfers"].sum()
+
+        reopened.sync()
+        fresh = make_indexer(FileBlockSource(tmp_path / "chain.jsonl"), tmp_path / "fresh")
+        fresh.sync()
+        pd.testing.assert_frame_equal(reopened.flows, fresh.flows, check_dtype=False)
+
+    @pytest.mark.unit
+    def test_missing_block_stops_index_without_gaps(self, tmp_path):
+        """Test an unavailable block leaves the index contiguous up to it."""
+        write_chain(tmp_path / "chain.jsonl", blocks=120)
+        source = FileBlockSource(tmp_path / "chain.jsonl")
+        del source._blocks[57]
+        indexer = make_indexer(source, tmp_path / "index", max_retries=0)
+
+        assert indexer.sync() == 57
+        assert indexer.last_block == 56
+
+
+class TestOnChainAnalyzerIndex:
+    """Test OnChainAnalyzer scoring from the local index."""
+
+    @pytest.mark.unit
+    def test_scores_are_local_queries(self, tmp_path):
+        """Test whale and flow scores come from the index without API calls."""
+        write_chain(tmp_path / "chain.jsonl", block_time=90)  # 15h of blocks
+        source = FileBlockSource(tmp_path / "chain.jsonl")
+        analyzer = OnChainAnalyzer(
+            indexer=make_indexer(source, tmp_path / "index", thresholds_eth=(100, 1000)),
+            max_index_lag=None,
+        )
+        assert analyzer.sync_index() == 598
+
+        with patch.object(EtherscanClient, "_make_request", side_effect=AssertionError("API called")):
+            whale_score = analyzer.get_whale_activity_score("ETH/USDT")
+            flow_score = analyzer.get_exchange_flow_score("ETH/USDT")
+        analyzer.stop_index_sync()
+
+        activity = analyzer.indexer.whale_activity(hours_back=6)
+        expected = (min(activity["volume_eth"] / 10000, 1.0) + min(activity["count"] / 50, 1.0)) / 2 * 0.5
+        assert whale_score == pytest.approx(expected)
+        assert -1.0 <= flow_score <= 1.0
+
+    @pytest.mark.unit
+    def test_scoring_does_not_wait_for_sync(self, tmp_path):
+        """Test scores return while the background sync is blocked on the block source."""
+        write_chain(tmp_path / "chain.jsonl", block_time=90)
+        source = FileBlockSource(tmp_path / "chain.jsonl")
+        released = threading.Event()
+        fetch = source.get_block
+
+        def blocked_fetch(number):
+            released.wait(5)
+            return fetch(number)
+
+        source.get_block = blocked_fetch
+        analyzer = OnChainAnalyzer(
+            indexer=make_indexer(source, tmp_path / "index"),
+            sync_blocks=100,
+            max_index_lag=None,
+        )
+
+        with patch.object(EtherscanClient, "get_whale_transactions", return_value=[]) as sampled:
+            assert analyzer.get_whale_activity_score("ETH/USDT") == 0.0
+        sampled.assert_called_once_with(hours_back=6)
+        assert analyzer.indexer.last_block is None
+
+        released.set()
+        deadline = time.time() + 5
+        while analyzer.indexer.last_block != 597 and time.time() < deadline:
+            time.sleep(0.01)
+        analyzer.stop_index_sync()
+        assert analyzer.indexer.last_block == 597
+        assert analyzer._use_index(6)
+
+    @pytest.mark.unit
+    def test_index_not_covering_window_falls_back_to_api(self, tmp_path):
+        """Test a fresh index shorter than the scoring window is not scored from."""
+        write_chain(tmp_path / "chain.jsonl")  # 2h of blocks
+        analyzer = OnChainAnalyzer(
+            indexer=make_indexer(FileBlockSource(tmp_path / "chain.jsonl"), tmp_path / "index"),
+            max_index_lag=None,
+        )
+        analyzer.sync_index()
+
+        with patch.object(EtherscanClient, "get_whale_transactions", return_value=[]) as sampled:
+            assert analyzer.get_whale_activity_score("ETH/USDT") == 0.0
+        analyzer.stop_index_sync()
+
+        sampled.assert_called_once_with(hours_back=6)
+        assert analyzer.indexer.covers(hours_back=1)
+        assert not analyzer.indexer.covers(hours_back=6)
+
+    @pytest.mark.unit
+    def test_stale_index_falls_back_to_api(self, tmp_path):
+        """Test an index far behind the chain head is reported and not scored from."""
+        write_chain(tmp_path / "chain.jsonl", blocks=50)
+        analyzer = OnChainAnalyzer(
+            indexer=make_indexer(FileBlockSource(tmp_path / "chain.jsonl"), tmp_path / "index")
+        )
+        analyzer.sync_index()
+
+        with patch.object(EtherscanClient, "get_whale_transactions", return_value=[]) as sampled:
+            assert analyzer.get_whale_activity_score("ETH/USDT") == 0.0
+        analyzer.stop_index_sync()
+
+        sampled.assert_called_once_with(hours_back=6)
+        status = analyzer.get_index_status()
+        assert status["last_block"] == 47
+        assert status["first_timestamp"] == GENESIS
+        assert status["lag_seconds"] > 3600
+
+    @pytest.mark.unit
+    def test_index_directory_created_on_first_sync(self, tmp_path):
+        """Test constructing the analyzer leaves no index directory behind."""
+        index_dir = tmp_path / "onchain"
+        analyzer = OnChainAnalyzer(index_dir=str(index_dir))
+        assert not index_dir.exists()
+
+        write_chain(tmp_path / "chain.jsonl", blocks=20)
+        analyzer.indexer.source = FileBlockSource(tmp_path / "chain.jsonl")
+        analyzer.indexer.confirmations = 2
+        assert analyzer.sync_index() == 18
+        assert (index_dir / "state.json").exists()
+
+    @pytest.mark.unit
+    def test_etherscan_proxy_responses_and_block_source(self):
+        """Test JSON-RPC proxy results are returned despite having no status field."""
+        client = EtherscanClient()
+        client.rate_limit_delay = 0
+        response = {"jsonrpc": "2.0", "id": 1, "result": "0x10"}
+        with patch("src.onchain.etherscan_client.requests.get") as get:
+            get.return_value.json.return_value = response
+            assert client.get_latest_block_number() == 16
@@ -4,6 +4,7 @@ Unit tests for data infrastructure components.
 
 import os
 import sys
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 
@@ -56,8 +57,13 @@ class TestDataInfrastructure(unittest.TestCase):
             mock_exchange_class.return_value = mock_exchange_instance
             mock_ccxt.binance = mock_exchange_class
 
-            # Create HistoricalDataManager instance
-            manager = HistoricalDataManager(self.config)
+            # Create HistoricalDataManager instance with storage in a temp dir
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                config = dict(self.config, storage={
+                    "database_path": os.path.join(tmp_dir, "historical_data.db"),
+                    "data_directory": os.path.join(tmp_dir, "historical"),
+                })
+                manager = HistoricalDataManager(config)
 
             # Verify initialization
             self.assertIsNotNone(manager.exchange)
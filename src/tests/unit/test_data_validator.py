@@ -300,3 +300,54 @@ class TestDataValidator:
         # Report should be generated despite errors
         assert "symbol" in report
         assert report["symbol"] == "BTC/USDT"
+
+    @pytest.mark.unit
+    def test_check_ohlcv_collects_all_issues(self, validator, invalid_ohlcv_data):
+        """Test the fused pass reports every failing check in order without raising."""
+        result = validator.check_ohlcv(invalid_ohlcv_data, "BTC/USDT")
+
+        assert not result.passed
+        assert result.errors[0].startswith("Invalid prices (<=0) in open")
+        assert any("Negative volumes" in error for error in result.errors)
+        assert result.errors[-1].startswith("Invalid low prices")
+        assert result.stats["negative_volumes"] == 1
+
+    @pytest.mark.unit
+    def test_quality_report_reuses_result(self, validator, sample_ohlcv_data):
+        """Test a precomputed result yields the same report as a fresh pass."""
+        result = validator.check_ohlcv(sample_ohlcv_data, "BTC/USDT")
+
+        with patch.object(validator, "check_ohlcv") as check:
+            reused = validator.get_data_quality_report(sample_ohlcv_data, "BTC/USDT", result)
+        check.assert_not_called()
+        assert reused == validator.get_data_quality_report(sample_ohlcv_data, "BTC/USDT")
+
+    @pytest.mark.unit
+    def test_watermark_validates_only_new_candles(self, validator, sample_ohlcv_data):
+        """Test repeated polls only check candles past the validated range."""
+        series = "BTC/USDT:1h"
+        assert validator.validate_ohlcv_data(sample_ohlcv_data.iloc[:60], "BTC/USDT", series)
+        assert validator.get_watermark(series)["last"] == sample_ohlcv_data["timestamp"].iloc[59]
+
+        # A corrupted candle inside the validated range is not re-checked
+        polled = sample_ohlcv_data.iloc[10:80].copy()
+        polled.loc[20, "volume"] = -1
+        with patch.object(validator, "check_ohlcv", wraps=validator.check_ohlcv) as check:
+            assert validator.validate_ohlcv_data(polled, "BTC/USDT", series)
+        assert len(check.call_args.args[0]) == 22  # context row, last validated candle, 20 new
+        assert validator.get_watermark(series)["first"] == sample_ohlcv_data["timestamp"].iloc[0]
+        assert validator.get_watermark(series)["last"] == sample_ohlcv_data["timestamp"].iloc[79]
+
+        # A bad new candle fails and leaves the watermark where it was
+        polled = sample_ohlcv_data.iloc[20:90].copy()
+        polled.loc[85, "volume"] = -1
+        with pytest.raises(DataValidationError, match="Negative volumes"):
+            validator.validate_ohlcv_data(polled, "BTC/USDT", series)
+        assert validator.get_watermark(series)["last"] == sample_ohlcv_data["timestamp"].iloc[79]
+
+        # Without a watermark the whole frame is checked again
+        validator.reset_watermark(series)
+        corrupted = sample_ohlcv_data.iloc[:60].copy()
+        corrupted.loc[20, "volume"] = -1
+        with pytest.raises(DataValidationError, match="Negative volumes"):
+            validator.validate_ohlcv_data(corrupted, "BTC/USDT", series)
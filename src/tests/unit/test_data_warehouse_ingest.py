@@ -0,0 +1,138 @@
+"""
+Unit tests for bulk OHLCV ingestion in the DataWarehouse.
+
+Tests columnar upserts round-trip, deduplication on
+(symbol, timeframe, timestamp), chunked writes and ingest stats, and that
+the consolidated warehouse and HistoricalDataManager share the same upsert.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.historical_data_manager import HistoricalDataManager
+from src.database.consolidated.data_warehouse import DataWarehouse as ConsolidatedWarehouse
+from src.database.data_warehouse import DataWarehouse
+
+
+def _candles(n=500, start="2024-01-01", seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.DataFrame(
+        {
+            "open": close * 0.999,
+            "high": close * 1.004,
+            "low": close * 0.995,
+            "close": close,
+            "volume": rng.uniform(10, 1000, n),
+        },
+        index=pd.date_range(start, periods=n, freq="1h", name="timestamp"),
+    )
+
+
+class TestDataWarehouseIngest:
+    """Test suite for DataWarehouse bulk OHLCV ingestion."""
+
+    @pytest.fixture
+    def warehouse(self, tmp_path):
+        warehouse = DataWarehouse(str(tmp_path / "warehouse.db"), chunk_size=64)
+        yield warehouse
+        warehouse.close()
+
+    @pytest.mark.unit
+    def test_round_trip_from_index_and_column(self, warehouse):
+        """Test DatetimeIndex and timestamp-column frames store identical candles."""
+        df = _candles()
+        stats = warehouse.store_ohlcv_data("BTC/USDT", "1h", df)
+        warehouse.store_ohlcv_data("ETH/USDT", "1h", df.reset_index())
+
+        assert stats["rows"] == len(df)
+        assert stats["rows_per_second"] > 0
+        for symbol in ("BTC/USDT", "ETH/USDT"):
+            stored = warehouse.get_ohlcv_data(symbol, "1h")
+            assert list(stored.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+            pd.testing.assert_frame_equal(stored.set_index("timestamp"), df, check_freq=False)
+
+    @pytest.mark.unit
+    def test_duplicates_collapse_and_upsert(self, warehouse):
+        """Test repeated timestamps keep the last row and overlaps overwrite."""
+        df = _candles(100)
+        warehouse.store_ohlcv_data("BTC/USDT", "1h", df.iloc[:60])
+
+        revised = df.iloc[40:].copy()
+        revised["close"] *= 2
+        doubled = pd.concat([df.iloc[40:50], revised])
+        stats = warehouse.store_ohlcv_data("BTC/USDT", "1h", doubled)
+
+        stored = warehouse.get_ohlcv_data("BTC/USDT", "1h").set_index("timestamp")
+        assert stats["duplicates"] == 10
+        assert len(stored) == 100
+        np.testing.assert_allclose(stored["close"].iloc[40:], df["close"].iloc[40:] * 2)
+        np.testing.assert_allclose(stored["close"].iloc[:40], df["close"].iloc[:40])
+
+        with sqlite3.connect(warehouse.db_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM ohlcv_data").fetchone()[0] == 100
+
+    @pytest.mark.unit
+    def test_limit_and_date_range(self, warehouse):
+        """Test limited queries return the newest candles and ranges are inclusive."""
+        df = _candles(200)
+        warehouse.store_ohlcv_data("BTC/USDT", "4h", df)
+
+        latest = warehouse.get_ohlcv_data("BTC/USDT", "4h", limit=10)
+        assert list(latest["timestamp"]) == list(df.index[-10:][::-1])
+
+        window = warehouse.get_ohlcv_data(
+            "BTC/USDT", "4h", start_date=df.index[10], end_date=df.index[20]
+        )
+        assert list(window["timestamp"]) == list(df.index[10:21])
+        assert warehouse.get_ohlcv_data("BTC/USDT", "1h").empty
+
+    @pytest.mark.unit
+    def test_empty_frame_rejected(self, warehouse):
+        """Test storing an empty DataFrame raises."""
+        with pytest.raises(ValueError, match="Cannot store empty DataFrame"):
+            warehouse.store_ohlcv_data("BTC/USDT", "1h", pd.DataFrame())
+
+
+class TestSharedOHLCVUpsert:
+    """Test suite for the other OHLCV writers using the shared upsert."""
+
+    @staticmethod
+    def _tagged(df):
+        return df.assign(symbol="BTC/USDT", timeframe="1h")
+
+    @pytest.mark.unit
+    def test_consolidated_warehouse_restores_overlap(self, tmp_path):
+        """Test re-storing overlapping candles overwrites instead of violating UNIQUE."""
+        warehouse = ConsolidatedWarehouse(str(tmp_path / "consolidated.db"))
+        df = self._tagged(_candles(100))
+        warehouse.store_ohlcv_data(df.iloc[:60].assign(trades=5, vwap=np.nan))
+
+        revised = df.iloc[40:].copy()
+        revised["close"] *= 2
+        warehouse.store_ohlcv_data(pd.concat([df.iloc[40:50], revised]).reset_index())
+
+        stored = warehouse.load_ohlcv_data("BTC/USDT", "1h")
+        assert len(stored) == 100
+        np.testing.assert_allclose(stored["close"].iloc[40:], df["close"].iloc[40:] * 2)
+        assert stored["trades"].iloc[0] == 5 and stored["vwap"].isna().all()
+        assert stored["trades"].iloc[40:].isna().all()
+
+    @pytest.mark.unit
+    def test_historical_manager_restores_overlap(self, tmp_path):
+        """Test HistoricalDataManager keeps one row per candle across repeated stores."""
+        manager = HistoricalDataManager({"storage": {
+            "database_path": str(tmp_path / "historical.db"),
+            "data_directory": str(tmp_path / "historical"),
+        }})
+        df = self._tagged(_candles(100))
+        manager.store_ohlcv_data(df.iloc[:60])
+        manager.store_ohlcv_data(pd.concat([df.iloc[50:60], df.iloc[40:]]))
+
+        stored = manager.load_ohlcv_data("BTC/USDT", "1h")
+        assert len(stored) == 100
+        with sqlite3.connect(manager.database_path) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM ohlcv_data").fetchone()[0] == 100
@@ -0,0 +1,151 @@
+"""
+Unit tests for concurrent DeFi protocol queries and the opportunity snapshot.
+
+Tests that protocol calls overlap instead of adding up, that timeouts and
+errors are contained per protocol, the per-protocol concurrency cap, and
+that optimizations are served from the snapshot without querying protocols.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.defi_yield import DeFiYieldOptimizer, ProtocolFanOut
+from src.defi_yield.protocol_analyzers import AaveAnalyzer, BaseProtocolAnalyzer, EthenaAnalyzer
+
+
+class SlowAnalyzer(BaseProtocolAnalyzer):
+    """Wraps a real analyzer with a delay and records concurrent calls."""
+
+    def __init__(self, inner=None, delay=0.1, fail=False):
+        self.inner = inner
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def get_opportunities(self, token, amount, preferences):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("protocol API down")
+            return await self.inner.get_opportunities(token, amount, preferences) if self.inner else []
+        finally:
+            self.active -= 1
+
+
+def make_optimizer(analyzers, **kwargs):
+    optimizer = DeFiYieldOptimizer(**kwargs)
+    optimizer.protocol_registry.analyzers = analyzers
+    return optimizer
+
+
+class TestProtocolFanOut:
+    """Test suite for concurrent protocol queries."""
+
+    @pytest.mark.unit
+    def test_protocol_calls_overlap(self):
+        """Test a portfolio costs about one protocol round-trip, not the sum."""
+        analyzers = {f"protocol_{i}": SlowAnalyzer(delay=0.1) for i in range(12)}
+        analyzers["aave"] = SlowAnalyzer(AaveAnalyzer(), delay=0.1)
+        optimizer = make_optimizer(analyzers)
+
+        started = time.perf_counter()
+        result = asyncio.run(optimizer.optimize_yield_for_portfolio({"USDT": 5000, "ETH": 3, "DAI": 800}))
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.6  # 39 sequential calls would take 3.9s
+        assert sum(analyzer.calls for analyzer in analyzers.values()) == 39
+        assert {item["opportunity"]["protocol"] for item in result["optimal_allocation"]} == {"Aave V3"}
+
+    @pytest.mark.unit
+    def test_timeouts_and_errors_are_contained(self):
+        """Test a hanging or failing protocol costs only its timeout."""
+        analyzers = {
+            "hanging": SlowAnalyzer(delay=10),
+            "broken": SlowAnalyzer(fail=True, delay=0),
+            "ethena": SlowAnalyzer(EthenaAnalyzer(), delay=0.01),
+        }
+        optimizer = make_optimizer(analyzers, protocol_timeout=0.2)
+
+        started = time.perf_counter()
+        opportunities = asyncio.run(optimizer.get_opportunities_for_token("USDC", 1000, {"min_apy": 0}))
+
+        assert time.perf_counter() - started < 1.0
+        assert [opportunity.protocol for opportunity in opportunities] == ["Ethena"]
+        stats = optimizer.fan_out.get_stats()
+        assert stats["hanging"]["timeouts"] == 1
+        assert stats["broken"]["errors"] == 1
+        assert stats["ethena"]["timeouts"] == stats["ethena"]["errors"] == 0
+
+    @pytest.mark.unit
+    def test_per_protocol_concurrency_cap(self):
+        """Test no protocol sees more in-flight calls than its cap."""
+        capped = SlowAnalyzer(delay=0.05)
+        fan_out = ProtocolFanOut(timeout=5, max_concurrency=8, per_protocol_concurrency=2)
+
+        async def run():
+            return await fan_out.gather(
+                (("capped", lambda token=token: capped.get_opportunities(token, 0, {})) for token in range(10)),
+                default=[],
+            )
+
+        assert asyncio.run(run()) == [[]] * 10
+        assert capped.max_active == 2
+        # The same fan-out keeps working from another event loop
+        asyncio.run(run())
+        assert fan_out.get_stats()["capped"]["calls"] == 20
+
+
+class TestOpportunitySnapshot:
+    """Test suite for serving optimizations from the snapshot."""
+
+    @pytest.mark.unit
+    def test_requests_are_served_from_snapshot(self):
+        """Test optimizations read the snapshot and only fetch unknown tokens."""
+        aave = SlowAnalyzer(AaveAnalyzer(), delay=0.05)
+        optimizer = make_optimizer({"aave": aave, "ethena": SlowAnalyzer(EthenaAnalyzer(), delay=0.05)})
+        snapshot = optimizer.enable_snapshot(tokens=["USDT", "ETH"], start=False)
+
+        assert asyncio.run(snapshot.refresh()) == 3
+        assert aave.calls == 2
+
+        live = make_optimizer({"aave": AaveAnalyzer(), "ethena": EthenaAnalyzer()})
+        expected = asyncio.run(live.get_opportunities_for_token("USDT", 5000, {}))
+        served = asyncio.run(optimizer.get_opportunities_for_token("USDT", 5000, {}))
+        assert [o.pool_id for o in served] == [o.pool_id for o in expected]
+        assert aave.calls == 2
+
+        # An untracked token is fetched once, then cached
+        asyncio.run(optimizer.get_opportunities_for_token("DAI", 100, {}))
+        asyncio.run(optimizer.get_opportunities_for_token("DAI", 100, {}))
+        assert aave.calls == 3
+        assert snapshot.get_status()["tokens"]["DAI"]["opportunities"] == 1
+
+        snapshot.max_age = 0
+        assert snapshot.get("USDT") is None
+
+    @pytest.mark.unit
+    def test_background_refresh(self):
+        """Test the refresher thread keeps the snapshot populated until stopped."""
+        aave = SlowAnalyzer(AaveAnalyzer(), delay=0)
+        optimizer = make_optimizer({"aave": aave})
+        snapshot = optimizer.enable_snapshot(tokens=["USDC"], refresh_interval=0.05)
+        try:
+            deadline = time.monotonic() + 5
+            while snapshot.refresh_count < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert snapshot.refresh_count >= 3
+            assert snapshot.get_status()["background_refresh"]
+        finally:
+            snapshot.stop()
+
+        assert [o.pool_id for o in snapshot.get("USDC")] == ["aave_v3_USDC"]
+        count = snapshot.refresh_count
+        time.sleep(0.15)
+        assert snapshot.refresh_count == count
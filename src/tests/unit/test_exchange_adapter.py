@@ -0,0 +1,127 @@
+"""
+Unit tests for the async exchange adapter and event-loop lag monitor.
+
+Tests that slow exchange responses no longer stall the event loop,
+per-call timeouts, shared adapters per exchange, and that the lag
+monitor reports blocking callbacks.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.market_data import exchange_adapter
+from src.market_data.event_loop_monitor import EventLoopLagMonitor
+from src.market_data.exchange_adapter import ExchangeAdapter, get_exchange_adapter
+from src.market_data.openbb.crypto_data import CryptoDataProvider
+from src.market_data.openbb.market_analysis import MarketAnalyzer
+
+
+class SlowExchange:
+    """Synchronous CCXT stand-in whose requests block for ``delay`` seconds."""
+
+    id = "slow"
+    markets = {"BTC/USDT": {}}
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=None):
+        time.sleep(self.delay)
+        return [
+            [1_700_000_000_000 + i * 60_000, 100 + i, 101 + i, 99 + i, 100.5 + i, 10 + i]
+            for i in range(limit or 100)
+        ]
+
+    def fetch_order_book(self, symbol, limit=None):
+        time.sleep(self.delay)
+        return {"bids": [[100.0, 2.0], [99.5, 1.0]], "asks": [[100.5, 1.5], [101.0, 3.0]]}
+
+
+class OfflineClient:
+    openbb_available = False
+
+
+class TestExchangeAdapter:
+    """Test suite for ExchangeAdapter and EventLoopLagMonitor."""
+
+    @pytest.mark.unit
+    def test_monitor_reports_blocking_callback(self):
+        """Test a synchronous sleep on the loop is reported as a stall."""
+        async def scenario():
+            async with EventLoopLagMonitor(interval=0.01, threshold=0.05) as monitor:
+                await asyncio.sleep(0.05)
+                time.sleep(0.15)
+                await asyncio.sleep(0.05)
+            return monitor.get_stats()
+
+        stats = asyncio.run(scenario())
+        assert stats["stalls"] >= 1
+        assert stats["max_lag_ms"] >= 100
+        assert not stats["running"]
+
+    @pytest.mark.unit
+    def test_adapter_calls_run_concurrently_off_loop(self):
+        """Test slow requests overlap and leave the loop responsive."""
+        adapter = ExchangeAdapter(SlowExchange(delay=0.2), max_workers=4)
+
+        async def scenario():
+            async with EventLoopLagMonitor(interval=0.01, threshold=0.1) as monitor:
+                started = time.perf_counter()
+                books = await asyncio.gather(*[adapter.fetch_order_book("BTC/USDT") for _ in range(4)])
+                elapsed = time.perf_counter() - started
+            await adapter.close()
+            return books, elapsed, monitor.get_stats()
+
+        books, elapsed, stats = asyncio.run(scenario())
+        assert len(books) == 4
+        assert elapsed < 0.7
+        assert stats["stalls"] == 0
+        assert adapter.stats["calls"] == 4
+
+    @pytest.mark.unit
+    def test_per_call_timeout(self):
+        """Test a request slower than its timeout raises and is counted."""
+        adapter = ExchangeAdapter(SlowExchange(delay=0.3))
+
+        async def scenario():
+            with pytest.raises(asyncio.TimeoutError):
+                await adapter.fetch_ohlcv("BTC/USDT", "1m", limit=5, timeout=0.05)
+            return await adapter.fetch_ohlcv("BTC/USDT", "1m", limit=5)
+
+        assert len(asyncio.run(scenario())) == 5
+        assert adapter.stats["timeouts"] == 1
+
+    @pytest.mark.unit
+    def test_adapters_shared_per_exchange(self, monkeypatch):
+        """Test public clients share one adapter and keyed clients get their own."""
+        pytest.importorskip("ccxt")
+        monkeypatch.setattr(exchange_adapter, "_adapters", {})
+
+        public = get_exchange_adapter("binance")
+        assert get_exchange_adapter("binance") is public
+        assert get_exchange_adapter("binance", {"apiKey": "key", "secret": "s"}) is not public
+
+    @pytest.mark.unit
+    def test_comprehensive_analysis_does_not_block(self, monkeypatch):
+        """Test MarketAnalyzer's concurrent fetches overlap through the shared adapter."""
+        monkeypatch.setattr(
+            exchange_adapter, "_adapters", {("binance", ""): ExchangeAdapter(SlowExchange(delay=0.2))}
+        )
+        provider = CryptoDataProvider()
+        provider._rate_limiter["min_interval"] = 0
+        analyzer = MarketAnalyzer(OfflineClient(), provider)
+
+        async def scenario():
+            async with EventLoopLagMonitor(interval=0.01, threshold=0.1) as monitor:
+                started = time.perf_counter()
+                analysis = await analyzer.get_comprehensive_analysis("BTC/USDT")
+                elapsed = time.perf_counter() - started
+            return analysis, elapsed, monitor.get_stats()
+
+        analysis, elapsed, stats = asyncio.run(scenario())
+        assert analysis["data_sources"]["market_depth_available"]
+        assert analysis["data_sources"]["delta_analysis_available"]
+        assert elapsed < 0.7
+        assert stats["stalls"] == 0
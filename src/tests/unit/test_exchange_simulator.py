@@ -0,0 +1,330 @@
+"""
+Unit tests for the local exchange simulator.
+
+Tests market impact and partial fills of aggressive orders, queue
+position and price-time priority of resting orders, order types, fees and
+balances, latency on manual and accelerated clocks, OHLCV replay, and the
+execution engines running against the simulator.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+# The execution engines import their siblings from src/ directly
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.market_data.exchange_adapter import ExchangeAdapter
+from src.market_data.exchange_simulator import (
+    ExchangeSimulator,
+    FeeSchedule,
+    InsufficientFunds,
+    OrderNotFound,
+    SimulatedMarket,
+    synthetic_trades,
+    trades_from_ohlcv,
+)
+
+START = 1_699_999_800_000  # aligned to 5 minutes
+
+
+def recorded(*prints):
+    """Market trades (seconds after START, price, amount, aggressor side)."""
+    return [
+        {"timestamp": START + int(seconds * 1000), "price": price, "amount": amount, "side": side}
+        for seconds, price, amount, side in prints
+    ]
+
+
+def make_simulator(prints=((0, 100.0, 1.0, "buy"),), **kwargs):
+    options = {"balances": {"USDT": 100_000.0, "BTC": 100.0}, "fees": FeeSchedule(maker=0.0, taker=0.001)}
+    options.update(kwargs)
+    return ExchangeSimulator(
+        [SimulatedMarket("BTC/USDT", tick_size=1.0, depth_levels=5, level_amount=2.0, refill_rate=1.0)],
+        trades={"BTC/USDT": recorded(*prints)},
+        **options,
+    )
+
+
+class TestMatching:
+    """Test suite for order matching."""
+
+    @pytest.mark.unit
+    def test_market_order_walks_depth(self):
+        """Test a large order fills across levels and pays taker fees."""
+        async def scenario():
+            sim = make_simulator()
+            sim.advance(0)
+            order = await sim.create_order("BTC/USDT", "market", "buy", 5.0)
+            book = await sim.fetch_order_book("BTC/USDT", 2)
+            return sim, order, book, await sim.fetch_balance()
+
+        sim, order, book, balance = asyncio.run(scenario())
+        assert order["status"] == "closed"
+        assert [(trade["price"], trade["amount"]) for trade in order["trades"]] == [(101, 2), (102, 2), (103, 1)]
+        assert order["average"] == pytest.approx(509 / 5)
+        assert order["fee"]["cost"] == pytest.approx(0.509)
+        # Taken liquidity stays gone until the next market trade
+        assert book["asks"] == [[103.0, 1.0], [104.0, 2.0]]
+        assert balance["BTC"]["total"] == pytest.approx(105)
+        assert balance["USDT"]["total"] == pytest.approx(100_000 - 509.509)
+
+        # Beyond the visible depth a market order only partially fills
+        sweep = asyncio.run(sim.create_order("BTC/USDT", "market", "buy", 50.0))
+        assert sweep["status"] == "canceled"
+        assert sweep["filled"] == pytest.approx(5.0)
+
+    @pytest.mark.unit
+    def test_queue_position_of_resting_order(self):
+        """Test market trades fill the liquidity ahead of a resting bid first."""
+        async def scenario():
+            sim = make_simulator(prints=[
+                (0, 100.0, 1.0, "buy"),
+                (1, 99.0, 1.5, "sell"),   # takes 1.5 of the 2.0 queued ahead
+                (2, 99.0, 1.0, "sell"),   # 0.5 ahead, then 0.5 for us
+                (3, 97.0, 0.1, "sell"),   # trades through our price
+            ])
+            sim.advance(0)
+            order = await sim.create_order("BTC/USDT", "limit", "buy", 1.0, 99.0)
+            states = []
+            for _ in range(3):
+                sim.advance(1)
+                states.append((await sim.fetch_order(order["id"]))["filled"])
+            return order, states, await sim.fetch_order(order["id"])
+
+        order, states, final = asyncio.run(scenario())
+        assert order["status"] == "open"
+        assert states == [pytest.approx(0.0), pytest.approx(0.5), pytest.approx(1.0)]
+        assert final["status"] == "closed"
+        assert {trade["takerOrMaker"] for trade in final["trades"]} == {"maker"}
+        assert final["average"] == pytest.approx(99.0)
+
+    @pytest.mark.unit
+    def test_price_time_priority(self):
+        """Test resting orders fill best price first, then first come first."""
+        async def scenario():
+            sim = make_simulator(prints=())  # no market depth, only our orders
+            first = await sim.create_order("BTC/USDT", "limit", "sell", 1.0, 100.0)
+            second = await sim.create_order("BTC/USDT", "limit", "sell", 1.0, 100.0)
+            better = await sim.create_order("BTC/USDT", "limit", "sell", 1.0, 99.0)
+            await sim.create_order("BTC/USDT", "market", "buy", 2.5)
+            return [await sim.fetch_order(order["id"]) for order in (first, second, better)]
+
+        first, second, better = asyncio.run(scenario())
+        assert better["filled"] == pytest.approx(1.0)
+        assert first["filled"] == pytest.approx(1.0)
+        assert second["filled"] == pytest.approx(0.5)
+        assert second["status"] == "open"
+
+
+class TestOrders:
+    """Test suite for order types, balances and fees."""
+
+    @pytest.mark.unit
+    def test_time_in_force_and_post_only(self):
+        """Test IOC keeps partial fills, FOK and post-only cancel untouched."""
+        async def scenario():
+            sim = make_simulator()
+            sim.advance(0)
+            ioc = await sim.create_order("BTC/USDT", "limit", "buy", 3.0, 101.0, {"timeInForce": "IOC"})
+            fok = await sim.create_order("BTC/USDT", "limit", "buy", 3.0, 102.0, {"timeInForce": "FOK"})
+            post = await sim.create_order("BTC/USDT", "limit", "buy", 1.0, 102.0, {"postOnly": True})
+            return ioc, fok, post, await sim.fetch_balance()
+
+        ioc, fok, post, balance = asyncio.run(scenario())
+        assert (ioc["status"], ioc["filled"]) == ("canceled", pytest.approx(2.0))
+        assert (fok["status"], fok["filled"]) == ("canceled", 0.0)
+        assert (post["status"], post["filled"]) == ("canceled", 0.0)
+        assert balance["USDT"]["used"] == pytest.approx(0.0)
+
+    @pytest.mark.unit
+    def test_balances_reservations_and_cancel(self):
+        """Test limit orders reserve funds, cancels release them, shortfalls raise."""
+        async def scenario():
+            sim = make_simulator(balances={"USDT": 1_000.0})
+            sim.advance(0)
+            order = await sim.create_order("BTC/USDT", "limit", "buy", 5.0, 90.0)
+            reserved = (await sim.fetch_balance())["USDT"]["used"]
+            with pytest.raises(InsufficientFunds):
+                await sim.create_order("BTC/USDT", "limit", "buy", 7.0, 90.0)
+            canceled = await sim.cancel_order(order["id"], "BTC/USDT")
+            with pytest.raises(OrderNotFound):
+                await sim.cancel_order(order["id"], "BTC/USDT")
+            return reserved, canceled, await sim.fetch_balance(), sim.get_stats()
+
+        reserved, canceled, balance, stats = asyncio.run(scenario())
+        assert reserved == pytest.approx(450 * 1.001)
+        assert canceled["status"] == "canceled"
+        assert balance["USDT"]["free"] == pytest.approx(1_000.0)
+        assert stats["rejects"] == 1
+
+    @pytest.mark.unit
+    def test_fee_tiers_and_stop_orders(self):
+        """Test fee tiers follow traded volume and stops trigger on market trades."""
+        async def scenario():
+            fees = FeeSchedule(maker=0.0, taker=0.002, tiers=[(100.0, 0.0, 0.001)])
+            sim = make_simulator(prints=[(0, 100.0, 1.0, "buy"), (5, 95.0, 1.0, "sell")], fees=fees)
+            sim.advance(0)
+            first = await sim.create_order("BTC/USDT", "market", "buy", 1.0)
+            second = await sim.create_order("BTC/USDT", "market", "buy", 1.0)
+            stop = await sim.create_order("BTC/USDT", "market", "sell", 1.0, None, {"stopPrice": 96.0})
+            sim.advance(5)
+            return first, second, stop, await sim.fetch_order(stop["id"])
+
+        first, second, stop, triggered = asyncio.run(scenario())
+        assert first["trades"][0]["fee"]["rate"] == 0.002
+        assert second["trades"][0]["fee"]["rate"] == 0.001
+        assert stop["status"] == "open"
+        assert triggered["status"] == "closed"
+        assert triggered["average"] == pytest.approx(94.0)
+
+
+class TestClockAndReplay:
+    """Test suite for latency, clock modes and trade streams."""
+
+    @pytest.mark.unit
+    def test_latency_lets_the_market_move_first(self):
+        """Test an order matches against the book as of its arrival time."""
+        prints = [(0, 100.0, 1.0, "buy"), (0.05, 110.0, 1.0, "buy")]
+        slow = make_simulator(prints=prints, latency_ms=100)
+        fast = make_simulator(prints=prints, latency_ms=10)
+        slow.advance(0)
+        fast.advance(0)
+
+        slow_fill = asyncio.run(slow.create_order("BTC/USDT", "market", "buy", 1.0))
+        fast_fill = asyncio.run(fast.create_order("BTC/USDT", "market", "buy", 1.0))
+
+        assert fast_fill["average"] == pytest.approx(101.0)
+        assert slow_fill["average"] == pytest.approx(111.0)
+        assert slow_fill["timestamp"] == START + 100
+
+    @pytest.mark.unit
+    def test_accelerated_clock_throughput(self):
+        """Test thousands of concurrent orders with latency complete quickly."""
+        sim = ExchangeSimulator(
+            [SimulatedMarket("ETH/USDT", tick_size=0.01, level_amount=50.0)],
+            trades={"ETH/USDT": synthetic_trades(2500, trades_per_second=50, seed=3)},
+            balances={"USDT": 10_000_000.0, "ETH": 10_000.0},
+            latency_ms=50, latency_jitter_ms=20, speed=1000, seed=1,
+        )
+        adapter = ExchangeAdapter(sim)
+
+        async def scenario():
+            return await asyncio.gather(*(
+                adapter.call("create_order", "ETH/USDT", "market", "buy" if i % 2 else "sell", 0.5)
+                for i in range(2000)
+            ))
+
+        started = time.perf_counter()
+        orders = asyncio.run(scenario())
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 2.0
+        assert all(order["status"] == "closed" for order in orders)
+        assert sim.get_stats()["market_trades"] > 0
+        with pytest.raises(RuntimeError):
+            sim.advance(1)
+
+    @pytest.mark.unit
+    def test_ohlcv_replay(self):
+        """Test candles replayed as trades come back out of fetch_ohlcv."""
+        candles = [
+            [START + i * 60_000, 100.0 + i, 102.0 + i, 99.0 + i, 101.0 + i, 8.0]
+            for i in range(10)
+        ]
+        frame = pd.DataFrame(candles, columns=["timestamp", "open", "high", "low", "close", "volume"])
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], unit="ms")
+        frame = frame.set_index("timestamp")
+        assert list(trades_from_ohlcv(frame)) == list(trades_from_ohlcv(candles))
+
+        sim = ExchangeSimulator(
+            [SimulatedMarket("BTC/USDT", tick_size=0.5)], trades={"BTC/USDT": trades_from_ohlcv(candles)}
+        )
+        sim.advance(600)
+
+        replayed = asyncio.run(sim.fetch_ohlcv("BTC/USDT", "1m"))
+        assert replayed == candles
+        five_minute = asyncio.run(sim.fetch_ohlcv("BTC/USDT", "5m"))
+        assert five_minute == [
+            [START, 100.0, 106.0, 99.0, 105.0, 40.0],
+            [START + 300_000, 105.0, 111.0, 104.0, 110.0, 40.0],
+        ]
+
+
+class TestExecutionEngines:
+    """Test suite for the execution stack running against the simulator."""
+
+    @pytest.mark.unit
+    def test_signal_execution_keeps_partial_entry(self):
+        """Test a partially filled entry opens a position whose exits never sell more than it holds."""
+        from advanced_signal_engine import SignalStrength, SignalType, TradingSignal
+        from signal_execution_engine import SignalExecutionEngine
+
+        # The market later trades through the first take profit, then through the stop
+        sim = make_simulator(prints=((0, 100.0, 1.0, "buy"), (60, 111.0, 1.0, "buy"), (120, 94.0, 1.0, "sell")))
+        sim.advance(0)
+        engine = SignalExecutionEngine(exchange=sim)
+        engine.portfolio_balance = 100_000.0
+        signal = TradingSignal(
+            symbol="BTC/USDT", signal_type=SignalType.ENTRY_LONG, strength=SignalStrength.STRONG,
+            confidence=0.7, entry_price=101.1, stop_loss=95.0, take_profit_levels=[110.0, 120.0],
+            risk_reward_ratio=2.0, position_size=0.0, reasoning=[], technical_indicators={},
+            chart_patterns=[], liquidity_score=1.0, unusual_activity=False, fibonacci_levels={},
+            timestamp=datetime.now(),
+        )
+
+        results = asyncio.run(engine.process_signals([signal]))
+
+        assert results[0]["action"] == "EXECUTED"
+        # The limit at 101.0 (0.1% under the signal price) only reaches one level
+        assert results[0]["quantity"] == pytest.approx(2.0)
+        assert results[0]["entry_price"] == pytest.approx(101.0)
+        position = engine.active_positions[results[0]["position_id"]]
+        open_orders = {order["id"]: order for order in asyncio.run(sim.fetch_open_orders("BTC/USDT"))}
+        assert set(open_orders) == {position.stop_order_id, *position.take_profit_order_ids}
+        assert open_orders[position.stop_order_id]["amount"] == pytest.approx(2.0)
+        assert sum(order["amount"] for order in open_orders.values() if order["stopPrice"] is None) == pytest.approx(2.0)
+
+        # The first take profit fills: the stop shrinks to the remaining quantity
+        sim.advance(60)
+        asyncio.run(engine.sync_orders())
+        assert position.quantity == pytest.approx(1.0)
+        open_orders = asyncio.run(sim.fetch_open_orders("BTC/USDT"))
+        assert [(order["price"], order["stopPrice"], order["amount"]) for order in open_orders] == [
+            (120.0, None, 1.0), (None, 95.0, 1.0)
+        ]
+
+        # The stop fills: the second take profit is canceled and nothing more is sold
+        sim.advance(60)
+        asyncio.run(engine.sync_orders())
+        assert len(engine.active_positions) == 0
+        assert engine.closed_positions[0]["status"].value == "STOPPED_OUT"
+        assert asyncio.run(sim.fetch_open_orders("BTC/USDT")) == []
+        sold = sum(trade["amount"] for trade in asyncio.run(sim.fetch_my_trades("BTC/USDT")) if trade["side"] == "sell")
+        assert sold == pytest.approx(2.0)
+        assert asyncio.run(sim.fetch_balance())["BTC"]["total"] == pytest.approx(100.0)
+
+    @pytest.mark.unit
+    def test_live_engine_reads_simulator_candles(self, tmp_path, monkeypatch):
+        """Test the live engine builds its frame from simulator candles."""
+        monkeypatch.chdir(tmp_path)  # the engine writes its trade DB and strategy dir here
+        from src.live_trading_engine import LiveTradingEngine
+
+        sim = ExchangeSimulator(
+            [SimulatedMarket("BTC/USDT", tick_size=0.5)],
+            trades={"BTC/USDT": synthetic_trades(45_000, start_ms=START, trades_per_second=2, seed=5)},
+        )
+        sim.advance(3600)
+        engine = LiveTradingEngine(exchange=sim)
+
+        frame = asyncio.run(engine.get_market_data("BTC/USDT", "1m", 60))
+
+        assert len(frame) == 60
+        assert frame.index[-1] == pd.Timestamp(START + 59 * 60_000, unit="ms")
+        assert frame["close"].iloc[-1] == asyncio.run(sim.fetch_ticker("BTC/USDT"))["last"]
+        assert "sma_50" in frame.columns
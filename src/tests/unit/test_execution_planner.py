@@ -0,0 +1,195 @@
+"""
+Unit tests for the order-book-driven execution planner.
+
+Tests impact curves walked from L2 depth, optimal TWAP slicing against
+timing risk, book resilience, VWAP and POV schedules, incremental
+re-planning, and sliced execution against the exchange simulator and
+through the signal execution engine.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+# The signal execution engine imports its siblings from src/ directly
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.cost.execution_planner import ExecutionPlanner, ImpactCurve, mid_price
+from src.market_data.exchange_simulator import ExchangeSimulator, FeeSchedule, SimulatedMarket
+
+START = 1_699_999_800_000
+
+BOOK = {
+    "symbol": "BTC/USDT",
+    "bids": [[99.0, 2.0], [98.0, 2.0], [97.0, 2.0]],
+    "asks": [[101.0, 2.0], [102.0, 2.0], [103.0, 2.0]],
+}
+
+
+def make_simulator():
+    """A venue whose price holds at 100 with a trade every second."""
+    prints = [
+        {"timestamp": START + second * 1000, "price": 100.0, "amount": 0.1, "side": "buy" if second % 2 else "sell"}
+        for second in range(3600)
+    ]
+    return ExchangeSimulator(
+        [SimulatedMarket("BTC/USDT", tick_size=1.0, depth_levels=5, level_amount=2.0, refill_rate=1.0)],
+        trades={"BTC/USDT": prints},
+        balances={"USDT": 1_000_000.0},
+        fees=FeeSchedule(maker=0.0, taker=0.001),
+    )
+
+
+class TestImpactCurve:
+    """Test suite for ImpactCurve."""
+
+    @pytest.mark.unit
+    def test_walks_depth_and_extrapolates(self):
+        """Test costs follow the visible levels, then the book's outer slope."""
+        curve = ImpactCurve.from_order_book(BOOK, "buy")
+        assert mid_price(BOOK) == 100.0
+        np.testing.assert_allclose(curve.notional([1.0, 3.0, 6.0]), [101.0, 304.0, 612.0])
+        # Two units past the book at a slope of 0.5 per unit: 2 * (103 + 0.5)
+        assert curve.notional(8.0) == pytest.approx(819.0)
+        np.testing.assert_allclose(curve.impact([1.0, 4.0]), [0.01, 0.015])
+        # Taking 2 after 2 were taken pays the second level
+        assert curve.cost(2.0, offset=2.0) == pytest.approx(4.0)
+
+        sell = ImpactCurve.from_order_book(BOOK, "sell")
+        np.testing.assert_allclose(sell.cost([2.0, 4.0]), [2.0, 6.0])
+
+    @pytest.mark.unit
+    def test_empty_side_is_rejected(self):
+        """Test a book without liquidity on the walked side raises."""
+        with pytest.raises(ValueError):
+            ImpactCurve.from_order_book({"bids": [[99.0, 1.0]], "asks": []}, "buy")
+
+
+class TestPlanning:
+    """Test suite for ExecutionPlanner schedules."""
+
+    @pytest.mark.unit
+    def test_twap_slicing_trades_impact_against_risk(self):
+        """Test small orders go at once, large ones are sliced, risk shortens schedules."""
+        planner = ExecutionPlanner()
+        assert len(planner.plan(BOOK, "buy", 0.5).child_quantities) == 1
+
+        large = planner.plan(BOOK, "buy", 20.0)
+        assert len(large.child_quantities) > 1
+        assert large.child_quantities.sum() == pytest.approx(20.0)
+        single = planner.child_costs(ImpactCurve.from_order_book(BOOK, "buy"), [20.0])
+        assert large.expected_cost < single.sum()
+
+        cautious = ExecutionPlanner(risk_aversion=200.0).plan(BOOK, "buy", 20.0)
+        assert len(cautious.child_quantities) < len(large.child_quantities)
+
+        fixed = planner.plan(BOOK, "buy", 20.0, horizon_seconds=300)
+        np.testing.assert_allclose(fixed.child_quantities, [4.0] * 5)
+
+    @pytest.mark.unit
+    def test_resilience_raises_cost_of_close_children(self):
+        """Test liquidity that has not refilled makes the next child pay more."""
+        curve = ImpactCurve.from_order_book(BOOK, "buy")
+        recovered = ExecutionPlanner(resilience_seconds=0, taker_fee=0.0)
+        lingering = ExecutionPlanner(resilience_seconds=60, interval_seconds=60, taker_fee=0.0)
+
+        np.testing.assert_allclose(recovered.child_costs(curve, [2.0, 2.0]), [2.0, 2.0])
+        costs = lingering.child_costs(curve, [2.0, 2.0])
+        assert costs[0] == pytest.approx(2.0)
+        # e^-1 of the first child is still missing: the second starts 0.74 units deeper
+        assert costs[1] == pytest.approx(2.0 + 2.0 * np.exp(-1.0))
+
+    @pytest.mark.unit
+    def test_vwap_and_pov_schedules(self):
+        """Test VWAP follows the volume profile and POV a share of volume."""
+        planner = ExecutionPlanner()
+        vwap = planner.plan(BOOK, "sell", 5.0, "vwap", volume_profile=[1, 2, 3, 4])
+        np.testing.assert_allclose(vwap.child_quantities, [0.5, 1.0, 1.5, 2.0])
+
+        pov = planner.plan(BOOK, "sell", 5.0, "pov", volume_profile=[10, 20], participation_rate=0.1)
+        np.testing.assert_allclose(pov.child_quantities, [1.0, 2.0, 2.0])
+
+        with pytest.raises(ValueError):
+            planner.plan(BOOK, "buy", 5.0, "vwap")
+
+    @pytest.mark.unit
+    def test_replan_keeps_sent_children(self):
+        """Test re-planning spreads the unfilled rest over the remaining intervals."""
+        planner = ExecutionPlanner()
+        schedule = planner.plan(BOOK, "buy", 6.0, "vwap", volume_profile=[1, 1, 2])
+        schedule.fills.append({"child": 0, "order_id": "1", "quantity": 1.0, "price": 101.0, "fee": 0.1})
+        schedule.next_child = 1
+
+        thin = {"bids": [[99.0, 0.5]], "asks": [[101.0, 0.5], [105.0, 0.5]]}
+        planner.replan(schedule, thin)
+
+        np.testing.assert_allclose(schedule.child_quantities, [1.5, 5 / 3, 10 / 3])
+        assert schedule.replans == 1
+        assert schedule.remaining_quantity == pytest.approx(5.0)
+        # Costs of the remaining children come from the thinner book
+        assert schedule.expected_cost > planner.plan(BOOK, "buy", 5.0, "vwap", volume_profile=[1, 2]).expected_cost
+
+
+class TestExecution:
+    """Test suite for sliced execution on the exchange simulator."""
+
+    @pytest.mark.unit
+    def test_sliced_order_beats_single_order(self):
+        """Test a sliced buy fills fully near the touch where one order walks the book."""
+        sim = make_simulator()
+        sim.advance(1)
+        planner = ExecutionPlanner(interval_seconds=60)
+        schedule = asyncio.run(planner.execute(sim, "BTC/USDT", "buy", 12.0))
+
+        assert schedule.filled_quantity == pytest.approx(12.0)
+        assert len(schedule.child_quantities) > 1
+        assert schedule.replans == len(schedule.child_quantities) - 1
+        assert sim.milliseconds() >= schedule.child_time(len(schedule.child_quantities) - 1)
+        assert schedule.average_price == pytest.approx(101.0)
+
+        single = make_simulator()
+        single.advance(1)
+        order = asyncio.run(single.create_order("BTC/USDT", "market", "buy", 12.0))
+        assert order["filled"] == pytest.approx(10.0)
+        assert order["average"] > schedule.average_price
+
+    @pytest.mark.unit
+    def test_limit_price_bounds_children(self):
+        """Test no child fills beyond the parent's limit price."""
+        sim = make_simulator()
+        sim.advance(1)
+        planner = ExecutionPlanner(interval_seconds=60, max_slices=1, max_slippage=0.05)
+        schedule = asyncio.run(planner.execute(sim, "BTC/USDT", "buy", 5.0, limit_price=102.0))
+
+        assert schedule.filled_quantity == pytest.approx(4.0)
+        assert schedule.average_price == pytest.approx(101.5)
+
+    @pytest.mark.unit
+    def test_signal_engine_submits_through_planner(self):
+        """Test entries go out as planned child orders when a planner is set."""
+        from advanced_signal_engine import SignalStrength, SignalType, TradingSignal
+        from signal_execution_engine import SignalExecutionEngine
+
+        sim = make_simulator()
+        sim.advance(1)
+        engine = SignalExecutionEngine(exchange=sim, execution_planner=ExecutionPlanner(interval_seconds=60))
+        signal = TradingSignal(
+            symbol="BTC/USDT", signal_type=SignalType.ENTRY_LONG, strength=SignalStrength.STRONG,
+            confidence=0.9, entry_price=100.0, stop_loss=95.0, take_profit_levels=[110.0],
+            risk_reward_ratio=2.0, position_size=0.0, reasoning=[], technical_indicators={},
+            chart_patterns=[], liquidity_score=1.0, unusual_activity=False, fibonacci_levels={},
+            timestamp=datetime.now(),
+        )
+
+        results = asyncio.run(engine.process_signals([signal]))
+
+        assert results[0]["action"] == "EXECUTED"
+        position = next(iter(engine.active_positions.values()))
+        children = [trade["order"] for trade in sim.my_trades if trade["side"] == "buy"]
+        assert len(set(children)) > 1
+        assert position.quantity == pytest.approx(sum(t["amount"] for t in sim.my_trades if t["side"] == "buy"))
+        assert position.entry_price == pytest.approx(101.0)
@@ -0,0 +1,190 @@
+"""
+Unit tests for the bounded history store.
+
+Tests ring-buffer eviction with per-symbol and time-range lookups,
+spilling evicted records to the Parquet record store, and the signal
+engine and regime analyzers keeping their history in it.
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The signal engine imports its siblings from src/ directly
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.data.history_store import HistoryStore
+from src.data.parquet_store import ParquetRecordStore
+
+FIELDS = [("price", "f8"), ("kind", "U8")]
+START = datetime(2024, 1, 31, 23, 50)
+
+
+def filled_store(n, capacity, **options):
+    """A store with record i for COIN{i % 3} at START + i minutes."""
+    store = HistoryStore(FIELDS, capacity=capacity, **options)
+    for i in range(n):
+        store.append(f"COIN{i % 3}", START + timedelta(minutes=i), price=float(i), kind="tick")
+    return store
+
+
+class TestHistoryStore:
+    """Test suite for HistoryStore."""
+
+    @pytest.mark.unit
+    def test_ring_evicts_oldest_and_indexes_symbols(self):
+        """Test a full ring keeps the newest records and per-symbol order."""
+        store = filled_store(25, capacity=10)
+
+        assert len(store) == 10 and store.evicted == 15
+        np.testing.assert_array_equal(store.last(4)["price"], [21.0, 22.0, 23.0, 24.0])
+        np.testing.assert_array_equal(store.last(100, "COIN1")["price"], [16.0, 19.0, 22.0])
+        np.testing.assert_array_equal(store.last(2, "COIN0")["price"], [21.0, 24.0])
+        assert len(store.last(5, "XRP")) == 0
+
+        latest = store.latest("COIN2")
+        assert latest == {"symbol": "COIN2", "timestamp": START + timedelta(minutes=23), "price": 23.0, "kind": "tick"}
+        assert store.latest("XRP") is None
+        with pytest.raises(ValueError):
+            store.append("COIN0", price=1.0, size=2.0)
+
+    @pytest.mark.unit
+    def test_between_across_the_wrap(self):
+        """Test time-range reads span both ring segments and fall back when unordered."""
+        store = filled_store(25, capacity=10)
+        window = store.between(START + timedelta(minutes=17), START + timedelta(minutes=21))
+        np.testing.assert_array_equal(window["price"], [17.0, 18.0, 19.0, 20.0, 21.0])
+        np.testing.assert_array_equal(store.between(START + timedelta(minutes=20), symbol="COIN2")["price"], [20.0, 23.0])
+        assert len(store.between(end=START)) == 0
+
+        store.append("COIN0", START, price=-1.0)  # late record
+        np.testing.assert_array_equal(store.between(end=START + timedelta(minutes=17))["price"], [16.0, 17.0, -1.0])
+
+        frame = store.to_frame(store.last(2))
+        assert list(frame.columns) == ["timestamp", "symbol", "price", "kind"]
+        assert list(frame["symbol"]) == ["COIN0", "COIN0"]
+
+    @pytest.mark.unit
+    def test_spills_before_eviction(self, tmp_path):
+        """Test evicted records reach the record store and can be read back."""
+        sink = ParquetRecordStore(tmp_path / "history")
+        store = filled_store(25, capacity=10, spill=sink, spill_batch=4)
+
+        # Batches of 4 go out as the oldest unspilled record is about to be overwritten
+        spilled = sink.read()
+        np.testing.assert_array_equal(spilled["price"], np.arange(16.0))
+        assert store.flush() == 9
+        assert store.flush() == 0
+
+        everything = sink.read()
+        np.testing.assert_array_equal(everything["price"], np.arange(25.0))
+        # Records straddle a month boundary, so reads prune by partition
+        assert sorted(path.name for path in (tmp_path / "history").iterdir()) == ["2024-01", "2024-02"]
+
+        # Naive datetimes read back as UTC wall time
+        start = pd.Timestamp(store.to_frame(store.last(1, "COIN1"))["timestamp"].iloc[0])
+        coin1 = sink.read(start=start, symbol="COIN1", columns=["price"])
+        assert list(coin1.columns) == ["timestamp", "price"]
+        np.testing.assert_array_equal(coin1["price"], [22.0])
+
+    @pytest.mark.unit
+    def test_memory_is_flat_and_lookups_are_fast(self):
+        """Test a long run keeps its allocation and answers last-N in microseconds."""
+        store = HistoryStore(FIELDS, capacity=10_000)
+        nbytes = store.nbytes
+        now = time.time()
+        for i in range(50_000):
+            store.append(f"COIN{i % 50}", now + i, price=float(i))
+
+        assert store.nbytes == nbytes and len(store) == 10_000
+        assert sum(len(index) for index in store._by_symbol) == 10_000
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            recent = store.last(20, "COIN7")
+        elapsed = (time.perf_counter() - started) / 1000
+
+        np.testing.assert_array_equal(recent["price"], np.arange(49_957.0 - 19 * 50, 49_958.0, 50))
+        assert elapsed < 100e-6
+
+
+def make_signal(symbol, confidence):
+    from advanced_signal_engine import SignalStrength, SignalType, TradingSignal
+
+    return TradingSignal(
+        symbol=symbol, signal_type=SignalType.ENTRY_LONG, strength=SignalStrength.STRONG,
+        confidence=confidence, entry_price=100.0, stop_loss=95.0, take_profit_levels=[110.0, 120.0],
+        risk_reward_ratio=2.0, position_size=0.02, reasoning=[], technical_indicators={},
+        chart_patterns=[], liquidity_score=0.8, unusual_activity=True, fibonacci_levels={},
+        timestamp=datetime.now(),
+    )
+
+
+class TestHistoryOwners:
+    """Test suite for the engines keeping their history in HistoryStore."""
+
+    @pytest.mark.unit
+    def test_signal_engine_records_signals(self):
+        """Test emitted signals are kept per symbol up to the history size."""
+        from advanced_signal_engine import AdvancedSignalEngine
+
+        engine = AdvancedSignalEngine(signal_history_size=4)
+        for i in range(6):
+            engine._record_signal(make_signal("BTC/USDT" if i % 2 else "ETH/USDT", i / 10))
+
+        assert len(engine.signal_history) == 4
+        recent = engine.recent_signals("BTC/USDT", n=5)
+        assert list(recent["confidence"]) == [0.3, 0.5]
+        assert recent["signal_type"].iloc[0] == "ENTRY_LONG" and recent["take_profit"].iloc[0] == 110.0
+        assert bool(recent["unusual_activity"].iloc[0])
+
+    @pytest.mark.unit
+    def test_regime_detector_tracks_pairs_separately(self):
+        """Test durations and summaries come from each pair's own history."""
+        from src.market_analysis.regime_detector import AdvancedRegimeDetector, MarketRegime, RegimeSignal
+
+        detector = AdvancedRegimeDetector(history_size=8)
+
+        def record(pair, regime):
+            duration = detector._calculate_regime_duration(regime, pair)
+            detector._update_regime_history(RegimeSignal(regime, 0.8, 0.6, duration, {}, {}), pair)
+            return duration
+
+        assert [record("BTC/USDT", MarketRegime.BULL) for _ in range(3)] == [0, 1, 2]
+        assert record("ETH/USDT", MarketRegime.BEAR) == 0
+        assert record("BTC/USDT", MarketRegime.BULL) == 3
+        assert record("BTC/USDT", MarketRegime.SIDEWAYS) == 0
+
+        summary = detector.get_regime_summary("BTC/USDT")
+        assert summary["current_regime"] == "sideways" and summary["duration"] == "0 periods"
+        assert summary["regime_changes_last_24h"] == 4
+        assert detector.get_regime_summary()["pair"] == "BTC/USDT"
+        assert detector.get_regime_summary("ETH/USDT")["current_regime"] == "bear"
+        assert AdvancedRegimeDetector().get_regime_summary() == {"status": "No regime data available"}
+
+    @pytest.mark.unit
+    def test_crypto_analyzer_duration_from_history(self):
+        """Test regime duration is measured from the start recorded in the history."""
+        from src.market_analysis.crypto_market_regime_analyzer import (
+            MARKET_HISTORY_KEY,
+            CryptoMarketRegimeAnalyzer,
+            MarketRegime,
+        )
+
+        analyzer = CryptoMarketRegimeAnalyzer(history_size=4)
+        first = analyzer._get_neutral_regime()
+        assert analyzer._update_regime_duration(first.market_regime) == 1
+        analyzer._record_regime(first)
+
+        # Pretend the sideways regime began three days ago
+        analyzer.regime_history.records["regime_start"][0] -= 3 * 86400
+        assert analyzer._update_regime_duration(MarketRegime.SIDEWAYS) == 3
+        assert analyzer._update_regime_duration(MarketRegime.BULL) == 1
+
+        latest = analyzer.regime_history.latest(MARKET_HISTORY_KEY)
+        assert latest["market_regime"] == "sideways" and latest["fundamental_health"] == "warning"
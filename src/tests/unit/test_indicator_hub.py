@@ -0,0 +1,235 @@
+"""
+Unit tests for the shared indicator hub.
+
+Tests that each indicator column is computed once per candle window across
+consumers (in process, over IPC and under concurrency), that candles are
+fetched once per candle period, the local fallback when no hub is reachable,
+and the deduplication statistics net of IPC time.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.market_data.indicator_hub import (
+    HUB_ADDRESS_ENV,
+    HUB_AUTHKEY_ENV,
+    IndicatorHub,
+    IndicatorHubClient,
+    candle_window,
+    compute_indicator,
+    hub_client_from_env,
+    hub_environment,
+    indicator_key,
+    start_hub_process,
+)
+
+
+def make_candles(periods, seed=0):
+    """Build a freqtrade-style random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, periods).cumsum()
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=periods, freq="1h", tz="UTC"),
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": rng.random(periods) + 1,
+    })
+
+
+class TestIndicatorHub:
+    """Test suite for the in-process IndicatorHub cache."""
+
+    @pytest.mark.unit
+    def test_computes_once_per_candle_window(self):
+        """Test repeated requests hit the cache and a new candle recomputes."""
+        hub = IndicatorHub(address="unused")
+        candles = make_candles(300)
+        key = indicator_key("BTC/USDT", "1h", "rsi", {"timeperiod": 14}, candle_window(candles))
+
+        first = hub.compute(key, candles, consumer="bot_1")
+        second = hub.compute(key, candles, consumer="bot_2")
+        assert second is first
+
+        grown = make_candles(301)
+        hub.compute(indicator_key("BTC/USDT", "1h", "RSI", {"timeperiod": 14}, candle_window(grown)), grown)
+
+        stats = hub.get_stats()
+        assert stats["requests"] == 3
+        assert stats["computes"] == 2
+        assert stats["hits"] == 1
+        assert stats["saved_compute_seconds"] > 0
+        assert stats["consumers"] == {"bot_1": 1, "bot_2": 1, "local": 1}
+        assert stats["indicators"]["RSI"] == {"computes": 2, "hits": 1}
+
+    @pytest.mark.unit
+    def test_concurrent_consumers_share_one_compute(self):
+        """Test consumers racing on the same column compute it once."""
+        hub = IndicatorHub(address="unused")
+        candles = make_candles(500)
+        key = indicator_key("ETH/USDT", "1h", "MACD", {}, candle_window(candles))
+
+        threads = [threading.Thread(target=hub.compute, args=(key, candles, f"bot_{i}")) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = hub.get_stats()
+        assert stats["computes"] == 1
+        assert stats["hits"] == 7
+
+    @pytest.mark.unit
+    def test_failed_compute_releases_key_lock(self):
+        """Test a compute that raises leaves no per-key lock behind."""
+        hub = IndicatorHub(address="unused")
+        candles = make_candles(50)
+        key = indicator_key("BTC/USDT", "1h", "NOPE", {}, candle_window(candles))
+
+        with pytest.raises(ValueError):
+            hub.compute(key, candles)
+
+        assert hub._key_locks == {}
+        assert hub.get_stats()["computes"] == 0
+
+    @pytest.mark.unit
+    def test_fallback_indicators(self):
+        """Test the pandas indicators honour price inputs and output names."""
+        candles = make_candles(200)
+
+        volume_sma = compute_indicator("SMA", candles, {"timeperiod": 20, "price": "volume"})["real"]
+        np.testing.assert_allclose(volume_sma, candles["volume"].rolling(20).mean().to_numpy())
+
+        macd = compute_indicator("MACD", candles, {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9})
+        assert list(macd) == ["macd", "macdsignal", "macdhist"]
+        assert np.isnan(macd["macd"][:33]).all() and not np.isnan(macd["macd"][33:]).any()
+
+        bands = compute_indicator("BBANDS", candles, {"timeperiod": 20})
+        assert (bands["upperband"][19:] >= bands["lowerband"][19:]).all()
+
+
+class TestIndicatorHubIPC:
+    """Test consumers sharing a hub over IPC."""
+
+    @pytest.mark.unit
+    def test_clients_share_columns_over_ipc(self, tmp_path):
+        """Test the second bot receives the first bot's column without recomputing."""
+        hub = IndicatorHub(address=str(tmp_path / "hub.sock"))
+        address = hub.start()
+        try:
+            candles = make_candles(400)
+            bot_1 = IndicatorHubClient(address, hub.authkey, consumer="bot_1")
+            bot_2 = IndicatorHubClient(address, hub.authkey, consumer="bot_2")
+
+            rsi_1 = bot_1.indicator("BTC/USDT", "1h", candles, "RSI", timeperiod=14)
+            rsi_2 = bot_2.indicator("BTC/USDT", "1h", candles, "RSI", timeperiod=14)
+            bands = bot_2.indicator("BTC/USDT", "1h", candles, "BBANDS", timeperiod=20)
+
+            expected = compute_indicator("RSI", candles, {"timeperiod": 14})["real"]
+            np.testing.assert_array_equal(rsi_1.to_numpy(), expected)
+            pd.testing.assert_series_equal(rsi_1, rsi_2)
+            assert list(bands.columns) == ["upperband", "middleband", "lowerband"]
+            assert bands.index.equals(candles.index)
+
+            assert (bot_1.remote_computes, bot_2.remote_hits, bot_2.remote_computes) == (1, 1, 1)
+            stats = bot_1.get_stats()
+            assert stats["requests"] == 3
+            assert stats["duplicate_computes_avoided"] == 1
+            assert stats["consumers"] == {"bot_1": 1, "bot_2": 2}
+            assert stats["ipc_seconds"] > 0
+            assert stats["net_saved_seconds"] == pytest.approx(
+                stats["saved_compute_seconds"] - stats["ipc_seconds"], abs=1e-5)
+
+            bot_1.close()
+            bot_2.close()
+        finally:
+            hub.stop()
+
+    @pytest.mark.unit
+    def test_clients_share_candle_fetches(self, tmp_path):
+        """Test bots asking for the same candles in one period share a single fetch."""
+        fetches = []
+
+        def fetch_ohlcv(pair, timeframe, limit=None):
+            fetches.append((pair, timeframe, limit))
+            return [[i * 3_600_000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(limit)]
+
+        hub = IndicatorHub(address=str(tmp_path / "hub.sock"), candle_source=fetch_ohlcv)
+        address = hub.start()
+        try:
+            bots = [IndicatorHubClient(address, hub.authkey, consumer=f"bot_{i}") for i in range(3)]
+            frames = [bot.candles("BTC/USDT", "1h", limit=100) for bot in bots]
+            other = bots[0].candles("ETH/USDT", "1h", limit=100)
+
+            assert fetches == [("BTC/USDT", "1h", 100), ("ETH/USDT", "1h", 100)]
+            assert list(frames[0].columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+            for frame in frames[1:]:
+                pd.testing.assert_frame_equal(frame, frames[0])
+            assert len(other) == 100 and frames[0]["timestamp"].iloc[-1] == 99 * 3_600_000
+            assert bots[0].get_stats()["indicators"]["OHLCV"] == {"computes": 2, "hits": 2}
+            for bot in bots:
+                bot.close()
+        finally:
+            hub.stop()
+
+    @pytest.mark.unit
+    def test_hub_without_candle_source_falls_back(self, tmp_path):
+        """Test clients fetch their own candles when the hub has no candle source."""
+        hub = IndicatorHub(address=str(tmp_path / "hub.sock"))
+        address = hub.start()
+        try:
+            client = IndicatorHubClient(address, hub.authkey, consumer="bot_1")
+            assert client.candles("BTC/USDT", "1h", limit=2) is None
+
+            local = client.candles("BTC/USDT", "1h", limit=2,
+                                   fetch=lambda pair, timeframe, limit: [[0, 1, 2, 0.5, 1.5, 10]] * limit)
+            assert len(local) == 2 and client.local_fetches == 1 and client.remote_candles == 0
+            client.close()
+        finally:
+            hub.stop()
+
+    @pytest.mark.unit
+    def test_unreachable_hub_computes_locally(self, tmp_path):
+        """Test clients keep working when no hub is listening."""
+        client = IndicatorHubClient(str(tmp_path / "missing.sock"), b"key", consumer="bot_1")
+        candles = make_candles(100)
+
+        atr = client.indicator("BTC/USDT", "1h", candles, "ATR", timeperiod=14)
+
+        np.testing.assert_array_equal(atr.to_numpy(), compute_indicator("ATR", candles, {"timeperiod": 14})["real"])
+        assert client.local_computes == 1
+        assert client.get_stats() is None
+
+    @pytest.mark.unit
+    def test_hub_process_and_environment(self, tmp_path, monkeypatch):
+        """Test a hub process is reachable through the exported environment."""
+        process, address, authkey = start_hub_process(str(tmp_path / "hub.sock"))
+        try:
+            for name, value in hub_environment(address, authkey).items():
+                monkeypatch.setenv(name, value)
+            client = hub_client_from_env("bot_1")
+            client.retry_after = 0
+
+            stats = None
+            deadline = time.monotonic() + 30
+            while stats is None and time.monotonic() < deadline:
+                stats = client.get_stats()
+                if stats is None:
+                    time.sleep(0.1)
+
+            assert stats is not None and stats["requests"] == 0
+            client.indicator("BTC/USDT", "1h", make_candles(50), "SMA", timeperiod=10)
+            assert client.get_stats()["computes"] == 1
+            client.close()
+        finally:
+            process.terminate()
+            process.join(timeout=10)
+
+        monkeypatch.delenv(HUB_ADDRESS_ENV)
+        monkeypatch.delenv(HUB_AUTHKEY_ENV)
+        assert hub_client_from_env() is None
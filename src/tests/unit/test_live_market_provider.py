@@ -0,0 +1,140 @@
+"""
+Unit tests for hedged price-source fetching in LiveMarketProvider.
+
+Tests that a hung source no longer delays the refresh, staggered hedging,
+fail-fast fallthrough, cancellation of unstarted sources, the adaptive
+source ranking driven by per-source latency and error statistics, and
+releasing the worker threads on close.
+"""
+
+import time
+
+import pytest
+
+from src.market_data import live_market_provider
+from src.market_data.live_market_provider import LiveMarketProvider
+
+
+def quote(source):
+    return {"BTC/USDT": {"price": 50_000.0, "source": source}}
+
+
+def make_provider(monkeypatch, behaviours, **kwargs):
+    """Provider whose sources sleep for a delay and return a quote, {} or raise."""
+    monkeypatch.setattr(live_market_provider, "PERSISTENT_CACHE_AVAILABLE", False)
+    provider = LiveMarketProvider(**kwargs)
+    provider.calls = []
+
+    for api_name, method in provider.price_sources.items():
+        delay, outcome = behaviours[api_name]
+
+        def fetch(api_name=api_name, delay=delay, outcome=outcome):
+            provider.calls.append(api_name)
+            time.sleep(delay)
+            if outcome == "error":
+                raise ConnectionError(f"{api_name} down")
+            return quote(api_name) if outcome == "ok" else {}
+
+        setattr(provider, method, fetch)
+    return provider
+
+
+class TestHedgedFetching:
+    """Test suite for hedged price refreshes."""
+
+    @pytest.mark.unit
+    def test_hung_source_is_hedged(self, monkeypatch):
+        """Test a hanging first source costs only the hedge delay."""
+        provider = make_provider(monkeypatch, {
+            "CryptoCompare": (2.0, "ok"),
+            "CoinPaprika": (0.05, "ok"),
+            "Binance": (0.05, "ok"),
+            "CoinGecko": (0.05, "ok"),
+        }, hedge_delay=0.1)
+
+        started = time.perf_counter()
+        prices = provider.get_live_prices()
+        elapsed = time.perf_counter() - started
+
+        assert prices["BTC/USDT"]["source"] == "CoinPaprika"
+        assert elapsed < 0.5
+        assert provider.calls == ["CryptoCompare", "CoinPaprika"]
+
+    @pytest.mark.unit
+    def test_failures_fall_through_immediately(self, monkeypatch):
+        """Test failing sources start the next one without waiting for the hedge delay."""
+        provider = make_provider(monkeypatch, {
+            "CryptoCompare": (0.0, "error"),
+            "CoinPaprika": (0.0, "empty"),
+            "Binance": (0.05, "ok"),
+            "CoinGecko": (0.05, "ok"),
+        }, hedge_delay=5.0)
+
+        started = time.perf_counter()
+        prices = provider.get_live_prices()
+
+        assert prices["BTC/USDT"]["source"] == "Binance"
+        assert time.perf_counter() - started < 1.0
+        stats = provider.get_source_stats()
+        assert stats["CryptoCompare"]["last_error"] == "CryptoCompare down"
+        assert stats["CoinPaprika"]["failures"] == 1
+        assert stats["CoinGecko"]["requests"] == 0
+
+    @pytest.mark.unit
+    def test_ranking_adapts_to_latency_and_health(self, monkeypatch):
+        """Test the fastest healthy source moves to the front and failing ones to the back."""
+        provider = make_provider(monkeypatch, {
+            "CryptoCompare": (0.3, "ok"),
+            "CoinPaprika": (0.0, "error"),
+            "Binance": (0.02, "ok"),
+            "CoinGecko": (0.1, "ok"),
+        }, hedge_delay=0)
+
+        for _ in range(3):
+            provider.cache.clear()
+            assert provider.get_live_prices()["BTC/USDT"]["source"] == "Binance"
+        time.sleep(0.4)  # let the abandoned slow requests report
+
+        assert list(provider.get_source_stats()) == ["Binance", "CoinGecko", "CryptoCompare", "CoinPaprika"]
+
+        provider.cache.clear()
+        provider.hedge_delay = 1.0
+        provider.calls.clear()
+        provider.get_live_prices()
+        assert provider.calls == ["Binance"]
+
+    @pytest.mark.unit
+    def test_sequential_mode_and_total_failure(self, monkeypatch):
+        """Test sequential mode uses the ranking and all-failed refreshes return {}."""
+        provider = make_provider(monkeypatch, {
+            "CryptoCompare": (0.0, "empty"),
+            "CoinPaprika": (0.0, "error"),
+            "Binance": (0.0, "empty"),
+            "CoinGecko": (0.0, "error"),
+        }, fetch_mode="sequential")
+
+        assert provider.get_live_prices() == {}
+        assert provider.calls == ["CryptoCompare", "CoinPaprika", "Binance", "CoinGecko"]
+        assert all(stats["failures"] == 1 for stats in provider.get_source_stats().values())
+
+    @pytest.mark.unit
+    def test_close_releases_worker_threads(self, monkeypatch):
+        """Test close shuts the hedging pool down and a later refresh starts a new one."""
+        provider = make_provider(monkeypatch, {
+            "CryptoCompare": (0.0, "ok"),
+            "CoinPaprika": (0.0, "ok"),
+            "Binance": (0.0, "ok"),
+            "CoinGecko": (0.0, "ok"),
+        }, hedge_delay=0.1)
+        provider.get_live_prices()
+        executor = provider._executor
+
+        provider.close()
+        provider.close()  # idempotent
+
+        assert provider._executor is None
+        with pytest.raises(RuntimeError):
+            executor.submit(time.sleep, 0)
+        provider.cache.clear()
+        assert provider.get_live_prices()["BTC/USDT"]["source"] == "CryptoCompare"
+        provider.close()
@@ -369,7 +369,7 @@ class TestMarketDataManager:
         assert symbol_dir.exists()
 
         # Check if parquet file was created
-        parquet_files = list(symbol_dir.glob("*.parquet"))
+        parquet_files = list(symbol_dir.rglob("*.parquet"))
         assert len(parquet_files) > 0
 
     @pytest.mark.unit
@@ -382,7 +382,7 @@ class TestMarketDataManager:
             assert isinstance(result, pd.DataFrame)
 
     @pytest.mark.unit
-    @patch("src.data.market_data_manager.logger")
+    @patch("src.data.market_data_manager.hot_log")
     def test_logging_on_successful_fetch(self, mock_logger, mock_manager):
         """Test that successful data fetches are logged."""
         mock_manager.fetch_real_time_data("BTC/USDT", limit=5)
@@ -0,0 +1,110 @@
+"""
+Unit tests for the symbol x bar MarketPanel.
+
+Tests panel alignment, cross-sectional and rolling operators, and
+that the VolumeScanner / IndividualCoinAnalyzer panel fast paths
+match their per-pair results.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.individual_coin_analyzer import IndividualCoinAnalyzer
+from src.analysis.market_panel import (MarketPanel, cs_rank, cs_zscore,
+                                       ewm_mean, rolling_mean, rolling_std)
+from src.analysis.volume_scanner import VolumeScanner
+from src.tests.fixtures.trading_scenarios import TradingScenarios
+
+
+class TestMarketPanel:
+    """Test suite for MarketPanel and panel operators."""
+
+    @pytest.fixture
+    def universe(self):
+        universe = TradingScenarios.generate_multi_symbol_universe(6, 260)
+        # One symbol listed later than the rest
+        universe["C5/USDT"] = universe["C5/USDT"].iloc[60:].reset_index(drop=True)
+        return universe
+
+    @pytest.mark.unit
+    def test_from_frames_aligns_on_timestamps(self, universe):
+        """Test frames are aligned and missing bars are NaN padded."""
+        panel = MarketPanel.from_frames(universe)
+
+        assert panel.shape == (6, 260)
+        assert panel.row("C5/USDT") == 5
+        assert np.isnan(panel.close[5, :60]).all()
+        assert panel.close[5, 60] == pytest.approx(universe["C5/USDT"]["close"].iloc[0])
+        assert list(panel.complete_rows()) == [True] * 5 + [False]
+        pd.testing.assert_series_equal(
+            panel.frame("C5/USDT")["close"], universe["C5/USDT"]["close"], check_names=False
+        )
+
+    @pytest.mark.unit
+    def test_rolling_operators_match_pandas(self, universe):
+        """Test rolling and EWM operators against pandas per symbol."""
+        panel = MarketPanel.from_frames(universe)
+        close = universe["C0/USDT"]["close"]
+
+        np.testing.assert_allclose(rolling_mean(panel.close, 20)[0], close.rolling(20).mean(), equal_nan=True)
+        np.testing.assert_allclose(rolling_std(panel.close, 20)[0], close.rolling(20).std(), equal_nan=True)
+        np.testing.assert_allclose(ewm_mean(panel.close, 21)[0], close.ewm(span=21).mean())
+        # Leading NaNs are skipped like a shorter pandas series
+        np.testing.assert_allclose(
+            ewm_mean(panel.close, 9)[5, 60:], universe["C5/USDT"]["close"].ewm(span=9).mean()
+        )
+
+    @pytest.mark.unit
+    def test_cross_sectional_operators(self):
+        """Test rank and z-score are computed across symbols per bar."""
+        values = np.array([[1.0, 4.0], [2.0, np.nan], [3.0, 2.0]])
+
+        np.testing.assert_allclose(cs_rank(values), [[1 / 3, 1.0], [2 / 3, np.nan], [1.0, 0.5]])
+        zscore = cs_zscore(values)
+        assert zscore[1, 0] == pytest.approx(0.0)
+        assert np.isnan(zscore[1, 1])
+        assert zscore[0, 1] == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    def test_universe_statistics(self, universe):
+        """Test breadth and sector rotation shapes and bounds."""
+        panel = MarketPanel.from_frames(universe)
+        breadth = panel.breadth(window=20)
+        rotation = panel.sector_rotation({"C0/USDT": "l1", "C1/USDT": "l1", "C2/USDT": "defi"})
+
+        assert breadth["valid"][-1] == 6
+        assert (breadth["advancing"] + breadth["declining"] <= breadth["valid"]).all()
+        assert set(rotation.index) == {"l1", "defi", "other"}
+        assert rotation.loc["other", "symbols"] == 3
+        rs_rank = panel.relative_strength_rank(20)[:, -1]
+        assert np.nanmin(rs_rank) > 0 and np.nanmax(rs_rank) == 1.0
+
+    @pytest.mark.unit
+    def test_volume_scanner_panel_matches_per_pair(self, universe):
+        """Test VolumeScanner.scan_panel reproduces scan_multiple_pairs."""
+        scanner = VolumeScanner()
+        expected = scanner.scan_multiple_pairs(universe)
+        actual = scanner.scan_panel(MarketPanel.from_frames(universe))
+
+        assert [p for p, _ in actual["ranked_pairs"]] == [p for p, _ in expected["ranked_pairs"]]
+        for pair, analysis in expected["individual_analysis"].items():
+            fast = actual["individual_analysis"][pair]
+            assert fast["overall_score"] == pytest.approx(analysis["overall_score"])
+            assert fast["money_flow"]["flow_type"] == analysis["money_flow"]["flow_type"]
+            assert fast["recommendation"] == analysis["recommendation"]
+
+    @pytest.mark.unit
+    def test_coin_analyzer_panel_matches_per_pair(self, universe):
+        """Test IndividualCoinAnalyzer.analyze_panel reproduces analyze_multiple_coins."""
+        analyzer = IndividualCoinAnalyzer()
+        expected = analyzer.analyze_multiple_coins(universe)
+        actual = analyzer.analyze_panel(MarketPanel.from_frames(universe))
+
+        for pair, analysis in expected.items():
+            fast = actual[pair]
+            assert fast.regime == analysis.regime
+            assert fast.trend_strength == analysis.trend_strength
+            assert fast.distance_from_ath == pytest.approx(analysis.distance_from_ath)
+            assert fast.key_levels == analysis.key_levels
+            assert fast.risk_factors == analysis.risk_factors
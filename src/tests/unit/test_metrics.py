@@ -0,0 +1,223 @@
+"""
+Unit tests for the metrics registry.
+
+Tests counter, gauge and histogram semantics with labels, the text
+exposition format, scrape-time collectors, hot-path overhead, and the
+cache, exchange, database and position metrics reported by subsystems
+through the dashboard scrape endpoint.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+# The signal execution engine imports its siblings from src/ directly
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.monitoring import metrics
+from src.monitoring.metrics import MetricsRegistry
+
+
+def value(metric, *labels):
+    return metric.labels(*labels).get()
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry and its metric types."""
+
+    @pytest.mark.unit
+    def test_exposition_format(self):
+        """Test counters, gauges and histograms render as Prometheus text."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests\nserved", ("path",))
+        requests.labels("/a").inc()
+        requests.labels(path='/b"\\').inc(2)
+        depth = registry.gauge("depth", "Queue depth")
+        depth.set(5)
+        depth.labels().dec(2)
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(seconds)
+
+        assert registry.render().splitlines() == [
+            "# HELP depth Queue depth",
+            "# TYPE depth gauge",
+            "depth 3.0",
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{le="0.1"} 2',
+            'latency_seconds_bucket{le="1.0"} 3',
+            'latency_seconds_bucket{le="+Inf"} 4',
+            "latency_seconds_sum 3.65",
+            "latency_seconds_count 4",
+            "# HELP requests_total Requests\\nserved",
+            "# TYPE requests_total counter",
+            'requests_total{path="/a"} 1.0',
+            'requests_total{path="/b\\"\\\\"} 2.0',
+        ]
+
+    @pytest.mark.unit
+    def test_registration_and_label_validation(self):
+        """Test re-registration is idempotent and mismatches are rejected."""
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Events", ("kind",))
+        assert registry.counter("events_total", "Events", ("kind",)) is counter
+        assert registry.get("events_total") is counter
+        with pytest.raises(ValueError):
+            registry.gauge("events_total", "Events", ("kind",))
+        with pytest.raises(ValueError):
+            registry.counter("events_total", "Events", ("kind", "source"))
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+        with pytest.raises(ValueError):
+            counter.labels("a").inc(-1)
+        assert counter.labels(kind="a") is counter.labels("a")
+
+    @pytest.mark.unit
+    def test_callbacks_and_collectors_run_at_scrape(self):
+        """Test gauge callbacks and collectors are evaluated only when scraped."""
+        registry = MetricsRegistry()
+        queue = []
+        depth = registry.gauge("depth", "Queue depth", ("queue",))
+        depth.labels("orders").set_function(lambda: len(queue))
+        depth.labels("broken").set_function(lambda: 1 / 0)
+        scrapes = registry.gauge("scrapes", "Scrapes")
+        registry.add_collector(lambda: scrapes.labels().inc())
+
+        queue.extend(range(3))
+        text = registry.render()
+        assert 'depth{queue="orders"} 3.0' in text
+        assert 'depth{queue="broken"} NaN' in text
+        assert "scrapes 1.0" in text
+
+        def failing():
+            raise RuntimeError("collector down")
+
+        registry.add_collector(failing)
+        assert "scrapes 2.0" in registry.render()
+
+    @pytest.mark.unit
+    def test_hot_path_updates_are_cheap_and_thread_safe(self):
+        """Test concurrent increments are exact and cost around a microsecond."""
+        registry = MetricsRegistry()
+        counter = registry.counter("hits_total", "Hits", ("cache",))
+        histogram = registry.histogram("write_seconds", "Writes", ("store",))
+
+        def work():
+            for _ in range(10_000):
+                counter.labels("market_data").inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert value(counter, "market_data") == 40_000
+
+        started = time.perf_counter()
+        for _ in range(100_000):
+            counter.labels("market_data").inc()
+            histogram.labels("sqlite").observe(0.002)
+        per_update = (time.perf_counter() - started) / 200_000
+        assert per_update < 5e-6
+
+
+class TestSubsystemMetrics:
+    """Test suite for metrics reported by the trading subsystems."""
+
+    @pytest.mark.unit
+    def test_exchange_adapter_requests_errors_and_in_flight(self):
+        """Test adapter calls count requests, errors and latency and release in-flight slots."""
+        from src.market_data.exchange_adapter import ExchangeAdapter
+
+        class Exchange:
+            id = "metrics-test"
+
+            def fetch_ticker(self, symbol):
+                assert value(metrics.EXCHANGE_IN_FLIGHT, "metrics-test") == 1
+                return {"symbol": symbol}
+
+            def fetch_order_book(self, symbol, limit=None):
+                raise ConnectionError("down")
+
+        adapter = ExchangeAdapter(Exchange())
+
+        async def run():
+            await adapter.call("fetch_ticker", "BTC/USDT")
+            with pytest.raises(ConnectionError):
+                await adapter.call("fetch_order_book", "BTC/USDT")
+
+        asyncio.run(run())
+        assert value(metrics.EXCHANGE_REQUESTS, "metrics-test", "fetch_ticker") == 1
+        assert value(metrics.EXCHANGE_ERRORS, "metrics-test", "fetch_order_book", "ConnectionError") == 1
+        assert value(metrics.EXCHANGE_LATENCY, "metrics-test", "fetch_order_book") == 1
+        assert value(metrics.EXCHANGE_IN_FLIGHT, "metrics-test") == 0
+
+    @pytest.mark.unit
+    def test_market_data_cache_and_storage(self, mock_exchange, tmp_path):
+        """Test cache hits and misses, exchange fetches and DB writes are counted."""
+        from src.data.market_data_manager import MarketDataManager
+        from src.database.data_warehouse import DataWarehouse
+
+        with patch("src.data.market_data_manager.ccxt.binance", return_value=mock_exchange):
+            manager = MarketDataManager({"data_dir": str(tmp_path / "data"), "rate_limit_delay": 0})
+        before = {
+            result: value(metrics.CACHE_REQUESTS, "market_data", result) for result in ("hit", "miss")
+        }
+        fetches = value(metrics.EXCHANGE_REQUESTS, "binance", "fetch_ohlcv")
+
+        df = manager.fetch_real_time_data("BTC/USDT", "1h", limit=50)
+        manager.fetch_real_time_data("BTC/USDT", "1h", limit=50)
+
+        assert value(metrics.CACHE_REQUESTS, "market_data", "miss") == before["miss"] + 1
+        assert value(metrics.CACHE_REQUESTS, "market_data", "hit") == before["hit"] + 1
+        assert value(metrics.EXCHANGE_REQUESTS, "binance", "fetch_ohlcv") == fetches + 1
+
+        writes = value(metrics.DB_WRITE_SECONDS, "sqlite", "ohlcv_data")
+        DataWarehouse(str(tmp_path / "warehouse.db")).store_ohlcv_data("BTC/USDT", "1h", df)
+        assert value(metrics.DB_WRITE_SECONDS, "sqlite", "ohlcv_data") == writes + 1
+
+    @pytest.mark.unit
+    def test_scrape_endpoint_reports_positions_and_stage_latency(self):
+        """Test /api/metrics serves open positions, signal outcomes and stage latencies."""
+        from advanced_signal_engine import SignalStrength, SignalType, TradingSignal
+        from signal_execution_engine import SignalExecutionEngine
+
+        from src.web_ui.blueprints.metrics_routes import metrics_bp
+
+        async def fill(symbol, side, quantity, order_type, price):
+            return {"status": "FILLED", "fill_price": price, "fill_quantity": quantity,
+                    "fill_time": datetime.now(), "fees": 0.0}
+
+        engine = SignalExecutionEngine()
+        engine._simulate_order_execution = fill
+        signal = TradingSignal(
+            symbol="BTC/USDT", signal_type=SignalType.ENTRY_LONG, strength=SignalStrength.STRONG,
+            confidence=0.9, entry_price=100.0, stop_loss=95.0, take_profit_levels=[110.0],
+            risk_reward_ratio=2.0, position_size=0.0, reasoning=[], technical_indicators={},
+            chart_patterns=[], liquidity_score=1.0, unusual_activity=False, fibonacci_levels={},
+            timestamp=datetime.now(),
+        )
+        executed = value(metrics.SIGNAL_DECISIONS, "signal_execution", "EXECUTED")
+        asyncio.run(engine.process_signals([signal]))
+
+        app = Flask(__name__)
+        app.register_blueprint(metrics_bp)
+        response = app.test_client().get("/api/metrics")
+
+        assert response.status_code == 200
+        assert response.content_type == metrics.CONTENT_TYPE
+        lines = response.get_data(as_text=True).splitlines()
+        assert 'fricktrader_open_positions{engine="signal_execution"} 1.0' in lines
+        assert f'fricktrader_signal_decisions_total{{engine="signal_execution",action="EXECUTED"}} {executed + 1}' in lines
+        p50 = next(line for line in lines if line.startswith(
+            'fricktrader_stage_latency_seconds{stage="execution.process_signals",quantile="0.5"}'))
+        assert 0 < float(p50.split()[-1]) < 1
+        assert "# TYPE fricktrader_exchange_request_seconds histogram" in lines
@@ -0,0 +1,207 @@
+"""
+Unit tests for the partitioned OHLCV Parquet store.
+
+Tests month partitioning, deduplicating compaction, range reads with
+projection, metadata coverage, and warm restarts of MarketDataManager
+that serve history from disk instead of the exchange.
+"""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.data.market_data_manager import MarketDataManager
+from src.data.parquet_store import ParquetOHLCVStore
+
+
+def make_candles(start, periods, freq="1h", base=100.0):
+    """Build a well-formed OHLCV frame."""
+    timestamps = pd.date_range(start, periods=periods, freq=freq)
+    close = base + np.arange(periods, dtype=float) * 0.1
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "open": close - 0.05,
+        "high": close + 0.5,
+        "low": close - 0.5,
+        "close": close,
+        "volume": np.full(periods, 10.0),
+    })
+
+
+class TestParquetOHLCVStore:
+    """Test suite for ParquetOHLCVStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return ParquetOHLCVStore(tmp_path, row_group_size=100, compact_after_parts=4)
+
+    @pytest.mark.unit
+    def test_append_partitions_by_month(self, store, tmp_path):
+        """Test rows spanning two months land in two partitions."""
+        store.append("BTC/USDT", "1h", make_candles("2024-01-31 20:00", 10))
+
+        months = sorted(p.name for p in (tmp_path / "BTC_USDT" / "1h").iterdir())
+        assert months == ["2024-01", "2024-02"]
+
+        df = store.read("BTC/USDT", "1h")
+        assert len(df) == 10
+        assert df["timestamp"].is_monotonic_increasing
+        assert df["timestamp"].dtype == "datetime64[ns]"
+
+    @pytest.mark.unit
+    def test_compaction_dedupes_latest_write_wins(self, store):
+        """Test overlapping appends collapse to one row per timestamp."""
+        store.append("BTC/USDT", "1h", make_candles("2024-03-01", 48))
+        revised = make_candles("2024-03-02", 48, base=200.0)
+        store.append("BTC/USDT", "1h", revised)
+
+        assert store.compact() == 1
+        [partition] = store.partitions("BTC/USDT", "1h")
+        assert partition["files"] == 1
+        assert partition["rows"] == 72
+
+        df = store.read("BTC/USDT", "1h")
+        assert len(df) == 72
+        overlap = df["timestamp"] >= pd.Timestamp("2024-03-02")
+        np.testing.assert_allclose(df.loc[overlap, "close"], revised["close"])
+
+    @pytest.mark.unit
+    def test_auto_compaction_after_part_limit(self, store):
+        """Test a month is compacted once it accumulates enough parts."""
+        for day in range(1, 5):
+            store.append("ETH/USDT", "1h", make_candles(f"2024-05-0{day}", 24))
+
+        [partition] = store.partitions("ETH/USDT", "1h")
+        assert partition["files"] == 1
+        assert partition["rows"] == 96
+
+    @pytest.mark.unit
+    def test_range_read_with_projection(self, store):
+        """Test start/end filtering, month pruning and column projection."""
+        store.append("BTC/USDT", "1h", make_candles("2024-01-01", 24 * 90))
+
+        df = store.read(
+            "BTC/USDT", "1h", start="2024-02-10", end="2024-02-11 23:00", columns=["close"]
+        )
+        assert list(df.columns) == ["timestamp", "close"]
+        assert len(df) == 48
+        assert df["timestamp"].iloc[0] == pd.Timestamp("2024-02-10")
+        assert df["timestamp"].iloc[-1] == pd.Timestamp("2024-02-11 23:00")
+
+        assert store._partitions("BTC/USDT", "1h", 1707523200000, 1707695999000)[0].name == "2024-02"
+
+    @pytest.mark.unit
+    def test_coverage_from_metadata(self, store):
+        """Test coverage bounds and empty-store behaviour."""
+        assert store.coverage("BTC/USDT", "1h") is None
+        assert store.read("BTC/USDT", "1h").empty
+
+        store.append("BTC/USDT", "1h", make_candles("2024-01-15", 24 * 40))
+        first, last = store.coverage("BTC/USDT", "1h")
+        assert first == pd.Timestamp("2024-01-15")
+        assert last == pd.Timestamp("2024-01-15") + pd.Timedelta(hours=24 * 40 - 1)
+
+
+class TestMarketDataManagerWarmStart:
+    """Test MarketDataManager reading history back from the store."""
+
+    @pytest.fixture
+    def exchange(self):
+        exchange = Mock()
+        exchange.load_markets.return_value = {"BTC/USDT": {}}
+        return exchange
+
+    def make_manager(self, tmp_path, exchange):
+        config = {"data_dir": str(tmp_path), "rate_limit_delay": 0}
+        with patch("src.data.market_data_manager.ccxt.binance", return_value=exchange):
+            return MarketDataManager(config)
+
+    @staticmethod
+    def as_ohlcv(df):
+        ms = df["timestamp"].astype("int64") // 1_000_000
+        return np.column_stack([ms, df[["open", "high", "low", "close", "volume"]]]).tolist()
+
+    @pytest.mark.unit
+    def test_warm_restart_serves_fresh_history_from_disk(self, tmp_path, exchange):
+        """Test a restarted manager answers from disk without calling the exchange."""
+        now = pd.Timestamp.utcnow().tz_localize(None).floor("h")
+        candles = make_candles(now - pd.Timedelta(hours=49), 50)
+        exchange.fetch_ohlcv.return_value = self.as_ohlcv(candles)
+
+        first = self.make_manager(tmp_path, exchange)
+        first.fetch_historical_data("BTC/USDT", "1h", limit=50)
+        assert exchange.fetch_ohlcv.call_count == 1
+
+        restarted = self.make_manager(tmp_path, exchange)
+        df = restarted.fetch_historical_data("BTC/USDT", "1h", limit=20)
+
+        assert exchange.fetch_ohlcv.call_count == 1
+        assert len(df) == 20
+        assert df["timestamp"].iloc[-1] == candles["timestamp"].iloc[-1]
+
+    @pytest.mark.unit
+    def test_stale_history_resumes_from_last_candle(self, tmp_path, exchange):
+        """Test stale history is topped up from its newest stored candle."""
+        now = pd.Timestamp.utcnow().tz_localize(None).floor("h")
+        candles = make_candles(now - pd.Timedelta(hours=59), 60)
+        exchange.fetch_ohlcv.return_value = self.as_ohlcv(candles.iloc[:50])
+
+        manager = self.make_manager(tmp_path, exchange)
+        manager.fetch_historical_data("BTC/USDT", "1h", limit=50)
+
+        exchange.fetch_ohlcv.return_value = self.as_ohlcv(candles.iloc[49:])
+        restarted = self.make_manager(tmp_path, exchange)
+        df = restarted.fetch_historical_data("BTC/USDT", "1h", limit=50)
+
+        last_stored_ms = int(candles["timestamp"].iloc[49].value // 1_000_000)
+        assert exchange.fetch_ohlcv.call_args.kwargs["since"] == last_stored_ms
+        assert len(df) == 50
+        assert df["timestamp"].is_unique
+        assert df["timestamp"].iloc[-1] == candles["timestamp"].iloc[-1]
+        assert len(restarted.load_historical_data("BTC/USDT", "1h")) == 60
+
+    @pytest.mark.unit
+    def test_stale_history_pages_forward_to_newest_candle(self, tmp_path, exchange):
+        """Test a resume longer than one page keeps fetching until it is current."""
+        now = pd.Timestamp.utcnow().tz_localize(None).floor("h")
+        candles = make_candles(now - pd.Timedelta(hours=29), 30)
+        exchange.fetch_ohlcv.return_value = self.as_ohlcv(candles.iloc[:21])
+
+        manager = self.make_manager(tmp_path, exchange)
+        manager.fetch_historical_data("BTC/USDT", "1h", limit=10)
+
+        # Exchange pages hold at most ``limit`` candles from ``since``
+        ohlcv = self.as_ohlcv(candles)
+        exchange.fetch_ohlcv.return_value = None
+        exchange.fetch_ohlcv.side_effect = lambda symbol, timeframe, since=None, limit=None: [
+            candle for candle in ohlcv if candle[0] >= since
+        ][:limit]
+        restarted = self.make_manager(tmp_path, exchange)
+        df = restarted.fetch_historical_data("BTC/USDT", "1h", limit=10)
+
+        sinces = [call.kwargs["since"] for call in exchange.fetch_ohlcv.call_args_list[1:]]
+        assert sinces == [ohlcv[20][0], ohlcv[29][0] + 1]
+        assert df["timestamp"].tolist() == candles["timestamp"].iloc[-10:].tolist()
+
+    @pytest.mark.unit
+    def test_history_far_behind_fetches_latest_candles(self, tmp_path, exchange):
+        """Test history older than the newest ``limit`` candles is not resumed from."""
+        now = pd.Timestamp.utcnow().tz_localize(None).floor("h")
+        old = make_candles(now - pd.Timedelta(days=30), 50)
+        exchange.fetch_ohlcv.return_value = self.as_ohlcv(old)
+
+        manager = self.make_manager(tmp_path, exchange)
+        manager.fetch_historical_data("BTC/USDT", "1h", limit=50)
+
+        latest = make_candles(now - pd.Timedelta(hours=49), 50, base=300.0)
+        exchange.fetch_ohlcv.return_value = self.as_ohlcv(latest)
+        restarted = self.make_manager(tmp_path, exchange)
+        df = restarted.fetch_historical_data("BTC/USDT", "1h", limit=50)
+
+        assert exchange.fetch_ohlcv.call_args.kwargs["since"] is None
+        assert df["timestamp"].tolist() == latest["timestamp"].tolist()
+        assert df["close"].iloc[-1] == latest["close"].iloc[-1]
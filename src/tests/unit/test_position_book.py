@@ -0,0 +1,277 @@
+"""
+Unit tests for the array-backed position book.
+
+Tests slot allocation, reuse and growth, attribute views over the
+columns and side table, stale views of reused slots, vectorized marking,
+trailing stops and exit masks, portfolio reductions, and both execution
+engines running on it.
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+# The signal execution engine imports its siblings from src/ directly
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.core.position_book import Column, PositionBook, PositionView
+
+
+class StopView(PositionView):
+    """View with an engine-specific name for the stop column."""
+
+    __slots__ = ()
+    stop = Column("stop_loss")
+
+
+class TestPositionBook:
+    """Test suite for PositionBook."""
+
+    @pytest.mark.unit
+    def test_views_read_and_write_columns_and_side_table(self):
+        """Test views map attributes onto columns and side-table fields."""
+        book = PositionBook(StopView)
+        position = book.open("p1", "BTC/USDT", 1, 100.0, 2.0, metadata={"strategy": "rsi"}, stop_loss=95.0)
+
+        assert position.id == "p1" and position.symbol == "BTC/USDT"
+        assert position.stop == 95.0 and position.strategy == "rsi"
+        position.stop = 97.0
+        position.quantity -= 0.5
+        position.note = "tightened"
+        assert book.columns["stop_loss"][position.slot] == 97.0
+        assert book["p1"].quantity == 1.5
+        assert book["p1"].note == "tightened"
+        with pytest.raises(AttributeError):
+            position.missing
+        with pytest.raises(ValueError):
+            book.open("p1", "BTC/USDT", 1, 100.0, 1.0)
+        with pytest.raises(ValueError):
+            book.open("p2", "BTC/USDT", 1, 100.0, 1.0, stop=1.0)
+
+    @pytest.mark.unit
+    def test_slots_are_reused_and_columns_grow(self):
+        """Test closed slots are recycled and capacity doubles when full."""
+        book = PositionBook(capacity=2)
+        a = book.open("a", "BTC/USDT", 1, 100.0, 1.0)
+        book.open("b", "ETH/USDT", -1, 10.0, 1.0)
+        generations = book.generations[[0, 1]]
+        del book["a"]
+        assert book.open("c", "SOL/USDT", 1, 5.0, 1.0).slot == 0
+        assert list(book.still_open(book.slots, generations)[0]) == [1]
+        assert a.id == "a" and not a.is_open
+        with pytest.raises(LookupError):
+            a.symbol
+        book.open("d", "SOL/USDT", 1, 5.0, 1.0)
+
+        assert len(book.active) == 4
+        assert list(book) == ["b", "c", "d"]
+        assert sorted(book.ids_of(book.slots)) == ["b", "c", "d"]
+        assert "a" not in book and book.find("SOL/USDT").id == "c"
+        assert book.find("XRP/USDT") is None
+
+    @pytest.mark.unit
+    def test_mark_trails_and_finds_exits(self):
+        """Test marking updates P&L for both sides and flags stops and targets."""
+        book = PositionBook()
+        book.open("long", "BTC/USDT", 1, 100.0, 2.0, stop_loss=90.0, trailing_distance=5.0, take_profit=120.0)
+        book.open("short", "ETH/USDT", -1, 50.0, 4.0, stop_loss=55.0, trailing_distance=2.0, take_profit=40.0)
+        book.open("idle", "SOL/USDT", 1, 10.0, 1.0, expires_at=time.time() - 1)
+
+        marked, trailed = book.mark({"BTC/USDT": 110.0, "ETH/USDT": 52.0}, trail=True)
+
+        assert sorted(book.ids_of(marked)) == ["long", "short"]
+        assert book["long"].unrealized_pnl == 20.0 and book["short"].unrealized_pnl == -8.0
+        assert book["long"].max_profit == 20.0 and book["short"].max_loss == -8.0
+        # Only the long moved in its favour: its stop trails to 110 - 5
+        assert book.ids_of(trailed) == ["long"]
+        assert book.columns["stop_loss"][book["long"].slot] == 105.0
+        assert book.ids_of(book.expired()) == ["idle"]
+
+        book.mark({"BTC/USDT": 121.0, "ETH/USDT": 56.0}, trail=True)
+        assert book.ids_of(book.targets_hit()) == ["long"]
+        assert book.ids_of(book.stops_hit()) == ["short"]
+
+    @pytest.mark.unit
+    def test_portfolio_reductions(self):
+        """Test P&L, exposure and risk are summed over the open positions."""
+        book = PositionBook()
+        book.open("long", "BTC/USDT", 1, 100.0, 2.0, stop_loss=90.0)
+        book.open("short", "ETH/USDT", -1, 50.0, 4.0, stop_loss=55.0)
+        book.open("closed", "SOL/USDT", 1, 10.0, 100.0)
+        del book["closed"]
+        book.mark({"BTC/USDT": 110.0, "ETH/USDT": 45.0})
+
+        assert book.unrealized_pnl() == pytest.approx(20.0 + 20.0)
+        assert book.exposure() == pytest.approx(220.0 + 180.0)
+        assert book.net_exposure() == pytest.approx(220.0 - 180.0)
+        assert book.entry_value() == pytest.approx(200.0 + 200.0)
+        assert book.risk() == pytest.approx(2 * 20.0 + 4 * 10.0)
+
+    @pytest.mark.unit
+    def test_large_book_is_compact(self):
+        """Test thousands of positions mark in one pass at ~130 bytes each."""
+        book = PositionBook()
+        symbols = [f"COIN{i}/USDT" for i in range(100)]
+        for i in range(10_000):
+            book.open(f"p{i}", symbols[i % 100], 1 if i % 2 else -1, 100.0, 1.0)
+
+        started = time.perf_counter()
+        marked, _ = book.mark({symbol: 101.0 for symbol in symbols})
+        elapsed = time.perf_counter() - started
+
+        assert len(marked) == 10_000
+        assert book.unrealized_pnl() == pytest.approx(0.0)
+        assert book.nbytes / len(book.active) < 130
+        assert elapsed < 0.05
+
+
+def make_signal(symbol="BTC/USDT", long=True, **overrides):
+    from advanced_signal_engine import SignalStrength, SignalType, TradingSignal
+
+    fields = dict(
+        symbol=symbol, signal_type=SignalType.ENTRY_LONG if long else SignalType.ENTRY_SHORT,
+        strength=SignalStrength.STRONG, confidence=0.9, entry_price=100.0,
+        stop_loss=95.0 if long else 105.0, take_profit_levels=[110.0, 120.0] if long else [90.0, 80.0],
+        risk_reward_ratio=2.0, position_size=0.0, reasoning=[], technical_indicators={},
+        chart_patterns=[], liquidity_score=1.0, unusual_activity=False, fibonacci_levels={},
+        timestamp=datetime.now(),
+    )
+    fields.update(overrides)
+    return TradingSignal(**fields)
+
+
+class TestEnginesOnPositionBook:
+    """Test suite for the execution engines using the position book."""
+
+    @pytest.mark.unit
+    def test_signal_engine_manages_exits(self):
+        """Test stops, take profits and momentum exits run off the book."""
+        from signal_execution_engine import PositionStatus, SignalExecutionEngine
+
+        engine = SignalExecutionEngine()
+        engine._simulate_order_execution = fill_immediately
+        asyncio.run(engine.process_signals([make_signal("BTC/USDT"), make_signal("ETH/USDT", long=False)]))
+        btc = engine.active_positions.find("BTC/USDT")
+        quantity = btc.quantity
+
+        # BTC reaches its first take profit; ETH rallies through its stop
+        asyncio.run(engine.update_positions({"BTC/USDT": 111.0, "ETH/USDT": 106.0}))
+        assert btc.quantity == pytest.approx(quantity / 2)
+        assert btc.take_profit_levels[0] == (110.0, 0)
+        assert btc.next_take_profit == 120.0
+        assert btc.status == PositionStatus.PARTIAL_CLOSE
+        assert btc.stop_loss_price == pytest.approx(111.0 - 5.0)
+        assert engine.closed_positions[0]["symbol"] == "ETH/USDT"
+        assert engine.closed_positions[0]["status"] == PositionStatus.STOPPED_OUT
+
+        # BTC gives back over 30% of its peak profit while still above 5%
+        asyncio.run(engine.update_positions({"BTC/USDT": 117.0}))
+        asyncio.run(engine.update_positions({"BTC/USDT": 113.0}))
+        assert len(engine.active_positions) == 0
+        assert engine.closed_positions[1]["exit_reasons"] == ["Momentum exit - profit protection"]
+
+        summary = engine.get_portfolio_summary()
+        assert summary["active_positions"] == 0 and summary["closed_positions"] == 2
+        assert summary["total_realized_pnl"] == pytest.approx(
+            sum(position["realized_pnl"] for position in engine.closed_positions)
+        )
+
+    @pytest.mark.unit
+    def test_failed_exit_does_not_stop_the_batch(self):
+        """Test one position failing to close leaves the other exits running."""
+        from signal_execution_engine import PositionStatus, SignalExecutionEngine
+
+        engine = SignalExecutionEngine()
+        engine._simulate_order_execution = fill_immediately
+        asyncio.run(engine.process_signals([make_signal("BTC/USDT"), make_signal("ETH/USDT")]))
+        close_position = engine._close_position
+
+        async def flaky_close(position, reason, price, **kwargs):
+            if position.symbol == "BTC/USDT":
+                raise RuntimeError("exchange down")
+            await close_position(position, reason, price, **kwargs)
+
+        engine._close_position = flaky_close
+        asyncio.run(engine.update_positions({"BTC/USDT": 94.0, "ETH/USDT": 94.0}))
+
+        assert engine.active_positions.find("BTC/USDT") is not None
+        assert [position["symbol"] for position in engine.closed_positions] == ["ETH/USDT"]
+        assert engine.closed_positions[0]["status"] == PositionStatus.STOPPED_OUT
+
+    @pytest.mark.unit
+    def test_slot_reused_during_update_cycle(self):
+        """Test a position opened while update_positions awaits is not exited as the one it replaced."""
+        from signal_execution_engine import SignalExecutionEngine
+
+        engine = SignalExecutionEngine()
+        engine._simulate_order_execution = fill_immediately
+        close_position = engine._close_position
+        suspended, resume = asyncio.Event(), asyncio.Event()
+
+        async def slow_close(position, reason, price, **kwargs):
+            if position.symbol == "BTC/USDT":
+                suspended.set()
+                await resume.wait()
+            await close_position(position, reason, price, **kwargs)
+
+        async def scenario():
+            await engine.process_signals([make_signal("BTC/USDT"), make_signal("ETH/USDT")])
+            eth = engine.active_positions.find("ETH/USDT")
+            engine._close_position = slow_close
+            cycle = asyncio.create_task(engine.update_positions({"BTC/USDT": 94.0, "ETH/USDT": 94.0}))
+
+            # While the BTC stop awaits the exchange, ETH is closed and SOL opens in its slot
+            await suspended.wait()
+            await close_position(eth, "Manual close", 94.0)
+            await engine.process_signals([make_signal("SOL/USDT")])
+            sol = engine.active_positions.find("SOL/USDT")
+            resume.set()
+            await cycle
+            return eth, sol
+
+        eth, sol = asyncio.run(scenario())
+
+        assert sol.slot == eth.slot and sol.is_open and not eth.is_open
+        assert eth.id != sol.id
+        with pytest.raises(LookupError):
+            eth.quantity
+        assert [position["symbol"] for position in engine.closed_positions] == ["ETH/USDT", "BTC/USDT"]
+        assert engine.closed_positions[0]["exit_reasons"] == ["Manual close"]
+
+    @pytest.mark.unit
+    def test_live_engine_monitors_from_book(self, tmp_path, monkeypatch):
+        """Test the live engine opens, trails and closes positions in the book."""
+        monkeypatch.chdir(tmp_path)  # the engine writes its trade DB and strategy dir here
+        from src.live_trading_engine import LiveTradingEngine
+
+        engine = LiveTradingEngine(initial_capital=10_000.0)
+        prices = {"BTC/USDT": 100.0}
+
+        async def market_data(symbol, timeframe="1m", limit=100):
+            return pd.DataFrame({"close": [prices[symbol]]})
+
+        engine.get_market_data = market_data
+        assert engine.open_position({"strategy_name": "rsi", "symbol": "BTC/USDT", "action": "BUY", "entry_price": 100.0})
+        position = engine.active_positions["rsi_BTC/USDT"]
+        assert position.position_type == "LONG" and position.strategy_name == "rsi"
+        size = position.position_size
+
+        prices["BTC/USDT"] = 104.0
+        asyncio.run(engine.monitor_positions())
+        assert position.trailing_stop == pytest.approx(104.0 * 0.97)
+        assert engine.get_portfolio_status()["unrealized_pnl"] == pytest.approx(size * 0.04)
+
+        prices["BTC/USDT"] = 107.0
+        asyncio.run(engine.monitor_positions())
+        assert len(engine.active_positions) == 0
+        trade = engine.completed_trades[0]
+        assert trade.exit_reason == "Take profit" and trade.pnl == pytest.approx(size * 0.07)
+
+
+async def fill_immediately(symbol, side, quantity, order_type, price):
+    return {"status": "FILLED", "fill_price": price, "fill_quantity": quantity, "fill_time": datetime.now(), "fees": 0.0}
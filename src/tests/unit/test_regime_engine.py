@@ -0,0 +1,171 @@
+"""
+Unit tests for the incremental regime engine.
+
+Tests vectorized features against pandas references, that per-candle
+updates reproduce the single-pass history, and that the regime
+analyzers built on the engine stay consistent across repeated calls.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.market_analysis.crypto_market_regime_analyzer import CryptoMarketRegimeAnalyzer
+from src.market_analysis.regime_detector import AdvancedRegimeDetector, MarketRegime
+from src.market_analysis.regime_engine import FEATURE_COLUMNS, RegimeEngine
+from src.tests.fixtures.trading_scenarios import TradingScenarios
+
+
+def _daily_frame(n_bars=400, seed=3, symbol=0):
+    universe = TradingScenarios.generate_multi_symbol_universe(symbol + 1, n_bars, seed=seed)
+    df = universe[f"C{symbol}/USDT"].drop(columns="timestamp")
+    df.index = pd.date_range("2023-01-01", periods=n_bars, freq="1D")
+    return df
+
+
+class TestRegimeEngine:
+    """Test suite for RegimeEngine and its analyzer integrations."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("smoothing", ["wilder", "sma"])
+    def test_history_matches_pandas_indicators(self, smoothing):
+        """Test vectorized features against the pandas formulas they replace."""
+        df = _daily_frame()
+        history = RegimeEngine(smoothing=smoothing).history(df)
+        close = df["close"]
+
+        def smooth(series):
+            if smoothing == "sma":
+                return series.rolling(14).mean()
+            return series.ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+
+        true_range = pd.concat(
+            [df["high"] - df["low"], (df["high"] - close.shift()).abs(), (df["low"] - close.shift()).abs()],
+            axis=1,
+        ).max(axis=1)
+        atr = smooth(true_range)
+        delta = close.diff()
+        gain = smooth(delta.where(delta > 0, 0))
+        loss = smooth(-delta.where(delta < 0, 0))
+
+        np.testing.assert_allclose(history["atr_14"], atr, equal_nan=True)
+        np.testing.assert_allclose(history["rsi_14"], 100 - 100 / (1 + gain / loss), equal_nan=True)
+        np.testing.assert_allclose(history["ema_200"], close.ewm(span=200).mean())
+        np.testing.assert_allclose(
+            history["atr_rank_50"], (atr / close * 100).rolling(50).rank(pct=True), equal_nan=True
+        )
+        assert history["atr_percentile"].iloc[-1] == pytest.approx((atr.tail(100) <= atr.iloc[-1]).mean())
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("smoothing", ["wilder", "sma"])
+    def test_updates_reproduce_history(self, smoothing):
+        """Test folding candles in one at a time matches the single-pass series."""
+        df = _daily_frame()
+        full = RegimeEngine(smoothing=smoothing).history(df)
+
+        engine = RegimeEngine(smoothing=smoothing)
+        engine.history(df.iloc[:300])
+        for i in range(300, len(df)):
+            state = engine.update(df.iloc[i])
+            expected = full.iloc[i]
+            np.testing.assert_allclose(
+                [state[key] for key in FEATURE_COLUMNS],
+                expected[list(FEATURE_COLUMNS)].astype(float),
+                rtol=1e-9, equal_nan=True,
+            )
+            assert state["regime"] == expected["regime"]
+            assert state["duration"] == expected["duration"]
+
+        assert engine.bars == len(df)
+
+    @pytest.mark.unit
+    def test_sync_folds_in_only_new_candles(self):
+        """Test sync resumes from the last seen bar and rebuilds on changed data."""
+        df = _daily_frame()
+        engine = RegimeEngine()
+        engine.sync(df.iloc[:390])
+        state = engine.sync(df.iloc[:395])
+
+        assert engine.bars == 395
+        assert state["close"] == pytest.approx(df["close"].iloc[394])
+
+        changed = df.iloc[:395].copy()
+        changed.iloc[-1, changed.columns.get_loc("close")] *= 1.01
+        assert engine.sync(changed)["close"] == pytest.approx(changed["close"].iloc[-1])
+        assert engine.bars == 395
+
+    @pytest.mark.unit
+    def test_crypto_analyzer_repeated_calls_match_fresh(self):
+        """Test the engine-backed analyzer gives the same result incrementally and fresh."""
+        btc, eth = _daily_frame(symbol=0), _daily_frame(symbol=1)
+        incremental = CryptoMarketRegimeAnalyzer()
+        for n in range(300, 321):
+            result = incremental.analyze_market_regime({"BTC": btc.iloc[:n], "ETH": eth.iloc[:n]})
+
+        fresh = CryptoMarketRegimeAnalyzer().analyze_market_regime(
+            {"BTC": btc.iloc[:320], "ETH": eth.iloc[:320]}
+        )
+
+        assert "market_structure" in result.signals
+        assert result.market_regime == fresh.market_regime
+        assert result.volatility_regime == fresh.volatility_regime
+        assert result.signals == pytest.approx(fresh.signals)
+
+    @pytest.mark.unit
+    def test_detector_matches_regime_series(self):
+        """Test AdvancedRegimeDetector's live signal agrees with its backtest series."""
+        df = _daily_frame(seed=5)
+        detector = AdvancedRegimeDetector()
+        series = detector.regime_series(df.iloc[:350])
+        for n in range(351, len(df) + 1):
+            signal = detector.analyze_market_regime(df.iloc[:n])
+
+        full = AdvancedRegimeDetector().regime_series(df)
+        assert len(series) == 350
+        assert signal.regime == MarketRegime(full["regime"].iloc[-1])
+        assert signal.confidence == pytest.approx(full["confidence"].iloc[-1])
+        assert signal.signals["trend"] == pytest.approx(full["trend"].iloc[-1])
+
+    @pytest.mark.unit
+    def test_analyzers_match_baseline_outputs(self):
+        """Test both analyzers reproduce their pre-engine outputs on fixed fixtures."""
+        crypto = CryptoMarketRegimeAnalyzer().analyze_market_regime(
+            {"BTC": _daily_frame(symbol=0), "ETH": _daily_frame(symbol=1)}
+        )
+        assert crypto.market_regime.value == "sideways"
+        assert crypto.volatility_regime.value == "low"
+        assert crypto.risk_environment.value == "neutral"
+        assert crypto.fundamental_health.value == "warning"
+        assert crypto.confidence_score == pytest.approx(0.3)
+        assert crypto.signals == pytest.approx({
+            "atr_percentile": 0.21,
+            "bollinger_squeeze": -1.0,
+            "btc_eth_correlation": 0.730385241554152,
+            "eth_btc_ratio_trend": 0.021516940739006948,
+            "higher_tf_trend": -0.5390416789678212,
+            "market_structure": 0.0,
+            "momentum_10d": 6.189384330789194e-05,
+            "price_volume_correlation": 0.4981716904762216,
+            "risk_environment": 0.10077456981590129,
+            "rsi_momentum": -0.017850066022840706,
+            "rsi_trend": -0.5739658031310156,
+            "volatility_regime": 0.0,
+            "volatility_trend": -0.02002390217874813,
+            "volume_relative": -0.004209436554698742,
+            "volume_trend": -0.004209436554698742,
+            "weekly_ema_alignment": -1.0,
+            "weekly_volume_trend": 0.07305547354785906,
+        }, abs=1e-6)
+
+        detector = AdvancedRegimeDetector().analyze_market_regime(_daily_frame(seed=5, symbol=1))
+        assert detector.regime == MarketRegime.BULL
+        assert detector.confidence == pytest.approx(0.652355, abs=1e-6)
+        assert detector.strength == pytest.approx(0.549667, abs=1e-6)
+        assert detector.signals == pytest.approx({
+            "trend": 1.0,
+            "volatility": 0.3,
+            "structure": 0.7,
+            "volume": 0.055206,
+            "smart_money": 0.259092,
+            "momentum": 0.600109,
+        }, abs=1e-6)
@@ -0,0 +1,160 @@
+"""
+Unit tests for the OHLCV resampling engine.
+
+Tests vectorized aggregation against pandas, exchange-style bucket
+alignment, incremental in-progress candles, revisions, backfills and
+MarketDataManager serving higher timeframes from one base stream.
+"""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.market_data_manager import MarketDataManager
+from src.data.resampler import CandleResampler, resample_ohlcv, timeframe_to_ms
+
+
+def make_candles(start, periods, freq="1min", seed=0):
+    """Build a random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, periods).cumsum()
+    return pd.DataFrame({
+        "timestamp": pd.date_range(start, periods=periods, freq=freq),
+        "open": close + rng.normal(0, 0.1, periods),
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": rng.random(periods),
+    })
+
+
+def pandas_resample(df, rule):
+    """Reference aggregation with pandas."""
+    agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    return df.set_index("timestamp").resample(rule).agg(agg).dropna().reset_index()
+
+
+class TestResampleOHLCV:
+    """Test suite for the vectorized resample_ohlcv function."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("timeframe,rule", [("5m", "5min"), ("1h", "1h"), ("4h", "4h"), ("1d", "1D")])
+    def test_matches_pandas(self, timeframe, rule):
+        """Test aggregation is identical to pandas resampling."""
+        df = make_candles("2024-01-03 05:07", 5000)
+        pd.testing.assert_frame_equal(
+            resample_ohlcv(df, timeframe), pandas_resample(df, rule), check_freq=False
+        )
+
+    @pytest.mark.unit
+    def test_weeks_open_on_monday(self):
+        """Test weekly candles are labelled by their Monday open."""
+        df = make_candles("2024-01-03", 24 * 30, freq="1h")
+        weekly = resample_ohlcv(df, "1w")
+        assert (weekly["timestamp"].dt.dayofweek == 0).all()
+        assert weekly["volume"].sum() == pytest.approx(df["volume"].sum())
+
+    @pytest.mark.unit
+    def test_datetime_index_and_partial_candle(self):
+        """Test indexed input keeps its layout and unfinished candles can be dropped."""
+        df = make_candles("2024-01-01", 150).set_index("timestamp")
+        hourly = resample_ohlcv(df, "1h")
+        assert isinstance(hourly.index, pd.DatetimeIndex)
+        assert len(hourly) == 3
+        assert len(resample_ohlcv(df, "1h", base_timeframe="1m", include_partial=False)) == 2
+
+    @pytest.mark.unit
+    def test_timeframe_parsing(self):
+        """Test timeframe strings convert to milliseconds."""
+        assert timeframe_to_ms("15m") == 900_000
+        assert timeframe_to_ms("1w") == 7 * 86_400_000
+        with pytest.raises(ValueError):
+            timeframe_to_ms("1x")
+
+
+class TestCandleResampler:
+    """Test suite for the incremental CandleResampler."""
+
+    @pytest.mark.unit
+    def test_incremental_matches_batch(self):
+        """Test streaming base candles gives the same candles as one batch."""
+        df = make_candles("2024-01-01 00:03", 1000)
+        resampler = CandleResampler("1m")
+
+        for start in range(0, len(df), 37):
+            resampler.ingest("BTC/USDT", df.iloc[start:start + 37])
+            for timeframe in ("5m", "1h", "4h"):
+                resampler.get("BTC/USDT", timeframe)
+
+        for timeframe in ("5m", "1h", "4h"):
+            pd.testing.assert_frame_equal(
+                resampler.get("BTC/USDT", timeframe), resample_ohlcv(df, timeframe)
+            )
+
+    @pytest.mark.unit
+    def test_revised_last_candle_rebuilds_partial(self):
+        """Test a re-sent forming base candle replaces the held one."""
+        df = make_candles("2024-01-01", 90)
+        resampler = CandleResampler("1m")
+        resampler.ingest("BTC/USDT", df)
+        resampler.get("BTC/USDT", "1h")
+
+        revised = df.iloc[-1:].copy()
+        revised["high"] += 50
+        revised["volume"] = 0.0
+        assert resampler.ingest("BTC/USDT", revised) == 0
+
+        expected = df.copy()
+        expected.iloc[-1] = revised.iloc[0]
+        pd.testing.assert_frame_equal(resampler.get("BTC/USDT", "1h"), resample_ohlcv(expected, "1h"))
+
+    @pytest.mark.unit
+    def test_backfill_and_cache(self):
+        """Test older history is merged and results are cached between ingests."""
+        df = make_candles("2024-01-01", 600)
+        resampler = CandleResampler("1m")
+        resampler.ingest("BTC/USDT", df.iloc[300:])
+        first = resampler.get("BTC/USDT", "1h")
+        assert resampler.get("BTC/USDT", "1h", limit=2).equals(first.iloc[-2:].reset_index(drop=True))
+
+        assert resampler.ingest("BTC/USDT", df.iloc[:400]) == 300
+        assert resampler.base_candles("BTC/USDT") == 600
+        pd.testing.assert_frame_equal(resampler.get("BTC/USDT", "1h"), resample_ohlcv(df, "1h"))
+
+        assert resampler.ingest("BTC/USDT", df.iloc[100:200]) == 0
+
+    @pytest.mark.unit
+    def test_rejects_finer_timeframe(self):
+        """Test targets that are not multiples of the base raise."""
+        resampler = CandleResampler("5m")
+        with pytest.raises(ValueError):
+            resampler.get("BTC/USDT", "3m")
+
+
+class TestMarketDataManagerResampling:
+    """Test MarketDataManager deriving timeframes from one base stream."""
+
+    @pytest.mark.unit
+    def test_only_base_timeframe_is_fetched(self, tmp_path):
+        """Test 15m and 1h requests both fetch 1m candles once."""
+        base = make_candles(pd.Timestamp.utcnow().tz_localize(None).floor("h") - pd.Timedelta(hours=10), 600)
+        ms = base["timestamp"].astype("int64") // 1_000_000
+        exchange = Mock()
+        exchange.load_markets.return_value = {"BTC/USDT": {}}
+        exchange.fetch_ohlcv.return_value = np.column_stack(
+            [ms, base[["open", "high", "low", "close", "volume"]]]
+        ).tolist()
+
+        config = {"data_dir": str(tmp_path), "rate_limit_delay": 0, "base_timeframe": "1m"}
+        with patch("src.data.market_data_manager.ccxt.binance", return_value=exchange):
+            manager = MarketDataManager(config)
+
+        hourly = manager.fetch_resampled_data("BTC/USDT", "1h", limit=10)
+        quarter = manager.fetch_resampled_data("BTC/USDT", "15m", limit=40)
+
+        assert {call.args[1] for call in exchange.fetch_ohlcv.call_args_list} == {"1m"}
+        assert len(hourly) == 10
+        assert len(quarter) == 40
+        assert hourly["volume"].sum() == pytest.approx(base["volume"].sum())
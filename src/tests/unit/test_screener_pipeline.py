@@ -0,0 +1,85 @@
+"""
+Unit tests for the universe screener pipeline.
+
+Tests columnar snapshot packing, sorting, persistence and
+serial/process-pool refresh equivalence.
+"""
+
+import numpy as np
+import pytest
+
+from src.analysis.screener_pipeline import (ScreenerPipeline, ScreenerSnapshot,
+                                            compute_pair_metrics)
+from src.tests.fixtures.trading_scenarios import TradingScenarios
+
+_make_universe = TradingScenarios.generate_multi_symbol_universe
+
+
+class TestScreenerPipeline:
+    """Test suite for ScreenerPipeline and ScreenerSnapshot."""
+
+    @pytest.mark.unit
+    def test_compute_pair_metrics_row(self):
+        """Test a computed row carries volume, flow and regime fields."""
+        pair, df = next(iter(_make_universe(1).items()))
+        row = compute_pair_metrics(pair, df)
+
+        assert row["pair"] == pair
+        assert row["close"] == pytest.approx(df["close"].iloc[-1])
+        assert 0.0 <= row["volume_score"] <= 100.0
+        assert row["regime"]
+        assert row["flow_type"] in {"accumulation", "distribution", "neutral"}
+
+    @pytest.mark.unit
+    def test_snapshot_top_sorts_and_puts_nan_last(self):
+        """Test snapshot ordering on numeric columns."""
+        rows = [
+            {"pair": "A/USDT", "change_pct": 1.0},
+            {"pair": "B/USDT"},
+            {"pair": "C/USDT", "change_pct": 5.0},
+        ]
+        snapshot = ScreenerSnapshot.from_rows(rows, "1h")
+
+        assert [r["pair"] for r in snapshot.top("change_pct")] == ["C/USDT", "A/USDT", "B/USDT"]
+        assert [r["pair"] for r in snapshot.top("change_pct", descending=False)] == [
+            "A/USDT", "C/USDT", "B/USDT"
+        ]
+        assert snapshot.top("change_pct", limit=1)[0]["change_pct"] == 5.0
+
+    @pytest.mark.unit
+    def test_snapshot_save_and_load(self, tmp_path):
+        """Test snapshot round-trips through the .npz file."""
+        universe = _make_universe(3)
+        pipeline = ScreenerPipeline(lambda: universe, config={"max_workers": 1})
+        snapshot = pipeline.refresh()
+
+        path = tmp_path / "snapshot.npz"
+        snapshot.save(path)
+        loaded = ScreenerSnapshot.load(path)
+
+        assert list(loaded.pairs) == list(snapshot.pairs)
+        np.testing.assert_allclose(loaded.columns["volume_score"], snapshot.columns["volume_score"])
+        assert loaded.candle_time == snapshot.candle_time
+
+    @pytest.mark.unit
+    def test_process_pool_matches_serial(self):
+        """Test the process pool produces the same snapshot as serial compute."""
+        universe = _make_universe(4)
+        serial = ScreenerPipeline(lambda: universe, config={"max_workers": 1}).refresh()
+
+        pooled_pipeline = ScreenerPipeline(lambda: universe, config={"max_workers": 2})
+        try:
+            pooled = pooled_pipeline.refresh()
+        finally:
+            pooled_pipeline.stop()
+
+        assert list(pooled.pairs) == list(serial.pairs)
+        np.testing.assert_allclose(pooled.columns["volume_score"], serial.columns["volume_score"])
+        assert list(pooled.columns["regime"]) == list(serial.columns["regime"])
+
+    @pytest.mark.unit
+    def test_seconds_until_next_close(self):
+        """Test candle-close scheduling aligns to timeframe boundaries."""
+        pipeline = ScreenerPipeline(dict, timeframe="1h", config={"close_delay_seconds": 0})
+
+        assert pipeline.seconds_until_next_close(now=3600 * 10 + 600) == pytest.approx(3000)
@@ -0,0 +1,124 @@
+"""
+Unit tests for batch (watchlist) strategy evaluation.
+
+Tests the vectorized MultiSignalStrategy scores against the pandas
+indicator formulas, bounded concurrency of batch data fetching, and
+one-cycle StrategyManager execution.
+"""
+
+import asyncio
+
+import pytest
+
+from src.strategy_framework import (DataProvider, MarketData, MultiSignalStrategy,
+                                    SignalType, StrategyManager, TimeFrame)
+from src.tests.fixtures.trading_scenarios import TradingScenarios
+
+
+class FakeDataProvider(DataProvider):
+    """In-memory provider that records how many fetches run at once."""
+
+    def __init__(self, universe, delay=0.0):
+        self.universe = universe
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_market_data(self, symbol, timeframe, periods=100):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+        index = int(symbol[1:].split("/")[0])
+        return MarketData(
+            symbol=symbol,
+            ohlcv=self.universe[symbol].copy(),
+            delta_analysis={"net_delta": index % 3 - 1, "institutional_flow": 0.4 + 0.05 * index},
+            market_depth={"imbalance_ratio": 0.3 + 0.04 * index},
+            sentiment={"social_score": (index % 5) / 4},
+        )
+
+    async def get_real_time_data(self, symbol):
+        return {}
+
+
+def _technical_score_reference(df):
+    """Per-symbol pandas version of the MultiSignal technical score."""
+    close = df["close"]
+    sma_20, sma_50 = close.rolling(20).mean(), close.rolling(50).mean()
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    rsi = 100 - 100 / (1 + gain / loss)
+    macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+    bb_std = close.rolling(20).std()
+
+    price, score = close.iloc[-1], 0.5
+    score += 0.1 if price > sma_20.iloc[-1] else 0
+    score += 0.1 if price > sma_50.iloc[-1] else 0
+    score += 0.1 if sma_20.iloc[-1] > sma_50.iloc[-1] else 0
+    if 30 <= rsi.iloc[-1] <= 70:
+        score += 0.05 if rsi.iloc[-1] > 50 else -0.05
+    score += 0.1 if macd.iloc[-1] > macd.ewm(span=9).mean().iloc[-1] else 0
+    if price < sma_20.iloc[-1] - 2 * bb_std.iloc[-1]:
+        score += 0.05
+    elif price > sma_20.iloc[-1] + 2 * bb_std.iloc[-1]:
+        score -= 0.05
+    return max(0, min(1, score))
+
+
+class TestStrategyBatch:
+    """Test suite for batch strategy evaluation."""
+
+    @pytest.fixture
+    def universe(self):
+        universe = TradingScenarios.generate_multi_symbol_universe(12, 220, seed=11)
+        # Shorter history for one symbol, volume spikes for others
+        universe["C4/USDT"] = universe["C4/USDT"].iloc[150:]
+        for symbol in list(universe)[::3]:
+            universe[symbol].loc[universe[symbol].index[-1], "volume"] *= 3
+        return universe
+
+    @pytest.mark.unit
+    def test_batch_scores_match_per_symbol_formulas(self, universe):
+        """Test vectorized scores agree with the pandas formulas and single analyze()."""
+        strategy = MultiSignalStrategy(FakeDataProvider(universe), {"buy_threshold": 0.55, "sell_threshold": 0.45})
+        batch = asyncio.run(strategy.analyze_batch(list(universe)))
+
+        assert set(batch) == set(universe)
+        emitted = [signal for signal in batch.values() if signal]
+        assert emitted
+        for signal in emitted:
+            assert signal.metadata["technical_score"] == pytest.approx(
+                _technical_score_reference(universe[signal.symbol])
+            )
+            single = asyncio.run(strategy.analyze(signal.symbol))
+            assert single.signal_type == signal.signal_type
+            assert single.stop_loss == pytest.approx(signal.stop_loss)
+            if signal.signal_type == SignalType.BUY:
+                assert signal.stop_loss < signal.price < signal.take_profit
+
+    @pytest.mark.unit
+    def test_batch_fetch_is_bounded(self, universe):
+        """Test batch data fetching never exceeds the concurrency limit."""
+        provider = FakeDataProvider(universe, delay=0.01)
+        batch = asyncio.run(provider.get_market_data_batch(list(universe), TimeFrame.H1, max_concurrency=3))
+
+        assert list(batch) == list(universe)
+        assert provider.max_in_flight == 3
+
+    @pytest.mark.unit
+    def test_manager_batch_cycle(self, universe):
+        """Test one cycle signals several symbols and repeats are suppressed per symbol."""
+        provider = FakeDataProvider(universe)
+        manager = StrategyManager(provider)
+        manager.add_strategy(MultiSignalStrategy(provider, {"buy_threshold": 0.55, "sell_threshold": 0.45}))
+
+        first = asyncio.run(manager.execute_all_strategies_batch(list(universe)))
+        second = asyncio.run(manager.execute_all_strategies_batch(list(universe)))
+
+        signalled = [symbol for symbol, signals in first.items() if signals]
+        assert len(signalled) > 1
+        assert all(not signals for signals in second.values())
+        assert manager.last_cycle_seconds is not None
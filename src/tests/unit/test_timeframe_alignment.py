@@ -0,0 +1,133 @@
+"""
+Unit tests for multi-timeframe feature alignment.
+
+Tests close-time alignment, the absence of look-ahead when features are
+rebuilt from truncated history, caching, and the feature matrices exposed
+by MultiSignalStrategy and AdvancedSignalEngine.
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.advanced_signal_engine import AdvancedSignalEngine
+from src.analysis.timeframe_alignment import TimeframeAligner, aligned_positions
+from src.strategy_framework import MultiSignalStrategy, TimeFrame
+
+
+def make_candles(periods, start="2024-01-01 00:00", freq="1h", seed=0):
+    """Build a random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, periods).cumsum()
+    return pd.DataFrame({
+        "timestamp": pd.date_range(start, periods=periods, freq=freq),
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": rng.random(periods) + 1,
+    })
+
+
+def trend_features(df):
+    """Simple causal features used by the tests."""
+    return pd.DataFrame({
+        "close": df["close"],
+        "sma_3": df["close"].rolling(3).mean(),
+    }, index=df.index)
+
+
+class TestTimeframeAligner:
+    """Test suite for TimeframeAligner."""
+
+    @pytest.mark.unit
+    def test_bar_visible_only_after_close(self):
+        """Test a 4h bar is first used by the 1h bar that closes with it."""
+        hour = 3_600_000
+        base_open = np.arange(10) * hour
+        four_hour_open = np.arange(3) * 4 * hour
+
+        positions = aligned_positions(base_open, "1h", four_hour_open, "4h")
+        # 00:00-02:00 bars close before the first 4h bar; 03:00 closes at 04:00
+        np.testing.assert_array_equal(positions, [-1, -1, -1, 0, 0, 0, 0, 1, 1, 1])
+
+    @pytest.mark.unit
+    def test_no_lookahead_against_truncated_history(self):
+        """Test every row equals the row rebuilt from history up to that bar."""
+        base = make_candles(24 * 20)
+        aligner = TimeframeAligner("1h")
+        full = aligner.from_base(base, ["4h", "1d"], trend_features)
+
+        for cut in (5, 27, 95, 96, 200, 479):
+            partial = TimeframeAligner("1h").from_base(base.iloc[:cut + 1], ["4h", "1d"], trend_features)
+            pd.testing.assert_series_equal(partial.iloc[-1], full.iloc[cut], check_names=False)
+
+        assert full["close_1d"].iloc[:23].isna().all()
+        assert full["close_1d"].iloc[23] == base["close"].iloc[23]
+
+    @pytest.mark.unit
+    def test_align_precomputed_features_with_cache(self):
+        """Test externally computed higher-timeframe features are aligned and cached."""
+        base = make_candles(48)
+        daily = pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=2, freq="1D"),
+            "bias": [1.0, -1.0],
+        })
+        aligner = TimeframeAligner("1h")
+
+        aligned = aligner.align(base, daily, "1d", key="BTC/USDT")
+        assert list(aligned.columns) == ["bias_1d"]
+        assert aligned["bias_1d"].iloc[23] == 1.0
+        assert aligned["bias_1d"].iloc[47] == -1.0
+        assert aligned["bias_1d"].iloc[:23].isna().all()
+
+        again = aligner.align(base, daily, "1d", key="BTC/USDT")
+        pd.testing.assert_frame_equal(again, aligned)
+        assert aligner.get_stats()["hits"] == 1
+
+
+class TestFeatureMatrixConsumers:
+    """Test strategies and engines expose aligned feature matrices."""
+
+    @pytest.mark.unit
+    def test_multi_signal_strategy_feature_matrix(self):
+        """Test MultiSignalStrategy builds 1h indicators plus aligned 4h/1d indicators."""
+        strategy = MultiSignalStrategy(data_provider=None, config={})
+        base = make_candles(24 * 60)
+
+        matrix = strategy.build_feature_matrix(base, TimeFrame.H1, symbol="BTC/USDT")
+
+        assert len(matrix) == len(base)
+        for column in ("rsi_1h", "sma_20_4h", "macd_1d", "atr_1d"):
+            assert column in matrix.columns
+        assert matrix["sma_50_1d"].notna().sum() > 0
+
+        truncated = strategy.build_feature_matrix(base.iloc[:1000], TimeFrame.H1)
+        pd.testing.assert_series_equal(truncated.iloc[-1], matrix.iloc[999], check_names=False)
+
+    @pytest.mark.unit
+    def test_advanced_engine_feature_matrix(self):
+        """Test AdvancedSignalEngine returns the base candles with aligned features."""
+        engine = AdvancedSignalEngine()
+
+        matrix = asyncio.run(engine.get_multi_timeframe_features("ETH/USDT", ["4h", "1d"], limit=200))
+
+        assert len(matrix) == 200
+        assert {"close", "rsi_1h", "rsi_4h", "rsi_1d"} <= set(matrix.columns)
+        assert matrix["rsi_1d"].notna().all()
+
+    @pytest.mark.unit
+    def test_advanced_engine_tops_up_held_history(self):
+        """Test a stream long enough for the request is still brought up to date."""
+        engine = AdvancedSignalEngine()
+        now = pd.Timestamp.now().floor("h")
+        stale = make_candles(24 * 250, start=now - pd.Timedelta(hours=24 * 250 + 9))
+        engine.resampler.ingest("ETH/USDT", stale)
+
+        matrix = asyncio.run(engine.get_multi_timeframe_features("ETH/USDT", limit=200))
+
+        assert engine.resampler.last_base_timestamp("ETH/USDT") == now.value // 1_000_000
+        assert matrix["timestamp"].iloc[-1] == now
+        assert matrix["timestamp"].is_unique
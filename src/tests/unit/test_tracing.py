@@ -0,0 +1,291 @@
+"""
+Unit tests for hot-path latency tracing.
+
+Tests log-bucket histogram percentiles, span nesting across awaits and
+tasks, trace export with candle-close origins, the traced stages of the
+signal execution engine and of the batch watchlist cycle, and the
+dashboard latency endpoint.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+from flask import Flask
+
+# The signal execution engine imports its siblings from src/ directly
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from src.monitoring import tracing
+from src.monitoring.tracing import CANDLE_TO_ORDER, ORDER_STAGE, LatencyHistogram, Tracer, traced
+
+
+@pytest.fixture
+def global_tracer(tmp_path):
+    """The process-wide tracer, emptied and exporting to a temporary file."""
+    tracer = tracing.tracer
+    previous = (tracer.export_path, tracer.export_batch, tracer.enabled)
+    tracer.reset()
+    tracer.export_path, tracer.export_batch, tracer.enabled = str(tmp_path / "traces.jsonl"), 100, True
+    yield tracer
+    tracer.reset()
+    tracer.export_path, tracer.export_batch, tracer.enabled = previous
+
+
+def read_traces(tracer):
+    tracer.flush()
+    with open(tracer.export_path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestLatencyHistogram:
+    """Test suite for LatencyHistogram."""
+
+    @pytest.mark.unit
+    def test_percentiles_within_bucket_resolution(self):
+        """Test p50/p99 of a lognormal sample stay within a bucket of the exact values."""
+        samples = np.random.default_rng(1).lognormal(np.log(2e6), 1.0, 20_000).astype(np.int64)
+        histogram = LatencyHistogram()
+        for ns in samples:
+            histogram.record(int(ns))
+
+        for q in (50, 99):
+            assert histogram.percentile(q) == pytest.approx(np.percentile(samples, q), rel=0.05)
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 20_000
+        assert snapshot["max_ms"] == pytest.approx(samples.max() / 1e6)
+        assert LatencyHistogram().snapshot()["p99_ms"] == 0.0
+
+
+class TestTracer:
+    """Test suite for Tracer spans and export."""
+
+    @pytest.mark.unit
+    def test_spans_nest_across_awaits_and_tasks(self, tmp_path):
+        """Test children started in awaited coroutines and gathered tasks share the trace."""
+        tracer = Tracer(export_path=str(tmp_path / "traces.jsonl"))
+
+        async def stage(name):
+            with tracer.span(name, symbol="BTC/USDT"):
+                await asyncio.sleep(0.001)
+
+        async def cycle():
+            with tracer.span("cycle"):
+                await stage("fetch")
+                await asyncio.gather(stage("analyze"), stage("analyze"))
+
+        asyncio.run(cycle())
+        assert tracer.current_span() is None
+
+        [trace] = read_traces(tracer)
+        spans = {span["span_id"]: span for span in trace["spans"]}
+        root = next(span for span in spans.values() if span["parent_id"] is None)
+        assert root["name"] == "cycle" and len(spans) == 4
+        assert all(span["parent_id"] == root["span_id"] for span in spans.values() if span is not root)
+        assert trace["duration_ms"] >= 2.0 and trace["origin_lag_ms"] is None
+        assert spans[trace["spans"][0]["span_id"]]["attributes"] == {"symbol": "BTC/USDT"}
+
+        report = tracer.latency_report()
+        assert report["stages"]["analyze"]["count"] == 2
+        assert report["stages"]["fetch"]["p50_ms"] >= 1.0
+        assert report["traces_finished"] == 1
+
+    @pytest.mark.unit
+    def test_errors_origins_and_batched_export(self, tmp_path):
+        """Test failed spans are flagged, origins give lag, and exports batch."""
+        tracer = Tracer(export_path=str(tmp_path / "traces.jsonl"), export_batch=2)
+        with pytest.raises(ValueError):
+            with tracer.span("risk"):
+                raise ValueError("rejected")
+        assert not os.path.exists(tracer.export_path)
+        assert tracer.export_queue_depth() == 1
+        assert list(tracer.stage_histograms()) == ["risk"]
+
+        with tracer.span("cycle"):
+            tracer.mark_origin(time.time() - 1.5)
+            tracer.mark_origin(time.time())  # the first origin wins
+        with open(tracer.export_path) as f:
+            failed, late = [json.loads(line) for line in f]
+
+        assert failed["spans"][0]["error"] is True
+        assert late["origin_lag_ms"] == pytest.approx(1500, abs=50)
+
+    @pytest.mark.unit
+    def test_disabled_tracer_is_cheap(self):
+        """Test disabled tracing records nothing and spans stay in the microsecond range."""
+        tracer = Tracer(enabled=False)
+        with tracer.span("noop"):
+            assert tracer.current_span() is None
+        assert tracer.latency_report()["stages"] == {}
+
+        tracer.enabled = True
+        started = time.perf_counter()
+        for _ in range(10_000):
+            with tracer.span("hot"):
+                pass
+        per_span = (time.perf_counter() - started) / 10_000
+        assert tracer.histograms["hot"].count == 10_000
+        assert per_span < 20e-6
+
+
+class TestTracedHotPath:
+    """Test suite for the traced trading stages and the dashboard endpoint."""
+
+    @pytest.mark.unit
+    def test_traced_decorator_wraps_sync_and_async(self, global_tracer):
+        """Test decorated functions keep their results and feed stage histograms."""
+        @traced("sync_stage")
+        def add(a, b):
+            return a + b
+
+        @traced("async_stage")
+        async def double(value):
+            return add(value, value)
+
+        assert asyncio.run(double(2)) == 4
+        assert add.__name__ == "add"
+        [trace] = read_traces(global_tracer)
+        assert [span["name"] for span in trace["spans"]] == ["sync_stage", "async_stage"]
+
+    @pytest.mark.unit
+    def test_candle_close_to_order_latency(self, global_tracer):
+        """Test an order placed by the execution engine is timed from the candle close."""
+        from datetime import datetime
+
+        from advanced_signal_engine import SignalStrength, SignalType, TradingSignal
+        from signal_execution_engine import SignalExecutionEngine
+
+        async def fill(symbol, side, quantity, order_type, price):
+            return {"status": "FILLED", "fill_price": price, "fill_quantity": quantity,
+                    "fill_time": datetime.now(), "fees": 0.0}
+
+        engine = SignalExecutionEngine()
+        engine._simulate_order_execution = fill
+        signal = TradingSignal(
+            symbol="BTC/USDT", signal_type=SignalType.ENTRY_LONG, strength=SignalStrength.STRONG,
+            confidence=0.9, entry_price=100.0, stop_loss=95.0, take_profit_levels=[110.0],
+            risk_reward_ratio=2.0, position_size=0.0, reasoning=[], technical_indicators={},
+            chart_patterns=[], liquidity_score=1.0, unusual_activity=False, fibonacci_levels={},
+            timestamp=datetime.now(),
+        )
+
+        async def cycle():
+            with global_tracer.span("bot.cycle", origin=time.time() - 2.0):
+                return await engine.process_signals([signal])
+
+        assert asyncio.run(cycle())[0]["action"] == "EXECUTED"
+
+        stages = global_tracer.latency_report()["stages"]
+        assert stages["execution.process_signals"]["count"] == 1
+        assert stages[ORDER_STAGE]["count"] == 1
+        # Bucket midpoints are within ~4% of the true 2 s lag
+        assert 1900 <= stages[CANDLE_TO_ORDER]["p50_ms"] < 2500
+        [trace] = read_traces(global_tracer)
+        assert [span["name"] for span in trace["spans"]] == [ORDER_STAGE, "execution.process_signals", "bot.cycle"]
+
+    @pytest.fixture
+    def watchlist_manager(self, tmp_path, monkeypatch):
+        """StrategyManager over a UnifiedDataPipeline whose newest 1h candles closed 2 s ago."""
+        import pandas as pd
+
+        from src.strategy_framework import (MarketData, SignalType, StrategyManager, TradingSignal,
+                                            TradingStrategy)
+        from src.unified_data_pipeline import UnifiedDataPipeline
+
+        monkeypatch.chdir(tmp_path)  # the pipeline's stores create their files here
+        pipeline = UnifiedDataPipeline({})
+        last_open = pd.Timestamp(time.time() - 3600 - 2.0, unit="s")
+
+        async def shared_inputs():
+            return {}
+
+        async def symbol_market_data(symbol, timeframe, periods, shared):
+            timestamps = pd.date_range(end=last_open, periods=periods, freq="h")
+            return MarketData(symbol=symbol, ohlcv=pd.DataFrame({"timestamp": timestamps, "close": 100.0}))
+
+        monkeypatch.setattr(pipeline, "_get_shared_inputs", shared_inputs)
+        monkeypatch.setattr(pipeline, "_get_symbol_market_data", symbol_market_data)
+
+        class Breakout(TradingStrategy):
+            async def analyze(self, symbol, timeframe):
+                return None
+
+            async def analyze_batch(self, symbols, timeframe, market_data=None):
+                return {symbol: TradingSignal(
+                    symbol=symbol, signal_type=SignalType.BUY, strength=0.8, price=100.0,
+                    timestamp=last_open, strategy_name=self.name, confidence=0.8, reasoning="", metadata={},
+                ) for symbol in symbols}
+
+            def get_required_indicators(self):
+                return []
+
+        manager = StrategyManager(pipeline)
+        manager.add_strategy(Breakout("Breakout", pipeline))
+        return manager
+
+    @pytest.mark.unit
+    def test_batch_cycle_carries_candle_close_origin(self, global_tracer, watchlist_manager):
+        """Test the batch data fetch marks the candle close on the enclosing cycle's trace."""
+        @traced(ORDER_STAGE)
+        async def place(signal):
+            return signal.symbol
+
+        async def cycle():
+            with global_tracer.span("engine.cycle"):
+                signals = await watchlist_manager.execute_all_strategies_batch(["BTC/USDT", "ETH/USDT"])
+                return [await place(signal) for batch in signals.values() for signal in batch]
+
+        assert asyncio.run(cycle()) == ["BTC/USDT", "ETH/USDT"]
+
+        stages = global_tracer.latency_report()["stages"]
+        assert stages[CANDLE_TO_ORDER]["count"] == 2
+        assert 1900 <= stages[CANDLE_TO_ORDER]["p50_ms"] < 2500
+        [trace] = read_traces(global_tracer)
+        assert trace["name"] == "engine.cycle" and 1900 <= trace["origin_lag_ms"] < 2500
+        assert {"data.get_market_data_batch", "strategy.execute_all_strategies_batch"} <= {
+            span["name"] for span in trace["spans"]
+        }
+
+    @pytest.mark.unit
+    def test_trading_engine_cycle_records_candle_close_to_order(self, global_tracer, watchlist_manager):
+        """Test a TradingEngine watchlist cycle times each signal hand-off from the candle close."""
+        from types import SimpleNamespace
+
+        trading_engine = pytest.importorskip("src.core.trading_engine")
+
+        engine = trading_engine.TradingEngine.__new__(trading_engine.TradingEngine)
+        engine.config = SimpleNamespace(trading=SimpleNamespace(max_open_positions=5))
+        engine.state = trading_engine.TradingState()
+        engine.strategy_manager = watchlist_manager
+        engine.active_symbols = ["BTC/USDT", "ETH/USDT"]
+
+        asyncio.run(engine._process_watchlist())
+
+        stages = global_tracer.latency_report()["stages"]
+        assert stages[ORDER_STAGE]["count"] == 2
+        assert 1900 <= stages[CANDLE_TO_ORDER]["p50_ms"] < 2500
+        [trace] = read_traces(global_tracer)
+        assert trace["name"] == "engine.cycle"
+
+    @pytest.mark.unit
+    def test_latency_endpoint(self, global_tracer):
+        """Test /api/metrics/latency serves the per-stage report."""
+        from src.web_ui.blueprints.metrics_routes import metrics_bp
+
+        with global_tracer.span("risk.evaluate_trade_proposal"):
+            pass
+        app = Flask(__name__)
+        app.register_blueprint(metrics_bp)
+
+        response = app.test_client().get("/api/metrics/latency")
+
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body["enabled"] is True
+        assert set(body["stages"]["risk.evaluate_trade_proposal"]) == {
+            "count", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"
+        }
@@ -0,0 +1,191 @@
+"""
+Unit tests for the compact trade-decision storage format.
+
+Tests the payload codec, store/read roundtrips with field projection,
+in-place migration of databases written with the JSON text layout and the
+size reduction of the compact layout.
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.database.consolidated.payload_codec import decode_payload, encode_payload
+from src.database.consolidated.trade_logic_schema import (
+    PAYLOAD_FIELDS,
+    TradeLogicDBManager,
+)
+
+LEGACY_DDL = """
+    CREATE TABLE trade_decisions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME NOT NULL, pair TEXT NOT NULL, timeframe TEXT NOT NULL,
+        technical_score REAL, technical_signals TEXT, technical_reasoning TEXT,
+        onchain_score REAL, onchain_signals TEXT, onchain_reasoning TEXT,
+        sentiment_score REAL, sentiment_signals TEXT, sentiment_reasoning TEXT,
+        market_regime TEXT, regime_confidence REAL,
+        composite_score REAL, final_decision INTEGER, position_size REAL, risk_assessment TEXT,
+        decision_tree TEXT, threshold_analysis TEXT, signal_weights TEXT,
+        market_conditions TEXT, volatility_metrics TEXT, correlation_data TEXT,
+        indicator_values TEXT,
+        trade_id INTEGER, outcome_profit_loss REAL, outcome_duration INTEGER, outcome_success BOOLEAN
+    )
+"""
+
+
+def make_decision(i, pair="BTC/USDT"):
+    """Build a decision with every payload field populated."""
+    rng = np.random.default_rng(i)
+    signals = {
+        name: {"value": float(rng.random() * 100), "weight": 0.25, "signal": "bullish"}
+        for name in ("rsi", "macd", "ema_cross", "volume")
+    }
+    decision = {field: {"note": f"{field} {i}", "score": float(rng.random())} for field in PAYLOAD_FIELDS}
+    decision.update({
+        "timestamp": f"2024-01-{1 + i % 28:02d} {i % 24:02d}:00:00",
+        "pair": pair,
+        "timeframe": "1h",
+        "technical_score": float(rng.random()),
+        "technical_signals": signals,
+        "technical_reasoning": [f"RSI at {signals['rsi']['value']:.1f}", "MACD bullish crossover"],
+        "onchain_reasoning": ["Net exchange outflow"],
+        "sentiment_reasoning": [],
+        "composite_score": float(rng.random()),
+        "final_decision": int(i % 2),
+        "position_size": 0.1,
+        "market_regime": "bullish",
+    })
+    return decision
+
+
+def write_legacy_db(path, decisions):
+    """Write decisions with the JSON text layout used before the payload column."""
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_DDL)
+    conn.execute("CREATE INDEX idx_trade_decisions_pair ON trade_decisions(pair)")
+    for i, decision in enumerate(decisions):
+        row = {key: value for key, value in decision.items() if key not in PAYLOAD_FIELDS}
+        row.update({field: json.dumps(decision[field]) for field in PAYLOAD_FIELDS})
+        row["id"] = 10 + 3 * i  # ids with gaps, as after deletions
+        row["indicator_values"] = json.dumps({"rsi": 41.5})
+        conn.execute(
+            f"INSERT INTO trade_decisions ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+            list(row.values()),
+        )
+    conn.commit()
+    conn.close()
+
+
+class TestPayloadCodec:
+    """Test suite for the binary payload codec."""
+
+    @pytest.mark.unit
+    def test_roundtrip_and_numpy_values(self):
+        """Test payloads roundtrip and numpy/datetime values become plain types."""
+        payload = make_decision(1)
+        assert decode_payload(encode_payload(payload)) == json.loads(json.dumps(payload))
+
+        converted = decode_payload(encode_payload({
+            "value": np.float64(0.5),
+            "count": np.int64(3),
+            "series": np.arange(3),
+            "at": datetime(2024, 1, 1, 12),
+        }))
+        assert converted == {"value": 0.5, "count": 3, "series": [0, 1, 2], "at": "2024-01-01T12:00:00"}
+
+        assert decode_payload(encode_payload({})) == {}
+        assert decode_payload(None) == {}
+        with pytest.raises(ValueError):
+            decode_payload(b"J?{}")
+
+
+class TestTradeLogicStorage:
+    """Test suite for TradeLogicDBManager on the compact layout."""
+
+    @pytest.mark.unit
+    def test_store_and_read_with_projection(self, tmp_path):
+        """Test full reads decode everything and projected reads skip the payload."""
+        manager = TradeLogicDBManager(str(tmp_path / "trade_logic.db"))
+        decision = make_decision(1)
+        decision_id = manager.store_decision(decision)
+        manager.store_decision(make_decision(2, pair="ETH/USDT"))
+        manager.update_trade_outcome(decision_id, 42, 12.5, 90, True)
+
+        stored = manager.get_decision(decision_id)
+        for field in PAYLOAD_FIELDS:
+            assert stored[field] == decision[field]
+        assert stored["composite_score"] == decision["composite_score"]
+        assert stored["outcome_profit_loss"] == 12.5
+
+        screen = manager.get_decisions({"pair": "BTC/USDT"}, fields=["pair", "composite_score"])
+        assert screen == [{"id": decision_id, "pair": "BTC/USDT", "composite_score": decision["composite_score"]}]
+
+        partial = manager.get_decision_by_trade_id(42, fields=["technical_score", "technical_reasoning"])
+        assert partial["technical_reasoning"] == decision["technical_reasoning"]
+        assert set(partial) == {"id", "technical_score", "technical_reasoning"}
+
+        with pytest.raises(ValueError):
+            manager.get_decisions(fields=["pair", "no_such_field"])
+
+    @pytest.mark.unit
+    def test_projection_does_not_read_payload(self, tmp_path):
+        """Test a scores-only read never touches the payload blob."""
+        manager = TradeLogicDBManager(str(tmp_path / "trade_logic.db"))
+        decision_id = manager.store_decision(make_decision(1))
+
+        with sqlite3.connect(manager.db_path) as conn:
+            conn.execute("UPDATE trade_decisions SET payload = ?", (b"J?corrupt",))
+
+        scores = manager.get_decision(decision_id, fields=["composite_score", "market_regime"])
+        assert scores["market_regime"] == "bullish"
+        assert manager.get_decision(decision_id)["technical_signals"] == {}
+
+    @pytest.mark.unit
+    def test_legacy_database_is_migrated(self, tmp_path):
+        """Test JSON text rows move to the compact layout with ids and data intact."""
+        path = tmp_path / "trade_logic.db"
+        decisions = [make_decision(i) for i in range(50)]
+        write_legacy_db(path, decisions)
+        with sqlite3.connect(path) as conn:
+            conn.execute("UPDATE trade_decisions SET decision_tree = 'not json' WHERE id = 10")
+
+        manager = TradeLogicDBManager(str(path))
+
+        with sqlite3.connect(path) as conn:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(trade_decisions)")]
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(trade_decisions)")}
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+        assert "payload" in columns and "technical_signals" not in columns
+        assert "idx_trade_decisions_pair_timestamp" in indexes
+
+        first = manager.get_decision(10)
+        assert first["decision_tree"] == {}
+        assert first["indicator_values"] == {"rsi": 41.5}
+
+        for i, decision in enumerate(decisions[1:], start=1):
+            stored = manager.get_decision(10 + 3 * i)
+            assert stored["pair"] == decision["pair"]
+            assert stored["composite_score"] == decision["composite_score"]
+            for field in PAYLOAD_FIELDS:
+                assert stored[field] == decision[field]
+
+        # A second open is a no-op and new rows continue after the old ids
+        reopened = TradeLogicDBManager(str(path))
+        assert reopened.store_decision(make_decision(99)) == 10 + 3 * 49 + 1
+
+    @pytest.mark.unit
+    def test_compact_layout_is_smaller(self, tmp_path):
+        """Test the migrated database takes less space than the JSON text one."""
+        decisions = [make_decision(i) for i in range(300)]
+        legacy, compact = tmp_path / "legacy.db", tmp_path / "compact.db"
+        write_legacy_db(legacy, decisions)
+        write_legacy_db(compact, decisions)
+        with sqlite3.connect(legacy) as conn:
+            conn.execute("VACUUM")
+
+        TradeLogicDBManager(str(compact))
+
+        assert compact.stat().st_size < legacy.stat().st_size * 0.8
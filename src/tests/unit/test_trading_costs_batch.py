@@ -0,0 +1,121 @@
+"""
+Unit tests for the batch trading-cost model.
+
+Tests that the batch API reproduces the per-trade calculator, that round
+trips give breakeven prices for longs and shorts, and that a million
+trades are costed in one vectorized pass.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.cost.trading_cost_calculator import (
+    OrderType,
+    TradingCostCalculator,
+    TradingSide,
+)
+
+
+class TestBatchTradeCost:
+    """Test suite for TradingCostCalculator.calculate_trade_cost_batch."""
+
+    @pytest.mark.unit
+    def test_matches_scalar_calculator(self):
+        """Test every cost component equals the per-trade calculation."""
+        calculator = TradingCostCalculator()
+        pair_ids = calculator.get_pair_ids(["BTC/USDT", "SOL/USDT", "ETH/USDT", "DOGE/USDT"])
+        rng = np.random.default_rng(3)
+        n = 500
+        pairs = rng.choice(pair_ids, n)
+        sides = rng.integers(0, 2, n)
+        sizes = rng.uniform(0.01, 5, n)
+        prices = rng.uniform(10, 50000, n)
+        volatilities = rng.uniform(0, 0.1, n)
+        order_types = rng.integers(0, 2, n)
+        futures = rng.random(n) < 0.5
+
+        batch = calculator.calculate_trade_cost_batch(
+            pairs, sides, sizes, prices, volatilities, order_types,
+            is_futures=futures, vip_tier=2, funding_rates=-0.0003, position_duration_hours=16,
+        )
+
+        for i in range(n):
+            expected = calculator.calculate_trade_cost(
+                calculator.pairs[pairs[i]],
+                OrderType.MARKET if order_types[i] else OrderType.LIMIT,
+                TradingSide.SELL if sides[i] else TradingSide.BUY,
+                sizes[i], prices[i], is_futures=bool(futures[i]), vip_tier=2,
+                current_volatility=volatilities[i], funding_rate=-0.0003, position_duration_hours=16,
+            )
+            for field in ("exchange_fees", "slippage_cost", "funding_cost", "withdrawal_cost",
+                          "total_cost", "cost_percent", "effective_price"):
+                assert getattr(batch, field)[i] == pytest.approx(getattr(expected, field), rel=1e-12)
+
+    @pytest.mark.unit
+    def test_enum_and_scalar_arguments_broadcast(self):
+        """Test enums and scalars are accepted alongside per-trade arrays."""
+        calculator = TradingCostCalculator()
+        btc = calculator.get_pair_ids(["BTC/USDT"])[0]
+        batch = calculator.calculate_trade_cost_batch(
+            btc, TradingSide.BUY, [0.1, 1.0], 45000, 0.02, OrderType.MARKET,
+            news_event=[False, True],
+        )
+        assert batch.total_cost.shape == (2,)
+        assert (batch.effective_price > 45000).all()
+        # News doubles slippage for the second trade (before its larger size)
+        assert batch.slippage_cost[1] > 2 * 10 * batch.slippage_cost[0]
+        assert calculator.get_pair_ids(["BTC/USDT"])[0] == btc
+
+    @pytest.mark.unit
+    def test_million_trades_vectorized(self):
+        """Test a million trades are costed without a per-trade loop."""
+        calculator = TradingCostCalculator()
+        calculator.get_pair_ids(["BTC/USDT", "ETH/USDT", "SOL/USDT", "ADA/USDT"])
+        rng = np.random.default_rng(0)
+        n = 1_000_000
+
+        sizes, prices = rng.uniform(0.01, 5, n), rng.uniform(10, 50000, n)
+
+        started = time.perf_counter()
+        batch = calculator.calculate_trade_cost_batch(
+            rng.integers(0, 4, n), rng.integers(0, 2, n), sizes, prices,
+            rng.uniform(0, 0.1, n), rng.integers(0, 2, n),
+        )
+        elapsed = time.perf_counter() - started
+
+        assert batch.total_cost.shape == (n,)
+        assert np.isfinite(batch.total_cost).all()
+        assert (batch.slippage_cost <= 0.005 * sizes * prices * (1 + 1e-12)).all()
+        assert elapsed < 2.0
+
+
+class TestBatchRoundTrip:
+    """Test suite for TradingCostCalculator.calculate_round_trip_cost_batch."""
+
+    @pytest.mark.unit
+    def test_matches_scalar_round_trip(self):
+        """Test spot round trips equal the per-trade round trip."""
+        calculator = TradingCostCalculator()
+        expected = calculator.calculate_round_trip_cost("BTC/USDT", 0.1, 45000, 47000)
+        batch = calculator.calculate_round_trip_cost_batch(
+            calculator.get_pair_ids(["BTC/USDT"]), 0.1, 45000, 47000
+        )
+        for key in ("gross_pnl", "net_pnl", "total_cost", "total_fees", "total_slippage", "breakeven_price"):
+            assert batch[key][0] == pytest.approx(expected[key])
+
+    @pytest.mark.unit
+    def test_breakeven_for_longs_and_shorts(self):
+        """Test breakeven sits above entry for longs and below for shorts."""
+        calculator = TradingCostCalculator()
+        pair_ids = calculator.get_pair_ids(["ETH/USDT", "ETH/USDT"])
+        batch = calculator.calculate_round_trip_cost_batch(
+            pair_ids, [2.0, 2.0], [3000.0, 3000.0], [3000.0, 3000.0],
+            sides=[0, 1], is_futures=True, funding_rates=0.0001, position_duration_hours=8,
+        )
+        assert batch["breakeven_price"][0] > 3000 > batch["breakeven_price"][1]
+        assert batch["breakeven_price"][0] - 3000 == pytest.approx(3000 - batch["breakeven_price"][1])
+        # Funding is charged once for the holding period
+        np.testing.assert_allclose(batch["total_funding"], 0.0001 * 6000)
+        np.testing.assert_allclose(batch["net_pnl"], -batch["total_cost"])
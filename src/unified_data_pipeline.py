@@ -6,15 +6,19 @@ Clean, high-performance data access for all strategies
 
 import asyncio
 import logging
+import numbers
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
 from src.data.historical_data_manager import HistoricalDataManager
 from src.data.real_time_feeds import RealTimeFeedsManager
+from src.data.resampler import timeframe_to_ms
 from src.database.data_warehouse import DataWarehouse
 from src.market_data.openbb_provider import OpenBBMarketDataProvider
+from src.monitoring.metrics import CACHE_REQUESTS
+from src.monitoring.tracing import traced, tracer
 from src.strategy_framework import DataProvider, MarketData, TimeFrame
 
 logger = logging.getLogger(__name__)
@@ -49,8 +53,17 @@ class UnifiedDataPipeline(DataProvider):
             "fundamentals": 3600,  # 1 hour for fundamentals
         }
         
+        # Batch evaluation: concurrent symbols and per-symbol time budget
+        self.batch_concurrency = self.config.get("batch_concurrency", 16)
+        self.symbol_timeout = self.config.get("symbol_timeout", 20.0)
+        
+        # Shared OpenBB capabilities client (None once known to be unavailable)
+        self._enhanced_capabilities = None
+        self._enhanced_checked = False
+        
         self.logger.info("🚀 Unified Data Pipeline initialized")
     
+    @traced('data.get_market_data')
     async def get_market_data(
         self, 
         symbol: str, 
@@ -64,40 +77,13 @@ class UnifiedDataPipeline(DataProvider):
         try:
             self.logger.info(f"📊 Getting unified market data for {symbol}")
             
-            # Get OHLCV data (fastest source first)
-            ohlcv_data = await self._get_ohlcv_optimized(symbol, timeframe, periods)
-            
-            # Get advanced analytics in parallel
-            tasks = [
-                self._get_market_depth_cached(symbol),
-                self._get_delta_analysis_cached(symbol, timeframe),
-                self._get_volume_profile_cached(symbol, timeframe),
-                self._get_sentiment_data_cached(symbol),
-                self._get_fundamentals_cached(symbol),
-                self._get_macro_data_cached()
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            shared = await self._get_shared_inputs()
+            market_data = await self._get_symbol_market_data(symbol, timeframe, periods, shared)
             
-            market_depth, delta_analysis, volume_profile, sentiment, fundamentals, macro_data = results
-            
-            # Handle exceptions
-            for i, result in enumerate(results):
-                if isinstance(result, Exception):
-                    self.logger.warning(f"Task {i} failed: {result}")
-            
-            # Create comprehensive market data object
-            market_data = MarketData(
-                symbol=symbol,
-                ohlcv=ohlcv_data,
-                orderbook=None,  # Real-time only
-                market_depth=market_depth.__dict__ if hasattr(market_depth, '__dict__') else market_depth,
-                delta_analysis=delta_analysis.__dict__ if hasattr(delta_analysis, '__dict__') else delta_analysis,
-                volume_profile=volume_profile.__dict__ if hasattr(volume_profile, '__dict__') else volume_profile,
-                sentiment=sentiment,
-                fundamentals=fundamentals,
-                macro_data=macro_data
-            )
+            # Latency of the rest of the hot path is measured from this candle's close
+            candle_close = _last_candle_close(market_data.ohlcv, timeframe)
+            if candle_close is not None:
+                tracer.mark_origin(candle_close)
             
             self.logger.info(f"✅ Unified market data ready for {symbol}")
             return market_data
@@ -111,6 +97,109 @@ class UnifiedDataPipeline(DataProvider):
                 sentiment={"error": str(e)}
             )
     
+    @traced('data.get_market_data_batch')
+    async def get_market_data_batch(
+        self,
+        symbols: List[str],
+        timeframe: TimeFrame,
+        periods: int = 100,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, MarketData]:
+        """
+        Get comprehensive market data for a whole watchlist
+        
+        Shared inputs (macro, fear & greed) are fetched once per call;
+        per-symbol inputs are gathered concurrently, at most
+        max_concurrency symbols at a time. Each symbol gets symbol_timeout
+        seconds so one slow source cannot stall the cycle.
+        """
+        started = datetime.now()
+        semaphore = asyncio.Semaphore(max_concurrency or self.batch_concurrency)
+        shared = await self._get_shared_inputs()
+        
+        async def fetch(symbol: str) -> MarketData:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._get_symbol_market_data(symbol, timeframe, periods, shared),
+                        timeout=self.symbol_timeout
+                    )
+                except Exception as e:
+                    reason = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                    self.logger.warning(f"Market data for {symbol} failed: {reason}")
+                    return MarketData(symbol=symbol, ohlcv=pd.DataFrame(), sentiment={"error": reason})
+        
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        
+        # The cycle's orders are timed from the newest candle close in the batch
+        closes = [_last_candle_close(data.ohlcv, timeframe) for data in results]
+        closes = [close for close in closes if close is not None]
+        if closes:
+            tracer.mark_origin(max(closes))
+        
+        elapsed = (datetime.now() - started).total_seconds()
+        self.logger.info(f"✅ Unified market data ready for {len(symbols)} symbols in {elapsed:.2f}s")
+        return dict(zip(symbols, results))
+    
+    async def _get_shared_inputs(self) -> Dict[str, Any]:
+        """Inputs that are the same for every symbol in a cycle"""
+        macro_data, fear_greed = await asyncio.gather(
+            self._get_macro_data_cached(),
+            self._get_fear_greed_cached(),
+            return_exceptions=True
+        )
+        return {
+            "macro_data": None if isinstance(macro_data, Exception) else macro_data,
+            "fear_greed_index": None if isinstance(fear_greed, Exception) else fear_greed,
+        }
+    
+    async def _get_symbol_market_data(
+        self,
+        symbol: str,
+        timeframe: TimeFrame,
+        periods: int,
+        shared: Dict[str, Any]
+    ) -> MarketData:
+        """Gather the per-symbol inputs and combine them with the shared ones"""
+        # Get OHLCV data (fastest source first)
+        ohlcv_data = await self._get_ohlcv_optimized(symbol, timeframe, periods)
+        
+        # Get advanced analytics in parallel
+        tasks = [
+            self._get_market_depth_cached(symbol),
+            self._get_delta_analysis_cached(symbol, timeframe),
+            self._get_volume_profile_cached(symbol, timeframe),
+            self._get_sentiment_data_cached(symbol),
+            self._get_fundamentals_cached(symbol)
+        ]
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Handle exceptions
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Task {i} failed for {symbol}: {result}")
+        
+        market_depth, delta_analysis, volume_profile, sentiment, fundamentals = [
+            None if isinstance(result, Exception) else result for result in results
+        ]
+        
+        if shared.get("fear_greed_index") is not None and isinstance(sentiment, dict):
+            sentiment = {**sentiment, "fear_greed_index": shared["fear_greed_index"]}
+        
+        # Create comprehensive market data object
+        return MarketData(
+            symbol=symbol,
+            ohlcv=ohlcv_data,
+            orderbook=None,  # Real-time only
+            market_depth=market_depth.__dict__ if hasattr(market_depth, '__dict__') else market_depth,
+            delta_analysis=delta_analysis.__dict__ if hasattr(delta_analysis, '__dict__') else delta_analysis,
+            volume_profile=volume_profile.__dict__ if hasattr(volume_profile, '__dict__') else volume_profile,
+            sentiment=sentiment,
+            fundamentals=fundamentals,
+            macro_data=shared.get("macro_data")
+        )
+    
     async def get_real_time_data(self, symbol: str) -> Dict[str, Any]:
         """Get real-time market data"""
         try:
@@ -165,7 +254,7 @@ class UnifiedDataPipeline(DataProvider):
             
             # 3. Fallback to OpenBB (external API)
             try:
-                ohlcv_list = await self.openbb_provider._get_ohlcv_data(
+                ohlcv_list = await self.openbb_provider.get_ohlcv_data(
                     symbol, timeframe.value, periods
                 )
                 if ohlcv_list:
@@ -177,7 +266,7 @@ class UnifiedDataPipeline(DataProvider):
                     df.set_index('timestamp', inplace=True)
                     
                     # Store in data warehouse for next time
-                    await self._store_in_warehouse(symbol, df)
+                    await self._store_in_warehouse(symbol, timeframe, df)
                     
                     self._cache_data(cache_key, df)
                     self.logger.info(f"🌐 OHLCV from OpenBB: {len(df)} candles")
@@ -218,7 +307,8 @@ class UnifiedDataPipeline(DataProvider):
         start_date = end_date - timeframe_map.get(timeframe, timedelta(hours=periods))
         
         # Fetch from historical manager
-        df = self.historical_manager.get_historical_data(
+        df = await asyncio.to_thread(
+            self.historical_manager.get_historical_data,
             symbol=symbol,
             timeframe=timeframe.value,
             start_date=start_date,
@@ -237,35 +327,32 @@ class UnifiedDataPipeline(DataProvider):
         
         try:
             # Use data warehouse query
-            df = self.data_warehouse.get_ohlcv_data(
+            df = await asyncio.to_thread(
+                self.data_warehouse.get_ohlcv_data,
                 symbol=symbol,
                 timeframe=timeframe.value,
                 limit=periods
             )
             
-            return df if df is not None else pd.DataFrame()
+            if df is None or df.empty:
+                return pd.DataFrame()
+            return df.set_index('timestamp').sort_index()
             
         except Exception as e:
             self.logger.debug(f"Data warehouse query failed: {e}")
             return pd.DataFrame()
     
-    async def _store_in_warehouse(self, symbol: str, df: pd.DataFrame):
+    async def _store_in_warehouse(self, symbol: str, timeframe: TimeFrame, df: pd.DataFrame):
         """Store OHLCV data in warehouse for future use"""
         try:
-            # Convert DataFrame to format expected by warehouse
-            ohlcv_data = []
-            for timestamp, row in df.iterrows():
-                ohlcv_data.append([
-                    int(timestamp.timestamp() * 1000),  # timestamp in ms
-                    float(row['open']),
-                    float(row['high']),
-                    float(row['low']),
-                    float(row['close']),
-                    float(row['volume'])
-                ])
-            
-            self.data_warehouse.store_ohlcv_data(symbol, ohlcv_data)
-            self.logger.debug(f"📝 Stored {len(ohlcv_data)} candles in warehouse")
+            # Columnar upsert off the event loop; duplicates collapse on the key
+            stats = await asyncio.to_thread(
+                self.data_warehouse.store_ohlcv_data, symbol, timeframe.value, df
+            )
+            self.logger.debug(
+                f"📝 Stored {stats['rows']} candles in warehouse "
+                f"({stats['rows_per_second']:,.0f} rows/s)"
+            )
             
         except Exception as e:
             self.logger.debug(f"Failed to store in warehouse: {e}")
@@ -332,9 +419,7 @@ class UnifiedDataPipeline(DataProvider):
         try:
             # Get crypto-specific sentiment if available
             if "/" in symbol:  # Crypto pair
-                from src.market_data.enhanced_openbb_capabilities import EnhancedOpenBBCapabilities
-                enhanced = EnhancedOpenBBCapabilities()
-                sentiment = await enhanced.get_crypto_analysis(symbol)
+                sentiment = await self._get_enhanced_capabilities().get_crypto_analysis(symbol)
             else:
                 # Stock sentiment (placeholder)
                 sentiment = {"social_score": 0.5, "news_sentiment": 0.5}
@@ -357,9 +442,7 @@ class UnifiedDataPipeline(DataProvider):
         try:
             # Only get fundamentals for stocks (not crypto pairs)
             if "/" not in symbol:
-                from src.market_data.enhanced_openbb_capabilities import EnhancedOpenBBCapabilities
-                enhanced = EnhancedOpenBBCapabilities()
-                fundamentals = await enhanced.get_fundamental_analysis(symbol)
+                fundamentals = await self._get_enhanced_capabilities().get_fundamental_analysis(symbol)
                 
                 if fundamentals and "error" not in fundamentals:
                     self._cache_data(cache_key, fundamentals)
@@ -379,9 +462,7 @@ class UnifiedDataPipeline(DataProvider):
             return self.cache[cache_key]["data"]
         
         try:
-            from src.market_data.enhanced_openbb_capabilities import EnhancedOpenBBCapabilities
-            enhanced = EnhancedOpenBBCapabilities()
-            macro_data = await enhanced.get_economic_indicators()
+            macro_data = await self._get_enhanced_capabilities().get_economic_indicators()
             
             if macro_data and "error" not in macro_data:
                 self._cache_data(cache_key, macro_data)
@@ -393,15 +474,46 @@ class UnifiedDataPipeline(DataProvider):
             self.logger.debug(f"Macro data failed: {e}")
             return None
     
-    def _is_cached(self, key: str, data_type: str) -> bool:
-        """Check if data is cached and still valid"""
-        if key not in self.cache:
-            return False
+    async def _get_fear_greed_cached(self) -> Optional[float]:
+        """Get the market-wide Fear & Greed index with caching"""
+        cache_key = "sentiment_fear_greed"
         
-        cache_age = datetime.now().timestamp() - self.cache[key]["timestamp"]
-        max_age = self.cache_duration.get(data_type, 300)  # 5 min default
+        if self._is_cached(cache_key, "sentiment"):
+            return self.cache[cache_key]["data"]
+        
+        try:
+            from src.data.alternative_data_provider import AlternativeDataProvider
+            provider = AlternativeDataProvider()
+            fear_greed = await asyncio.to_thread(provider._fetch_fear_greed_index)
+            self._cache_data(cache_key, fear_greed)
+            return fear_greed
+            
+        except Exception as e:
+            self.logger.debug(f"Fear & Greed index failed: {e}")
+            return None
+    
+    def _get_enhanced_capabilities(self):
+        """Shared EnhancedOpenBBCapabilities client, created on first use"""
+        if not self._enhanced_checked:
+            self._enhanced_checked = True
+            try:
+                from src.market_data.enhanced_openbb_capabilities import EnhancedOpenBBCapabilities
+                self._enhanced_capabilities = EnhancedOpenBBCapabilities()
+            except ImportError as e:
+                self.logger.debug(f"Enhanced OpenBB capabilities unavailable: {e}")
         
-        return cache_age < max_age
+        if self._enhanced_capabilities is None:
+            raise RuntimeError("Enhanced OpenBB capabilities unavailable")
+        return self._enhanced_capabilities
+    
+    def _is_cached(self, key: str, data_type: str) -> bool:
+        """Check if data is cached and still valid"""
+        entry = self.cache.get(key)
+        fresh = entry is not None and (
+            datetime.now().timestamp() - entry["timestamp"] < self.cache_duration.get(data_type, 300)  # 5 min default
+        )
+        CACHE_REQUESTS.labels(f"pipeline.{data_type}", "hit" if fresh else "miss").inc()
+        return fresh
     
     def _cache_data(self, key: str, data: Any):
         """Cache data with timestamp"""
@@ -427,9 +539,13 @@ class UnifiedDataPipeline(DataProvider):
                 "status": "active"
             },
             "openbb_provider": {
-                "available": self.openbb_provider.openbb_available,
-                "fallback_available": self.openbb_provider.exchange is not None
+                "available": self.openbb_provider.client.openbb_available,
+                "fallback_available": self.openbb_provider.crypto_provider.exchange is not None
             },
+            "exchange_adapter": (
+                dict(self.openbb_provider.crypto_provider.adapter.stats)
+                if self.openbb_provider.crypto_provider.adapter else None
+            ),
             "cache": {
                 "entries": len(self.cache),
                 "types": list(set(
@@ -463,6 +579,24 @@ class UnifiedDataPipeline(DataProvider):
             self.logger.info("🗑️ Cleared all cache")
 
 
+def _last_candle_close(ohlcv: pd.DataFrame, timeframe: TimeFrame) -> Optional[float]:
+    """Epoch seconds at which the newest candle closed (None if unknown)"""
+    if ohlcv is None or ohlcv.empty:
+        return None
+    try:
+        if "timestamp" in ohlcv.columns:
+            opened = ohlcv["timestamp"].iloc[-1]
+        elif isinstance(ohlcv.index, pd.DatetimeIndex):
+            opened = ohlcv.index[-1]
+        else:
+            return None
+        if isinstance(opened, numbers.Real) and not isinstance(opened, bool):
+            opened = pd.Timestamp(opened, unit="ms")
+        return pd.Timestamp(opened).timestamp() + timeframe_to_ms(timeframe.value) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
 # Factory function for easy integration
 def create_unified_pipeline(config: Dict[str, Any] = None) -> UnifiedDataPipeline:
     """Create and initialize unified data pipeline"""
@@ -18,15 +18,21 @@ from typing import Dict, List
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(1, str(project_root.parent.parent))  # repository root, for src.*
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from src.monitoring.async_logging import configure_logging
+
+# Configure logging (records are written by a background thread)
+configure_logging(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'fricktrader-sophisticated-2024'
 
+from blueprints.metrics_routes import metrics_bp
+app.register_blueprint(metrics_bp)
+
 class FreqtradeAPI:
     """Direct connection to live Freqtrade API for REAL-TIME data"""
     
@@ -15,7 +15,7 @@ sys.path.insert(0, str(project_root))
 
 # Import DeFi optimizer
 try:
-    from src.defi_yield_optimizer import DeFiYieldOptimizer
+    from src.defi_yield import DeFiYieldOptimizer
     DEFI_OPTIMIZER_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️ DeFi optimizer not available: {e}")
@@ -23,9 +23,13 @@ except ImportError as e:
 
 defi_bp = Blueprint('defi', __name__, url_prefix='/api/defi')
 
-# Initialize optimizer
+# Initialize optimizer; per-token opportunities are served from a snapshot
+# refreshed in the background instead of querying every protocol per request
+SNAPSHOT_REFRESH_SECONDS = 300
+
 if DEFI_OPTIMIZER_AVAILABLE:
     defi_optimizer = DeFiYieldOptimizer()
+    defi_optimizer.enable_snapshot(refresh_interval=SNAPSHOT_REFRESH_SECONDS)
 
 # Rate limiting
 last_api_call = {}
@@ -83,6 +87,17 @@ def optimize_yield():
             'optimization_result': None
         })
 
+@defi_bp.route('/snapshot')
+def get_snapshot_status():
+    """Freshness and protocol statistics of the opportunity snapshot"""
+    if not DEFI_OPTIMIZER_AVAILABLE:
+        return jsonify({'error': 'DeFi optimizer not available', 'snapshot': None})
+
+    return jsonify({
+        'snapshot': defi_optimizer.snapshot.get_status(),
+        'timestamp': datetime.now().isoformat()
+    })
+
 @defi_bp.route('/protocols/<protocol_name>')
 @rate_limit(5)
 def get_protocol_opportunities(protocol_name):
@@ -133,7 +133,7 @@ def get_technical_analysis(pair):
                 cursor = conn.cursor()
                 cursor.execute(
                     """
-                    SELECT technical_score, indicator_values, technical_reasoning
+                    SELECT technical_score, payload
                     FROM trade_decisions
                     WHERE pair = ?
                     ORDER BY timestamp DESC
@@ -144,9 +144,20 @@ def get_technical_analysis(pair):
 
                 result = cursor.fetchone()
                 if result:
-                    import json
+                    import sys
+                    from pathlib import Path
 
-                    indicators = json.loads(result[1]) if result[1] else {}
+                    project_root = Path(__file__).parent.parent.parent
+                    sys.path.insert(0, str(project_root))
+
+                    from src.database.consolidated.payload_codec import decode_payload
+
+                    payload = decode_payload(result[1])
+                    indicators = {
+                        name: signal.get("value", 0)
+                        for name, signal in payload.get("technical_signals", {}).items()
+                        if isinstance(signal, dict)
+                    }
                     return {
                         "technical_score": round(result[0] or 0.0, 3),
                         "rsi": round(indicators.get("rsi", 50), 1),
@@ -156,7 +167,7 @@ def get_technical_analysis(pair):
                         "ema_50": round(indicators.get("ema_50", 0), 4),
                         "volume_ratio": round(indicators.get("volume_ratio", 1.0), 2),
                         "atr_percent": round(indicators.get("atr_percent", 3.0), 2),
-                        "reasoning": result[2].split("\n") if result[2] else [],
+                        "reasoning": payload.get("technical_reasoning", []),
                     }
 
         # Fallback technical data
@@ -0,0 +1,53 @@
+"""
+Metrics API Routes Blueprint - Hot-path latency and system metrics
+"""
+import logging
+import sys
+from pathlib import Path
+from flask import Blueprint, Response, jsonify, request
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.monitoring.async_logging import set_hot_path_debug
+from src.monitoring.metrics import CONTENT_TYPE, registry
+from src.monitoring.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__, url_prefix='/api/metrics')
+
+@metrics_bp.route('')
+def scrape_metrics():
+    """Every registered metric in the Prometheus text exposition format"""
+    try:
+        return Response(registry.render(), content_type=CONTENT_TYPE)
+    except Exception as e:
+        logger.error(f"Metrics scrape error: {e}")
+        return Response(f"# scrape failed: {e}\n", status=500, content_type=CONTENT_TYPE)
+
+@metrics_bp.route('/latency')
+def get_latency_metrics():
+    """Per-stage latency percentiles from candle close to order placement"""
+    try:
+        return jsonify(tracer.latency_report())
+    except Exception as e:
+        logger.error(f"Latency metrics API error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@metrics_bp.route('/logging/debug', methods=['POST'])
+def set_debug_logging():
+    """Switch unsampled hot-path debug logging of a module on or off"""
+    try:
+        data = request.get_json() or {}
+        module = data.get('module')
+        if not module:
+            return jsonify({'error': 'module is required'}), 400
+        enabled = bool(data.get('enabled', True))
+        set_hot_path_debug(module, enabled)
+        logger.info(f"🔧 Hot-path debug logging {'enabled' if enabled else 'disabled'} for {module}")
+        return jsonify({'module': module, 'enabled': enabled})
+    except Exception as e:
+        logger.error(f"Debug logging API error: {e}")
+        return jsonify({'error': str(e)}), 500
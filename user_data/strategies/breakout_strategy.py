@@ -9,6 +9,11 @@ from freqtrade.strategy import IStrategy, DecimalParameter
 from pandas import DataFrame
 import logging
 
+try:
+    from src.market_data.indicator_hub import hub_client_from_env
+except ImportError:  # repo not on the bot's path; indicators are computed locally
+    hub_client_from_env = None
+
 logger = logging.getLogger(__name__)
 
 class BreakoutStrategy(IStrategy):
@@ -29,9 +34,22 @@ class BreakoutStrategy(IStrategy):
     volume_factor = DecimalParameter(1.2, 2.0, default=1.5, space="buy")
     resistance_lookback = DecimalParameter(15, 25, default=20, space="buy")
     
+    def bot_start(self, **kwargs) -> None:
+        # Share indicator columns with the other bots when the coordinator runs an indicator hub
+        consumer = self.config.get('bot_name', self.__class__.__name__)
+        self.indicator_hub = hub_client_from_env(consumer) if hub_client_from_env else None
+    
+    def _indicator(self, name: str, dataframe: DataFrame, metadata: dict, **params):
+        """ta.<name>(dataframe, **params), computed once per candle across bots when a hub is running"""
+        hub = getattr(self, 'indicator_hub', None)
+        if hub is not None:
+            return hub.indicator(metadata['pair'], metadata.get('timeframe', self.timeframe),
+                                 dataframe, name, **params)
+        return getattr(ta, name)(dataframe, **params)
+    
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # ATR for volatility
-        dataframe['atr'] = ta.ATR(dataframe, timeperiod=int(self.atr_period.value))
+        dataframe['atr'] = self._indicator('ATR', dataframe, metadata, timeperiod=int(self.atr_period.value))
         
         # Support and Resistance
         dataframe['resistance'] = dataframe['high'].rolling(int(self.resistance_lookback.value)).max()
@@ -41,7 +59,7 @@ class BreakoutStrategy(IStrategy):
         dataframe['range_size'] = (dataframe['resistance'] - dataframe['support']) / dataframe['close'] * 100
         
         # Volume indicators
-        dataframe['volume_sma'] = ta.SMA(dataframe['volume'], timeperiod=20)
+        dataframe['volume_sma'] = self._indicator('SMA', dataframe, metadata, timeperiod=20, price='volume')
         dataframe['volume_ratio'] = dataframe['volume'] / dataframe['volume_sma']
         
         # Consolidation detection
@@ -56,79 +74,57 @@ class BreakoutStrategy(IStrategy):
         return dataframe
     
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        conditions = [
+        entry = (
             # Price breaks above resistance
-            (dataframe['close'] > dataframe['resistance'].shift(1)),
-            (dataframe['close'].shift(1) <= dataframe['resistance'].shift(1)),
+            (dataframe['close'] > dataframe['resistance'].shift(1)) &
+            (dataframe['close'].shift(1) <= dataframe['resistance'].shift(1)) &
             
             # Was in consolidation recently
-            (dataframe['consolidation'].shift(1) == True),
+            (dataframe['consolidation'].shift(1) == True) &
             
             # Strong volume on breakout
-            (dataframe['volume_ratio'] >= self.volume_factor.value),
+            (dataframe['volume_ratio'] >= self.volume_factor.value) &
             
             # Sufficient range size (not micro-breakout)
-            (dataframe['range_size'] >= 2.0),
+            (dataframe['range_size'] >= 2.0) &
             
             # Strong momentum
             (dataframe['breakout_momentum'] > 0.5)
-        ]
+        )
+        dataframe.loc[entry, 'enter_long'] = 1
         
-        if all(conditions):
+        if self._log_signals() and entry.iloc[-1]:
             pair = metadata.get('pair', 'Unknown')
-            price = dataframe['close'].iloc[-1]
-            resistance = dataframe['resistance'].iloc[-1]
-            volume_ratio = dataframe['volume_ratio'].iloc[-1]
-            range_size = dataframe['range_size'].iloc[-1]
-            momentum = dataframe['breakout_momentum'].iloc[-1]
-            
+            last = dataframe.iloc[-1]
             logger.info(f"⚡ BREAKOUT ENTRY for {pair}: "
-                       f"Price={price:.4f} broke Resistance={resistance:.4f}, "
-                       f"Volume={volume_ratio:.1f}x, Range={range_size:.2f}%, "
-                       f"Momentum={momentum:.2f}%")
-        
-        dataframe.loc[
-            (dataframe['close'] > dataframe['resistance'].shift(1)) &
-            (dataframe['close'].shift(1) <= dataframe['resistance'].shift(1)) &
-            (dataframe['consolidation'].shift(1) == True) &
-            (dataframe['volume_ratio'] >= self.volume_factor.value) &
-            (dataframe['range_size'] >= 2.0) &
-            (dataframe['breakout_momentum'] > 0.5),
-            'enter_long'] = 1
+                       f"Price={last['close']:.4f} broke Resistance={last['resistance']:.4f}, "
+                       f"Volume={last['volume_ratio']:.1f}x, Range={last['range_size']:.2f}%, "
+                       f"Momentum={last['breakout_momentum']:.2f}%")
             
         return dataframe
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        exit_conditions = [
-            # Price falls back below previous resistance (now support)
-            (dataframe['close'] < dataframe['resistance'].shift(5) * 0.995),
-            # OR momentum turns significantly negative
-            (dataframe['breakout_momentum'] < -1.0)
-        ]
-        
-        # Use OR logic for exit conditions
-        support_break = dataframe['close'] < dataframe['resistance'].shift(5) * 0.995
+        # Price falls back below previous resistance (now support) OR momentum turns significantly negative
+        previous_resistance = dataframe['resistance'].shift(5)
+        support_break = dataframe['close'] < previous_resistance * 0.995
         momentum_fade = dataframe['breakout_momentum'] < -1.0
+        dataframe.loc[support_break | momentum_fade, 'exit_long'] = 1
         
-        if support_break.iloc[-1] or momentum_fade.iloc[-1]:
+        if self._log_signals() and (support_break.iloc[-1] or momentum_fade.iloc[-1]):
             pair = metadata.get('pair', 'Unknown')
-            price = dataframe['close'].iloc[-1]
-            prev_resistance = dataframe['resistance'].shift(5).iloc[-1]
-            momentum = dataframe['breakout_momentum'].iloc[-1]
-            
+            last = dataframe.iloc[-1]
             exit_reason = "Support Break" if support_break.iloc[-1] else "Momentum Fade"
             logger.info(f"🔻 BREAKOUT EXIT for {pair}: "
-                       f"{exit_reason} - Price={price:.4f}, "
-                       f"Prev Resistance={prev_resistance:.4f}, "
-                       f"Momentum={momentum:.2f}%")
-        
-        dataframe.loc[
-            (dataframe['close'] < dataframe['resistance'].shift(5) * 0.995) |
-            (dataframe['breakout_momentum'] < -1.0),
-            'exit_long'] = 1
+                       f"{exit_reason} - Price={last['close']:.4f}, "
+                       f"Prev Resistance={previous_resistance.iloc[-1]:.4f}, "
+                       f"Momentum={last['breakout_momentum']:.2f}%")
             
         return dataframe
     
+    def _log_signals(self) -> bool:
+        """Log the latest candle's signal only when trading live or dry-run (not in backtests/hyperopt)"""
+        return self.dp is not None and self.dp.runmode.value in ('live', 'dry_run')
+    
     def custom_entry_price(self, pair: str, current_time, proposed_rate: float, **kwargs) -> float:
         logger.info(f"🚀 BREAKOUT ENTRY for {pair} at {proposed_rate:.4f} "
                    f"(Riding momentum breakout)")
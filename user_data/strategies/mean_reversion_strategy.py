@@ -9,6 +9,11 @@ from freqtrade.strategy import IStrategy, DecimalParameter
 from pandas import DataFrame
 import logging
 
+try:
+    from src.market_data.indicator_hub import hub_client_from_env
+except ImportError:  # repo not on the bot's path; indicators are computed locally
+    hub_client_from_env = None
+
 logger = logging.getLogger(__name__)
 
 class MeanReversionStrategy(IStrategy):
@@ -31,15 +36,28 @@ class MeanReversionStrategy(IStrategy):
     bb_period = DecimalParameter(15, 25, default=20, space="buy")
     bb_std = DecimalParameter(1.8, 2.5, default=2.0, space="buy")
     
+    def bot_start(self, **kwargs) -> None:
+        # Share indicator columns with the other bots when the coordinator runs an indicator hub
+        consumer = self.config.get('bot_name', self.__class__.__name__)
+        self.indicator_hub = hub_client_from_env(consumer) if hub_client_from_env else None
+    
+    def _indicator(self, name: str, dataframe: DataFrame, metadata: dict, **params):
+        """ta.<name>(dataframe, **params), computed once per candle across bots when a hub is running"""
+        hub = getattr(self, 'indicator_hub', None)
+        if hub is not None:
+            return hub.indicator(metadata['pair'], metadata.get('timeframe', self.timeframe),
+                                 dataframe, name, **params)
+        return getattr(ta, name)(dataframe, **params)
+    
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # RSI
-        dataframe['rsi'] = ta.RSI(dataframe, timeperiod=int(self.rsi_period.value))
+        dataframe['rsi'] = self._indicator('RSI', dataframe, metadata, timeperiod=int(self.rsi_period.value))
         
         # Bollinger Bands
-        bb = ta.BBANDS(dataframe, 
-                      timeperiod=int(self.bb_period.value),
-                      nbdevup=self.bb_std.value,
-                      nbdevdn=self.bb_std.value)
+        bb = self._indicator('BBANDS', dataframe, metadata,
+                             timeperiod=int(self.bb_period.value),
+                             nbdevup=self.bb_std.value,
+                             nbdevdn=self.bb_std.value)
         dataframe['bb_upper'] = bb['upperband']
         dataframe['bb_middle'] = bb['middleband']
         dataframe['bb_lower'] = bb['lowerband']
@@ -56,72 +74,51 @@ class MeanReversionStrategy(IStrategy):
         return dataframe
     
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        conditions = [
+        entry = (
             # RSI oversold
-            (dataframe['rsi'] <= self.rsi_oversold.value),
-            (dataframe['rsi'] > dataframe['rsi'].shift(1)),  # RSI turning up
+            (dataframe['rsi'] <= self.rsi_oversold.value) &
+            (dataframe['rsi'] > dataframe['rsi'].shift(1)) &  # RSI turning up
             
             # Price near or below lower Bollinger Band
-            (dataframe['close'] <= dataframe['bb_lower'] * 1.02),
+            (dataframe['close'] <= dataframe['bb_lower'] * 1.02) &
             
             # Bollinger Bands not too narrow (avoid low volatility)
-            (dataframe['bb_width'] > 0.02),
+            (dataframe['bb_width'] > 0.02) &
             
             # Price above recent support
             (dataframe['close'] > dataframe['support'] * 0.995)
-        ]
+        )
+        dataframe.loc[entry, 'enter_long'] = 1
         
-        if all(conditions):
+        if self._log_signals() and entry.iloc[-1]:
             pair = metadata.get('pair', 'Unknown')
-            rsi_val = dataframe['rsi'].iloc[-1]
-            price = dataframe['close'].iloc[-1]
-            bb_lower = dataframe['bb_lower'].iloc[-1]
-            distance_from_band = dataframe['price_vs_lower'].iloc[-1]
-            
+            last = dataframe.iloc[-1]
             logger.info(f"📈 MEAN REVERSION ENTRY for {pair}: "
-                       f"RSI={rsi_val:.1f} (oversold), Price={price:.4f}, "
-                       f"BB Lower={bb_lower:.4f}, Distance={distance_from_band:.2f}%")
-        
-        dataframe.loc[
-            (dataframe['rsi'] <= self.rsi_oversold.value) &
-            (dataframe['rsi'] > dataframe['rsi'].shift(1)) &
-            (dataframe['close'] <= dataframe['bb_lower'] * 1.02) &
-            (dataframe['bb_width'] > 0.02) &
-            (dataframe['close'] > dataframe['support'] * 0.995),
-            'enter_long'] = 1
+                       f"RSI={last['rsi']:.1f} (oversold), Price={last['close']:.4f}, "
+                       f"BB Lower={last['bb_lower']:.4f}, Distance={last['price_vs_lower']:.2f}%")
             
         return dataframe
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        exit_conditions = [
-            # RSI overbought OR
-            (dataframe['rsi'] >= self.rsi_overbought.value),
-            # Price reached upper Bollinger Band
-            (dataframe['close'] >= dataframe['bb_upper'] * 0.98)
-        ]
-        
-        # Use OR logic for exit conditions
+        # RSI overbought OR price reached upper Bollinger Band
         rsi_exit = dataframe['rsi'] >= self.rsi_overbought.value
         bb_exit = dataframe['close'] >= dataframe['bb_upper'] * 0.98
+        dataframe.loc[rsi_exit | bb_exit, 'exit_long'] = 1
         
-        if rsi_exit.iloc[-1] or bb_exit.iloc[-1]:
+        if self._log_signals() and (rsi_exit.iloc[-1] or bb_exit.iloc[-1]):
             pair = metadata.get('pair', 'Unknown')
-            rsi_val = dataframe['rsi'].iloc[-1]
-            price = dataframe['close'].iloc[-1]
-            bb_upper = dataframe['bb_upper'].iloc[-1]
-            
+            last = dataframe.iloc[-1]
             exit_reason = "RSI Overbought" if rsi_exit.iloc[-1] else "BB Upper Touch"
             logger.info(f"📉 MEAN REVERSION EXIT for {pair}: "
-                       f"{exit_reason} - RSI={rsi_val:.1f}, "
-                       f"Price={price:.4f}, BB Upper={bb_upper:.4f}")
-        
-        dataframe.loc[
-            (dataframe['rsi'] >= self.rsi_overbought.value) |
-            (dataframe['close'] >= dataframe['bb_upper'] * 0.98),
-            'exit_long'] = 1
+                       f"{exit_reason} - RSI={last['rsi']:.1f}, "
+                       f"Price={last['close']:.4f}, BB Upper={last['bb_upper']:.4f}")
             
         return dataframe
     
+    def _log_signals(self) -> bool:
+        """Log the latest candle's signal only when trading live or dry-run (not in backtests/hyperopt)"""
+        return self.dp is not None and self.dp.runmode.value in ('live', 'dry_run')
+    
     def custom_entry_price(self, pair: str, current_time, proposed_rate: float, **kwargs) -> float:
         logger.info(f"🎯 MEAN REVERSION ENTRY for {pair} at {proposed_rate:.4f} "
                    f"(Expecting bounce from oversold)")
@@ -9,6 +9,11 @@ from freqtrade.strategy import IStrategy, DecimalParameter
 from pandas import DataFrame
 import logging
 
+try:
+    from src.market_data.indicator_hub import hub_client_from_env
+except ImportError:  # repo not on the bot's path; indicators are computed locally
+    hub_client_from_env = None
+
 logger = logging.getLogger(__name__)
 
 class MomentumStrategy(IStrategy):
@@ -30,21 +35,34 @@ class MomentumStrategy(IStrategy):
     macd_signal = DecimalParameter(7, 12, default=9, space="buy")
     momentum_period = DecimalParameter(10, 20, default=14, space="buy")
     
+    def bot_start(self, **kwargs) -> None:
+        # Share indicator columns with the other bots when the coordinator runs an indicator hub
+        consumer = self.config.get('bot_name', self.__class__.__name__)
+        self.indicator_hub = hub_client_from_env(consumer) if hub_client_from_env else None
+    
+    def _indicator(self, name: str, dataframe: DataFrame, metadata: dict, **params):
+        """ta.<name>(dataframe, **params), computed once per candle across bots when a hub is running"""
+        hub = getattr(self, 'indicator_hub', None)
+        if hub is not None:
+            return hub.indicator(metadata['pair'], metadata.get('timeframe', self.timeframe),
+                                 dataframe, name, **params)
+        return getattr(ta, name)(dataframe, **params)
+    
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # MACD
-        macd = ta.MACD(dataframe, 
-                      fastperiod=int(self.macd_fast.value),
-                      slowperiod=int(self.macd_slow.value), 
-                      signalperiod=int(self.macd_signal.value))
+        macd = self._indicator('MACD', dataframe, metadata,
+                               fastperiod=int(self.macd_fast.value),
+                               slowperiod=int(self.macd_slow.value),
+                               signalperiod=int(self.macd_signal.value))
         dataframe['macd'] = macd['macd']
         dataframe['macdsignal'] = macd['macdsignal']
         dataframe['macdhist'] = macd['macdhist']
         
         # Momentum
-        dataframe['momentum'] = ta.MOM(dataframe, timeperiod=int(self.momentum_period.value))
+        dataframe['momentum'] = self._indicator('MOM', dataframe, metadata, timeperiod=int(self.momentum_period.value))
         
         # Volume
-        dataframe['volume_sma'] = ta.SMA(dataframe['volume'], timeperiod=20)
+        dataframe['volume_sma'] = self._indicator('SMA', dataframe, metadata, timeperiod=20, price='volume')
         
         # Price action
         dataframe['price_change'] = dataframe['close'].pct_change(periods=4) * 100
@@ -52,66 +70,53 @@ class MomentumStrategy(IStrategy):
         return dataframe
     
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        conditions = [
+        entry = (
             # MACD bullish crossover
-            (dataframe['macd'] > dataframe['macdsignal']),
-            (dataframe['macd'].shift(1) <= dataframe['macdsignal'].shift(1)),
+            (dataframe['macd'] > dataframe['macdsignal']) &
+            (dataframe['macd'].shift(1) <= dataframe['macdsignal'].shift(1)) &
             
             # Strong momentum
-            (dataframe['momentum'] > 0),
-            (dataframe['momentum'] > dataframe['momentum'].shift(1)),
+            (dataframe['momentum'] > 0) &
+            (dataframe['momentum'] > dataframe['momentum'].shift(1)) &
             
             # Volume confirmation
-            (dataframe['volume'] > dataframe['volume_sma']),
+            (dataframe['volume'] > dataframe['volume_sma']) &
             
             # Price moving up
             (dataframe['price_change'] > 1.0)
-        ]
+        )
+        dataframe.loc[entry, 'enter_long'] = 1
         
-        if all(conditions):
+        if self._log_signals() and entry.iloc[-1]:
             pair = metadata.get('pair', 'Unknown')
-            macd_val = dataframe['macd'].iloc[-1]
-            momentum_val = dataframe['momentum'].iloc[-1]
-            price_change = dataframe['price_change'].iloc[-1]
-            
+            last = dataframe.iloc[-1]
             logger.info(f"🚀 MOMENTUM ENTRY SIGNAL for {pair}: "
-                       f"MACD={macd_val:.4f}, Momentum={momentum_val:.2f}, "
-                       f"Price Change={price_change:.2f}%, Volume Above Average")
-        
-        dataframe.loc[
-            (dataframe['macd'] > dataframe['macdsignal']) &
-            (dataframe['macd'].shift(1) <= dataframe['macdsignal'].shift(1)) &
-            (dataframe['momentum'] > 0) &
-            (dataframe['momentum'] > dataframe['momentum'].shift(1)) &
-            (dataframe['volume'] > dataframe['volume_sma']) &
-            (dataframe['price_change'] > 1.0),
-            'enter_long'] = 1
+                       f"MACD={last['macd']:.4f}, Momentum={last['momentum']:.2f}, "
+                       f"Price Change={last['price_change']:.2f}%, Volume Above Average")
             
         return dataframe
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        exit_conditions = [
-            # MACD bearish crossover
-            (dataframe['macd'] < dataframe['macdsignal']),
+        # MACD bearish crossover
+        exit_ = (
+            (dataframe['macd'] < dataframe['macdsignal']) &
             (dataframe['macd'].shift(1) >= dataframe['macdsignal'].shift(1))
-        ]
+        )
+        dataframe.loc[exit_, 'exit_long'] = 1
         
-        if all(exit_conditions):
+        if self._log_signals() and exit_.iloc[-1]:
             pair = metadata.get('pair', 'Unknown')
-            macd_val = dataframe['macd'].iloc[-1]
-            momentum_val = dataframe['momentum'].iloc[-1]
-            
+            last = dataframe.iloc[-1]
             logger.info(f"🛑 MOMENTUM EXIT SIGNAL for {pair}: "
-                       f"MACD Bearish Crossover - MACD={macd_val:.4f}, "
-                       f"Momentum={momentum_val:.2f}")
-        
-        dataframe.loc[
-            (dataframe['macd'] < dataframe['macdsignal']) &
-            (dataframe['macd'].shift(1) >= dataframe['macdsignal'].shift(1)),
-            'exit_long'] = 1
+                       f"MACD Bearish Crossover - MACD={last['macd']:.4f}, "
+                       f"Momentum={last['momentum']:.2f}")
             
         return dataframe
     
+    def _log_signals(self) -> bool:
+        """Log the latest candle's signal only when trading live or dry-run (not in backtests/hyperopt)"""
+        return self.dp is not None and self.dp.runmode.value in ('live', 'dry_run')
+    
     def custom_entry_price(self, pair: str, current_time, proposed_rate: float, **kwargs) -> float:
         logger.info(f"💰 MOMENTUM ENTRY for {pair} at {proposed_rate:.4f}")
         return proposed_rate
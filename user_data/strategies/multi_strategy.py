@@ -1,13 +1,22 @@
 """
 Multi-Strategy Manager - Combines multiple strategies with detailed logging
 Rotates between different strategies based on market conditions
+
+Market state, the active sub-strategy and entry/exit signals are computed
+for every candle, so backtesting and hyperopt see the same decisions the
+live bot would have made at each bar.
 """
 
+import numpy as np
 import talib.abstract as ta
 from freqtrade.strategy import IStrategy, DecimalParameter
-from pandas import DataFrame
+from pandas import DataFrame, Series
 import logging
-import random
+
+try:
+    from src.market_data.indicator_hub import hub_client_from_env
+except ImportError:  # repo not on the bot's path; indicators are computed locally
+    hub_client_from_env = None
 
 logger = logging.getLogger(__name__)
 
@@ -28,24 +37,37 @@ class MultiStrategy(IStrategy):
     volatility_threshold = DecimalParameter(0.02, 0.08, default=0.04, space="buy")
     trend_strength = DecimalParameter(0.5, 2.0, default=1.0, space="buy")
     
+    def bot_start(self, **kwargs) -> None:
+        # Share indicator columns with the other bots when the coordinator runs an indicator hub
+        consumer = self.config.get('bot_name', self.__class__.__name__)
+        self.indicator_hub = hub_client_from_env(consumer) if hub_client_from_env else None
+    
+    def _indicator(self, name: str, dataframe: DataFrame, metadata: dict, **params):
+        """ta.<name>(dataframe, **params), computed once per candle across bots when a hub is running"""
+        hub = getattr(self, 'indicator_hub', None)
+        if hub is not None:
+            return hub.indicator(metadata['pair'], metadata.get('timeframe', self.timeframe),
+                                 dataframe, name, **params)
+        return getattr(ta, name)(dataframe, **params)
+    
     def populate_indicators(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
         # RSI for mean reversion
-        dataframe['rsi'] = ta.RSI(dataframe, timeperiod=14)
+        dataframe['rsi'] = self._indicator('RSI', dataframe, metadata, timeperiod=14)
         
         # MACD for momentum
-        macd = ta.MACD(dataframe, fastperiod=12, slowperiod=26, signalperiod=9)
+        macd = self._indicator('MACD', dataframe, metadata, fastperiod=12, slowperiod=26, signalperiod=9)
         dataframe['macd'] = macd['macd']
         dataframe['macdsignal'] = macd['macdsignal']
         dataframe['macdhist'] = macd['macdhist']
         
         # Bollinger Bands for mean reversion
-        bb = ta.BBANDS(dataframe, timeperiod=20)
+        bb = self._indicator('BBANDS', dataframe, metadata, timeperiod=20)
         dataframe['bb_upper'] = bb['upperband']
         dataframe['bb_middle'] = bb['middleband']
         dataframe['bb_lower'] = bb['lowerband']
         
         # ATR for volatility
-        dataframe['atr'] = ta.ATR(dataframe, timeperiod=14)
+        dataframe['atr'] = self._indicator('ATR', dataframe, metadata, timeperiod=14)
         dataframe['volatility'] = dataframe['atr'] / dataframe['close']
         
         # Support/Resistance for breakouts
@@ -53,191 +75,177 @@ class MultiStrategy(IStrategy):
         dataframe['support'] = dataframe['low'].rolling(20).min()
         
         # Volume
-        dataframe['volume_sma'] = ta.SMA(dataframe['volume'], timeperiod=20)
+        dataframe['volume_sma'] = self._indicator('SMA', dataframe, metadata, timeperiod=20, price='volume')
         dataframe['volume_ratio'] = dataframe['volume'] / dataframe['volume_sma']
         
         # Market condition detection
-        sma_20 = ta.SMA(dataframe['close'], timeperiod=20)
+        sma_20 = self._indicator('SMA', dataframe, metadata, timeperiod=20)
         dataframe['sma_20'] = sma_20
         dataframe['trend_direction'] = dataframe['sma_20'].pct_change(periods=5)
         dataframe['market_state'] = self.detect_market_state(dataframe)
+        dataframe['active_strategy'] = self.get_active_strategy(dataframe)
         
         return dataframe
     
-    def detect_market_state(self, dataframe: DataFrame) -> str:
-        """Detect current market conditions"""
-        if len(dataframe) < 20:
-            return 'neutral'
-            
-        current_volatility = dataframe['volatility'].iloc[-1]
-        trend_direction = dataframe['trend_direction'].iloc[-1]
-        rsi = dataframe['rsi'].iloc[-1]
-        
-        if current_volatility > self.volatility_threshold.value:
-            if abs(trend_direction) > 0.02:
-                return 'trending_volatile'  # Good for momentum
-            else:
-                return 'choppy_volatile'    # Good for mean reversion
-        else:
-            if abs(trend_direction) > 0.01:
-                return 'trending_calm'      # Good for breakout
-            else:
-                return 'consolidating'      # Good for mean reversion
-    
-    def get_active_strategy(self, dataframe: DataFrame) -> str:
-        """Select strategy based on market conditions"""
-        if len(dataframe) < 20:
-            return 'sample'
-            
-        market_state = dataframe['market_state'].iloc[-1] if 'market_state' in dataframe.columns else 'neutral'
+    def detect_market_state(self, dataframe: DataFrame) -> Series:
+        """Detect market conditions for every candle"""
+        volatility = dataframe['volatility']
+        trend = dataframe['trend_direction'].abs()
+        volatile = volatility > self.volatility_threshold.value
+        
+        state = np.select(
+            [
+                volatile & (trend > 0.02),   # Good for momentum
+                volatile,                    # Choppy: good for mean reversion
+                trend > 0.01,                # Calm trend: good for breakout
+            ],
+            ['trending_volatile', 'choppy_volatile', 'trending_calm'],
+            default='consolidating'          # Good for mean reversion
+        )
         
-        if market_state == 'trending_volatile':
-            return 'momentum'
-        elif market_state in ['choppy_volatile', 'consolidating']:
-            return 'mean_reversion'
-        elif market_state == 'trending_calm':
-            return 'breakout'
-        else:
-            return 'sample'  # Default fallback
+        # Not enough history for the indicators yet
+        warming_up = volatility.isna() | dataframe['trend_direction'].isna()
+        return Series(np.where(warming_up, 'neutral', state), index=dataframe.index)
+    
+    def get_active_strategy(self, dataframe: DataFrame) -> Series:
+        """Select the sub-strategy for every candle based on market conditions"""
+        strategy = dataframe['market_state'].map({
+            'trending_volatile': 'momentum',
+            'choppy_volatile': 'mean_reversion',
+            'consolidating': 'mean_reversion',
+            'trending_calm': 'breakout',
+        })
+        return strategy.fillna('sample')  # Default fallback
     
     def populate_entry_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        pair = metadata.get('pair', 'Unknown')
-        active_strategy = self.get_active_strategy(dataframe)
-        
-        if active_strategy == 'momentum':
-            entry_signal = self.momentum_entry(dataframe, pair)
-        elif active_strategy == 'mean_reversion':
-            entry_signal = self.mean_reversion_entry(dataframe, pair)
-        elif active_strategy == 'breakout':
-            entry_signal = self.breakout_entry(dataframe, pair)
-        else:
-            entry_signal = self.sample_entry(dataframe, pair)
-        
-        dataframe['enter_long'] = entry_signal
+        active = dataframe['active_strategy']
+        signals = {
+            'momentum': self.momentum_entry(dataframe),
+            'mean_reversion': self.mean_reversion_entry(dataframe),
+            'breakout': self.breakout_entry(dataframe),
+            'sample': self.sample_entry(dataframe),
+        }
+        
+        entry = Series(False, index=dataframe.index)
+        for name, condition in signals.items():
+            entry |= (active == name) & condition
+        
+        dataframe.loc[entry, 'enter_long'] = 1
+        dataframe.loc[entry, 'enter_tag'] = active[entry]
+        
+        if self._log_signals() and entry.iloc[-1]:
+            self._log_entry(dataframe, metadata.get('pair', 'Unknown'), active.iloc[-1])
         return dataframe
     
     def populate_exit_trend(self, dataframe: DataFrame, metadata: dict) -> DataFrame:
-        pair = metadata.get('pair', 'Unknown')
-        active_strategy = self.get_active_strategy(dataframe)
-        
-        if active_strategy == 'momentum':
-            exit_signal = self.momentum_exit(dataframe, pair)
-        elif active_strategy == 'mean_reversion':
-            exit_signal = self.mean_reversion_exit(dataframe, pair)
-        elif active_strategy == 'breakout':
-            exit_signal = self.breakout_exit(dataframe, pair)
-        else:
-            exit_signal = self.sample_exit(dataframe, pair)
-        
-        dataframe['exit_long'] = exit_signal
+        active = dataframe['active_strategy']
+        signals = {
+            'momentum': self.momentum_exit(dataframe),
+            'mean_reversion': self.mean_reversion_exit(dataframe),
+            'breakout': self.breakout_exit(dataframe),
+            'sample': self.sample_exit(dataframe),
+        }
+        
+        exit_ = Series(False, index=dataframe.index)
+        for name, condition in signals.items():
+            exit_ |= (active == name) & condition
+        
+        dataframe.loc[exit_, 'exit_long'] = 1
+        dataframe.loc[exit_, 'exit_tag'] = active[exit_]
+        
+        if self._log_signals() and exit_.iloc[-1]:
+            self._log_exit(dataframe, metadata.get('pair', 'Unknown'), active.iloc[-1])
         return dataframe
     
-    def momentum_entry(self, dataframe: DataFrame, pair: str) -> int:
+    def momentum_entry(self, dataframe: DataFrame) -> Series:
         """Momentum strategy entry logic - FIXED: Simplified conditions"""
-        condition = (
+        return (
             (dataframe['macd'] > dataframe['macdsignal']) &  # MACD bullish
             (dataframe['rsi'] > 45) & (dataframe['rsi'] < 65) &  # RSI in reasonable range
             (dataframe['volume_ratio'] > 1.1)  # Reduced volume requirement
         )
-        
-        if condition.iloc[-1]:
-            logger.info(f"🚀 MOMENTUM ENTRY for {pair}: MACD Bullish, "
-                       f"RSI={dataframe['rsi'].iloc[-1]:.1f}, Volume={dataframe['volume_ratio'].iloc[-1]:.1f}x")
-            return 1
-        return 0
     
-    def mean_reversion_entry(self, dataframe: DataFrame, pair: str) -> int:
+    def mean_reversion_entry(self, dataframe: DataFrame) -> Series:
         """Mean reversion strategy entry logic - FIXED: More realistic conditions"""
-        condition = (
+        return (
             (dataframe['rsi'] <= 40) &  # Changed from 30 to 40 - less restrictive
             (dataframe['close'] <= dataframe['bb_middle'] * 1.02) &  # Changed to middle band, not lower
             (dataframe['volatility'] > 0.005)  # Reduced volatility requirement
         )
-        
-        if condition.iloc[-1]:
-            logger.info(f"📈 MEAN REVERSION ENTRY for {pair}: RSI={dataframe['rsi'].iloc[-1]:.1f}, "
-                       f"Below BB Middle, Volatility={dataframe['volatility'].iloc[-1]:.3f}")
-            return 1
-        return 0
     
-    def breakout_entry(self, dataframe: DataFrame, pair: str) -> int:
+    def breakout_entry(self, dataframe: DataFrame) -> Series:
         """Breakout strategy entry logic - FIXED: Simplified conditions"""
-        condition = (
+        return (
             (dataframe['close'] > dataframe['sma_20']) &  # Above moving average
             (dataframe['rsi'] > 55) &  # Showing strength
             (dataframe['volume_ratio'] > 1.2)  # Some volume increase
         )
-        
-        if condition.iloc[-1]:
-            logger.info(f"⚡ BREAKOUT ENTRY for {pair}: Price above SMA20, "
-                       f"RSI={dataframe['rsi'].iloc[-1]:.1f}, Volume={dataframe['volume_ratio'].iloc[-1]:.1f}x")
-            return 1
-        return 0
     
-    def sample_entry(self, dataframe: DataFrame, pair: str) -> int:
+    def sample_entry(self, dataframe: DataFrame) -> Series:
         """Default sample strategy entry logic - FIXED: More active"""
-        condition = (
+        return (
             (dataframe['rsi'] <= 45) &  # Changed from 35 to 45 - less restrictive
             (dataframe['volume'] > dataframe['volume_sma'] * 0.8)  # Reduced volume requirement
         )
-        
-        if condition.iloc[-1]:
-            logger.info(f"🎯 SAMPLE ENTRY for {pair}: RSI={dataframe['rsi'].iloc[-1]:.1f}, "
-                       f"Volume Above 80% Average")
-            return 1
-        return 0
     
-    def momentum_exit(self, dataframe: DataFrame, pair: str) -> int:
+    def momentum_exit(self, dataframe: DataFrame) -> Series:
         """Momentum strategy exit logic"""
-        condition = (
+        return (
             (dataframe['macd'] < dataframe['macdsignal']) &
             (dataframe['macd'].shift(1) >= dataframe['macdsignal'].shift(1))
         )
-        
-        if condition.iloc[-1]:
-            logger.info(f"🛑 MOMENTUM EXIT for {pair}: MACD Bearish Crossover")
-            return 1
-        return 0
     
-    def mean_reversion_exit(self, dataframe: DataFrame, pair: str) -> int:
+    def mean_reversion_exit(self, dataframe: DataFrame) -> Series:
         """Mean reversion strategy exit logic - BALANCED: Less aggressive"""
-        condition = (
+        return (
             (dataframe['rsi'] >= 75) |  # Changed from 70 to 75 - less trigger-happy
             (dataframe['close'] >= dataframe['bb_upper'] * 0.95)  # Changed from 0.99 to 0.95
         )
-        
-        if condition.iloc[-1]:
-            reason = "RSI Overbought" if dataframe['rsi'].iloc[-1] >= 75 else "BB Upper Touch"
-            logger.info(f"📉 MEAN REVERSION EXIT for {pair}: {reason}")
-            return 1
-        return 0
     
-    def breakout_exit(self, dataframe: DataFrame, pair: str) -> int:
+    def breakout_exit(self, dataframe: DataFrame) -> Series:
         """Breakout strategy exit logic"""
-        condition = (
-            dataframe['close'] < dataframe['support'] * 1.005
-        )
-        
-        if condition.iloc[-1]:
-            logger.info(f"🔻 BREAKOUT EXIT for {pair}: Support Break")
-            return 1
-        return 0
+        return dataframe['close'] < dataframe['support'] * 1.005
     
-    def sample_exit(self, dataframe: DataFrame, pair: str) -> int:
+    def sample_exit(self, dataframe: DataFrame) -> Series:
         """Default sample strategy exit logic"""
-        condition = dataframe['rsi'] >= 75
-        
-        if condition.iloc[-1]:
-            logger.info(f"🔄 SAMPLE EXIT for {pair}: RSI Overbought={dataframe['rsi'].iloc[-1]:.1f}")
-            return 1
-        return 0
+        return dataframe['rsi'] >= 75
+    
+    def _log_signals(self) -> bool:
+        """Log the latest candle's signal only when trading live or dry-run (not in backtests/hyperopt)"""
+        return self.dp is not None and self.dp.runmode.value in ('live', 'dry_run')
+    
+    def _log_entry(self, dataframe: DataFrame, pair: str, strategy: str) -> None:
+        last = dataframe.iloc[-1]
+        if strategy == 'momentum':
+            logger.info("🚀 MOMENTUM ENTRY for %s: MACD Bullish, RSI=%.1f, Volume=%.1fx",
+                        pair, last['rsi'], last['volume_ratio'])
+        elif strategy == 'mean_reversion':
+            logger.info("📈 MEAN REVERSION ENTRY for %s: RSI=%.1f, Below BB Middle, Volatility=%.3f",
+                        pair, last['rsi'], last['volatility'])
+        elif strategy == 'breakout':
+            logger.info("⚡ BREAKOUT ENTRY for %s: Price above SMA20, RSI=%.1f, Volume=%.1fx",
+                        pair, last['rsi'], last['volume_ratio'])
+        else:
+            logger.info("🎯 SAMPLE ENTRY for %s: RSI=%.1f, Volume Above 80%% Average", pair, last['rsi'])
+    
+    def _log_exit(self, dataframe: DataFrame, pair: str, strategy: str) -> None:
+        last = dataframe.iloc[-1]
+        if strategy == 'momentum':
+            logger.info("🛑 MOMENTUM EXIT for %s: MACD Bearish Crossover", pair)
+        elif strategy == 'mean_reversion':
+            reason = "RSI Overbought" if last['rsi'] >= 75 else "BB Upper Touch"
+            logger.info("📉 MEAN REVERSION EXIT for %s: %s", pair, reason)
+        elif strategy == 'breakout':
+            logger.info("🔻 BREAKOUT EXIT for %s: Support Break", pair)
+        else:
+            logger.info("🔄 SAMPLE EXIT for %s: RSI Overbought=%.1f", pair, last['rsi'])
     
     def custom_entry_price(self, pair: str, current_time, proposed_rate: float, **kwargs) -> float:
-        logger.info(f"💰 MULTI-STRATEGY ENTRY for {pair} at {proposed_rate:.4f}")
+        logger.info("💰 MULTI-STRATEGY ENTRY for %s at %.4f", pair, proposed_rate)
         return proposed_rate
     
     def custom_exit_price(self, pair: str, trade, current_time, proposed_rate: float, **kwargs) -> float:
         profit_ratio = trade.calc_profit_ratio(proposed_rate)
-        logger.info(f"💸 MULTI-STRATEGY EXIT for {pair} at {proposed_rate:.4f} "
-                   f"(Profit: {profit_ratio*100:.2f}%)")
+        logger.info("💸 MULTI-STRATEGY EXIT for %s at %.4f (Profit: %.2f%%)",
+                    pair, proposed_rate, profit_ratio * 100)
         return proposed_rate
\ No newline at end of file